@@ -0,0 +1,31 @@
+"""add user ledger version
+
+Revision ID: 3c7e1a9d2b40
+Revises: 51ff4b081d2d
+Create Date: 2026-10-19 09:12:31.804512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7e1a9d2b40'
+down_revision: Union[str, Sequence[str], None] = '51ff4b081d2d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'users',
+        sa.Column('ledger_version', sa.BigInteger(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'ledger_version')
@@ -0,0 +1,89 @@
+"""add expected inflow aggregates
+
+Revision ID: 7d4b2e9c1a63
+Revises: 3c7e1a9d2b40
+Create Date: 2026-10-19 12:05:47.216384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d4b2e9c1a63'
+down_revision: Union[str, Sequence[str], None] = '3c7e1a9d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Backfills from the stored received_amount and live write-offs. Run
+    expected_inflow_service.verify_promise_aggregates(repair=True) afterwards
+    to re-derive received amounts from realizations where they disagree.
+    """
+    op.add_column(
+        'expected_incomes',
+        sa.Column('written_off_amount', sa.BigInteger(), server_default='0', nullable=False),
+    )
+    op.add_column(
+        'expected_incomes',
+        sa.Column('outstanding_amount', sa.BigInteger(), server_default='0', nullable=False),
+    )
+    op.add_column(
+        'expected_inflow_promises',
+        sa.Column('received_amount', sa.BigInteger(), server_default='0', nullable=False),
+    )
+    op.add_column(
+        'expected_inflow_promises',
+        sa.Column('written_off_amount', sa.BigInteger(), server_default='0', nullable=False),
+    )
+    op.add_column(
+        'expected_inflow_promises',
+        sa.Column('outstanding_amount', sa.BigInteger(), server_default='0', nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE expected_incomes SET written_off_amount = COALESCE((
+            SELECT SUM(w.amount) FROM expected_inflow_write_offs w
+            WHERE w.schedule_id = expected_incomes.id AND w.reversed_at IS NULL
+        ), 0)
+        """
+    )
+    op.execute(
+        """
+        UPDATE expected_incomes SET outstanding_amount = GREATEST(
+            amount - COALESCE(received_amount, 0) - written_off_amount, 0
+        )
+        """
+    )
+    op.execute(
+        """
+        UPDATE expected_inflow_promises SET
+            received_amount = COALESCE((
+                SELECT SUM(COALESCE(s.received_amount, 0)) FROM expected_incomes s
+                WHERE s.promise_id = expected_inflow_promises.id
+            ), 0),
+            written_off_amount = COALESCE((
+                SELECT SUM(s.written_off_amount) FROM expected_incomes s
+                WHERE s.promise_id = expected_inflow_promises.id
+            ), 0),
+            outstanding_amount = COALESCE((
+                SELECT SUM(s.outstanding_amount) FROM expected_incomes s
+                WHERE s.promise_id = expected_inflow_promises.id
+                  AND COALESCE(s.close_reason, '') NOT IN ('RESCHEDULED', 'CANCELLED', 'RESCHEDULE_REVERSED')
+            ), 0)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('expected_inflow_promises', 'outstanding_amount')
+    op.drop_column('expected_inflow_promises', 'written_off_amount')
+    op.drop_column('expected_inflow_promises', 'received_amount')
+    op.drop_column('expected_incomes', 'outstanding_amount')
+    op.drop_column('expected_incomes', 'written_off_amount')
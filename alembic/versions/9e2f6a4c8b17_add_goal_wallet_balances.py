@@ -0,0 +1,69 @@
+"""add goal wallet balances
+
+Revision ID: 9e2f6a4c8b17
+Revises: 7d4b2e9c1a63
+Create Date: 2026-10-19 15:41:08.530912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e2f6a4c8b17'
+down_revision: Union[str, Sequence[str], None] = '7d4b2e9c1a63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'goal_wallet_balances',
+        sa.Column('goal_id', sa.Integer(), nullable=False),
+        sa.Column('wallet_id', sa.Integer(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('allocated', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('returned', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('consumed', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('released', sa.BigInteger(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['goal_id'], ['goals.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['wallet_id'], ['wallets.id'], ondelete='RESTRICT'),
+        sa.PrimaryKeyConstraint('goal_id', 'wallet_id'),
+    )
+    op.create_index(
+        'ix_goal_wallet_balances_owner_wallet',
+        'goal_wallet_balances',
+        ['owner_id', 'wallet_id'],
+        unique=False,
+    )
+    op.execute(
+        """
+        INSERT INTO goal_wallet_balances
+            (goal_id, wallet_id, owner_id, allocated, returned, consumed, released)
+        SELECT goal_id, wallet_id, MIN(owner_id),
+               SUM(allocated), SUM(returned), SUM(consumed), SUM(released)
+        FROM (
+            SELECT goal_id, wallet_id, owner_id,
+                   CASE WHEN contribution_type = 'ALLOCATE' THEN amount ELSE 0 END AS allocated,
+                   CASE WHEN contribution_type = 'RETURN' THEN amount ELSE 0 END AS returned,
+                   CASE WHEN contribution_type = 'CONSUME' THEN amount ELSE 0 END AS consumed,
+                   0 AS released
+            FROM goal_contributions
+            UNION ALL
+            SELECT goal_id, wallet_id, owner_id, 0, 0, 0, amount
+            FROM goal_project_releases
+            WHERE wallet_id IS NOT NULL
+        ) AS history
+        GROUP BY goal_id, wallet_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_goal_wallet_balances_owner_wallet', table_name='goal_wallet_balances')
+    op.drop_table('goal_wallet_balances')
@@ -0,0 +1,51 @@
+"""add money in feed indexes
+
+Revision ID: b5c8d1e7f304
+Revises: 9e2f6a4c8b17
+Create Date: 2026-10-19 17:22:41.903517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5c8d1e7f304'
+down_revision: Union[str, Sequence[str], None] = '9e2f6a4c8b17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_financial_events_owner_date_created',
+        'financial_events',
+        ['owner_id', 'date', 'created_at', 'id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_financial_events_title_trgm',
+        'financial_events',
+        ['title'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_financial_events_description_trgm',
+        'financial_events',
+        ['description'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'description': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_financial_events_description_trgm', table_name='financial_events')
+    op.drop_index('ix_financial_events_title_trgm', table_name='financial_events')
+    op.drop_index('ix_financial_events_owner_date_created', table_name='financial_events')
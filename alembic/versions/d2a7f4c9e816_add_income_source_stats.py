@@ -0,0 +1,93 @@
+"""add income source stats
+
+Revision ID: d2a7f4c9e816
+Revises: b5c8d1e7f304
+Create Date: 2026-10-19 18:22:41.604718
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7f4c9e816'
+down_revision: Union[str, Sequence[str], None] = 'b5c8d1e7f304'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_entity_ledger_income_source_event',
+        'entity_ledger',
+        ['income_source_id', 'event_id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_expected_inflow_promises_owner_source',
+        'expected_inflow_promises',
+        ['owner_id', 'source_id'],
+        unique=False,
+    )
+    op.create_table(
+        'income_source_stats',
+        sa.Column('source_id', sa.Integer(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('entry_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('entry_total_received', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('promise_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('lifetime_expected', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('lifetime_received', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('outstanding_expected', sa.BigInteger(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['source_id'], ['income_sources.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('source_id'),
+    )
+    op.create_index(
+        op.f('ix_income_source_stats_owner_id'),
+        'income_source_stats',
+        ['owner_id'],
+        unique=False,
+    )
+    op.execute(
+        """
+        INSERT INTO income_source_stats
+            (source_id, owner_id, entry_count, entry_total_received,
+             promise_count, lifetime_expected, lifetime_received, outstanding_expected)
+        SELECT s.id, s.owner_id,
+               COALESCE(e.entry_count, 0), COALESCE(e.entry_total_received, 0),
+               COALESCE(p.promise_count, 0), COALESCE(p.lifetime_expected, 0),
+               COALESCE(p.lifetime_received, 0), COALESCE(p.outstanding_expected, 0)
+        FROM income_sources s
+        LEFT JOIN (
+            SELECT income_source_id,
+                   COUNT(DISTINCT event_id) AS entry_count,
+                   SUM(amount) AS entry_total_received
+            FROM entity_ledger
+            WHERE income_source_id IS NOT NULL
+            GROUP BY income_source_id
+        ) e ON e.income_source_id = s.id
+        LEFT JOIN (
+            SELECT source_id,
+                   COUNT(id) AS promise_count,
+                   SUM(original_amount) AS lifetime_expected,
+                   SUM(received_amount) AS lifetime_received,
+                   SUM(outstanding_amount) AS outstanding_expected
+            FROM expected_inflow_promises
+            WHERE source_id IS NOT NULL AND kind = 'EARNED'
+            GROUP BY source_id
+        ) p ON p.source_id = s.id
+        WHERE e.income_source_id IS NOT NULL OR p.source_id IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_income_source_stats_owner_id'), table_name='income_source_stats')
+    op.drop_table('income_source_stats')
+    op.drop_index('ix_expected_inflow_promises_owner_source', table_name='expected_inflow_promises')
+    op.drop_index('ix_entity_ledger_income_source_event', table_name='entity_ledger')
@@ -0,0 +1,36 @@
+"""add notification read created index
+
+Revision ID: e8b3c6f1a295
+Revises: d2a7f4c9e816
+Create Date: 2026-10-19 20:07:13.482096
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b3c6f1a295'
+down_revision: Union[str, Sequence[str], None] = 'd2a7f4c9e816'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Serves read/unread-filtered keyset pages and the unread recount; it also
+    # covers the (owner_id, is_read) prefix, so that index is dropped.
+    op.create_index(
+        'ix_notifications_owner_read_created',
+        'notifications',
+        ['owner_id', 'is_read', 'created_at'],
+        unique=False,
+    )
+    op.drop_index('ix_notifications_owner_is_read', table_name='notifications')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_notifications_owner_is_read', 'notifications', ['owner_id', 'is_read'], unique=False)
+    op.drop_index('ix_notifications_owner_read_created', table_name='notifications')
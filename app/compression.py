@@ -0,0 +1,76 @@
+"""Response compression negotiated from `Accept-Encoding`.
+
+Extends Starlette's gzip middleware with brotli when the optional `brotli`
+package is installed. Bodies below `minimum_size` are sent as-is, and
+`text/event-stream` responses are never compressed.
+"""
+# pyrefly: ignore [missing-import]
+from starlette.datastructures import Headers
+# pyrefly: ignore [missing-import]
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder, IdentityResponder
+
+try:
+    # pyrefly: ignore [missing-import]
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """Content codings the client accepts (q > 0)."""
+    encodings = set()
+    for part in accept_encoding.split(","):
+        name, *params = (piece.strip() for piece in part.split(";"))
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name and quality > 0:
+            encodings.add(name.lower())
+    return encodings
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app, minimum_size: int, quality: int = 4) -> None:
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        compressed = self.compressor.process(body)
+        if more_body:
+            return compressed + self.compressor.flush()
+        return compressed + self.compressor.finish()
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """Prefer brotli, then gzip, for responses of at least `minimum_size` bytes."""
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        compresslevel: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encodings = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in encodings:
+            responder = BrotliResponder(self.app, self.minimum_size, quality=self.brotli_quality)
+        elif "gzip" in encodings:
+            responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
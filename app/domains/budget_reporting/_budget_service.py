@@ -8,9 +8,10 @@ from fastapi import HTTPException, status
 # pyrefly: ignore [missing-import]
 from sqlalchemy import and_, case, func, or_, select
 # pyrefly: ignore [missing-import]
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager, selectinload
 
 from app import models, schemas
+from app.read_cache import cached_read
 from app.services.goal_funding_service import get_wallet_goal_allocated_amount
 from app.services.borrowing_survival_service import get_or_build_summary as get_borrowing_survival_summary
 from app.services.category_floor_service import CategoryFloorWarning, build_category_floor_warnings
@@ -286,7 +287,7 @@ def get_expected_income_remaining(
 ) -> int:
     from app.services import expected_inflow_service
 
-    rows = expected_inflow_service.inflow_query(db).filter(
+    rows = expected_inflow_service.inflow_query(db, include_detail=False).filter(
         models.ExpectedIncome.owner_id == owner_id,
         models.ExpectedIncome.budget_year == budget_year,
         models.ExpectedIncome.budget_month == budget_month,
@@ -303,7 +304,7 @@ def get_expected_income_lifecycle_summary(
     from app.services import expected_inflow_service
 
     rows = (
-        expected_inflow_service.inflow_query(db)
+        expected_inflow_service.inflow_query(db, include_detail=False)
         .filter(
             models.ExpectedIncome.owner_id == owner_id,
             models.ExpectedIncome.budget_year == budget_year,
@@ -1009,6 +1010,7 @@ def build_budget_out(computation: BudgetComputation) -> schemas.BudgetOut:
     return budget_out
 
 
+@cached_read("budget_month_summary")
 def build_budget_month_summary(
     db: Session,
     owner_id: int,
@@ -1752,13 +1754,24 @@ def get_budget_remaining_for_month(
     return int(computed.remaining)
 
 
+SUMMARY_PROJECT_STATUSES = (models.ProjectStatus.ACTIVE, models.ProjectStatus.STOPPED)
+
+
 def get_project_budget_summaries(
     db: Session,
     owner_id: int,
     selected_budget_year: int | None = None,
     selected_budget_month: int | None = None,
     default_budget_date: date | None = None,
+    *,
+    include_history: bool = False,
+    project_id: int | None = None,
 ) -> list[schemas.ProjectBudgetOut]:
+    """Budget summaries for the owner's active and stopped projects in the selected month.
+
+    ``include_history`` adds completed and archived projects; ``project_id``
+    restricts the result to that one project whatever its status.
+    """
     if (selected_budget_year is None) != (selected_budget_month is None):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="projects.reservation_month_required")
     if selected_budget_year is None or selected_budget_month is None:
@@ -1766,15 +1779,45 @@ def get_project_budget_summaries(
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="projects.reservation_month_required")
         selected_budget_year = default_budget_date.year
         selected_budget_month = default_budget_date.month
+    return _build_project_budget_summaries(
+        db,
+        owner_id,
+        int(selected_budget_year),
+        int(selected_budget_month),
+        include_history=include_history,
+        project_id=project_id,
+    )
 
-    projects = (
+
+@cached_read("project_budget_summaries")
+def _build_project_budget_summaries(
+    db: Session,
+    owner_id: int,
+    selected_budget_year: int,
+    selected_budget_month: int,
+    *,
+    include_history: bool,
+    project_id: int | None,
+) -> list[schemas.ProjectBudgetOut]:
+    project_query = (
         db.query(models.Project)
+        .options(
+            selectinload(models.Project.overlay_detail),
+            selectinload(models.Project.isolated_detail),
+            selectinload(models.Project.isolated_category_allocations),
+            selectinload(models.Project.isolated_wallet_allocations)
+            .selectinload(models.IsolatedProjectWalletAllocation.wallet),
+        )
         .filter(models.Project.owner_id == owner_id)
-        .order_by(models.Project.created_at.desc())
-        .all()
     )
+    if project_id is not None:
+        project_query = project_query.filter(models.Project.id == project_id)
+    elif not include_history:
+        project_query = project_query.filter(models.Project.status.in_(SUMMARY_PROJECT_STATUSES))
+    projects = project_query.order_by(models.Project.created_at.desc()).all()
     if not projects:
         return []
+    project_ids = [int(project.id) for project in projects]
 
     signed_amount = _signed_expense_amount()
     project_spend_rows = (
@@ -1786,7 +1829,7 @@ def get_project_budget_summaries(
         .filter(
             models.FinancialEvent.owner_id == owner_id,
             models.FinancialEvent.status == models.FinancialEventStatus.POSTED,
-            models.EntityLedger.project_id.isnot(None),
+            models.EntityLedger.project_id.in_(project_ids),
             models.FinancialEvent.event_type.in_(
                 [models.TransactionType.EXPENSE, models.TransactionType.REFUND]
             ),
@@ -1802,6 +1845,7 @@ def get_project_budget_summaries(
         )
         .filter(
             models.GoalProjectRelease.owner_id == owner_id,
+            models.GoalProjectRelease.project_id.in_(project_ids),
         )
         .group_by(models.GoalProjectRelease.project_id)
         .all()
@@ -1822,7 +1866,7 @@ def get_project_budget_summaries(
         .filter(
             models.FinancialEvent.owner_id == owner_id,
             models.FinancialEvent.status == models.FinancialEventStatus.POSTED,
-            models.EntityLedger.project_id.isnot(None),
+            models.EntityLedger.project_id.in_(project_ids),
             models.EntityLedger.category.isnot(None),
             models.FinancialEvent.event_type.in_(
                 [models.TransactionType.EXPENSE, models.TransactionType.REFUND]
@@ -1839,32 +1883,50 @@ def get_project_budget_summaries(
     selected_overlay_category_spent = get_overlay_project_spent_by_project_category(
         db,
         owner_id,
-        int(selected_budget_year),
-        int(selected_budget_month),
+        selected_budget_year,
+        selected_budget_month,
     )
     selected_overlay_subcategory_spent = get_overlay_project_spent_by_project_subcategory(
         db,
         owner_id,
-        int(selected_budget_year),
-        int(selected_budget_month),
+        selected_budget_year,
+        selected_budget_month,
     )
-    total_reserved_scope_by_project: dict[int, int] = {}
-    for project in projects:
-        if get_project_type(project) == models.ProjectType.ISOLATED:
-            continue
-        total_reserved_scope_by_project[int(project.id)] = sum(
-            int(limit.limit_amount or 0)
-            for limit in project.overlay_category_reservations
+    total_reserved_scope_by_project = {
+        int(project_id): int(amount or 0)
+        for project_id, amount in (
+            db.query(
+                models.OverlayProjectCategoryReservation.project_id,
+                func.coalesce(func.sum(models.OverlayProjectCategoryReservation.limit_amount), 0),
+            )
+            .filter(models.OverlayProjectCategoryReservation.project_id.in_(project_ids))
+            .group_by(models.OverlayProjectCategoryReservation.project_id)
+            .all()
+        )
+    }
+    selected_reservations_by_project: dict[int, list[models.OverlayProjectCategoryReservation]] = defaultdict(list)
+    for row in (
+        db.query(models.OverlayProjectCategoryReservation)
+        .filter(
+            models.OverlayProjectCategoryReservation.project_id.in_(project_ids),
+            models.OverlayProjectCategoryReservation.budget_year == selected_budget_year,
+            models.OverlayProjectCategoryReservation.budget_month == selected_budget_month,
         )
+        .order_by(models.OverlayProjectCategoryReservation.id.asc())
+        .all()
+    ):
+        selected_reservations_by_project[int(row.project_id)].append(row)
     overlay_subcategory_rows = (
         db.query(models.OverlayProjectSubcategoryReservation)
         .join(models.Project, models.Project.id == models.OverlayProjectSubcategoryReservation.project_id)
         .join(models.UserSubcategory, models.UserSubcategory.id == models.OverlayProjectSubcategoryReservation.user_subcategory_id)
+        .options(contains_eager(models.OverlayProjectSubcategoryReservation.user_subcategory))
         .filter(
             models.Project.owner_id == owner_id,
             models.Project.project_type == models.ProjectType.OVERLAY,
-            models.OverlayProjectSubcategoryReservation.budget_year == int(selected_budget_year),
-            models.OverlayProjectSubcategoryReservation.budget_month == int(selected_budget_month),
+            models.OverlayProjectSubcategoryReservation.project_id.in_(project_ids),
+            models.OverlayProjectSubcategoryReservation.budget_year == selected_budget_year,
+            models.OverlayProjectSubcategoryReservation.budget_month == selected_budget_month,
         )
         .order_by(models.OverlayProjectSubcategoryReservation.project_id.asc(), models.UserSubcategory.name.asc())
         .all()
@@ -1876,9 +1938,11 @@ def get_project_budget_summaries(
         db.query(models.IsolatedProjectSubcategoryAllocation)
         .join(models.Project, models.Project.id == models.IsolatedProjectSubcategoryAllocation.project_id)
         .join(models.UserSubcategory, models.UserSubcategory.id == models.IsolatedProjectSubcategoryAllocation.user_subcategory_id)
+        .options(contains_eager(models.IsolatedProjectSubcategoryAllocation.user_subcategory))
         .filter(
             models.Project.owner_id == owner_id,
             models.Project.project_type == models.ProjectType.ISOLATED,
+            models.IsolatedProjectSubcategoryAllocation.project_id.in_(project_ids),
         )
         .order_by(models.IsolatedProjectSubcategoryAllocation.project_id.asc(), models.UserSubcategory.name.asc())
         .all()
@@ -1896,7 +1960,7 @@ def get_project_budget_summaries(
         .filter(
             models.FinancialEvent.owner_id == owner_id,
             models.FinancialEvent.status == models.FinancialEventStatus.POSTED,
-            models.EntityLedger.project_id.isnot(None),
+            models.EntityLedger.project_id.in_(project_ids),
             models.EntityLedger.subcategory_id.isnot(None),
             models.FinancialEvent.event_type.in_(
                 [models.TransactionType.EXPENSE, models.TransactionType.REFUND]
@@ -1976,12 +2040,7 @@ def get_project_budget_summaries(
         category_limits = (
             list(project.isolated_category_allocations)
             if is_isolated
-            else [
-                item
-                for item in project.overlay_category_reservations
-                if int(item.budget_year) == int(selected_budget_year)
-                and int(item.budget_month) == int(selected_budget_month)
-            ]
+            else selected_reservations_by_project.get(int(project.id), [])
         )
         for limit in category_limits:
             if is_isolated:
@@ -18,6 +18,7 @@ Debt service:
 - ``get_debt_total_paid`` — total paid for a debt
 - ``reverse_wallet_effect`` — reverse wallet effects of a financial event
 - ``reverse_debt_transaction_ledger`` — create reversal entries for a transaction
+- ``build_debt_summary`` — cached open-balance totals per debt direction
 
 Debt payment service:
 - ``create_debt_payment`` — create a debt payment with wallet allocation
@@ -26,6 +27,7 @@ Debt payment service:
 Debt policy:
 - ``evaluate_debt_action`` — evaluate if a debt action is allowed
 - ``evaluate_debt_actions`` — evaluate all debt actions
+- ``evaluate_debt_policies`` — batch decisions for many debts and ledger entries
 - ``evaluate_ledger_entry_reversal`` — evaluate if a ledger entry can be reversed
 - ``is_pristine_debt`` — check if a debt has no non-initial ledger entries
 - ``is_formal_debt`` / ``is_informal_debt`` / ``is_open_debt`` / ``is_closed_debt``
@@ -33,6 +35,7 @@ Debt policy:
 
 from app.domains.debt._debt_service import (
     POSTED_DEBT_LEDGER_STATUS,
+    build_debt_summary,
     create_debt_ledger_entry,
     get_debt_total_charges,
     get_debt_total_charges_by_debt_ids,
@@ -48,8 +51,10 @@ from app.domains.debt._payment_service import (
 )
 from app.domains.debt._policy import (
     DebtActionDecision,
+    DebtPolicyDecisions,
     evaluate_debt_action,
     evaluate_debt_actions,
+    evaluate_debt_policies,
     evaluate_ledger_entry_reversal,
     is_archived_debt,
     is_closed_debt,
@@ -62,6 +67,7 @@ from app.domains.debt._policy import (
 __all__ = [
     # debt_service
     "POSTED_DEBT_LEDGER_STATUS",
+    "build_debt_summary",
     "create_debt_ledger_entry",
     "get_debt_total_charges",
     "get_debt_total_charges_by_debt_ids",
@@ -75,8 +81,10 @@ __all__ = [
     "create_debt_payment",
     # debt_policy
     "DebtActionDecision",
+    "DebtPolicyDecisions",
     "evaluate_debt_action",
     "evaluate_debt_actions",
+    "evaluate_debt_policies",
     "evaluate_ledger_entry_reversal",
     "is_archived_debt",
     "is_closed_debt",
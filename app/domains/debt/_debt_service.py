@@ -4,7 +4,8 @@ from datetime import date
 from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session, aliased
 
-from app import models
+from app import models, schemas
+from app.read_cache import cached_read
 
 
 POSTED_DEBT_LEDGER_STATUS = "POSTED"
@@ -246,3 +247,25 @@ def reconcile_debt(db: Session, debt_id: int) -> models.Debt:
     debt.remaining_amount = max(0, int(ledger_total))
     db.flush()
     return debt
+
+
+@cached_read("debt_summary")
+def build_debt_summary(db: Session, owner_id: int) -> schemas.DebtSummaryOut:
+    """Totals of open, unarchived balances in both debt directions."""
+    totals = dict(
+        db.query(
+            models.Debt.debt_type,
+            func.coalesce(func.sum(models.Debt.remaining_amount), 0),
+        )
+        .filter(
+            models.Debt.owner_id == owner_id,
+            models.Debt.remaining_amount > 0,
+            models.Debt.archived_at.is_(None),
+        )
+        .group_by(models.Debt.debt_type)
+        .all()
+    )
+    return schemas.DebtSummaryOut(
+        total_i_owe=int(totals.get(models.DebtType.OWING) or 0),
+        total_owed_to_me=int(totals.get(models.DebtType.OWED) or 0),
+    )
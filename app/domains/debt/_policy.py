@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 
-from sqlalchemy import exists
+from sqlalchemy import exists, func, inspect
 from sqlalchemy.orm import Session, aliased
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app import models
 from app.domains.debt._debt_service import POSTED_DEBT_LEDGER_STATUS
@@ -279,6 +280,28 @@ def evaluate_ledger_entry_reversal(
         debt,
         models.DebtActionKind.REVERSE_ENTRY,
     )
+    return _evaluate_entry_reversal(
+        decision,
+        debt,
+        entry,
+        has_posted_reversal=lambda: _entry_has_posted_reversal(db, entry),
+        latest_entry=lambda: _latest_unreversed_reversible_entry(db, debt),
+    )
+
+
+def _evaluate_entry_reversal(
+    decision: DebtActionDecision,
+    debt: models.Debt,
+    entry: models.DebtLedgerEntry,
+    *,
+    has_posted_reversal,
+    latest_entry,
+) -> DebtActionDecision:
+    """Entry checks on top of the debt's REVERSE_ENTRY decision.
+
+    ``has_posted_reversal`` and ``latest_entry`` are thunks so the single
+    evaluator only queries when the cheaper checks pass.
+    """
     if not decision.allowed:
         return decision
 
@@ -292,16 +315,16 @@ def evaluate_ledger_entry_reversal(
         return decision.blocked("debts.policy.entry_type_not_reversible")
     if not entry.is_reversible:
         return decision.blocked("debts.policy.entry_marked_not_reversible")
-    if _entry_has_posted_reversal(db, entry):
+    if has_posted_reversal():
         return decision.blocked("debts.policy.entry_already_reversed")
 
-    latest_entry = _latest_unreversed_reversible_entry(db, debt)
-    if latest_entry is not None and latest_entry.id != entry.id:
+    latest = latest_entry()
+    if latest is not None and latest.id != entry.id:
         return decision.blocked(
             "debts.policy.reverse_latest_first",
             details={
-                "latest_entry_id": latest_entry.id,
-                "latest_entry_type": latest_entry.entry_type.value,
+                "latest_entry_id": latest.id,
+                "latest_entry_type": latest.entry_type.value,
                 "blocked_entry_id": entry.id,
             },
         )
@@ -309,3 +332,103 @@ def evaluate_ledger_entry_reversal(
     if entry.source != models.DebtLedgerEntrySource.USER:
         return decision.with_confirmation("debts.policy.non_user_entry_reversal_confirm")
     return decision
+
+
+@dataclass(frozen=True)
+class DebtPolicyDecisions:
+    """Batch policy output: ``actions[debt_id][action_kind]`` and
+    ``reversals[entry_id]`` for every ledger entry passed in."""
+
+    actions: dict[int, dict[models.DebtActionKind, DebtActionDecision]]
+    reversals: dict[int, DebtActionDecision]
+
+
+def _preload_formal_details(db: Session, debts: list[models.Debt]) -> None:
+    unloaded = [debt for debt in debts if "formal_details" in inspect(debt).unloaded]
+    if not unloaded:
+        return
+    details_by_debt = {
+        details.debt_id: details
+        for details in db.query(models.DebtFormalDetails)
+        .filter(models.DebtFormalDetails.debt_id.in_([debt.id for debt in unloaded]))
+        .all()
+    }
+    for debt in unloaded:
+        set_committed_value(debt, "formal_details", details_by_debt.get(debt.id))
+
+
+def _posted_reversal_target_ids(db: Session, entry_ids: list[int]) -> set[int]:
+    return {
+        int(entry_id)
+        for (entry_id,) in db.query(models.DebtLedgerEntry.reverses_entry_id)
+        .filter(
+            models.DebtLedgerEntry.reverses_entry_id.in_(entry_ids),
+            models.DebtLedgerEntry.status == POSTED_DEBT_LEDGER_STATUS,
+        )
+        .distinct()
+        .all()
+    }
+
+
+def _latest_unreversed_reversible_entries(
+    db: Session,
+    debts: list[models.Debt],
+) -> dict[int, models.DebtLedgerEntry]:
+    """``_latest_unreversed_reversible_entry`` for many debts in one query."""
+    reversal = aliased(models.DebtLedgerEntry)
+    latest_ids = (
+        db.query(func.max(models.DebtLedgerEntry.id))
+        .filter(
+            models.DebtLedgerEntry.debt_id.in_([debt.id for debt in debts]),
+            models.DebtLedgerEntry.status == POSTED_DEBT_LEDGER_STATUS,
+            models.DebtLedgerEntry.entry_type != models.DebtLedgerEntryType.INITIAL,
+            models.DebtLedgerEntry.entry_type != models.DebtLedgerEntryType.REVERSAL,
+            models.DebtLedgerEntry.is_reversible,
+            ~exists().where(
+                reversal.reverses_entry_id == models.DebtLedgerEntry.id,
+                reversal.status == POSTED_DEBT_LEDGER_STATUS,
+            ),
+        )
+        .group_by(models.DebtLedgerEntry.debt_id)
+    )
+    owner_by_debt = {debt.id: debt.owner_id for debt in debts}
+    return {
+        entry.debt_id: entry
+        for entry in db.query(models.DebtLedgerEntry)
+        .filter(models.DebtLedgerEntry.id.in_(latest_ids.scalar_subquery()))
+        .all()
+        if owner_by_debt.get(entry.debt_id) == entry.owner_id
+    }
+
+
+def evaluate_debt_policies(
+    db: Session,
+    debts: list[models.Debt],
+    *,
+    entries: list[models.DebtLedgerEntry] = (),
+) -> DebtPolicyDecisions:
+    """Every (debt, action) decision, plus reversal decisions for ``entries``.
+
+    Ledger facts are loaded up front with at most three grouped queries
+    (formal details, posted reversals, latest reversible entry per debt)
+    regardless of how many debts or entries are evaluated. Decisions match
+    ``evaluate_debt_actions`` and ``evaluate_ledger_entry_reversal``.
+    """
+    _preload_formal_details(db, list(debts))
+    actions = {int(debt.id): evaluate_debt_actions(db, debt) for debt in debts}
+
+    reversals: dict[int, DebtActionDecision] = {}
+    if entries:
+        debts_by_id = {int(debt.id): debt for debt in debts}
+        reversed_ids = _posted_reversal_target_ids(db, [entry.id for entry in entries])
+        latest_by_debt = _latest_unreversed_reversible_entries(db, list(debts))
+        for entry in entries:
+            debt = debts_by_id[int(entry.debt_id)]
+            reversals[int(entry.id)] = _evaluate_entry_reversal(
+                actions[int(debt.id)][models.DebtActionKind.REVERSE_ENTRY],
+                debt,
+                entry,
+                has_posted_reversal=lambda entry=entry: entry.id in reversed_ids,
+                latest_entry=lambda debt=debt: latest_by_debt.get(debt.id),
+            )
+    return DebtPolicyDecisions(actions=actions, reversals=reversals)
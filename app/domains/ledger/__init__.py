@@ -14,6 +14,10 @@ Public API
 - ``verify_wallet_projection`` — check that a wallet's balance matches
   its WalletLedger entries
 - ``verify_all_wallet_projections`` — check all active wallets for an owner
+- ``bump_ledger_version`` — increment a user's ledger version once per
+  transaction (read-cache invalidation)
+- ``get_ledger_version`` — read a user's current ledger version
+- ``is_ledger_version_bumped`` — whether this transaction already bumped it
 - ``PostWalletLeg`` — a single wallet-leg line for the Wallet Ledger
 - ``PostEntityLeg`` — a single entity-leg line for the Entity Ledger
 - ``WalletProjection`` — dataclass returned by projection verification
@@ -32,6 +36,11 @@ from app.domains.ledger._ledger_service import (
     verify_wallet_projection,
     void_financial_event,
 )
+from app.domains.ledger._ledger_version import (
+    bump_ledger_version,
+    get_ledger_version,
+    is_ledger_version_bumped,
+)
 
 __all__ = [
     "post_financial_event",
@@ -39,6 +48,9 @@ __all__ = [
     "validate_wallet_epochs",
     "verify_wallet_projection",
     "verify_all_wallet_projections",
+    "bump_ledger_version",
+    "get_ledger_version",
+    "is_ledger_version_bumped",
     "PostWalletLeg",
     "PostEntityLeg",
     "WalletProjection",
@@ -27,6 +27,8 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app import models
+from app.domains.ledger._ledger_version import bump_ledger_version
+from app.realtime import queue_wallet_balances
 from app.services.wallet_service import WalletService
 from app.services.wallet_value_service import classify_outflow
 from app.timezone import today_in_tz
@@ -143,6 +145,7 @@ def post_financial_event(
     - Creates the FinancialEvent row
     - Writes WalletLedger rows
     - Writes EntityLedger rows
+    - Bumps the owner's ledger version (read-cache invalidation)
 
     It does **not** validate business rules — callers are responsible for
     ensuring budget permission, goal protection, project rules, category
@@ -161,6 +164,8 @@ def post_financial_event(
         raise ValueError("post_financial_event requires at least one entity leg")
 
     is_bypass = _is_bypass_category(entity_category)
+    bump_ledger_version(db, owner_id)
+    queue_wallet_balances(db, owner_id, (leg.wallet_id for leg in wallet_legs))
 
     # ---- 1. FinancialEvent (Pile 1) ----------------------------------------
     event = models.FinancialEvent(
@@ -268,7 +273,10 @@ def void_financial_event(
     This is the **single shared application-level seam** for voiding posted
     financial events.  It preserves the original event, creates a linked
     REVERSAL event with counter-balancing wallet and entity ledger legs, and
-    marks the original as VOIDED.
+    marks the original as VOIDED.  The reversal is posted through
+    ``post_financial_event``, which bumps the owner's ledger version.
+    Expected-inflow schedules and Promises realized by the event have their
+    stored aggregates re-synced.
 
     Callers are responsible for any domain-specific pre-checks (session
     eligibility, refund/asset/dependency locks, archived-wallet checks, etc.).
@@ -340,6 +348,11 @@ def void_financial_event(
     event.void_reason = void_reason
     event.void_reversal_event_id = reversal.id
 
+    # Receipts against expected inflows stop counting once their event is
+    # voided; their stored schedule and Promise aggregates follow here.
+    from app.services.expected_inflow_service import sync_aggregates_for_voided_events  # lazy — avoids circular import
+    sync_aggregates_for_voided_events(db, [event.id])
+
     return reversal
 
 
@@ -0,0 +1,101 @@
+"""Per-user ledger version — a monotonically increasing data-version counter.
+
+Every write that can change what a read model shows for a user — notifications
+included — bumps ``users.ledger_version`` exactly once per transaction.  Read
+caches and ETags key off that version, so a committed write invalidates every
+cached read for the owner without having to enumerate cache keys.
+
+Two seams keep the counter honest:
+
+- ``post_financial_event`` / ``void_financial_event`` call
+  ``bump_ledger_version`` explicitly (they also touch wallet balances
+  through bulk paths).
+- A ``before_flush`` session listener bumps the owner of every new, dirty or
+  deleted ORM row that carries an ``owner_id`` (or belongs to a project).  Bulk ``Query.update()`` /
+  ``Query.delete()`` statements bypass the flush, so callers issuing them
+  without any accompanying owner-scoped ORM change must call
+  ``bump_ledger_version`` themselves.
+
+The bump itself is a single ``UPDATE users SET ledger_version =
+ledger_version + 1`` on the current transaction's connection; a rollback
+undoes it together with the write it describes.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+_BUMPED_OWNERS_KEY = "ledger_version_bumped_owners"
+
+
+def _bumped_owners(db: Session) -> set[int]:
+    return db.info.setdefault(_BUMPED_OWNERS_KEY, set())
+
+
+def bump_ledger_version(db: Session, owner_id: int) -> None:
+    """Increment *owner_id*'s ledger version once for the current transaction."""
+    owner_id = int(owner_id)
+    bumped = _bumped_owners(db)
+    if owner_id in bumped:
+        return
+    db.connection().execute(
+        update(models.User)
+        .where(models.User.id == owner_id)
+        .values(ledger_version=models.User.ledger_version + 1)
+    )
+    bumped.add(owner_id)
+
+
+def is_ledger_version_bumped(db: Session, owner_id: int) -> bool:
+    """Return True when the current transaction has already bumped *owner_id*.
+
+    Reads inside such a transaction see uncommitted data and must not be
+    served from (or stored into) a version-keyed cache.
+    """
+    return int(owner_id) in db.info.get(_BUMPED_OWNERS_KEY, ())
+
+
+def get_ledger_version(db: Session, owner_id: int) -> int:
+    """Return the committed-or-own-transaction ledger version for *owner_id*."""
+    version = (
+        db.query(models.User.ledger_version)
+        .filter(models.User.id == owner_id)
+        .scalar()
+    )
+    return int(version or 0)
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_versions_for_flushed_owners(db: Session, flush_context, instances) -> None:
+    owners: set[int] = set()
+    for obj in (*db.new, *db.dirty, *db.deleted):
+        owner_id = getattr(obj, "owner_id", None)
+        if owner_id is None:
+            # Pending rows may be linked through the relationship only.
+            owner = getattr(obj, "owner", None)
+            owner_id = owner.id if isinstance(owner, models.User) else None
+        if owner_id is None:
+            # Project reservations and allocations carry no owner_id of
+            # their own; they belong to their project's owner.
+            project = getattr(obj, "project", None)
+            if project is None and getattr(obj, "project_id", None) is not None:
+                project = db.get(models.Project, obj.project_id)
+            owner_id = project.owner_id if isinstance(project, models.Project) else None
+        if owner_id is not None:
+            owners.add(int(owner_id))
+    for owner_id in owners:
+        bump_ledger_version(db, owner_id)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _reset_bumped_owners(db: Session, transaction) -> None:
+    # Flushes run in internal sub-transactions; only the outermost
+    # transaction or a savepoint ending decides whether a bump survived.  A
+    # savepoint rollback undoes its bump too; forgetting a bump that did
+    # survive only costs one redundant increment later.
+    if transaction.parent is None or transaction.nested:
+        db.info.pop(_BUMPED_OWNERS_KEY, None)
@@ -0,0 +1,231 @@
+"""Transactional email outbox.
+
+Request handlers no longer talk to the email provider. ``enqueue_email``
+adds an ``email_outbox`` row to the request's session, so the message
+commits (or rolls back) together with the token or password change it
+describes, and the request never waits on an external HTTPS round trip.
+
+``dispatch_email_outbox`` is the worker, run by the scheduler every
+``email_dispatch_interval_seconds``:
+
+- due rows are claimed in batches of ``email_outbox_batch_size`` with
+  ``FOR UPDATE SKIP LOCKED`` and leased for ``email_outbox_lease_seconds``,
+  so concurrent dispatchers never pick the same row and a crashed one only
+  delays its batch;
+- each batch is sent outside any transaction by ``email_outbox_workers``
+  threads over the transport's pooled keep-alive client;
+- one run sends at most ``email_outbox_max_batches_per_run`` batches, so a
+  backlog cannot hold a scheduler thread; the next run picks up the rest;
+- retryable failures (timeouts, 429, 5xx) back off exponentially from
+  ``email_outbox_backoff_base_seconds`` up to
+  ``email_outbox_backoff_max_seconds``, and give up after
+  ``email_outbox_max_attempts``; permanent rejections fail at once.
+
+Every row carries an idempotency key that is sent as the provider's
+``Idempotency-Key`` header on every attempt, so a retry after a lost
+response cannot deliver twice. Caller keys (several are raw single-use
+tokens) are stored hashed; rows without one get a random key. Message
+bodies are cleared once a row is settled, since they hold single-use links,
+and ``purge_settled_emails`` deletes settled rows after
+``email_outbox_retention_days``. Without an email transport nothing is
+queued: the body would sit in the table with no worker to send it.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import random
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+# pyrefly: ignore [missing-import]
+from sqlalchemy import delete, update
+# pyrefly: ignore [missing-import]
+from sqlalchemy.orm import Session
+
+from app import models
+from app.email_service import EmailDeliveryError, EmailMessage, get_email_transport
+from config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def outbox_idempotency_key(key: str | None) -> str:
+    if not key:
+        return f"outbox-{uuid.uuid4().hex}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def email_delivery_configured() -> bool:
+    return get_email_transport() is not None
+
+
+def enqueue_email(db: Session, message: EmailMessage) -> models.EmailOutbox | None:
+    """Queue *message* in the caller's transaction; the caller commits.
+
+    A message whose idempotency key is already queued is not added again.
+    Returns None, queuing nothing, when no email transport is configured.
+    """
+    if not email_delivery_configured():
+        logger.warning("No email transport configured; not queuing %r for %s", message.subject, message.to_email)
+        return None
+    key = outbox_idempotency_key(message.idempotency_key)
+    if message.idempotency_key:
+        # Sessions do not autoflush, so look at rows queued in this one too.
+        pending = (
+            obj for obj in db.new
+            if isinstance(obj, models.EmailOutbox) and obj.idempotency_key == key
+        )
+        existing = next(pending, None) or (
+            db.query(models.EmailOutbox)
+            .filter(models.EmailOutbox.idempotency_key == key)
+            .first()
+        )
+        if existing is not None:
+            return existing
+    row = models.EmailOutbox(
+        to_email=message.to_email,
+        subject=message.subject,
+        text_body=message.text_body,
+        html_body=message.html_body,
+        idempotency_key=key,
+        status=models.EmailOutboxStatus.PENDING.value,
+        attempts=0,
+        next_attempt_at=datetime.now(timezone.utc),
+    )
+    db.add(row)
+    return row
+
+
+def purge_settled_emails(
+    db: Session,
+    *,
+    older_than_days: int | None = None,
+    batch_size: int | None = None,
+    now: datetime | None = None,
+) -> int:
+    """Delete sent and failed rows older than the retention window, committing per batch.
+
+    Returns the number of rows deleted.
+    """
+    days = settings.email_outbox_retention_days if older_than_days is None else older_than_days
+    size = max(1, settings.email_outbox_retention_batch_size if batch_size is None else batch_size)
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=days)
+    outbox = models.EmailOutbox
+    settled = (models.EmailOutboxStatus.SENT.value, models.EmailOutboxStatus.FAILED.value)
+    deleted = 0
+    while True:
+        ids = [
+            row_id
+            for (row_id,) in db.query(outbox.id)
+            .filter(outbox.status.in_(settled), outbox.created_at < cutoff)
+            .order_by(outbox.id)
+            .limit(size)
+        ]
+        if not ids:
+            return deleted
+        db.execute(delete(outbox).where(outbox.id.in_(ids)))
+        db.commit()
+        deleted += len(ids)
+        if len(ids) < size:
+            return deleted
+
+
+def _backoff_seconds(attempts: int) -> float:
+    delay = min(
+        settings.email_outbox_backoff_max_seconds,
+        settings.email_outbox_backoff_base_seconds * 2 ** max(0, attempts - 1),
+    )
+    # Jitter spreads retries of a batch that failed together.
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _claim_batch(db: Session, now: datetime, size: int) -> list[tuple[int, int, EmailMessage]]:
+    """Lease up to *size* due rows and return ``(id, attempts, message)`` for each."""
+    outbox = models.EmailOutbox
+    rows = (
+        db.query(outbox)
+        .filter(
+            outbox.status == models.EmailOutboxStatus.PENDING.value,
+            outbox.next_attempt_at <= now,
+        )
+        .order_by(outbox.next_attempt_at, outbox.id)
+        .limit(size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    claimed = []
+    for row in rows:
+        claimed.append((
+            int(row.id),
+            int(row.attempts or 0),
+            EmailMessage(row.to_email, row.subject, row.text_body or "", row.html_body or "", row.idempotency_key),
+        ))
+        row.next_attempt_at = now + timedelta(seconds=settings.email_outbox_lease_seconds)
+    db.commit()
+    return claimed
+
+
+def _deliver(transport, message: EmailMessage) -> EmailDeliveryError | None:
+    try:
+        transport.send(message)
+    except EmailDeliveryError as exc:
+        return exc
+    except Exception as exc:
+        logger.exception("Unexpected email transport failure for %s", message.to_email)
+        return EmailDeliveryError(f"unexpected error: {exc}", retryable=True)
+    return None
+
+
+def _settle(db: Session, row_id: int, attempts: int, error: EmailDeliveryError | None, now: datetime) -> bool:
+    outbox = models.EmailOutbox
+    attempts += 1
+    values: dict = {"attempts": attempts}
+    if error is None:
+        values.update(status=models.EmailOutboxStatus.SENT.value, sent_at=now, last_error=None)
+    elif error.retryable and attempts < settings.email_outbox_max_attempts:
+        values.update(
+            next_attempt_at=now + timedelta(seconds=_backoff_seconds(attempts)),
+            last_error=str(error)[:500],
+        )
+    else:
+        values.update(status=models.EmailOutboxStatus.FAILED.value, last_error=str(error)[:500])
+        logger.error("Email outbox row %s failed after %s attempt(s): %s", row_id, attempts, error)
+    if "status" in values:
+        values.update(text_body=None, html_body=None)
+    db.execute(update(outbox).where(outbox.id == row_id).values(values))
+    return error is None
+
+
+def dispatch_email_outbox(
+    db: Session,
+    *,
+    transport=None,
+    batch_size: int | None = None,
+    max_batches: int | None = None,
+    now: datetime | None = None,
+) -> int:
+    """Send due outbox rows batch by batch; returns how many were delivered."""
+    transport = transport or get_email_transport()
+    if transport is None:
+        return 0
+    size = max(1, batch_size or settings.email_outbox_batch_size)
+    workers = max(1, settings.email_outbox_workers)
+    batches = max(1, max_batches or settings.email_outbox_max_batches_per_run)
+    delivered = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="email-outbox") as pool:
+        for _ in range(batches):
+            started_at = now or datetime.now(timezone.utc)
+            claimed = _claim_batch(db, started_at, size)
+            if not claimed:
+                break
+            errors = list(pool.map(lambda item: _deliver(transport, item[2]), claimed))
+            settled_at = now or datetime.now(timezone.utc)
+            for (row_id, attempts, _message), error in zip(claimed, errors):
+                delivered += int(_settle(db, row_id, attempts, error, settled_at))
+            db.commit()
+            if len(claimed) < size:
+                break
+    return delivered
@@ -1,7 +1,11 @@
 import logging
-import json
-import http.client
+import threading
+from dataclasses import dataclass, field
 
+# pyrefly: ignore [missing-import]
+import httpx
+
+from app.http_clients import get_sync_client
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -50,64 +54,118 @@ def _get_base_template(content_html: str, action_text: str, action_url: str) ->
 </html>
 """.strip()
 
-def _send_email(to_email: str, subject: str, text_body: str, html_body: str, idempotency_key: str | None = None) -> bool:
-    """Centralized, resilient email sender helper.
+@dataclass(frozen=True)
+class EmailMessage:
+    to_email: str
+    subject: str
+    text_body: str
+    html_body: str
+    idempotency_key: str | None = None
 
-    Delivery order:
-    1) Resend HTTP API
-    """
-    return _send_email_via_resend_api(to_email, subject, text_body, html_body, idempotency_key)
 
+class EmailDeliveryError(Exception):
+    """A send the provider did not accept; ``retryable`` is False for permanent rejections."""
 
-def _send_email_via_resend_api(
-    to_email: str, subject: str, text_body: str, html_body: str, idempotency_key: str | None = None
-) -> bool:
-    api_key = settings.resend_api_key
-    if not api_key:
-        logger.info("RESEND_API_KEY is not set; skipping Resend API transport")
-        return False
-
-    payload = {
-        "from": settings.email_from,
-        "to": [to_email],
-        "subject": subject,
-        "text": text_body,
-        "html": html_body,
-    }
-    body = json.dumps(payload)
-    headers = {
-        "Authorization": f"Bearer {api_key.get_secret_value()}",
-        "Content-Type": "application/json",
-    }
-    if idempotency_key:
-        headers["Idempotency-Key"] = idempotency_key
-
-    conn = None
-    try:
-        logger.info("Email Attempt: Resend API for %s", to_email)
-        conn = http.client.HTTPSConnection("api.resend.com", timeout=20)
-        conn.request("POST", "/emails", body=body, headers=headers)
-        resp = conn.getresponse()
-        status_code = resp.status
-        raw_body = resp.read()
-        response_text = raw_body.decode("utf-8", errors="replace")
-        if status_code >= 400:
+    def __init__(self, message: str, *, retryable: bool):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+RESEND_EMAILS_URL = "https://api.resend.com/emails"
+
+
+class ResendTransport:
+    """Resend HTTP API over the shared pooled keep-alive client; safe to use across threads."""
+
+    def __init__(self, api_key: str, *, client: httpx.Client | None = None):
+        self._api_key = api_key
+        self._client = client
+
+    def _http(self) -> httpx.Client:
+        # Resolved per send: the shared client is replaced when the app restarts it.
+        return self._client or get_sync_client()
+
+    def send(self, message: EmailMessage) -> None:
+        headers = {
+            "Authorization": f"Bearer {self._api_key}",
+            "Content-Type": "application/json",
+        }
+        if message.idempotency_key:
+            headers["Idempotency-Key"] = message.idempotency_key
+        payload = {
+            "from": settings.email_from,
+            "to": [message.to_email],
+            "subject": message.subject,
+            "text": message.text_body,
+            "html": message.html_body,
+        }
+        try:
+            logger.info("Email Attempt: Resend API for %s", message.to_email)
+            resp = self._http().post(RESEND_EMAILS_URL, json=payload, headers=headers, timeout=20.0)
+        except httpx.HTTPError as exc:
+            logger.warning("Resend API request failed for %s: %s", message.to_email, exc)
+            raise EmailDeliveryError(f"transport error: {exc}", retryable=True) from exc
+        if resp.status_code >= 400:
             logger.error(
                 "Resend API returned status=%s for %s body=%s",
-                status_code,
-                to_email,
-                response_text[:1000],
+                resp.status_code,
+                message.to_email,
+                resp.text[:1000],
             )
-            return False
-        return True
-    except Exception:
-        logger.exception("Unexpected Resend API send failure for %s", to_email)
-        return False
-    finally:
-        if conn is not None:
-            conn.close()
-
-def send_password_reset_email(to_email: str, reset_link: str, idempotency_key: str | None = None) -> bool:
+            # Rate limits and provider outages are worth retrying; other
+            # client errors (bad address, bad key) will not get better.
+            retryable = resp.status_code == 429 or resp.status_code >= 500
+            raise EmailDeliveryError(f"status {resp.status_code}: {resp.text[:200]}", retryable=retryable)
+
+
+@dataclass
+class StubTransport:
+    """In-memory transport for tests and local runs: records messages instead of sending.
+
+    Queue ``EmailDeliveryError`` instances on ``failures`` to make the next
+    sends fail in order.
+    """
+
+    sent: list[EmailMessage] = field(default_factory=list)
+    failures: list[EmailDeliveryError] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def send(self, message: EmailMessage) -> None:
+        with self._lock:
+            if self.failures:
+                raise self.failures.pop(0)
+            self.sent.append(message)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.sent.clear()
+            self.failures.clear()
+
+
+stub_transport = StubTransport()
+_resend_transport: ResendTransport | None = None
+_transport_lock = threading.Lock()
+
+
+def get_email_transport():
+    """The configured transport, or None when email delivery is not set up.
+
+    ``email_transport = "stub"`` selects ``stub_transport``; otherwise the
+    Resend transport is used once ``RESEND_API_KEY`` is set.
+    """
+    global _resend_transport
+    if settings.email_transport == "stub":
+        return stub_transport
+    api_key = settings.resend_api_key
+    if not api_key:
+        return None
+    with _transport_lock:
+        if _resend_transport is None:
+            _resend_transport = ResendTransport(api_key.get_secret_value())
+        return _resend_transport
+
+
+def password_reset_email(to_email: str, reset_link: str, idempotency_key: str | None = None) -> EmailMessage:
     subject = "Reset your Sarflog password"
     text_body = f"Use this link to set a new password: {reset_link}\nThis link expires in 30 minutes."
     
@@ -117,9 +175,9 @@ def send_password_reset_email(to_email: str, reset_link: str, idempotency_key: s
         <p>Ready to set a new password? Click the button below:</p>
     """
     html_body = _get_base_template(content_html, "Reset Password", reset_link)
-    return _send_email(to_email, subject, text_body, html_body, idempotency_key)
+    return EmailMessage(to_email, subject, text_body, html_body, idempotency_key)
 
-def send_verification_email(to_email: str, verify_link: str, idempotency_key: str | None = None) -> bool:
+def verification_email(to_email: str, verify_link: str, idempotency_key: str | None = None) -> EmailMessage:
     subject = "Verify your Sarflog email"
     text_body = f"Welcome to Sarflog! Verify your email by opening this link: {verify_link}"
     
@@ -128,10 +186,10 @@ def send_verification_email(to_email: str, verify_link: str, idempotency_key: st
         <p>To finish setting up your account and start tracking your finances like a pro, please verify your email address.</p>
     """
     html_body = _get_base_template(content_html, "Verify Email", verify_link)
-    return _send_email(to_email, subject, text_body, html_body, idempotency_key)
+    return EmailMessage(to_email, subject, text_body, html_body, idempotency_key)
 
 
-def send_password_changed_email(to_email: str, idempotency_key: str | None = None) -> bool:
+def password_changed_email(to_email: str, idempotency_key: str | None = None) -> EmailMessage:
     subject = "Your Sarflog password was changed"
     text_body = "Your password has been changed successfully. If you did not make this change, please contact support immediately."
     
@@ -143,4 +201,4 @@ def send_password_changed_email(to_email: str, idempotency_key: str | None = Non
     """
     signin_link = settings.frontend_url.rstrip("/") + "/sign-in"
     html_body = _get_base_template(content_html, "Sign In to Account", signin_link)
-    return _send_email(to_email, subject, text_body, html_body, idempotency_key)
+    return EmailMessage(to_email, subject, text_body, html_body, idempotency_key)
@@ -24,7 +24,14 @@ def issue_email_verification_token(
     db: Session,
     user: models.User,
     now: datetime | None = None,
+    *,
+    commit: bool = True,
 ) -> str:
+    """Replace the user's open verification tokens with a new one.
+
+    Pass ``commit=False`` to leave the commit to the caller, e.g. so the
+    verification email is queued in the same transaction.
+    """
     now = now or datetime.now(timezone.utc)
     raw_token = secrets.token_urlsafe(48)
     token_hash = hash_email_verification_token(raw_token)
@@ -44,5 +51,6 @@ def issue_email_verification_token(
             expires_at=now + timedelta(hours=VERIFY_EMAIL_TOKEN_TTL_HOURS),
         )
     )
-    db.commit()
+    if commit:
+        db.commit()
     return raw_token
@@ -0,0 +1,63 @@
+"""Weak ETags for per-user read endpoints.
+
+Attach ``Depends(etag_precondition)`` to a GET route's ``dependencies``.  The
+tag is derived from the user's ledger version (bumped by every data write,
+see ``app.domains.ledger``), the request path and query parameters, and the
+user's local date — so day-relative reports revalidate at local midnight.
+
+A matching ``If-None-Match`` is answered with ``304 Not Modified`` while
+dependencies are still resolving, i.e. before the handler runs any report
+query.  Only use it on routes that return data (not a ``Response``), so the
+``ETag`` header set here is merged into the final response.
+"""
+
+import hashlib
+from datetime import tzinfo
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
+
+from app import models, oauth2
+from app.domains.ledger import get_ledger_version
+from app.session import get_db
+from app.timezone import get_effective_user_timezone, today_in_tz
+
+
+def build_weak_etag(user_id: int, version: int, request: Request, today) -> str:
+    query = "&".join(
+        f"{key}={value}" for key, value in sorted(request.query_params.multi_items())
+    )
+    raw = f"{user_id}|{request.url.path}|{query}|{today.isoformat()}"
+    digest = hashlib.sha1(raw.encode()).hexdigest()[:16]
+    return f'W/"{version}-{digest}"'
+
+
+def if_none_match_matches(header_value: str | None, etag: str) -> bool:
+    """Weak comparison (RFC 9110 §13.1.2) of *etag* against an If-None-Match list."""
+    if not header_value:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in header_value.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def etag_precondition(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(oauth2.get_current_user),
+    user_tz: tzinfo = Depends(get_effective_user_timezone),
+) -> None:
+    version = get_ledger_version(db, current_user.id)
+    etag = build_weak_etag(current_user.id, version, request, today_in_tz(user_tz))
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Authorization, X-Timezone",
+    }
+    if if_none_match_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
@@ -0,0 +1,261 @@
+"""Cached Google signing keys for ID-token verification.
+
+``verify_google_id_token`` checks Google ID tokens against a locally cached
+copy of Google's signing certificates, so a sign-in only does local
+signature verification instead of downloading the certificates each time.
+
+- The key set is kept for the ``max-age`` of the certificate endpoint's
+  ``Cache-Control`` header (``google_certs_default_max_age_seconds`` when it
+  has none).
+- Within ``google_certs_refresh_margin_seconds`` of expiry, a request that
+  uses the set starts a background refresh and carries on with the current
+  one.
+- Fetched sets are shared with other workers through Redis under
+  ``google:certs``, so a worker with a cold or expiring cache picks up a set
+  another worker already fetched. A Redis lock keeps background refreshes to
+  one worker at a time.
+- When a refresh fails, the last good key set keeps being served and the
+  refresh is retried after ``google_certs_retry_seconds``.
+- A token signed with a key id the set does not know (Google rotated keys
+  early) forces one refresh, at most every ``google_certs_retry_seconds``.
+
+Keys come from the PEM certificate endpoint (``google_certs_url``): it
+publishes the same keys as Google's JWKS endpoint, and google-auth verifies
+against it without extra dependencies. Tests point ``google_certs_url`` at a
+local key server.
+
+Like the read cache, the Redis layer fails open: errors are logged and each
+worker falls back to its own copy.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, replace
+
+# pyrefly: ignore [missing-import]
+from google.auth import jwt as google_jwt
+
+from app.http_clients import get_sync_client
+from app.redis_rate_limiter import redis_client
+from config import settings
+
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+CLOCK_SKEW_SECONDS = 10
+
+SHARED_KEY = "google:certs"
+REFRESH_LOCK_KEY = "google:certs:refresh"
+REFRESH_LOCK_SECONDS = 30
+
+_MAX_AGE_RE = re.compile(r"(?:^|[,\s])max-age=(\d+)", re.IGNORECASE)
+
+
+class GoogleCertsUnavailable(Exception):
+    """No key set could be fetched and none was cached."""
+
+
+@dataclass(frozen=True)
+class _KeySet:
+    certs: dict[str, str]
+    fetched_at: float
+    expires_at: float
+
+    def refresh_due(self, now: float) -> bool:
+        return now >= self.expires_at - settings.google_certs_refresh_margin_seconds
+
+
+_key_set: _KeySet | None = None
+_state_lock = threading.Lock()
+_fetch_lock = threading.Lock()
+_refresh_thread: threading.Thread | None = None
+_last_forced_refresh = 0.0
+
+
+def _max_age(cache_control: str) -> int | None:
+    match = _MAX_AGE_RE.search(cache_control or "")
+    return int(match.group(1)) if match else None
+
+
+def _fetch() -> _KeySet:
+    response = get_sync_client().get(settings.google_certs_url)
+    response.raise_for_status()
+    certs = response.json()
+    if not isinstance(certs, dict) or not certs or not all(
+        isinstance(kid, str) and isinstance(pem, str) for kid, pem in certs.items()
+    ):
+        raise ValueError("unexpected certificate payload")
+    max_age = _max_age(response.headers.get("cache-control", ""))
+    if max_age is None:
+        max_age = settings.google_certs_default_max_age_seconds
+    now = time.time()
+    return _KeySet(certs=certs, fetched_at=now, expires_at=now + max_age)
+
+
+def _load_shared() -> _KeySet | None:
+    try:
+        raw = redis_client.get(SHARED_KEY)
+    except Exception as exc:
+        logger.warning("Google key set read failed: %s", exc)
+        return None
+    if raw is None:
+        return None
+    try:
+        data = json.loads(raw)
+        return _KeySet(
+            certs=dict(data["certs"]),
+            fetched_at=float(data["fetched_at"]),
+            expires_at=float(data["expires_at"]),
+        )
+    except (TypeError, ValueError, KeyError):
+        logger.warning("Ignoring malformed shared Google key set")
+        return None
+
+
+def _store_shared(key_set: _KeySet) -> None:
+    payload = json.dumps(
+        {"certs": key_set.certs, "fetched_at": key_set.fetched_at, "expires_at": key_set.expires_at},
+        separators=(",", ":"),
+    )
+    # Kept past expiry so a worker starting while Google is unreachable
+    # still has a last good set.
+    ttl = max(0, int(key_set.expires_at - time.time())) + settings.google_certs_stale_ttl_seconds
+    try:
+        redis_client.set(SHARED_KEY, payload, ex=ttl)
+    except Exception as exc:
+        logger.warning("Google key set write failed: %s", exc)
+
+
+def _install(key_set: _KeySet) -> _KeySet:
+    global _key_set
+    with _state_lock:
+        if _key_set is None or key_set.fetched_at >= _key_set.fetched_at:
+            _key_set = key_set
+        return _key_set
+
+
+def _acquire_refresh_lock() -> bool:
+    try:
+        return bool(redis_client.set(REFRESH_LOCK_KEY, "1", ex=REFRESH_LOCK_SECONDS, nx=True))
+    except Exception as exc:
+        logger.warning("Google key refresh lock failed: %s", exc)
+        return True
+
+
+def _refresh(*, force: bool = False, background: bool = False) -> _KeySet | None:
+    """Bring the local key set up to date; returns it, or None if there is none.
+
+    Unless *force* is set, a newer set shared by another worker is used
+    instead of fetching.
+    """
+    with _fetch_lock:
+        now = time.time()
+        current = _key_set
+        if not force:
+            if current is not None and not current.refresh_due(now):
+                return current
+            shared = _load_shared()
+            if shared is not None and (current is None or shared.fetched_at > current.fetched_at):
+                current = _install(shared)
+                if not current.refresh_due(now):
+                    return current
+            if background and not _acquire_refresh_lock():
+                # Another worker is fetching; its set reaches us through Redis.
+                return current
+        try:
+            fetched = _fetch()
+        except Exception as exc:
+            if current is None:
+                logger.error("Google signing keys unavailable: %s", exc)
+                return None
+            logger.warning("Google signing key refresh failed, keeping last good set: %s", exc)
+            # Retry later rather than on every sign-in while Google is unreachable.
+            retry_at = now + settings.google_certs_retry_seconds
+            if current.expires_at < retry_at:
+                current = _install(replace(current, expires_at=retry_at))
+            return current
+        _store_shared(fetched)
+        return _install(fetched)
+
+
+def _background_refresh() -> None:
+    global _refresh_thread
+    try:
+        _refresh(background=True)
+    finally:
+        with _state_lock:
+            _refresh_thread = None
+
+
+def _schedule_refresh() -> None:
+    global _refresh_thread
+    with _state_lock:
+        if _refresh_thread is not None:
+            return
+        _refresh_thread = threading.Thread(
+            target=_background_refresh, name="google-certs-refresh", daemon=True
+        )
+        thread = _refresh_thread
+    thread.start()
+
+
+def get_google_certs() -> dict[str, str]:
+    """Google's current signing certificates, keyed by key id."""
+    now = time.time()
+    key_set = _key_set
+    if key_set is None or now >= key_set.expires_at:
+        key_set = _refresh()
+        if key_set is None:
+            raise GoogleCertsUnavailable("Google signing keys are unavailable")
+    elif key_set.refresh_due(now):
+        _schedule_refresh()
+    return key_set.certs
+
+
+def _certs_for_unknown_key() -> dict[str, str]:
+    global _last_forced_refresh
+    now = time.monotonic()
+    with _state_lock:
+        throttled = now - _last_forced_refresh < settings.google_certs_retry_seconds
+        if not throttled:
+            _last_forced_refresh = now
+    if throttled:
+        return get_google_certs()
+    key_set = _refresh(force=True)
+    if key_set is None:
+        raise GoogleCertsUnavailable("Google signing keys are unavailable")
+    return key_set.certs
+
+
+def verify_google_id_token(token: str | bytes, audience: str | None = None) -> dict:
+    """Verify a Google ID token's signature, expiry, issuer and (optionally) audience.
+
+    Raises ``ValueError`` for an invalid token and ``GoogleCertsUnavailable``
+    when no signing keys could be obtained.
+    """
+    kid = google_jwt.decode_header(token).get("kid")
+    certs = get_google_certs()
+    if kid and kid not in certs:
+        certs = _certs_for_unknown_key()
+    idinfo = google_jwt.decode(
+        token,
+        certs=certs,
+        audience=audience,
+        clock_skew_in_seconds=CLOCK_SKEW_SECONDS,
+    )
+    if idinfo.get("iss") not in GOOGLE_ISSUERS:
+        raise ValueError(f"Wrong issuer: {idinfo.get('iss')!r}")
+    return idinfo
+
+
+def reset_google_certs_cache() -> None:
+    """Drop this worker's key set (the shared Redis copy is left alone)."""
+    global _key_set, _last_forced_refresh
+    with _state_lock:
+        _key_set = None
+        _last_forced_refresh = 0.0
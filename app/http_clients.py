@@ -0,0 +1,220 @@
+"""Shared outbound HTTP clients.
+
+One sync and one async ``httpx`` client serve every external call (Resend,
+Telegram, Cloudflare Turnstile, Google token exchange), so connections are
+kept alive and reused instead of paying TCP and TLS setup per request.
+
+- Each upstream host gets its own connection pool, capped by
+  ``http_client_max_connections_per_host`` and
+  ``http_client_max_keepalive_per_host``, so one slow provider cannot starve
+  the others.
+- HTTP/2 is negotiated when the optional ``h2`` package is installed.
+- Default timeouts come from ``http_client_timeout_seconds`` and
+  ``http_client_connect_timeout_seconds``; callers may pass ``timeout=`` per
+  request.
+- Latency, status and error counts are recorded per pool, keyed by
+  ``scheme://host[:port]`` like the pools themselves; read them with
+  ``get_http_client_stats``.
+
+The app lifespan opens the clients with ``open_http_clients`` and closes
+them with ``close_http_clients``. Code running outside the app (scripts,
+tests) gets clients created on first use. The async client is tied to the
+event loop it was created on, so a different loop gets its own client.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+# pyrefly: ignore [missing-import]
+import httpx
+
+from config import settings
+
+try:
+    # pyrefly: ignore [missing-import]
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    HTTP2_AVAILABLE = False
+
+
+@dataclass
+class HostStats:
+    requests: int = 0
+    errors: int = 0  # transport failures and 5xx responses
+    status_4xx: int = 0
+    status_5xx: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def average_seconds(self) -> float:
+        return self.total_seconds / self.requests if self.requests else 0.0
+
+
+_stats: dict[str, HostStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(host: str, elapsed: float, status_code: int | None) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(host, HostStats())
+        stats.requests += 1
+        stats.total_seconds += elapsed
+        stats.max_seconds = max(stats.max_seconds, elapsed)
+        if status_code is None or status_code >= 500:
+            stats.errors += 1
+        if status_code is not None and 400 <= status_code < 500:
+            stats.status_4xx += 1
+        elif status_code is not None and status_code >= 500:
+            stats.status_5xx += 1
+
+
+def get_http_client_stats() -> dict[str, dict]:
+    with _stats_lock:
+        return {
+            host: {
+                **asdict(stats),
+                "total_seconds": round(stats.total_seconds, 4),
+                "max_seconds": round(stats.max_seconds, 4),
+                "average_seconds": round(stats.average_seconds, 4),
+            }
+            for host, stats in _stats.items()
+        }
+
+
+def reset_http_client_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.http_client_max_connections_per_host,
+        max_keepalive_connections=settings.http_client_max_keepalive_per_host,
+        keepalive_expiry=settings.http_client_keepalive_expiry_seconds,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        settings.http_client_timeout_seconds,
+        connect=settings.http_client_connect_timeout_seconds,
+    )
+
+
+def _host_key(request: httpx.Request) -> str:
+    return f"{request.url.scheme}://{request.url.netloc.decode('ascii')}"
+
+
+class _PerHostTransport(httpx.BaseTransport):
+    """Routes each host to its own pooled transport and records per-host metrics."""
+
+    def __init__(self):
+        self._pools: dict[str, httpx.HTTPTransport] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, host: str) -> httpx.HTTPTransport:
+        with self._lock:
+            pool = self._pools.get(host)
+            if pool is None:
+                pool = httpx.HTTPTransport(http2=HTTP2_AVAILABLE, limits=_limits())
+                self._pools[host] = pool
+            return pool
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        host = _host_key(request)
+        started = time.perf_counter()
+        try:
+            response = self._pool(host).handle_request(request)
+        except Exception:
+            _record(host, time.perf_counter() - started, None)
+            raise
+        _record(host, time.perf_counter() - started, response.status_code)
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
+
+
+class _AsyncPerHostTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of ``_PerHostTransport``."""
+
+    def __init__(self):
+        self._pools: dict[str, httpx.AsyncHTTPTransport] = {}
+
+    def _pool(self, host: str) -> httpx.AsyncHTTPTransport:
+        pool = self._pools.get(host)
+        if pool is None:
+            pool = httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE, limits=_limits())
+            self._pools[host] = pool
+        return pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = _host_key(request)
+        started = time.perf_counter()
+        try:
+            response = await self._pool(host).handle_async_request(request)
+        except Exception:
+            _record(host, time.perf_counter() - started, None)
+            raise
+        _record(host, time.perf_counter() - started, response.status_code)
+        return response
+
+    async def aclose(self) -> None:
+        pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            await pool.aclose()
+
+
+_sync_client: httpx.Client | None = None
+_async_client: httpx.AsyncClient | None = None
+_async_client_loop: asyncio.AbstractEventLoop | None = None
+_client_lock = threading.Lock()
+
+
+def get_sync_client() -> httpx.Client:
+    """The shared blocking client; safe to use from any thread."""
+    global _sync_client
+    with _client_lock:
+        if _sync_client is None:
+            _sync_client = httpx.Client(transport=_PerHostTransport(), timeout=_timeout())
+        return _sync_client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """The shared async client for the running event loop."""
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        if _async_client is None or _async_client_loop is not loop:
+            # A client left behind by another loop cannot be closed from this
+            # one; its pooled connections are dropped with it.
+            _async_client = httpx.AsyncClient(transport=_AsyncPerHostTransport(), timeout=_timeout())
+            _async_client_loop = loop
+        return _async_client
+
+
+async def open_http_clients() -> None:
+    """Create both shared clients up front (app startup)."""
+    get_sync_client()
+    get_async_client()
+
+
+async def close_http_clients() -> None:
+    """Close the shared clients and their pooled connections (app shutdown)."""
+    global _sync_client, _async_client, _async_client_loop
+    with _client_lock:
+        sync_client, _sync_client = _sync_client, None
+        async_client, _async_client = _async_client, None
+        loop, _async_client_loop = _async_client_loop, None
+    if sync_client is not None:
+        sync_client.close()
+    if async_client is not None and loop is asyncio.get_running_loop():
+        await async_client.aclose()
@@ -0,0 +1,63 @@
+"""JSON response rendering.
+
+`FastJSONResponse` is the app's default response class: it renders with
+orjson when installed and falls back to Starlette's stdlib rendering.
+
+`schema_response` is the fast path for handlers that already build their
+`response_model` instances. FastAPI would otherwise re-validate the returned
+models, dump them to Python dicts, and encode those dicts again. Here the
+models are serialized straight to JSON bytes by pydantic-core; the route's
+`response_model` still documents the schema.
+"""
+from functools import lru_cache
+from typing import Any
+
+# pyrefly: ignore [missing-import]
+from fastapi import Response
+# pyrefly: ignore [missing-import]
+from fastapi.responses import JSONResponse
+# pyrefly: ignore [missing-import]
+from pydantic import TypeAdapter
+
+try:
+    # pyrefly: ignore [missing-import]
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=None)
+def _schema_adapter(schema_type: Any) -> TypeAdapter:
+    return TypeAdapter(schema_type)
+
+
+def schema_response(
+    content: Any,
+    schema_type: Any = None,
+    *,
+    response: Response | None = None,
+) -> Response:
+    """Serialize already-validated *content* as *schema_type* without re-validation.
+
+    *schema_type* defaults to ``type(content)``; pass it for lists. Pass the
+    handler's injected *response* so headers and status set by dependencies
+    (e.g. the ETag precondition) are kept.
+    """
+    adapter = _schema_adapter(schema_type if schema_type is not None else type(content))
+    body = adapter.dump_json(content, by_alias=True)
+    status_code = 200
+    if response is not None and response.status_code:
+        status_code = response.status_code
+    fast_response = Response(content=body, status_code=status_code, media_type="application/json")
+    if response is not None:
+        fast_response.raw_headers.extend(
+            header for header in response.raw_headers if header[0] != b"content-length"
+        )
+    return fast_response
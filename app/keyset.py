@@ -0,0 +1,57 @@
+"""Keyset pagination for feeds with a stable sort order.
+
+A feed ordered by some columns (descending for newest-first feeds, or
+ascending), with the row id as the final tie-breaker, pages with an opaque
+``next_cursor`` that is the id of the last row served. ``keyset_after`` turns
+that id back into a filter: the anchor row's sort values are read with scalar
+subqueries, so only the id travels through the client and a page never
+depends on timestamp precision.
+"""
+from typing import Sequence
+
+# pyrefly: ignore [missing-import]
+from fastapi import HTTPException, status
+# pyrefly: ignore [missing-import]
+from sqlalchemy import and_, exists, or_, select
+# pyrefly: ignore [missing-import]
+from sqlalchemy.orm import Session, aliased
+
+
+def keyset_after(
+    db: Session,
+    model,
+    *,
+    owner_id: int,
+    cursor: str,
+    order_by: Sequence,
+    invalid_detail: str,
+    descending: bool = True,
+):
+    """Filter for *model* rows after the cursor row in (*order_by, id) order.
+
+    The order is descending unless *descending* is false. Raises 400 with
+    *invalid_detail* when the cursor is not one of the owner's row ids.
+    """
+    try:
+        cursor_id = int(cursor)
+    except (TypeError, ValueError):
+        cursor_id = 0
+    exists_for_owner = cursor_id > 0 and db.query(
+        exists().where(model.id == cursor_id, model.owner_id == owner_id)
+    ).scalar()
+    if not exists_for_owner:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=invalid_detail)
+
+    def after(column, value):
+        return column < value if descending else column > value
+
+    anchor = aliased(model)
+    clause = after(model.id, cursor_id)
+    for column in reversed(order_by):
+        anchor_value = select(getattr(anchor, column.key)).where(anchor.id == cursor_id).scalar_subquery()
+        clause = or_(after(column, anchor_value), and_(column == anchor_value, clause))
+    return clause
+
+
+def next_cursor(rows: Sequence, has_more: bool) -> str | None:
+    return str(rows[-1].id) if has_more and rows else None
@@ -2,7 +2,7 @@ from fastapi import FastAPI, Depends, HTTPException, Request
 # pyrefly: ignore [missing-import]
 from fastapi.middleware.cors import CORSMiddleware
 # pyrefly: ignore [missing-import]
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse
 # pyrefly: ignore [missing-import]
 from sqlalchemy import text
 # pyrefly: ignore [missing-import]
@@ -12,7 +12,12 @@ from starlette.middleware.trustedhost import TrustedHostMiddleware
 import logging
 
 from app.session import get_db
-from app.routers import users, expenses, budget, analytics, auth, oauth_google, recurring, income, savings, goals, payments, notifications, debts, payment_plans, wallets, assets, projects, expected_inflows, subcategories
+from app.rate_limit_middleware import RateLimitMiddleware
+from app.security_headers import SecurityHeadersMiddleware, build_security_headers
+from app.compression import CompressionMiddleware
+from app.http_clients import close_http_clients, open_http_clients
+from app.json_responses import FastJSONResponse
+from app.routers import users, expenses, budget, analytics, auth, oauth_google, recurring, income, savings, goals, payments, notifications, debts, payment_plans, wallets, assets, projects, expected_inflows, subcategories, events
 from .models import ExpenseCategory
 from config import settings
 
@@ -22,40 +27,55 @@ from app.domains.ledger import LedgerError
 
 logger = logging.getLogger(__name__)
 try:
-    from app.scheduler import start_scheduler
+    from app.scheduler import start_scheduler, stop_scheduler
 except Exception as exc:  # pragma: no cover - defensive fallback
     logger.warning("Scheduler is disabled: %s", exc)
 
     def start_scheduler():
         return None
 
+    def stop_scheduler(scheduler):
+        scheduler.shutdown()
+
 # Tables are managed by Alembic migrations.
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Start the background scheduler
+    # Startup: Open the shared outbound HTTP clients, then start the background scheduler
+    await open_http_clients()
     scheduler = start_scheduler()
     yield
-    # Shutdown: Stop the scheduler
+    # Shutdown: Stop the scheduler before closing the clients its jobs use
     if scheduler:
-        scheduler.shutdown()
+        stop_scheduler(scheduler)
+    await close_http_clients()
 
 app = FastAPI(
     title="Expense Tracker API",
     description="A professional API to track your spending and manage budgets.",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 origins = settings.cors_origins_list
 
+# Innermost: throttled routes are rejected before any dependency (and DB
+# session) runs, while 429s still pass through CORS on the way out.
+app.add_middleware(RateLimitMiddleware)
+
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.response_compression_min_size,
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT","PATCH" ,"DELETE", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type", "X-Timezone"],
-    expose_headers=["Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "Content-Disposition"],
+    allow_headers=["Authorization", "Content-Type", "X-Timezone", "If-None-Match"],
+    expose_headers=["Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "Content-Disposition", "ETag"],
 )
 
 app.add_middleware(
@@ -63,44 +83,15 @@ app.add_middleware(
     allowed_hosts=settings.trusted_hosts_list,
 )
 
+# Outermost: every response, including rejections from the middleware above,
+# carries the security headers computed once here.
+app.add_middleware(SecurityHeadersMiddleware, headers=build_security_headers())
+
 # Redundant HTTPS redirection is handled by Railway and Nginx.
 # if settings.is_production:
 #     app.add_middleware(HTTPSRedirectMiddleware)
 
 
-@app.middleware("http")
-async def add_security_headers(request: Request, call_next):
-    response: Response = await call_next(request)
-
-    connect_sources = ["'self'"] + settings.cors_origins_list
-    csp_parts = [
-        "default-src 'self'",
-        "base-uri 'self'",
-        "frame-ancestors 'none'",
-        "object-src 'none'",
-        "form-action 'self'",
-        "script-src 'self'",
-        "style-src 'self' 'unsafe-inline'",
-        "img-src 'self' data: blob:",
-        "font-src 'self' data:",
-        f"connect-src {' '.join(connect_sources)}",
-    ]
-    if settings.is_production:
-        csp_parts.append("upgrade-insecure-requests")
-
-    response.headers["Content-Security-Policy"] = "; ".join(csp_parts)
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["Referrer-Policy"] = "no-referrer"
-    response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
-    response.headers["Cross-Origin-Opener-Policy"] = "same-origin"
-    response.headers["Cross-Origin-Resource-Policy"] = "same-origin"
-    if settings.is_production:
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-
-    return response
-
-
 @app.exception_handler(LedgerError)
 async def ledger_error_handler(_request: Request, exc: LedgerError):
     """Map domain-level LedgerError subclasses to HTTP 400 responses."""
@@ -149,6 +140,7 @@ app.include_router(savings.router)
 app.include_router(goals.router)
 app.include_router(payments.router)
 app.include_router(notifications.router)
+app.include_router(events.router)
 app.include_router(debts.router)
 app.include_router(payment_plans.router)
 app.include_router(wallets.router)
@@ -1,5 +1,5 @@
 # pyrefly: ignore [missing-import]
-from sqlalchemy import Boolean, CheckConstraint, Column, Date, Index, Integer, BigInteger, String, DateTime, ForeignKey, Enum, UniqueConstraint, JSON
+from sqlalchemy import Boolean, CheckConstraint, Column, Date, Index, Integer, BigInteger, String, Text, DateTime, ForeignKey, Enum, UniqueConstraint, JSON
 # pyrefly: ignore [missing-import]
 from sqlalchemy.sql import func
 from .session import Base
@@ -467,6 +467,9 @@ class User(Base):
     premium_expires_at = Column(DateTime(timezone=True), nullable=True)
     timezone = Column(String(50), default="UTC", nullable=False)
     total_debts_created = Column(Integer, default=0, nullable=False)
+    # Bumped once per transaction that changes the user's financial data;
+    # read caches key their entries by it (see app.domains.ledger).
+    ledger_version = Column(BigInteger, default=0, server_default="0", nullable=False)
     profile = relationship(
         "UserProfile",
         back_populates="user",
@@ -742,6 +745,25 @@ class IncomeSource(Base):
         "ExpectedInflowPromise", back_populates="source")
 
 
+class IncomeSourceStats(Base):
+    """Running per-source totals behind the income source analytics card.
+
+    Maintained by app.services.income_source_stats_service; never written directly.
+    """
+    __tablename__ = "income_source_stats"
+
+    source_id = Column(Integer, ForeignKey(
+        "income_sources.id", ondelete="CASCADE"), primary_key=True)
+    owner_id = Column(Integer, ForeignKey(
+        "users.id", ondelete="CASCADE"), nullable=False, index=True)
+    entry_count = Column(Integer, nullable=False, default=0, server_default="0")
+    entry_total_received = Column(BigInteger, nullable=False, default=0, server_default="0")
+    promise_count = Column(Integer, nullable=False, default=0, server_default="0")
+    lifetime_expected = Column(BigInteger, nullable=False, default=0, server_default="0")
+    lifetime_received = Column(BigInteger, nullable=False, default=0, server_default="0")
+    outstanding_expected = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+
 class IncomeEntry(Base):
     __tablename__ = "income_entries"
     __table_args__ = (
@@ -778,6 +800,13 @@ class IncomeEntry(Base):
     source = relationship("IncomeSource", back_populates="income_entries")
 
 
+def _outstanding_from_amount(column_name: str):
+    """Insert default: a fresh Promise or schedule owes its full amount."""
+    def default(context):
+        return context.get_current_parameters()[column_name]
+    return default
+
+
 class ExpectedInflowPromise(Base):
     __tablename__ = "expected_inflow_promises"
     __table_args__ = (
@@ -794,6 +823,7 @@ class ExpectedInflowPromise(Base):
         ),
         Index("ix_expected_inflow_promises_owner_status", "owner_id", "status"),
         Index("ix_expected_inflow_promises_owner_kind", "owner_id", "kind"),
+        Index("ix_expected_inflow_promises_owner_source", "owner_id", "source_id"),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -817,6 +847,15 @@ class ExpectedInflowPromise(Base):
         default=ExpectedInflowPromiseStatus.OPEN.value,
     )
     """Stored lifecycle: OPEN or CLOSED. Display state derived via PromiseDisplayState."""
+    # Aggregates over schedules, maintained by expected_inflow_service._sync_promise
+    received_amount = Column(BigInteger, nullable=False, default=0, server_default="0")
+    written_off_amount = Column(BigInteger, nullable=False, default=0, server_default="0")
+    outstanding_amount = Column(
+        BigInteger,
+        nullable=False,
+        default=_outstanding_from_amount("original_amount"),
+        server_default="0",
+    )
     backing_eligible = Column(Boolean, nullable=False, default=True)
     note = Column(String(200), nullable=True)
     closed_at = Column(DateTime(timezone=True), nullable=True)
@@ -901,6 +940,14 @@ class ExpectedIncome(Base):
         "expected_incomes.id", ondelete="RESTRICT"), nullable=True, index=True)
     amount = Column(BigInteger, nullable=False)
     received_amount = Column(BigInteger, nullable=True, default=0)
+    # Maintained with received_amount by expected_inflow_service._sync_schedule
+    written_off_amount = Column(BigInteger, nullable=False, default=0, server_default="0")
+    outstanding_amount = Column(
+        BigInteger,
+        nullable=False,
+        default=_outstanding_from_amount("amount"),
+        server_default="0",
+    )
     linked_transaction_id = Column(Integer, ForeignKey(
         "financial_events.id", ondelete="SET NULL"), nullable=True, index=True)
     due_date = Column(Date, nullable=False)
@@ -1375,6 +1422,40 @@ class EmailVerificationToken(Base):
     user = relationship("User", back_populates="email_verification_tokens")
 
 
+class EmailOutboxStatus(str, enum.Enum):
+    PENDING = "PENDING"  # Waiting for (another) delivery attempt
+    SENT = "SENT"
+    FAILED = "FAILED"    # Rejected by the provider or out of attempts
+
+
+class EmailOutbox(Base):
+    """Transactional email queued with the write that triggers it (see app/email_outbox.py)."""
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    to_email = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    # Cleared once the message is settled: bodies carry single-use links.
+    text_body = Column(Text, nullable=True)
+    html_body = Column(Text, nullable=True)
+    # Sent as the provider's Idempotency-Key header, and unique here so a
+    # retried request cannot queue the same message twice.
+    idempotency_key = Column(String(255), nullable=True, unique=True)
+    status = Column(String(20), nullable=False,
+                    default=EmailOutboxStatus.PENDING.value,
+                    server_default=EmailOutboxStatus.PENDING.value)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime(timezone=True),
+                             server_default=func.now(), nullable=False)
+    last_error = Column(String(500), nullable=True)
+    created_at = Column(DateTime(timezone=True),
+                        server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+
 class SavingsTransactions(Base):
     __tablename__ = "savings_transactions"
     __table_args__ = (
@@ -1448,6 +1529,8 @@ class Goals(Base):
         "GoalContributions", back_populates="goal", cascade="all, delete")
     project_releases = relationship(
         "GoalProjectRelease", back_populates="goal", cascade="all, delete-orphan")
+    wallet_balances = relationship(
+        "GoalWalletBalance", back_populates="goal", cascade="all, delete-orphan")
     linked_asset = relationship("Asset", foreign_keys=[linked_asset_id])
     linked_debt = relationship("Debt", foreign_keys=[linked_debt_id])
     linked_debt_transaction = relationship("DebtTransaction", foreign_keys=[
@@ -1540,6 +1623,30 @@ class GoalProjectRelease(Base):
     wallet = relationship("Wallet")
 
 
+class GoalWalletBalance(Base):
+    """Running per-wallet totals of a goal's contributions and releases.
+
+    Maintained by app.services.goal_balance_service; never written directly.
+    """
+    __tablename__ = "goal_wallet_balances"
+    __table_args__ = (
+        Index("ix_goal_wallet_balances_owner_wallet", "owner_id", "wallet_id"),
+    )
+
+    goal_id = Column(Integer, ForeignKey(
+        "goals.id", ondelete="CASCADE"), primary_key=True)
+    wallet_id = Column(Integer, ForeignKey(
+        "wallets.id", ondelete="RESTRICT"), primary_key=True)
+    owner_id = Column(Integer, ForeignKey(
+        "users.id", ondelete="CASCADE"), nullable=False)
+    allocated = Column(BigInteger, nullable=False, default=0, server_default="0")
+    returned = Column(BigInteger, nullable=False, default=0, server_default="0")
+    consumed = Column(BigInteger, nullable=False, default=0, server_default="0")
+    released = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    goal = relationship("Goals", back_populates="wallet_balances")
+
+
 class Debt(Base):
     __tablename__ = "debts"
     __table_args__ = (
@@ -2195,7 +2302,7 @@ class Notification(Base):
     __tablename__ = "notifications"
     __table_args__ = (
         Index("ix_notifications_owner_id", "owner_id"),
-        Index("ix_notifications_owner_is_read", "owner_id", "is_read"),
+        Index("ix_notifications_owner_read_created", "owner_id", "is_read", "created_at"),
         Index("ix_notifications_owner_created_at", "owner_id", "created_at"),
     )
 
@@ -2792,6 +2899,15 @@ class ExpenseMergeGroup(Base):
 
 class FinancialEvent(Base):
     __tablename__ = "financial_events"
+    __table_args__ = (
+        Index("ix_financial_events_owner_date_created",
+              "owner_id", "date", "created_at", "id"),
+        # Trigram indexes serve ILIKE '%term%' searches on Postgres (pg_trgm).
+        Index("ix_financial_events_title_trgm", "title",
+              postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_financial_events_description_trgm", "description",
+              postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     owner_id = Column(Integer, ForeignKey(
@@ -2858,6 +2974,9 @@ class WalletLedger(Base):
 
 class EntityLedger(Base):
     __tablename__ = "entity_ledger"
+    __table_args__ = (
+        Index("ix_entity_ledger_income_source_event", "income_source_id", "event_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(Integer, ForeignKey(
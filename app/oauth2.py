@@ -86,6 +86,22 @@ def verify_access_token(token: str, credentials_exception):
     return token_data
 
 
+def peek_access_token_user_id(token: str) -> str | None:
+    """
+    Returns the user_id claim of a valid access token, or None.
+
+    Signature and expiry are checked, but the user is NOT loaded from the
+    database — callers (e.g. the rate-limit middleware) only need a stable
+    identity before the request reaches any DB-backed dependency.
+    """
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    user_id = payload.get("user_id")
+    return str(user_id) if user_id is not None else None
+
+
 def get_current_user(token: str = Depends(oauth2_scheme), db=Depends(get_db)):
     """
     FastAPI dependency: extracts and validates the access token from the
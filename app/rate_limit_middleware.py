@@ -0,0 +1,361 @@
+"""Declarative per-route rate limiting.
+
+Every throttled route is listed once in `ROUTE_RATE_LIMITS` as
+(method, path template) -> policy. `RateLimitMiddleware` is a pure ASGI
+middleware that matches the incoming request against that table, reads the
+user id straight from the JWT (no DB lookup), and charges all of the policy's
+token buckets in a single pipelined Redis call. Over-limit requests are
+rejected with 429 before the router runs, so no DB session is ever opened
+for them.
+
+Requests without a valid access token skip the user-scoped buckets but are
+still charged to IP-scoped ones; the route's auth dependency answers them
+with 401.
+"""
+import re
+from dataclasses import dataclass
+
+# pyrefly: ignore [missing-import]
+from starlette.concurrency import run_in_threadpool
+# pyrefly: ignore [missing-import]
+from starlette.responses import JSONResponse
+# pyrefly: ignore [missing-import]
+from starlette.routing import compile_path
+
+from app import oauth2
+from app.redis_rate_limiter import RateLimitResult, TokenBucketCheck, consume_token_buckets
+
+
+USER_KEY = "user"
+IP_KEY = "ip"
+
+
+@dataclass(frozen=True)
+class BucketPolicy:
+    scope: str
+    capacity: int
+    refill_rate_per_second: float
+    key: str = USER_KEY
+
+
+@dataclass(frozen=True)
+class RoutePolicy:
+    detail: str
+    buckets: tuple[BucketPolicy, ...]
+
+
+AUTH_CHANGE_PASSWORD = RoutePolicy(
+    detail="auth.change_password_rate_limited",
+    buckets=(
+        BucketPolicy("change_pw_ip", 10, 10 / 3600, key=IP_KEY),
+        BucketPolicy("change_pw_user", 5, 5 / 3600),
+    ),
+)
+AUTH_VERIFY_PASSWORD = RoutePolicy(
+    detail="auth.rate_limited",
+    buckets=(
+        BucketPolicy("verify_pw_ip", 10, 10 / 3600, key=IP_KEY),
+        BucketPolicy("verify_pw_user", 5, 5 / 3600),
+    ),
+)
+EXPENSES_WRITE = RoutePolicy(
+    detail="expenses.write_rate_limited",
+    buckets=(BucketPolicy("expenses_write", 10, 10 / 60),),
+)
+EXPENSES_EXPORT = RoutePolicy(
+    detail="export.too_many_requests",
+    buckets=(BucketPolicy("export_csv", 5, 5 / 60),),
+)
+BUDGETS_WRITE = RoutePolicy(
+    detail="budgets.write_rate_limited",
+    buckets=(BucketPolicy("budgets_write", 10, 10 / 60),),
+)
+DEBTS_WRITE = RoutePolicy(
+    detail="debts.write_rate_limited",
+    buckets=(BucketPolicy("debts_write", 20, 20 / 60),),
+)
+GOALS_LIFECYCLE_WRITE = RoutePolicy(
+    detail="goals.write_rate_limited",
+    buckets=(BucketPolicy("goals_lifecycle_write", 10, 10 / 60),),
+)
+GOALS_MONEY_WRITE = RoutePolicy(
+    detail="goals.write_rate_limited",
+    buckets=(BucketPolicy("goals_money_write", 20, 20 / 60),),
+)
+INCOME_SOURCES_WRITE = RoutePolicy(
+    detail="income.sources_write_rate_limited",
+    buckets=(BucketPolicy("income_sources_write", 10, 10 / 60),),
+)
+INCOME_ENTRIES_WRITE = RoutePolicy(
+    detail="income.entries_write_rate_limited",
+    buckets=(BucketPolicy("income_entries_write", 20, 20 / 60),),
+)
+NOTIFICATIONS_READ = RoutePolicy(
+    detail="notifications.rate_limited",
+    buckets=(BucketPolicy("notifications_read", 30, 30 / 60),),
+)
+EVENTS_STREAM = RoutePolicy(
+    detail="events.rate_limited",
+    buckets=(BucketPolicy("events_stream", 10, 10 / 60),),
+)
+PAYMENT_PLANS_WRITE = RoutePolicy(
+    detail="payment_plans.write_rate_limited",
+    buckets=(BucketPolicy("payment_plans_write", 20, 20 / 60),),
+)
+PROJECTS_WRITE = RoutePolicy(
+    detail="projects.write_rate_limited",
+    buckets=(BucketPolicy("projects_write", 10, 10 / 60),),
+)
+RECURRING_WRITE = RoutePolicy(
+    detail="recurring_expenses.write_rate_limited",
+    buckets=(BucketPolicy("recurring_write", 10, 10 / 60),),
+)
+
+
+# (method, path template, policy). Templates use the same `{param}` syntax as
+# the routers; the first matching row wins.
+ROUTE_RATE_LIMITS: tuple[tuple[str, str, RoutePolicy], ...] = (
+    # Auth (password checks on an authenticated session)
+    ("POST", "/auth/change-password", AUTH_CHANGE_PASSWORD),
+    ("POST", "/auth/mobile/change-password", AUTH_CHANGE_PASSWORD),
+    ("POST", "/auth/verify-password", AUTH_VERIFY_PASSWORD),
+    # Expenses
+    ("POST", "/expenses/", EXPENSES_WRITE),
+    ("GET", "/expenses/export", EXPENSES_EXPORT),
+    ("POST", "/expenses/session-drafts", EXPENSES_WRITE),
+    ("PUT", "/expenses/session-drafts/{draft_id}", EXPENSES_WRITE),
+    ("DELETE", "/expenses/session-drafts/{draft_id}", EXPENSES_WRITE),
+    ("POST", "/expenses/session-drafts/{draft_id}/pause", EXPENSES_WRITE),
+    ("POST", "/expenses/session-drafts/{draft_id}/resume", EXPENSES_WRITE),
+    ("POST", "/expenses/session-drafts/{draft_id}/abandon", EXPENSES_WRITE),
+    ("POST", "/expenses/session-drafts/{draft_id}/items", EXPENSES_WRITE),
+    ("PUT", "/expenses/session-drafts/{draft_id}/items/{item_id}", EXPENSES_WRITE),
+    ("DELETE", "/expenses/session-drafts/{draft_id}/items/{item_id}", EXPENSES_WRITE),
+    ("POST", "/expenses/session-drafts/{draft_id}/wallet-allocations", EXPENSES_WRITE),
+    ("PUT", "/expenses/session-drafts/{draft_id}/wallet-allocations/{allocation_id}", EXPENSES_WRITE),
+    ("DELETE", "/expenses/session-drafts/{draft_id}/wallet-allocations/{allocation_id}", EXPENSES_WRITE),
+    ("POST", "/expenses/session-drafts/{draft_id}/splits", EXPENSES_WRITE),
+    ("PUT", "/expenses/session-drafts/{draft_id}/splits/{split_id}", EXPENSES_WRITE),
+    ("DELETE", "/expenses/session-drafts/{draft_id}/splits/{split_id}", EXPENSES_WRITE),
+    ("POST", "/expenses/session-drafts/{draft_id}/finalize", EXPENSES_WRITE),
+    ("POST", "/expenses/merge-groups", EXPENSES_WRITE),
+    ("PUT", "/expenses/merge-groups/{group_id}", EXPENSES_WRITE),
+    ("DELETE", "/expenses/merge-groups/{group_id}", EXPENSES_WRITE),
+    ("POST", "/expenses/merge-groups/{group_id}/items", EXPENSES_WRITE),
+    ("DELETE", "/expenses/merge-groups/{group_id}/items/{expense_id}", EXPENSES_WRITE),
+    ("PUT", "/expenses/{id}", EXPENSES_WRITE),
+    ("DELETE", "/expenses/{id}", EXPENSES_WRITE),
+    ("POST", "/expenses/{id}/mark-as-asset", EXPENSES_WRITE),
+    ("POST", "/expenses/{id}/mark-as-recurring", EXPENSES_WRITE),
+    ("POST", "/expenses/{id}/split", EXPENSES_WRITE),
+    # Budgets
+    ("POST", "/budgets/", BUDGETS_WRITE),
+    ("PATCH", "/budgets/item", BUDGETS_WRITE),
+    ("DELETE", "/budgets/item", BUDGETS_WRITE),
+    ("PUT", "/budgets/borrowing-survival", BUDGETS_WRITE),
+    ("POST", "/budgets/month-setup/apply", BUDGETS_WRITE),
+    ("POST", "/budgets/expected-incomes", BUDGETS_WRITE),
+    ("PATCH", "/budgets/expected-incomes/{expected_income_id}", BUDGETS_WRITE),
+    ("DELETE", "/budgets/expected-incomes/{expected_income_id}", BUDGETS_WRITE),
+    ("POST", "/budgets/expected-incomes/{expected_income_id}/mark-received", BUDGETS_WRITE),
+    ("POST", "/budgets/reallocate", BUDGETS_WRITE),
+    ("POST", "/budgets/recalculate", BUDGETS_WRITE),
+    ("POST", "/budgets/{budget_id}/subcategories/reallocate", BUDGETS_WRITE),
+    ("POST", "/budgets/{budget_id}/subcategories", BUDGETS_WRITE),
+    ("PATCH", "/budgets/subcategories/{subcategory_id}", BUDGETS_WRITE),
+    ("DELETE", "/budgets/subcategories/{subcategory_id}", BUDGETS_WRITE),
+    # Debts
+    ("POST", "/debts", DEBTS_WRITE),
+    ("POST", "/debts/transactions", DEBTS_WRITE),
+    ("DELETE", "/debts/transactions/{transaction_id}", DEBTS_WRITE),
+    ("PATCH", "/debts/{debt_id}", DEBTS_WRITE),
+    ("DELETE", "/debts/{debt_id}", DEBTS_WRITE),
+    ("POST", "/debts/{debt_id}/archive", DEBTS_WRITE),
+    ("POST", "/debts/{debt_id}/restore", DEBTS_WRITE),
+    ("POST", "/debts/{debt_id}/unarchive", DEBTS_WRITE),
+    ("POST", "/debts/{debt_id}/payments", DEBTS_WRITE),
+    ("POST", "/debts/{debt_id}/add-charge", DEBTS_WRITE),
+    ("POST", "/debts/{debt_id}/forgive", DEBTS_WRITE),
+    ("POST", "/debts/{debt_id}/forgiveness", DEBTS_WRITE),
+    ("POST", "/debts/{debt_id}/balance-adjustments", DEBTS_WRITE),
+    ("POST", "/debts/{debt_id}/ledger/{entry_id}/reverse", DEBTS_WRITE),
+    ("PATCH", "/debts/{debt_id}/formal-details", DEBTS_WRITE),
+    # Goals
+    ("POST", "/goals/", GOALS_LIFECYCLE_WRITE),
+    ("PATCH", "/goals/{goal_id}", GOALS_LIFECYCLE_WRITE),
+    ("DELETE", "/goals/{goal_id}", GOALS_LIFECYCLE_WRITE),
+    ("POST", "/goals/{goal_id}/archive", GOALS_LIFECYCLE_WRITE),
+    ("POST", "/goals/{goal_id}/restore", GOALS_LIFECYCLE_WRITE),
+    ("POST", "/goals/{goal_id}/allocations", GOALS_MONEY_WRITE),
+    ("POST", "/goals/{goal_id}/allocations/move", GOALS_MONEY_WRITE),
+    ("POST", "/goals/{goal_id}/allocations/return", GOALS_MONEY_WRITE),
+    ("POST", "/goals/{goal_id}/allocations/consume", GOALS_MONEY_WRITE),
+    ("POST", "/goals/{goal_id}/use-reserve", GOALS_MONEY_WRITE),
+    ("POST", "/goals/{goal_id}/record-purchase", GOALS_MONEY_WRITE),
+    ("POST", "/goals/{goal_id}/pay-debt", GOALS_MONEY_WRITE),
+    ("POST", "/goals/{goal_id}/graduate", GOALS_MONEY_WRITE),
+    ("POST", "/goals/{goal_id}/release-to-project", GOALS_MONEY_WRITE),
+    # Income
+    ("POST", "/income/sources", INCOME_SOURCES_WRITE),
+    ("PATCH", "/income/sources/{source_id}", INCOME_SOURCES_WRITE),
+    ("DELETE", "/income/sources/{source_id}", INCOME_SOURCES_WRITE),
+    ("PATCH", "/income/sources/{source_id}/active", INCOME_SOURCES_WRITE),
+    ("POST", "/income/entries", INCOME_ENTRIES_WRITE),
+    ("PUT", "/income/entries/{entry_id}", INCOME_ENTRIES_WRITE),
+    ("DELETE", "/income/entries/{entry_id}", INCOME_ENTRIES_WRITE),
+    # Notifications
+    ("GET", "/notifications/", NOTIFICATIONS_READ),
+    # Server-sent events
+    ("GET", "/events/stream", EVENTS_STREAM),
+    # Payment plans
+    ("POST", "/payment-plans", PAYMENT_PLANS_WRITE),
+    ("PATCH", "/payment-plans/{plan_id}", PAYMENT_PLANS_WRITE),
+    ("POST", "/payment-plans/{plan_id}/payments", PAYMENT_PLANS_WRITE),
+    ("POST", "/payment-plans/{plan_id}/payments/undo-latest", PAYMENT_PLANS_WRITE),
+    ("POST", "/payment-plans/payments/{payment_id}/mark-paid", PAYMENT_PLANS_WRITE),
+    ("POST", "/payment-plans/payments/{payment_id}/write-off", PAYMENT_PLANS_WRITE),
+    ("POST", "/payment-plans/payments/{payment_id}/undo-write-off", PAYMENT_PLANS_WRITE),
+    ("POST", "/payment-plans/{plan_id}/charges", PAYMENT_PLANS_WRITE),
+    ("POST", "/payment-plans/{plan_id}/charges/undo-latest", PAYMENT_PLANS_WRITE),
+    ("POST", "/payment-plans/{plan_id}/write-off", PAYMENT_PLANS_WRITE),
+    ("POST", "/payment-plans/{plan_id}/archive", PAYMENT_PLANS_WRITE),
+    ("POST", "/payment-plans/{plan_id}/unarchive", PAYMENT_PLANS_WRITE),
+    # Projects
+    ("POST", "/projects", PROJECTS_WRITE),
+    ("POST", "/projects/overlay", PROJECTS_WRITE),
+    ("PUT", "/projects/{project_id}", PROJECTS_WRITE),
+    ("DELETE", "/projects/{project_id}", PROJECTS_WRITE),
+    ("POST", "/projects/{project_id}/top-ups", PROJECTS_WRITE),
+    ("POST", "/projects/{project_id}/category-allocations", PROJECTS_WRITE),
+    ("POST", "/projects/{project_id}/subcategory-allocations", PROJECTS_WRITE),
+    ("POST", "/projects/{project_id}/rebalances", PROJECTS_WRITE),
+    ("POST", "/projects/{project_id}/delete-resolution", PROJECTS_WRITE),
+    ("POST", "/projects/{project_id}/stop", PROJECTS_WRITE),
+    ("POST", "/projects/{project_id}/resume", PROJECTS_WRITE),
+    ("POST", "/projects/{project_id}/complete", PROJECTS_WRITE),
+    ("POST", "/projects/{project_id}/archive", PROJECTS_WRITE),
+    ("POST", "/projects/{project_id}/reopen", PROJECTS_WRITE),
+    ("POST", "/projects/{project_id}/category-limits", PROJECTS_WRITE),
+    ("PUT", "/projects/{project_id}/category-limits/{category}", PROJECTS_WRITE),
+    ("DELETE", "/projects/{project_id}/category-limits/{category}", PROJECTS_WRITE),
+    ("POST", "/projects/{project_id}/subcategories", PROJECTS_WRITE),
+    ("PUT", "/projects/{project_id}/subcategories/{subcategory_id}", PROJECTS_WRITE),
+    ("DELETE", "/projects/{project_id}/subcategories/{subcategory_id}", PROJECTS_WRITE),
+    # Recurring
+    ("POST", "/recurring/", RECURRING_WRITE),
+    ("PUT", "/recurring/{id}", RECURRING_WRITE),
+    ("DELETE", "/recurring/{id}", RECURRING_WRITE),
+    ("PUT", "/recurring/{id}/projection-horizons", RECURRING_WRITE),
+    ("PATCH", "/recurring/{id}/toggle", RECURRING_WRITE),
+    ("PATCH", "/recurring/{id}/change-wallet", RECURRING_WRITE),
+)
+
+
+def _compile_table(
+    table: tuple[tuple[str, str, RoutePolicy], ...],
+) -> dict[str, list[tuple[re.Pattern, RoutePolicy]]]:
+    compiled: dict[str, list[tuple[re.Pattern, RoutePolicy]]] = {}
+    for method, template, policy in table:
+        path_regex, _path_format, _convertors = compile_path(template)
+        compiled.setdefault(method, []).append((path_regex, policy))
+    return compiled
+
+
+_COMPILED_ROUTE_RATE_LIMITS = _compile_table(ROUTE_RATE_LIMITS)
+
+
+def match_route_policy(method: str, path: str) -> RoutePolicy | None:
+    for path_regex, policy in _COMPILED_ROUTE_RATE_LIMITS.get(method, ()):
+        if path_regex.match(path):
+            return policy
+    return None
+
+
+def _bearer_token(headers: list[tuple[bytes, bytes]]) -> str | None:
+    for name, value in headers:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                return token.strip()
+            return None
+    return None
+
+
+def _client_ip(scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def build_bucket_checks(policy: RoutePolicy, scope) -> list[TokenBucketCheck]:
+    identifiers: dict[str, str | None] = {IP_KEY: _client_ip(scope)}
+    if any(bucket.key == USER_KEY for bucket in policy.buckets):
+        token = _bearer_token(scope.get("headers", []))
+        user_id = oauth2.peek_access_token_user_id(token) if token else None
+        identifiers[USER_KEY] = str(user_id) if user_id is not None else None
+
+    return [
+        TokenBucketCheck(
+            scope=bucket.scope,
+            identifier=identifiers[bucket.key],
+            capacity=bucket.capacity,
+            refill_rate_per_second=bucket.refill_rate_per_second,
+        )
+        for bucket in policy.buckets
+        if identifiers.get(bucket.key) is not None
+    ]
+
+
+def rate_limit_headers(results: list[RateLimitResult]) -> dict[str, str]:
+    """Headers for the tightest bucket, plus Retry-After when any bucket denied."""
+    tightest = min(results, key=lambda rl: (rl.allowed, rl.remaining))
+    headers = {
+        "X-RateLimit-Limit": str(tightest.limit),
+        "X-RateLimit-Remaining": str(tightest.remaining),
+        "X-RateLimit-Reset": str(tightest.reset_seconds),
+    }
+    denied = [rl for rl in results if not rl.allowed]
+    if denied:
+        headers["Retry-After"] = str(max(rl.reset_seconds for rl in denied))
+    return headers
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware enforcing `ROUTE_RATE_LIMITS`."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        policy = match_route_policy(scope["method"], scope["path"])
+        checks = build_bucket_checks(policy, scope) if policy else []
+        if not checks:
+            await self.app(scope, receive, send)
+            return
+
+        # The Redis client is synchronous; keep its round trip off the event loop.
+        results = await run_in_threadpool(consume_token_buckets, checks)
+        headers = rate_limit_headers(results)
+        if not all(rl.allowed for rl in results):
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": policy.detail},
+                headers=headers,
+            )
+            await response(scope, receive, send)
+            return
+
+        raw_headers = [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in headers.items()
+        ]
+
+        async def send_with_rate_limit_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + raw_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_rate_limit_headers)
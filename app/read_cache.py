@@ -0,0 +1,211 @@
+"""Version-keyed Redis cache for per-user read models.
+
+``@cached_read("namespace")`` wraps a read service shaped like
+``fn(db, owner_id, *args)``.  Entries are keyed by
+``(owner_id, ledger_version, args)``: any committed write bumps the owner's
+ledger version (see ``app.domains.ledger``), so stale entries are never
+read again and simply age out.
+
+Bounding and eviction
+---------------------
+Each user has a sorted-set index of their entry keys scored by last use.
+Storing a new entry trims the index to
+``settings.read_cache_max_entries_per_user`` and deletes the least recently
+used entries; every entry also carries a TTL.
+
+Consistency
+-----------
+The cache is bypassed when the session has pending ORM changes or the
+current transaction already bumped the owner's version — those reads see
+uncommitted data that must not be shared.
+
+Like the rate limiter, the cache fails open: Redis errors fall through to
+the wrapped function.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar, get_type_hints
+
+# pyrefly: ignore [missing-import]
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+
+from app.domains.ledger import get_ledger_version, is_ledger_version_bumped
+from app.redis_rate_limiter import redis_client
+from config import settings
+
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+KEY_PREFIX = "rc"
+
+STORE_ENTRY_SCRIPT = redis_client.register_script(
+    """
+local ttl_seconds = tonumber(ARGV[2])
+local max_entries = tonumber(ARGV[4])
+redis.call("SET", KEYS[1], ARGV[1], "EX", ttl_seconds)
+redis.call("ZADD", KEYS[2], ARGV[3], KEYS[1])
+redis.call("EXPIRE", KEYS[2], ttl_seconds)
+local excess = redis.call("ZCARD", KEYS[2]) - max_entries
+if excess <= 0 then
+  return 0
+end
+local evicted = redis.call("ZRANGE", KEYS[2], 0, excess - 1)
+redis.call("ZREMRANGEBYRANK", KEYS[2], 0, excess - 1)
+redis.call("DEL", unpack(evicted))
+return excess
+"""
+)
+
+
+@dataclass
+class ReadCacheStats:
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    errors: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return round(self.hits / lookups, 4) if lookups else 0.0
+
+
+_stats: dict[str, ReadCacheStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(namespace: str, field: str, amount: int = 1) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(namespace, ReadCacheStats())
+        setattr(stats, field, getattr(stats, field) + amount)
+
+
+def get_read_cache_stats() -> dict[str, dict[str, float]]:
+    """Return per-namespace hit/miss counters and hit rates for this process."""
+    with _stats_lock:
+        return {
+            namespace: {
+                "hits": stats.hits,
+                "misses": stats.misses,
+                "bypassed": stats.bypassed,
+                "errors": stats.errors,
+                "evictions": stats.evictions,
+                "hit_rate": stats.hit_rate,
+            }
+            for namespace, stats in _stats.items()
+        }
+
+
+def reset_read_cache_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def _index_key(owner_id: int) -> str:
+    return f"{KEY_PREFIX}:{owner_id}:index"
+
+
+def _entry_key(namespace: str, owner_id: int, version: int, args: tuple, kwargs: dict) -> str:
+    raw_args = json.dumps([list(args), kwargs], default=str, sort_keys=True)
+    digest = hashlib.sha1(raw_args.encode()).hexdigest()[:20]
+    return f"{KEY_PREFIX}:{owner_id}:{namespace}:v{version}:{digest}"
+
+
+def _lookup(owner_id: int, key: str) -> str | None:
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.get(key)
+    # Touch the LRU score; XX keeps the index from resurrecting evicted keys.
+    pipe.zadd(_index_key(owner_id), {key: time.time()}, xx=True)
+    raw, _touched = pipe.execute()
+    return raw
+
+
+def _store(owner_id: int, key: str, payload: bytes, ttl_seconds: int) -> int:
+    return int(
+        STORE_ENTRY_SCRIPT(
+            keys=[key, _index_key(owner_id)],
+            args=[
+                payload,
+                ttl_seconds,
+                time.time(),
+                settings.read_cache_max_entries_per_user,
+            ],
+        )
+        or 0
+    )
+
+
+def _can_use_cache(db: Session, owner_id: int) -> bool:
+    if not settings.read_cache_enabled:
+        return False
+    if db.new or db.dirty or db.deleted:
+        return False
+    return not is_ledger_version_bumped(db, owner_id)
+
+
+def cached_read(namespace: str, *, ttl_seconds: int | None = None) -> Callable[[F], F]:
+    """Cache a ``fn(db, owner_id, *args)`` read service behind the ledger version.
+
+    The return annotation drives (de)serialization, so it must be a type
+    pydantic can round-trip through JSON (a schema model, list of models, or
+    a plain scalar).
+    """
+
+    def decorator(fn: F) -> F:
+        adapter: TypeAdapter | None = None
+
+        def _adapter() -> TypeAdapter:
+            nonlocal adapter
+            if adapter is None:
+                adapter = TypeAdapter(get_type_hints(fn)["return"])
+            return adapter
+
+        @functools.wraps(fn)
+        def wrapper(db: Session, owner_id: int, *args, **kwargs):
+            if not _can_use_cache(db, owner_id):
+                _record(namespace, "bypassed")
+                return fn(db, owner_id, *args, **kwargs)
+
+            version = get_ledger_version(db, owner_id)
+            key = _entry_key(namespace, owner_id, version, args, kwargs)
+            try:
+                raw = _lookup(owner_id, key)
+            except Exception as exc:
+                _record(namespace, "errors")
+                logger.warning("Read cache lookup failed (%s): %s", namespace, exc)
+                return fn(db, owner_id, *args, **kwargs)
+
+            if raw is not None:
+                _record(namespace, "hits")
+                return _adapter().validate_json(raw)
+
+            _record(namespace, "misses")
+            result = fn(db, owner_id, *args, **kwargs)
+            try:
+                evicted = _store(
+                    owner_id,
+                    key,
+                    _adapter().dump_json(result),
+                    ttl_seconds or settings.read_cache_ttl_seconds,
+                )
+            except Exception as exc:
+                _record(namespace, "errors")
+                logger.warning("Read cache store failed (%s): %s", namespace, exc)
+            else:
+                if evicted:
+                    _record(namespace, "evictions", evicted)
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,250 @@
+"""Per-user push events over Redis pub/sub.
+
+Writes queue small events on their session and the events are published to
+``events:{owner_id}`` once the transaction commits; ``GET /events/stream``
+relays a user's channel to the client as Server-Sent Events, so clients can
+stop polling notification lists, unread counts and wallet balances.
+
+Event sources
+-------------
+- ``notification.created``: a mapper listener on ``Notification`` queues one
+  per inserted row, which covers ``create_notification``,
+  ``create_budget_notification`` and ``notify_pending_confirmation_once``.
+- ``notifications.unread_count``: the same listener queues the change in
+  the owner's unread count for every inserted, read/unread toggled or
+  deleted notification. Bulk ``Query.update()`` / ``Query.delete()`` paths
+  call ``queue_unread_delta`` or ``queue_unread_count`` themselves.
+- ``wallet.balance``: ``post_financial_event`` calls
+  ``queue_wallet_balances`` for the wallets its legs touch, which covers
+  voids as well.
+
+Unread counts are kept in Redis by ``notification_service``: deltas are
+applied after commit and owners without a counter are recounted in
+``before_commit``. Wallet balances are read once per transaction in
+``before_commit``, so events describe the committed state and the database
+only sees the write path. Events queued in a transaction that rolls back are
+discarded.
+
+Like the read cache, publishing fails open: Redis errors are logged and the
+write still commits.
+"""
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable
+
+# pyrefly: ignore [missing-import]
+import redis.asyncio
+# pyrefly: ignore [missing-import]
+from sqlalchemy import event
+# pyrefly: ignore [missing-import]
+from sqlalchemy.orm import Session, attributes, object_session
+
+from app import models
+from app.redis_rate_limiter import redis_client
+from app.services import notification_service
+from config import settings
+
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "events"
+
+_PENDING_KEY = "realtime_pending_events"
+
+
+@dataclass
+class _PendingEvents:
+    events: list[tuple[int, str, dict]] = field(default_factory=list)
+    # owner_id -> net change in unread notifications
+    unread_deltas: dict[int, int] = field(default_factory=lambda: defaultdict(int))
+    # owners whose unread count must be recounted from the database
+    unread_recounts: set[int] = field(default_factory=set)
+    # resolved in before_commit, applied to Redis after commit
+    unread_counts: dict[int, int] = field(default_factory=dict)
+    # owner_id -> wallet ids whose balance changed
+    wallets: dict[int, set[int]] = field(default_factory=lambda: defaultdict(set))
+
+
+def channel_name(owner_id: int) -> str:
+    return f"{CHANNEL_PREFIX}:{int(owner_id)}"
+
+
+def _pending(db: Session) -> _PendingEvents:
+    return db.info.setdefault(_PENDING_KEY, _PendingEvents())
+
+
+def queue_event(db: Session, owner_id: int, event_type: str, data: dict) -> None:
+    """Publish ``event_type`` to *owner_id* once the current transaction commits."""
+    _pending(db).events.append((int(owner_id), event_type, data))
+
+
+def queue_unread_delta(db: Session, owner_id: int, delta: int) -> None:
+    """Adjust *owner_id*'s unread counter by *delta* after commit and publish it."""
+    _pending(db).unread_deltas[int(owner_id)] += int(delta)
+
+
+def queue_unread_count(db: Session, owner_id: int) -> None:
+    """Recount *owner_id*'s unread notifications before commit and publish the count."""
+    _pending(db).unread_recounts.add(int(owner_id))
+
+
+def queue_wallet_balances(db: Session, owner_id: int, wallet_ids) -> None:
+    """Publish the committed balance of each wallet in *wallet_ids* after commit."""
+    _pending(db).wallets[int(owner_id)].update(int(wallet_id) for wallet_id in wallet_ids)
+
+
+@event.listens_for(models.Notification, "after_insert")
+def _notification_inserted(mapper, connection, target) -> None:
+    db = object_session(target)
+    if db is None:
+        return
+    queue_event(
+        db,
+        target.owner_id,
+        "notification.created",
+        {
+            "id": int(target.id),
+            "type": target.type,
+            "title": target.title,
+            "message": target.message,
+            "priority": target.priority,
+        },
+    )
+    queue_unread_delta(db, target.owner_id, 0 if target.is_read else 1)
+
+
+@event.listens_for(models.Notification, "after_update")
+def _notification_updated(mapper, connection, target) -> None:
+    db = object_session(target)
+    history = attributes.get_history(target, "is_read")
+    if db is None or not history.deleted:
+        return
+    was_unread = not history.deleted[0]
+    queue_unread_delta(db, target.owner_id, int(not target.is_read) - int(was_unread))
+
+
+@event.listens_for(models.Notification, "after_delete")
+def _notification_deleted(mapper, connection, target) -> None:
+    db = object_session(target)
+    if db is not None and not target.is_read:
+        queue_unread_delta(db, target.owner_id, -1)
+
+
+@event.listens_for(Session, "before_commit")
+def _resolve_pending(db: Session) -> None:
+    pending = db.info.get(_PENDING_KEY)
+    if pending is None or not (pending.unread_deltas or pending.unread_recounts or pending.wallets):
+        return
+    db.flush()
+    if pending.unread_deltas or pending.unread_recounts:
+        # Owners without a live counter get an absolute count, which already
+        # includes this transaction's flushed changes.
+        counted = notification_service.existing_unread_counters(
+            set(pending.unread_deltas) - pending.unread_recounts
+        )
+        recount = (set(pending.unread_deltas) | pending.unread_recounts) - counted
+        pending.unread_counts.update(notification_service.count_unread_in_db(db, recount))
+        for owner_id in recount:
+            pending.unread_deltas.pop(owner_id, None)
+        pending.unread_recounts.clear()
+    if pending.wallets:
+        wallet_ids = set().union(*pending.wallets.values())
+        rows = (
+            db.query(models.Wallet.id, models.Wallet.owner_id, models.Wallet.current_balance)
+            .filter(models.Wallet.id.in_(wallet_ids))
+            .order_by(models.Wallet.id)
+            .all()
+        )
+        pending.events.extend(
+            (int(owner_id), "wallet.balance", {"wallet_id": int(wallet_id), "current_balance": int(balance or 0)})
+            for wallet_id, owner_id, balance in rows
+            if int(wallet_id) in pending.wallets.get(int(owner_id), ())
+        )
+        pending.wallets.clear()
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(db: Session) -> None:
+    pending = db.info.pop(_PENDING_KEY, None)
+    if pending is None:
+        return
+    deltas = {owner_id: delta for owner_id, delta in pending.unread_deltas.items() if delta}
+    if deltas or pending.unread_counts:
+        counts = notification_service.apply_unread_changes(deltas=deltas, counts=pending.unread_counts)
+        pending.events.extend(
+            (owner_id, "notifications.unread_count", {"unread_count": count})
+            for owner_id, count in sorted(counts.items())
+        )
+    if pending.events:
+        publish_events(pending.events)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(db: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        db.info.pop(_PENDING_KEY, None)
+
+
+def publish_events(events: list[tuple[int, str, dict]]) -> None:
+    """Publish ``(owner_id, event_type, data)`` triples in one pipeline."""
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for owner_id, event_type, data in events:
+            pipe.publish(
+                channel_name(owner_id),
+                json.dumps({"type": event_type, "data": data}, separators=(",", ":")),
+            )
+        pipe.execute()
+    except Exception as exc:
+        logger.warning("Realtime publish failed: %s", exc)
+
+
+def format_sse(event_type: str, data: dict) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def stream_events(
+    owner_id: int,
+    *,
+    is_disconnected: Callable[[], Awaitable[bool]],
+    heartbeat_seconds: float | None = None,
+    max_stream_seconds: float | None = None,
+) -> AsyncIterator[str]:
+    """Yield SSE frames for *owner_id*'s channel until the client leaves.
+
+    A comment frame is sent after ``heartbeat_seconds`` of silence so proxies
+    keep the connection open. The stream ends after ``max_stream_seconds`` so
+    clients reconnect with a current access token.
+    """
+    heartbeat = float(heartbeat_seconds or settings.sse_heartbeat_seconds)
+    lifetime = float(max_stream_seconds or settings.sse_max_stream_seconds)
+    client = redis.asyncio.Redis.from_url(settings.redis_url, decode_responses=True)
+    pubsub = client.pubsub(ignore_subscribe_messages=True)
+    try:
+        await pubsub.subscribe(channel_name(owner_id))
+        yield f"retry: {settings.sse_retry_milliseconds}\n\n"
+        loop_time = asyncio.get_running_loop().time
+        deadline = loop_time() + lifetime
+        while not await is_disconnected():
+            remaining = deadline - loop_time()
+            if remaining <= 0:
+                break
+            message = await pubsub.get_message(timeout=min(heartbeat, remaining))
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+            try:
+                payload = json.loads(message["data"])
+                yield format_sse(payload["type"], payload.get("data", {}))
+            except (TypeError, ValueError, KeyError):
+                logger.warning("Dropping malformed realtime message on %s", message.get("channel"))
+    finally:
+        try:
+            await pubsub.aclose()
+            await client.aclose()
+        except Exception as exc:
+            logger.warning("Realtime stream cleanup failed: %s", exc)
@@ -1,5 +1,6 @@
 import time
 from dataclasses import dataclass
+from typing import Sequence
 
 # pyrefly: ignore [missing-import]
 import redis
@@ -18,6 +19,15 @@ class RateLimitResult:
     reset_seconds: int
 
 
+@dataclass(frozen=True)
+class TokenBucketCheck:
+    scope: str
+    identifier: str
+    capacity: int
+    refill_rate_per_second: float
+    consume_tokens: int = 1
+
+
 redis_client = redis.Redis.from_url(
     settings.redis_url, 
     decode_responses=True,
@@ -133,6 +143,26 @@ def check_and_consume(scope: str, identifier: str, window_seconds: int = 60, max
         )
 
 
+def _token_bucket_key(scope: str, identifier: str) -> str:
+    safe_id = identifier.strip().lower()
+    return f"tb:{scope}:{safe_id}"
+
+
+def _token_bucket_ttl(capacity: int, refill_rate_per_second: float) -> int:
+    return max(1, int((capacity / refill_rate_per_second) * 2))
+
+
+def _token_bucket_result(capacity: int, raw) -> RateLimitResult:
+    allowed_raw, tokens_raw, retry_after_raw = raw
+    retry_after = int(retry_after_raw)
+    return RateLimitResult(
+        allowed=int(allowed_raw) == 1,
+        limit=capacity,
+        remaining=max(0, int(float(tokens_raw))),
+        reset_seconds=max(1, retry_after if retry_after > 0 else 1),
+    )
+
+
 def consume_token_bucket(
     scope: str,
     identifier: str,
@@ -142,25 +172,15 @@ def consume_token_bucket(
 ) -> RateLimitResult:
     try:
         # Single Redis hash key; no window suffix for token bucket.
-        safe_id = identifier.strip().lower()
-        key = f"tb:{scope}:{safe_id}"
+        key = _token_bucket_key(scope, identifier)
         now_ts = int(time.time())
-        ttl_seconds = max(1, int((capacity / refill_rate_per_second) * 2))
+        ttl_seconds = _token_bucket_ttl(capacity, refill_rate_per_second)
 
-        allowed_raw, tokens_raw, retry_after_raw = TOKEN_BUCKET_SCRIPT(
+        raw = TOKEN_BUCKET_SCRIPT(
             keys=[key],
             args=[now_ts, capacity, refill_rate_per_second, consume_tokens, ttl_seconds],
         )
-        allowed = int(allowed_raw) == 1
-        tokens_left = int(float(tokens_raw))
-        retry_after = int(retry_after_raw)
-
-        return RateLimitResult(
-            allowed=allowed,
-            limit=capacity,
-            remaining=max(0, tokens_left),
-            reset_seconds=max(1, retry_after if retry_after > 0 else 1),
-        )
+        return _token_bucket_result(capacity, raw)
     except Exception as exc:
         # FAIL OPEN for same reasons as check_and_consume
         import logging
@@ -171,3 +191,46 @@ def consume_token_bucket(
             remaining=capacity,
             reset_seconds=1,
         )
+
+
+def consume_token_buckets(checks: Sequence[TokenBucketCheck]) -> list[RateLimitResult]:
+    """Evaluate several token buckets (e.g. IP + user) in one pipelined round trip.
+
+    Every bucket is charged, even when an earlier one denies, so the result
+    matches calling `consume_token_bucket` once per check.
+    """
+    if not checks:
+        return []
+    try:
+        now_ts = int(time.time())
+        pipe = redis_client.pipeline(transaction=False)
+        for check in checks:
+            TOKEN_BUCKET_SCRIPT(
+                keys=[_token_bucket_key(check.scope, check.identifier)],
+                args=[
+                    now_ts,
+                    check.capacity,
+                    check.refill_rate_per_second,
+                    check.consume_tokens,
+                    _token_bucket_ttl(check.capacity, check.refill_rate_per_second),
+                ],
+                client=pipe,
+            )
+        raw_results = pipe.execute()
+        return [
+            _token_bucket_result(check.capacity, raw)
+            for check, raw in zip(checks, raw_results)
+        ]
+    except Exception as exc:
+        # FAIL OPEN for same reasons as check_and_consume
+        import logging
+        logging.getLogger(__name__).warning("Redis rate limiter failed (consume_token_buckets): %s", exc)
+        return [
+            RateLimitResult(
+                allowed=True,
+                limit=check.capacity,
+                remaining=check.capacity,
+                reset_seconds=1,
+            )
+            for check in checks
+        ]
@@ -6,9 +6,11 @@ from sqlalchemy import and_, case, func
 from sqlalchemy.orm import Session
 
 from app import models, oauth2, schemas
+from app.read_cache import cached_read
 from app.savings_balances import get_net_position, get_total_balance
 from app.services.budget_service import get_budget_spent_amount
 from app.services.obligation_source_service import exclude_legacy_payment_plan_debt_duplicate_filter
+from app.etag import etag_precondition
 from app.session import get_db
 from app.timezone import get_effective_user_timezone, today_in_tz
 
@@ -83,13 +85,8 @@ def _income_total_for_range(
     return int(total)
 
 
-@router.get("/this-month-stats", response_model=schemas.ExpenseStats)
-def get_this_month_stats(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user),
-    user_tz: tzinfo = Depends(get_effective_user_timezone),
-):
-    today = today_in_tz(user_tz)
+@cached_read("analytics_this_month_stats")
+def _build_this_month_stats(db: Session, user_id: int, today: date) -> schemas.ExpenseStats:
     current_month_start = today.replace(day=1)
     next_month_start = date(today.year + 1, 1, 1) if today.month == 12 else date(today.year, today.month + 1, 1)
     signed_amount = _expense_signed_amount()
@@ -105,7 +102,7 @@ def get_this_month_stats(
         .join(models.FinancialEvent, models.FinancialEvent.id == models.EntityLedger.event_id)
         .outerjoin(models.Project, models.Project.id == models.EntityLedger.project_id)
         .filter(
-            models.FinancialEvent.owner_id == current_user.id,
+            models.FinancialEvent.owner_id == user_id,
             models.FinancialEvent.status == models.FinancialEventStatus.POSTED,
             models.FinancialEvent.event_type.in_([
                 models.TransactionType.EXPENSE,
@@ -130,7 +127,7 @@ def get_this_month_stats(
         .outerjoin(models.FinancialEvent, models.FinancialEvent.id == models.EntityLedger.event_id)
         .outerjoin(models.Project, models.Project.id == models.EntityLedger.project_id)
         .filter(
-            models.Budget.owner_id == current_user.id,
+            models.Budget.owner_id == user_id,
             models.Budget.budget_year == today.year,
             models.Budget.budget_month == today.month,
         )
@@ -144,7 +141,7 @@ def get_this_month_stats(
         limit_value = int(monthly_limit or 0)
         total_value = get_budget_spent_amount(
             db,
-            current_user.id,
+            user_id,
             category=category,
             start_date=current_month_start,
             end_date=next_month_start,
@@ -173,22 +170,26 @@ def get_this_month_stats(
             }
         )
 
-    return {
-        "total_expenses": int(stats.total or 0),
-        "average_expenses": float(stats.average or 0),
-        "max_expenses": int(stats.max or 0),
-        "min_expenses": int(stats.min or 0),
-        "category_breakdown": enhanced_breakdown,
-    }
+    return schemas.ExpenseStats(
+        total_expenses=int(stats.total or 0),
+        average_expenses=float(stats.average or 0),
+        max_expenses=int(stats.max or 0),
+        min_expenses=int(stats.min or 0),
+        category_breakdown=enhanced_breakdown,
+    )
 
 
-@router.get("/dashboard-summary", response_model=schemas.DashboardSummary)
-def get_dashboard_summary(
+@router.get("/this-month-stats", response_model=schemas.ExpenseStats, dependencies=[Depends(etag_precondition)])
+def get_this_month_stats(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    today = today_in_tz(user_tz)
+    return _build_this_month_stats(db, current_user.id, today_in_tz(user_tz))
+
+
+@cached_read("analytics_dashboard_summary")
+def _build_dashboard_summary(db: Session, user_id: int, today: date) -> schemas.DashboardSummary:
     current_month_start = today.replace(day=1)
     signed_amount = _expense_signed_amount()
 
@@ -198,7 +199,7 @@ def get_dashboard_summary(
         .join(models.FinancialEvent, models.FinancialEvent.id == models.EntityLedger.event_id)
         .outerjoin(models.Project, models.Project.id == models.EntityLedger.project_id)
         .filter(
-            models.FinancialEvent.owner_id == current_user.id,
+            models.FinancialEvent.owner_id == user_id,
             models.FinancialEvent.status == models.FinancialEventStatus.POSTED,
             models.FinancialEvent.event_type.in_([
                 models.TransactionType.EXPENSE,
@@ -213,29 +214,35 @@ def get_dashboard_summary(
         or 0
     )
 
-    income = _income_total_for_range(db, current_user.id, current_month_start, today)
+    income = _income_total_for_range(db, user_id, current_month_start, today)
     spent_int = int(spent)
     remaining = income - spent_int
-    overall_balance = get_total_balance(db, current_user.id)
-    net_position = get_net_position(db, current_user.id)
+    overall_balance = get_total_balance(db, user_id)
+    net_position = get_net_position(db, user_id)
     elapsed_days = max(today.day, 1)
     daily_average = round(spent_int / elapsed_days) if elapsed_days else 0
 
-    return {
-        "income": income,
-        "spent": spent_int,
-        "remaining": int(remaining),
-        "daily_average": int(daily_average),
-        "overall_balance": int(overall_balance),
-        "net_position": int(net_position),
-    }
+    return schemas.DashboardSummary(
+        income=income,
+        spent=spent_int,
+        remaining=int(remaining),
+        daily_average=int(daily_average),
+        overall_balance=int(overall_balance),
+        net_position=int(net_position),
+    )
 
 
-@router.get("/history", response_model=schemas.AnalyticsHistory)
-def get_historical_stats(
+@router.get("/dashboard-summary", response_model=schemas.DashboardSummary, dependencies=[Depends(etag_precondition)])
+def get_dashboard_summary(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
+    user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
+    return _build_dashboard_summary(db, current_user.id, today_in_tz(user_tz))
+
+
+@cached_read("analytics_history")
+def _build_history(db: Session, user_id: int) -> schemas.AnalyticsHistory:
     signed_amount = _expense_signed_amount()
     stats = (
         db.query(
@@ -248,7 +255,7 @@ def get_historical_stats(
         .join(models.FinancialEvent, models.FinancialEvent.id == models.EntityLedger.event_id)
         .outerjoin(models.Project, models.Project.id == models.EntityLedger.project_id)
         .filter(
-            models.FinancialEvent.owner_id == current_user.id,
+            models.FinancialEvent.owner_id == user_id,
             models.FinancialEvent.status == models.FinancialEventStatus.POSTED,
             models.FinancialEvent.event_type.in_([
                 models.TransactionType.EXPENSE,
@@ -260,12 +267,20 @@ def get_historical_stats(
         .first()
     )
 
-    return {
-        "total_spent_lifetime": int(stats.total_spent or 0),
-        "average_transaction": float(round(stats.average_transaction or 0, 2)),
-        "total_transaction": int(stats.total_transactions or 0),
-        "member_since": stats.first_expense_date,
-    }
+    return schemas.AnalyticsHistory(
+        total_spent_lifetime=int(stats.total_spent or 0),
+        average_transaction=float(round(stats.average_transaction or 0, 2)),
+        total_transaction=int(stats.total_transactions or 0),
+        member_since=stats.first_expense_date,
+    )
+
+
+@router.get("/history", response_model=schemas.AnalyticsHistory, dependencies=[Depends(etag_precondition)])
+def get_historical_stats(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(oauth2.get_current_user),
+):
+    return _build_history(db, current_user.id)
 
 
 def _resolve_trend_range(
@@ -299,12 +314,13 @@ def _resolve_trend_range(
     return today - timedelta(days=days - 1), today
 
 
+@cached_read("analytics_daily_amounts")
 def _daily_amounts(
     db: Session,
     user_id: int,
     start_date: date,
     end_date: date,
-) -> list[dict]:
+) -> list[schemas.DailyTrendItem]:
     signed_amount = _expense_signed_amount()
     results = (
         db.query(
@@ -333,15 +349,15 @@ def _daily_amounts(
 
     spending_dict = {row.date: int(row.total or 0) for row in results}
     return [
-        {
-            "date": start_date + timedelta(days=i),
-            "amount": spending_dict.get(start_date + timedelta(days=i), 0),
-        }
+        schemas.DailyTrendItem(
+            date=start_date + timedelta(days=i),
+            amount=spending_dict.get(start_date + timedelta(days=i), 0),
+        )
         for i in range((end_date - start_date).days + 1)
     ]
 
 
-@router.get("/daily-trend", response_model=List[schemas.DailyTrendItem])
+@router.get("/daily-trend", response_model=List[schemas.DailyTrendItem], dependencies=[Depends(etag_precondition)])
 def get_daily_trend(
     days: int = 30,
     start_date: date | None = None,
@@ -360,7 +376,7 @@ def get_daily_trend(
     return _daily_amounts(db, current_user.id, start_date, end_date)
 
 
-@router.get("/month-to-date-trend", response_model=List[schemas.DailyTrendItem])
+@router.get("/month-to-date-trend", response_model=List[schemas.DailyTrendItem], dependencies=[Depends(etag_precondition)])
 def get_month_to_date_trend(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
@@ -371,7 +387,7 @@ def get_month_to_date_trend(
     return _daily_amounts(db, current_user.id, start_date, today)
 
 
-@router.get("/category-breakdown", response_model=List[schemas.CategoryBreakdownItem])
+@router.get("/category-breakdown", response_model=List[schemas.CategoryBreakdownItem], dependencies=[Depends(etag_precondition)])
 def get_category_breakdown(
     days: int = 30,
     start_date: date | None = None,
@@ -403,6 +419,16 @@ def get_category_breakdown(
         start_date = today - timedelta(days=days - 1)
         end_date = today
 
+    return _category_totals(db, current_user.id, start_date, end_date)
+
+
+@cached_read("analytics_category_totals")
+def _category_totals(
+    db: Session,
+    user_id: int,
+    start_date: date,
+    end_date: date,
+) -> list[schemas.CategoryBreakdownItem]:
     signed_amount = _expense_signed_amount()
     results = (
         db.query(
@@ -414,7 +440,7 @@ def get_category_breakdown(
         .join(models.FinancialEvent, models.FinancialEvent.id == models.EntityLedger.event_id)
         .outerjoin(models.Project, models.Project.id == models.EntityLedger.project_id)
         .filter(
-            models.FinancialEvent.owner_id == current_user.id,
+            models.FinancialEvent.owner_id == user_id,
             models.FinancialEvent.status == models.FinancialEventStatus.POSTED,
             models.FinancialEvent.event_type.in_([
                 models.TransactionType.EXPENSE,
@@ -431,10 +457,10 @@ def get_category_breakdown(
     )
 
     return [
-        {
-            "category": row.category.value if hasattr(row.category, "value") else row.category,
-            "total": int(row.total or 0),
-            "count": int(row.count or 0),
-        }
+        schemas.CategoryBreakdownItem(
+            category=row.category.value if hasattr(row.category, "value") else row.category,
+            total=int(row.total or 0),
+            count=int(row.count or 0),
+        )
         for row in results
     ]
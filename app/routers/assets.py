@@ -9,6 +9,7 @@ from app.timezone import get_effective_user_timezone, today_in_tz
 
 from .. import models, oauth2, schemas
 from ..services.wallet_service import WalletService
+from ..etag import etag_precondition
 from ..session import get_db
 from .wallets import _get_owned_wallet_or_404
 
@@ -218,7 +219,7 @@ def create_asset(
     return schemas.AssetOut.model_validate(asset)
 
 
-@router.get("", response_model=schemas.PaginatedAssetsOut)
+@router.get("", response_model=schemas.PaginatedAssetsOut, dependencies=[Depends(etag_precondition)])
 def list_assets(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
@@ -11,7 +11,8 @@ from sqlalchemy.orm import Session
 from app import models, schemas, utils
 from app import oauth2
 from app.audit import log_security_event, SecurityAction, SecurityStatus
-from app.email_service import send_password_changed_email, send_password_reset_email, send_verification_email
+from app.email_outbox import email_delivery_configured, enqueue_email
+from app.email_service import password_changed_email, password_reset_email, verification_email
 from app.email_verification import (
     build_verify_email_link,
     hash_email_verification_token,
@@ -125,11 +126,11 @@ def forgot_password(
                 expires_at=now + timedelta(minutes=RESET_TOKEN_TTL_MINUTES),
             )
         )
+        reset_link = _build_reset_link(raw_token)
+        enqueue_email(db, password_reset_email(email, reset_link, idempotency_key=raw_token))
         db.commit()
 
-        reset_link = _build_reset_link(raw_token)
-        sent = send_password_reset_email(email, reset_link, idempotency_key=raw_token)
-        if not sent and not settings.is_production:
+        if not email_delivery_configured() and not settings.is_production:
             logger.info("Password reset link fallback for %s: %s",
                         email, reset_link)
 
@@ -174,16 +175,17 @@ def resend_verification(
 
     user = db.query(models.User).filter(models.User.email == email).first()
     if user and not user.is_verified:
-        raw_token = issue_email_verification_token(db, user)
+        raw_token = issue_email_verification_token(db, user, commit=False)
         verify_link = build_verify_email_link(raw_token)
-        sent = send_verification_email(user.email, verify_link, idempotency_key=raw_token)
-        if sent:
-            logger.info("Resend verification email accepted for %s", user.email)
+        enqueue_email(db, verification_email(user.email, verify_link, idempotency_key=raw_token))
+        db.commit()
+        if email_delivery_configured():
+            logger.info("Resend verification email queued for %s", user.email)
         elif not settings.is_production:
             logger.info("Email verification link fallback for %s: %s",
                         user.email, verify_link)
         else:
-            logger.warning("Resend verification send failed for %s", user.email)
+            logger.warning("Resend verification not sent: no email transport for %s", user.email)
     elif not user:
         logger.info("Resend verification skipped: no user for %s", email)
     else:
@@ -414,18 +416,20 @@ def reset_password(
         synchronize_session=False,
     )
 
+    # Notify about the password change
+    enqueue_email(
+        db,
+        password_changed_email(
+            to_email=user.email,
+            idempotency_key=f"reset-notif-{user.id}-{now.timestamp()}",
+        ),
+    )
     db.commit()
 
     # After password reset, revoke ALL refresh tokens for this user.
     # This forces them to log in again on every device — critical for security.
     # Imagine: attacker has your session, you reset your password → their session dies.
     oauth2.revoke_all_user_tokens(user.id)
-    
-    # Send an email notification about the password change
-    send_password_changed_email(
-        to_email=user.email,
-        idempotency_key=f"reset-notif-{user.id}-{now.timestamp()}"
-    )
 
     log_security_event(db, action=SecurityAction.PASSWORD_RESET, status=SecurityStatus.SUCCESS,
                        request=request, user_id=user.id)
@@ -675,18 +679,6 @@ def change_password(
                 detail="auth.idempotency_conflict_in_progress"
             )
 
-    client_ip = request.client.host if request.client else "unknown"
-    ip_rl = check_and_consume("change_pw_ip", client_ip, window_seconds=3600, max_attempts=10)
-    user_rl = check_and_consume("change_pw_user", str(current_user.id), window_seconds=3600, max_attempts=5)
-
-    if not ip_rl.allowed or not user_rl.allowed:
-        retry_after = max(ip_rl.reset_seconds, user_rl.reset_seconds)
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="auth.change_password_rate_limited",
-            headers={"Retry-After": str(retry_after)},
-        )
-
     has_local = any(identity.provider == "local" for identity in current_user.identities)
     if not has_local:
         raise HTTPException(status_code=400, detail="auth.google_only_cannot_change_password")
@@ -698,6 +690,7 @@ def change_password(
         raise HTTPException(status_code=403, detail="auth.incorrect_current_password")
 
     current_user.hashed_password = utils.hash_password(payload.new_password)
+    enqueue_email(db, password_changed_email(current_user.email))
     db.commit()
 
     oauth2.revoke_all_user_tokens(current_user.id)
@@ -706,11 +699,6 @@ def change_password(
     refresh_token = oauth2.create_refresh_token(user_id=current_user.id)
     oauth2.set_refresh_cookie(response, refresh_token)
 
-    try:
-        send_password_changed_email(current_user.email)
-    except Exception as e:
-        logger.error("Failed to send password changed email to %s: %s", current_user.email, e)
-
     log_security_event(db, action=SecurityAction.PASSWORD_CHANGED, status=SecurityStatus.SUCCESS,
                        request=request, user_id=current_user.id)
 
@@ -733,18 +721,6 @@ def mobile_change_password(
                 detail="auth.idempotency_conflict_in_progress"
             )
 
-    client_ip = request.client.host if request.client else "unknown"
-    ip_rl = check_and_consume("change_pw_ip", client_ip, window_seconds=3600, max_attempts=10)
-    user_rl = check_and_consume("change_pw_user", str(current_user.id), window_seconds=3600, max_attempts=5)
-
-    if not ip_rl.allowed or not user_rl.allowed:
-        retry_after = max(ip_rl.reset_seconds, user_rl.reset_seconds)
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="auth.change_password_rate_limited",
-            headers={"Retry-After": str(retry_after)},
-        )
-
     has_local = any(identity.provider == "local" for identity in current_user.identities)
     if not has_local:
         raise HTTPException(status_code=400, detail="auth.google_only_cannot_change_password")
@@ -756,6 +732,7 @@ def mobile_change_password(
         raise HTTPException(status_code=403, detail="auth.incorrect_current_password")
 
     current_user.hashed_password = utils.hash_password(payload.new_password)
+    enqueue_email(db, password_changed_email(current_user.email))
     db.commit()
 
     oauth2.revoke_all_user_tokens(current_user.id)
@@ -763,11 +740,6 @@ def mobile_change_password(
     access_token = oauth2.create_access_token(data={"user_id": current_user.id})
     refresh_token = oauth2.create_refresh_token(user_id=current_user.id)
 
-    try:
-        send_password_changed_email(current_user.email)
-    except Exception as e:
-        logger.error("Failed to send password changed email to %s: %s", current_user.email, e)
-
     log_security_event(db, action=SecurityAction.PASSWORD_CHANGED, status=SecurityStatus.SUCCESS,
                        request=request, user_id=current_user.id, metadata={"client": "mobile"})
 
@@ -801,19 +773,6 @@ def verify_password(
                 detail="auth.idempotency_conflict_in_progress",
             )
 
-    # Rate limiting
-    client_ip = request.client.host if request.client else "unknown"
-    ip_rl = check_and_consume("verify_pw_ip", client_ip, window_seconds=3600, max_attempts=10)
-    user_rl = check_and_consume("verify_pw_user", str(current_user.id), window_seconds=3600, max_attempts=5)
-
-    if not ip_rl.allowed or not user_rl.allowed:
-        retry_after = max(ip_rl.reset_seconds, user_rl.reset_seconds)
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="auth.rate_limited",
-            headers={"Retry-After": str(retry_after)},
-        )
-
     # Verify the password
     if not current_user.hashed_password:
         raise HTTPException(
@@ -1,13 +1,14 @@
 from datetime import date, tzinfo
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 # pyrefly: ignore [missing-import]
 from sqlalchemy.orm import Session
 # pyrefly: ignore [missing-import]
 from sqlalchemy.orm import selectinload
 
 from .. import models, oauth2, schemas
+from ..etag import etag_precondition
 from ..session import get_db
 from ..services.budget_service import (
     apply_budget_month_setup,
@@ -32,7 +33,6 @@ from ..services.borrowing_survival_service import (
     upsert_plan as upsert_borrowing_survival_plan,
 )
 from ..services.category_policy import validate_active_expense_category
-from app.redis_rate_limiter import consume_token_bucket
 from app.timezone import get_effective_user_timezone, today_in_tz
 
 
@@ -41,9 +41,6 @@ router = APIRouter(
     tags=["Budgets"],
 )
 
-BUDGET_WRITE_BUCKET_CAPACITY = 10
-BUDGET_WRITE_REFILL_RATE = 10 / 60
-
 
 def _get_budget_or_404(
     db: Session,
@@ -214,28 +211,6 @@ def _validate_expected_income_month(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="expected_income.month_mismatch")
 
 
-def enforce_budget_write_rate_limit(user_id: int) -> dict[str, str]:
-    rl = consume_token_bucket(
-        scope="budgets_write",
-        identifier=str(user_id),
-        capacity=BUDGET_WRITE_BUCKET_CAPACITY,
-        refill_rate_per_second=BUDGET_WRITE_REFILL_RATE,
-    )
-    headers = {
-        "X-RateLimit-Limit": str(rl.limit),
-        "X-RateLimit-Remaining": str(rl.remaining),
-        "X-RateLimit-Reset": str(rl.reset_seconds),
-    }
-    if not rl.allowed:
-        headers["Retry-After"] = str(rl.reset_seconds)
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="budgets.write_rate_limited",
-            headers=headers,
-        )
-    return headers
-
-
 def validate_budget_month_window(
     budget_year: int,
     budget_month: int,
@@ -256,20 +231,13 @@ def validate_budget_month_window(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="budgets.month_too_far_in_future")
 
 
-def _apply_headers(response: Response, headers: dict[str, str]) -> None:
-    for key, value in headers.items():
-        response.headers[key] = value
-
-
 @router.post("/", response_model=schemas.BudgetOut, status_code=status.HTTP_201_CREATED)
 def create_budget(
     budget: schemas.BudgetCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_budget_write_rate_limit(current_user.id))
     validate_budget_month_window(budget.budget_year, budget.budget_month, user_tz)
     validate_active_expense_category(
         budget.category,
@@ -301,7 +269,7 @@ def create_budget(
     return next(build_budget_out(item) for item in computed if item.budget.id == new_budget.id)
 
 
-@router.get("/", response_model=List[schemas.BudgetOut])
+@router.get("/", response_model=List[schemas.BudgetOut], dependencies=[Depends(etag_precondition)])
 def get_budgets(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
@@ -362,11 +330,9 @@ def update_budget(
     budget_month: int,
     category: schemas.ExpenseCategory,
     budget_update: schemas.BudgetUpdate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    _apply_headers(response, enforce_budget_write_rate_limit(current_user.id))
     budget = _get_budget_or_404(db, current_user.id, budget_year, budget_month, category)
     previous_effective_total = sum(
         int(item.effective_monthly_limit or 0)
@@ -395,11 +361,9 @@ def delete_budget(
     budget_year: int,
     budget_month: int,
     category: schemas.ExpenseCategory,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    _apply_headers(response, enforce_budget_write_rate_limit(current_user.id))
     budget = _get_budget_or_404(db, current_user.id, budget_year, budget_month, category)
 
     start, end = date(budget_year, budget_month, 1), date(budget_year + 1, 1, 1) if budget_month == 12 else date(budget_year, budget_month + 1, 1)
@@ -432,6 +396,7 @@ def delete_budget(
 def get_project_budgets(
     budget_year: int | None = None,
     budget_month: int | None = None,
+    include_history: bool = False,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
@@ -442,10 +407,11 @@ def get_project_budgets(
         budget_year,
         budget_month,
         default_budget_date=today_in_tz(user_tz),
+        include_history=include_history,
     )
 
 
-@router.get("/month-summary", response_model=schemas.BudgetMonthSummaryOut)
+@router.get("/month-summary", response_model=schemas.BudgetMonthSummaryOut, dependencies=[Depends(etag_precondition)])
 def get_budget_month_summary(
     budget_year: int,
     budget_month: int,
@@ -460,13 +426,10 @@ def get_budget_month_summary(
 @router.put("/borrowing-survival", response_model=schemas.BorrowingSurvivalSummaryOut)
 def configure_borrowing_survival(
     payload: schemas.BorrowingSurvivalPlanUpsert,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    for key, value in enforce_budget_write_rate_limit(current_user.id).items():
-        response.headers[key] = value
     validate_budget_month_window(payload.budget_year, payload.budget_month, user_tz)
     upsert_borrowing_survival_plan(
         db,
@@ -515,12 +478,10 @@ def preview_budget_month_setup(
 @router.post("/month-setup/apply", response_model=schemas.BudgetMonthSetupPreviewOut)
 def apply_budget_month_setup_route(
     payload: schemas.BudgetMonthSetupRequest,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_budget_write_rate_limit(current_user.id))
     validate_budget_month_window(payload.budget_year, payload.budget_month, user_tz)
     result = apply_budget_month_setup(
         db,
@@ -561,12 +522,10 @@ def list_expected_incomes(
 @router.post("/expected-incomes", response_model=schemas.ExpectedIncomeOut, status_code=status.HTTP_201_CREATED)
 def create_expected_income(
     payload: schemas.ExpectedIncomeCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_budget_write_rate_limit(current_user.id))
     validate_budget_month_window(payload.budget_year, payload.budget_month, user_tz)
     _validate_expected_income_month(payload.due_date, payload.budget_year, payload.budget_month)
     _validate_expected_income_source_shape(payload.source_id, payload.debt_id)
@@ -603,12 +562,10 @@ def create_expected_income(
 def update_expected_income(
     expected_income_id: int,
     payload: schemas.ExpectedIncomeUpdate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_budget_write_rate_limit(current_user.id))
     expected_income = _get_expected_income_or_404(db, current_user.id, expected_income_id)
     update_data = payload.model_dump(exclude_unset=True)
     forbidden = update_data.keys() & {
@@ -656,12 +613,10 @@ def update_expected_income(
 def mark_expected_income_received(
     expected_income_id: int,
     payload: schemas.ExpectedIncomeMarkReceivedCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_budget_write_rate_limit(current_user.id))
     expected_income = _get_expected_income_or_404(db, current_user.id, expected_income_id)
     wallet_allocations = _resolve_expected_income_wallet_allocations(
         db,
@@ -700,11 +655,9 @@ def mark_expected_income_received(
 @router.delete("/expected-incomes/{expected_income_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_expected_income(
     expected_income_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    _apply_headers(response, enforce_budget_write_rate_limit(current_user.id))
     expected_income = _get_expected_income_or_404(db, current_user.id, expected_income_id)
 
     from app.services import expected_inflow_service
@@ -723,11 +676,9 @@ def delete_expected_income(
 @router.post("/reallocate", response_model=list[schemas.BudgetOut])
 def reallocate_budget(
     payload: schemas.BudgetReallocateRequest,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    _apply_headers(response, enforce_budget_write_rate_limit(current_user.id))
     if payload.from_category == payload.to_category:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="budgets.reallocate_same_category")
 
@@ -773,11 +724,9 @@ def reallocate_budget(
 @router.post("/recalculate", response_model=list[schemas.BudgetOut])
 def recalculate_budget_chain(
     payload: schemas.BudgetRecalculateRequest,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    _apply_headers(response, enforce_budget_write_rate_limit(current_user.id))
     recompute_budget_chain(db, current_user.id, payload.category)
     db.commit()
     budgets = _budgets_for_category(db, current_user.id, payload.category)
@@ -834,11 +783,9 @@ def _upsert_budget_subcategory_limit(
 def reallocate_budget_subcategory(
     budget_id: int,
     payload: schemas.BudgetSubcategoryReallocateRequest,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    _apply_headers(response, enforce_budget_write_rate_limit(current_user.id))
     budget = _get_budget_by_id_or_404(db, current_user.id, budget_id)
     validate_active_expense_category(
         budget.category,
@@ -922,11 +869,9 @@ def reallocate_budget_subcategory(
 def create_budget_subcategory(
     budget_id: int,
     payload: schemas.BudgetSubcategoryCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    _apply_headers(response, enforce_budget_write_rate_limit(current_user.id))
     budget = (
         db.query(models.Budget)
         .filter(models.Budget.id == budget_id, models.Budget.owner_id == current_user.id)
@@ -1005,12 +950,10 @@ def create_budget_subcategory(
 def update_budget_subcategory(
     subcategory_id: int,
     payload: schemas.BudgetSubcategoryUpdate,
-    response: Response,
     budget_id: int | None = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    _apply_headers(response, enforce_budget_write_rate_limit(current_user.id))
     subcategory = get_owned_subcategory_or_404(db, current_user.id, subcategory_id)
     if budget_id is not None:
         budget = _get_budget_by_id_or_404(db, current_user.id, budget_id)
@@ -1072,11 +1015,9 @@ def update_budget_subcategory(
 def delete_budget_subcategory(
     subcategory_id: int,
     budget_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    _apply_headers(response, enforce_budget_write_rate_limit(current_user.id))
     budget = _get_budget_by_id_or_404(db, current_user.id, budget_id)
     subcategory = get_owned_subcategory_or_404(db, current_user.id, subcategory_id)
     _require_subcategory_in_budget_category(subcategory, budget)
@@ -1107,3 +1048,28 @@ def get_timeline(
         budget_month=budget_month,
     )
 
+
+@router.get(
+    "/timeline/range",
+    response_model=schemas.TimelineEventPage,
+    dependencies=[Depends(etag_precondition)],
+)
+def get_timeline_range(
+    start_date: date,
+    end_date: date,
+    limit: int | None = Query(default=None, ge=1, le=500),
+    cursor: str | None = Query(default=None, max_length=64),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(oauth2.get_current_user),
+):
+    """Cash calendar across several months, keyset-paged by `next_cursor`."""
+    from app.services import timeline_service
+    return timeline_service.get_timeline_range(
+        db,
+        current_user.id,
+        start_date,
+        end_date,
+        limit=limit,
+        cursor=cursor,
+    )
+
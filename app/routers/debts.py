@@ -1,10 +1,9 @@
-from collections import defaultdict
 from datetime import date, datetime, timezone, tzinfo
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
 # pyrefly: ignore [missing-import]
-from sqlalchemy import func
+from sqlalchemy import and_, func, or_, select
 # pyrefly: ignore [missing-import]
 from sqlalchemy.orm import Session, joinedload
 
@@ -12,9 +11,9 @@ from app.timezone import get_effective_user_timezone, today_in_tz
 from app.utils import check_budget_alerts
 
 from .. import models, oauth2, schemas
-from ..redis_rate_limiter import consume_token_bucket
 from ..services.debt_service import (
     POSTED_DEBT_LEDGER_STATUS,
+    build_debt_summary,
     create_debt_ledger_entry,
     get_debt_total_charges,
     get_debt_total_charges_by_debt_ids,
@@ -28,6 +27,7 @@ from ..services.debt_payment_service import create_debt_payment as create_debt_p
 from ..services.debt_policy import (
     evaluate_debt_action,
     evaluate_debt_actions,
+    evaluate_debt_policies,
     evaluate_ledger_entry_reversal,
     is_pristine_debt,
 )
@@ -41,6 +41,9 @@ from ..services.financial_event_ledger_service import (
 )
 from ..services.session_draft_service import validate_session_item_links
 from ..services.wallet_service import WalletService
+from ..etag import etag_precondition
+from ..keyset import keyset_after, next_cursor
+from ..json_responses import schema_response
 from ..session import get_db
 from .wallets import _execute_wallet_transfer, _get_owned_wallet_or_404
 
@@ -49,8 +52,6 @@ router = APIRouter(
     tags=["Debts (Qarz)"],
 )
 
-DEBTS_WRITE_BUCKET_CAPACITY = 20
-DEBTS_WRITE_REFILL_RATE = 20 / 60
 CONSUMPTION_ORIGIN_KINDS = {
     models.DebtOriginKind.DEFERRED_EXPENSE,
     models.DebtOriginKind.FINANCED_ASSET_PURCHASE,
@@ -111,48 +112,48 @@ def _resolve_payment_allocation(
     return principal, charge
 
 
-def _matches_debt_lifecycle_filter(debt: models.Debt, lifecycle_status: schemas.DebtLifecycleStatus | None) -> bool:
-    if lifecycle_status is None:
-        return True
-    return _debt_lifecycle_status(debt) == lifecycle_status
+def _debt_lifecycle_clause(lifecycle_status: schemas.DebtLifecycleStatus):
+    """SQL form of ``_debt_lifecycle_status(debt) == lifecycle_status``."""
+    if lifecycle_status == schemas.DebtLifecycleStatus.CLOSED:
+        return models.Debt.remaining_amount <= 0
+    return models.Debt.remaining_amount > 0
 
 
-def _matches_debt_time_filter(
-    debt: models.Debt,
-    time_status: schemas.DebtTimeStatus | None,
-    *,
-    today: date,
-) -> bool:
-    if time_status is None:
-        return True
-    return _debt_time_status(debt, today=today) == time_status
+def _debt_time_clause(time_status: schemas.DebtTimeStatus, *, today: date):
+    """SQL form of ``_debt_time_status(debt) == time_status``; closed debts have no time status."""
+    if time_status == schemas.DebtTimeStatus.OVERDUE:
+        return and_(models.Debt.remaining_amount > 0, models.Debt.expected_return_date < today)
+    return and_(models.Debt.remaining_amount > 0, models.Debt.expected_return_date >= today)
 
 
-def enforce_debts_write_rate_limit(user_id: int) -> dict[str, str]:
-    rl = consume_token_bucket(
-        scope="debts_write",
-        identifier=str(user_id),
-        capacity=DEBTS_WRITE_BUCKET_CAPACITY,
-        refill_rate_per_second=DEBTS_WRITE_REFILL_RATE,
+def _debt_touches_archived_wallet(owner_id: int):
+    """EXISTS: the debt's initial wallet or any of its transaction wallets is archived."""
+    archived_wallet = and_(models.Wallet.owner_id == owner_id, models.Wallet.is_active.is_(False))
+    initial_wallet = (
+        select(models.Wallet.id)
+        .where(models.Wallet.id == models.Debt.initial_wallet_id, archived_wallet)
+        .exists()
     )
-    headers = {
-        "X-RateLimit-Limit": str(rl.limit),
-        "X-RateLimit-Remaining": str(rl.remaining),
-        "X-RateLimit-Reset": str(rl.reset_seconds),
-    }
-    if not rl.allowed:
-        headers["Retry-After"] = str(rl.reset_seconds)
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="debts.write_rate_limited",
-            headers=headers,
-        )
-    return headers
+    transaction_wallet = (
+        select(models.DebtTransaction.id)
+        .join(models.Wallet, models.Wallet.id == models.DebtTransaction.wallet_id)
+        .where(models.DebtTransaction.debt_id == models.Debt.id, archived_wallet)
+        .exists()
+    )
+    return or_(initial_wallet, transaction_wallet)
 
 
-def _apply_rate_limit_headers(response: Response, headers: dict[str, str]) -> None:
-    for key, value in headers.items():
-        response.headers[key] = value
+def _parse_wallet_obligation_cursor(cursor: str) -> int | None:
+    """Wallet id behind an obligation cursor (``-<wallet id>``), or None for a debt cursor."""
+    if not cursor.startswith("-"):
+        return None
+    try:
+        wallet_id = int(cursor[1:])
+    except ValueError:
+        wallet_id = 0
+    if wallet_id <= 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="debts.cursor_invalid")
+    return wallet_id
 
 
 def _get_owned_debt_or_404(db: Session, user_id: int, debt_id: int) -> models.Debt:
@@ -542,8 +543,50 @@ def _posted_principal_balance(db: Session, debt_id: int) -> int:
 
 
 def _debt_component_balances(db: Session, debt: models.Debt) -> tuple[int, int]:
-    charge_balance = _posted_charge_balance(db, debt.id)
-    principal_balance = _posted_principal_balance(db, debt.id)
+    return _reconcile_component_balances(
+        debt,
+        principal_balance=_posted_principal_balance(db, debt.id),
+        charge_balance=_posted_charge_balance(db, debt.id),
+    )
+
+
+def _debt_component_balances_by_debt_ids(db: Session, debts: list[models.Debt]) -> dict[int, tuple[int, int]]:
+    """``_debt_component_balances`` for many debts with one grouped query."""
+    if not debts:
+        return {}
+    sums = {
+        int(debt_id): (int(principal or 0), int(charge or 0))
+        for debt_id, principal, charge in (
+            db.query(
+                models.DebtLedgerEntry.debt_id,
+                func.sum(models.DebtLedgerEntry.principal_delta),
+                func.sum(models.DebtLedgerEntry.charge_delta),
+            )
+            .filter(
+                models.DebtLedgerEntry.debt_id.in_([debt.id for debt in debts]),
+                models.DebtLedgerEntry.status == POSTED_DEBT_LEDGER_STATUS,
+            )
+            .group_by(models.DebtLedgerEntry.debt_id)
+            .all()
+        )
+    }
+    balances: dict[int, tuple[int, int]] = {}
+    for debt in debts:
+        principal, charge = sums.get(int(debt.id), (0, 0))
+        balances[int(debt.id)] = _reconcile_component_balances(
+            debt,
+            principal_balance=max(0, principal),
+            charge_balance=max(0, charge),
+        )
+    return balances
+
+
+def _reconcile_component_balances(
+    debt: models.Debt,
+    *,
+    principal_balance: int,
+    charge_balance: int,
+) -> tuple[int, int]:
     remaining = int(debt.remaining_amount or 0)
     component_total = principal_balance + charge_balance
     if component_total != remaining:
@@ -658,9 +701,8 @@ def _activity_title(entry: models.DebtLedgerEntry) -> str:
 
 
 def _build_activity_item(
-    db: Session,
-    debt: models.Debt,
     entry: models.DebtLedgerEntry,
+    reversal_decision,
 ) -> schemas.DebtActivityItemOut:
     return schemas.DebtActivityItemOut(
         ledger_entry_id=entry.id,
@@ -676,7 +718,7 @@ def _build_activity_item(
         created_at=entry.created_at,
         source=entry.source,
         is_reversible=bool(entry.is_reversible),
-        reversal=_build_action_decision_out(evaluate_ledger_entry_reversal(db, debt, entry)),
+        reversal=_build_action_decision_out(reversal_decision),
         financial_event_id=entry.financial_event_id,
         source_debt_transaction_id=entry.source_debt_transaction_id,
         source_debt_charge_id=entry.source_debt_charge_id,
@@ -1291,49 +1333,21 @@ def _create_financial_event_reversal(
     return reversal
 
 
-@router.get("/summary", response_model=schemas.DebtSummaryOut)
+@router.get("/summary", response_model=schemas.DebtSummaryOut, dependencies=[Depends(etag_precondition)])
 def get_debt_summary(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    total_i_owe = (
-        db.query(func.coalesce(func.sum(models.Debt.remaining_amount), 0))
-        .filter(
-            models.Debt.owner_id == current_user.id,
-            models.Debt.debt_type == models.DebtType.OWING,
-            models.Debt.remaining_amount > 0,
-            models.Debt.archived_at.is_(None),
-        )
-        .scalar()
-    ) or 0
-
-    total_owed_to_me = (
-        db.query(func.coalesce(func.sum(models.Debt.remaining_amount), 0))
-        .filter(
-            models.Debt.owner_id == current_user.id,
-            models.Debt.debt_type == models.DebtType.OWED,
-            models.Debt.remaining_amount > 0,
-            models.Debt.archived_at.is_(None),
-        )
-        .scalar()
-    ) or 0
-
-    return schemas.DebtSummaryOut(
-        total_i_owe=int(total_i_owe),
-        total_owed_to_me=int(total_owed_to_me),
-    )
+    return build_debt_summary(db, current_user.id)
 
 
 @router.post("", response_model=schemas.DebtOut, status_code=status.HTTP_201_CREATED)
 def create_debt(
     payload: schemas.DebtCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_rate_limit_headers(response, enforce_debts_write_rate_limit(current_user.id))
-
     if (
         payload.debt_type == models.DebtType.OWING
         and not payload.is_money_transferred
@@ -1451,8 +1465,9 @@ def create_debt(
     return _build_debt_out_with_ledger_totals(db, debt, today=today_in_tz(user_tz))
 
 
-@router.get("", response_model=schemas.DebtListOut)
+@router.get("", response_model=schemas.DebtListOut, dependencies=[Depends(etag_precondition)])
 def list_debts(
+    response: Response,
     debt_type: Optional[models.DebtType] = None,
     lifecycle_status: Optional[schemas.DebtLifecycleStatus] = None,
     time_status: Optional[schemas.DebtTimeStatus] = None,
@@ -1461,10 +1476,14 @@ def list_debts(
     search: Optional[str] = None,
     limit: int = 50,
     skip: int = 0,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
+    limit = max(int(limit), 0)
+    skip = max(int(skip), 0)
+    today = today_in_tz(user_tz)
     query = db.query(models.Debt).filter(models.Debt.owner_id == current_user.id)
 
     if debt_type:
@@ -1475,52 +1494,77 @@ def list_debts(
         query = query.filter(models.Debt.archived_at.is_(None))
     if search:
         query = query.filter(models.Debt.counterparty_name.ilike(f"%{search}%"))
+    if lifecycle_status is not None:
+        query = query.filter(_debt_lifecycle_clause(lifecycle_status))
+    if time_status is not None:
+        query = query.filter(_debt_time_clause(time_status, today=today))
 
-    today = today_in_tz(user_tz)
-    formal_items = query.order_by(models.Debt.id.desc()).all()
-    formal_items = [
-        debt
-        for debt in formal_items
-        if _matches_debt_lifecycle_filter(debt, lifecycle_status)
-        and _matches_debt_time_filter(debt, time_status, today=today)
-    ]
-
-    user_wallets = {
-        wallet.id: wallet
-        for wallet in db.query(models.Wallet).filter(models.Wallet.owner_id == current_user.id).all()
-    }
-    debt_ids = [debt.id for debt in formal_items]
+    include_wallet_obligations = (
+        (debt_type is None or debt_type == models.DebtType.OWING)
+        and archived is not True
+        and not include_archived
+        and (lifecycle_status is None or lifecycle_status == schemas.DebtLifecycleStatus.OPEN)
+        and time_status is None
+    )
+    obligation_items: list[schemas.DebtOut] = []
+    if include_wallet_obligations:
+        for wallet in (
+            db.query(models.Wallet)
+            .filter(models.Wallet.owner_id == current_user.id, models.Wallet.current_balance < 0)
+            .order_by(models.Wallet.id.asc())
+            .all()
+        ):
+            if not _is_wallet_backed_obligation(wallet):
+                continue
+            if search and search.lower() not in wallet.name.lower():
+                continue
+            obligation_items.append(_build_wallet_obligation_out(wallet, today=today))
+
+    # One sequence: wallet-backed obligations by wallet id, then debts newest
+    # first. The cursor is the id of the last item served, so an obligation
+    # cursor is negative (-<wallet id>) and a debt cursor is a debt id.
+    debt_count = query.count()
+    total = debt_count + len(obligation_items)
+    if cursor is None:
+        remaining_obligations = obligation_items[skip:]
+        debt_offset = max(skip - len(obligation_items), 0)
+    else:
+        after_wallet_id = _parse_wallet_obligation_cursor(cursor)
+        if after_wallet_id is not None:
+            remaining_obligations = [item for item in obligation_items if item.wallet_id > after_wallet_id]
+        else:
+            remaining_obligations = []
+            query = query.filter(keyset_after(
+                db,
+                models.Debt,
+                owner_id=current_user.id,
+                cursor=cursor,
+                order_by=(),
+                invalid_detail="debts.cursor_invalid",
+            ))
+        debt_offset = 0
+    page_obligations = remaining_obligations[:limit]
+    debt_limit = limit - len(page_obligations)
+
+    rows = (
+        query.add_columns(_debt_touches_archived_wallet(current_user.id))
+        .order_by(models.Debt.id.desc())
+        .offset(debt_offset)
+        .limit(debt_limit + 1)
+        .all()
+    ) if debt_limit > 0 else []
+    has_more = len(rows) > debt_limit
+    rows = rows[:debt_limit]
+    debts = [debt for debt, _ in rows]
+    debt_ids = [debt.id for debt in debts]
 
     charges_by_debt = get_debt_total_charges_by_debt_ids(db, debt_ids)
     paid_by_debt = get_debt_total_paid_by_debt_ids(db, debt_ids)
+    balances_by_debt = _debt_component_balances_by_debt_ids(db, debts)
 
-    debt_transactions = []
-    if debt_ids:
-        debt_transactions = (
-            db.query(models.DebtTransaction)
-            .filter(models.DebtTransaction.debt_id.in_(debt_ids))
-            .all()
-        )
-    txns_by_debt: dict[int, list[models.DebtTransaction]] = defaultdict(list)
-    for transaction in debt_transactions:
-        txns_by_debt[transaction.debt_id].append(transaction)
-
-    result_items = []
-    for debt in formal_items:
-        has_archived = False
-        if debt.initial_wallet_id:
-            wallet = user_wallets.get(debt.initial_wallet_id)
-            if wallet and not wallet.is_active:
-                has_archived = True
-
-        if not has_archived:
-            for transaction in txns_by_debt.get(debt.id, []):
-                wallet = user_wallets.get(transaction.wallet_id)
-                if wallet and not wallet.is_active:
-                    has_archived = True
-                    break
-
-        principal_balance, charge_balance = _debt_component_balances(db, debt)
+    result_items = list(page_obligations)
+    for debt, has_archived in rows:
+        principal_balance, charge_balance = balances_by_debt[int(debt.id)]
         result_items.append(
             _build_debt_out(
                 debt,
@@ -1528,29 +1572,24 @@ def list_debts(
                 total_paid=paid_by_debt.get(debt.id, 0),
                 remaining_principal_amount=principal_balance,
                 remaining_charge_amount=charge_balance,
-                has_archived_transactions=has_archived,
+                has_archived_transactions=bool(has_archived),
                 today=today,
             )
         )
 
-    include_wallet_obligations = (
-        (debt_type is None or debt_type == models.DebtType.OWING)
-        and archived is not True
-        and not include_archived
-        and (lifecycle_status is None or lifecycle_status == schemas.DebtLifecycleStatus.OPEN)
-        and time_status is None
+    if debts:
+        page_cursor = next_cursor(debts, has_more)
+    elif page_obligations and debt_limit == 0 and (
+        len(remaining_obligations) > limit or debt_count > debt_offset
+    ):
+        # The page filled up with obligations; more obligations or debts follow.
+        page_cursor = str(page_obligations[-1].id)
+    else:
+        page_cursor = None
+    return schema_response(
+        schemas.DebtListOut(total=total, items=result_items, next_cursor=page_cursor),
+        response=response,
     )
-    if include_wallet_obligations:
-        for wallet in user_wallets.values():
-            if not _is_wallet_backed_obligation(wallet):
-                continue
-            if search and search.lower() not in wallet.name.lower():
-                continue
-            result_items.append(_build_wallet_obligation_out(wallet, today=today))
-
-    result_items.sort(key=lambda item: (item.source_type != "DEBT", item.id), reverse=True)
-    total = len(result_items)
-    return schemas.DebtListOut(total=total, items=result_items[skip:skip + limit])
 
 
 @router.post("/wallet-obligations/{wallet_id}/payoff", response_model=schemas.WalletTransferOut)
@@ -1660,12 +1699,10 @@ def get_debt_actions(
 @router.post("/{debt_id}/archive", response_model=schemas.DebtOut)
 def archive_debt(
     debt_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_rate_limit_headers(response, enforce_debts_write_rate_limit(current_user.id))
     debt = _get_owned_debt_or_404(db, current_user.id, debt_id)
     _raise_policy_denied(evaluate_debt_action(db, debt, models.DebtActionKind.ARCHIVE))
 
@@ -1678,12 +1715,10 @@ def archive_debt(
 
 def _restore_debt_from_archive(
     debt_id: int,
-    response: Response,
     db: Session,
     current_user: models.User,
     user_tz: tzinfo,
 ) -> schemas.DebtOut:
-    _apply_rate_limit_headers(response, enforce_debts_write_rate_limit(current_user.id))
     debt = _get_owned_debt_or_404(db, current_user.id, debt_id)
     _raise_policy_denied(evaluate_debt_action(db, debt, models.DebtActionKind.RESTORE))
 
@@ -1696,23 +1731,21 @@ def _restore_debt_from_archive(
 @router.post("/{debt_id}/restore", response_model=schemas.DebtOut)
 def restore_debt(
     debt_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    return _restore_debt_from_archive(debt_id, response, db, current_user, user_tz)
+    return _restore_debt_from_archive(debt_id, db, current_user, user_tz)
 
 
 @router.post("/{debt_id}/unarchive", response_model=schemas.DebtOut)
 def unarchive_debt(
     debt_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    return _restore_debt_from_archive(debt_id, response, db, current_user, user_tz)
+    return _restore_debt_from_archive(debt_id, db, current_user, user_tz)
 
 
 @router.get("/{debt_id}/details", response_model=schemas.DebtDetailsOut)
@@ -1765,6 +1798,8 @@ def get_debt_details(
         .all()
     )
 
+    decisions = evaluate_debt_policies(db, [debt], entries=ledger_entries)
+
     return schemas.DebtDetailsOut(
         debt=_build_debt_out_with_ledger_totals(db, debt, today=today_in_tz(user_tz)),
         formal_details=(
@@ -1772,11 +1807,14 @@ def get_debt_details(
             if debt.formal_details
             else None
         ),
-        actions=_build_action_decisions_out(db, debt),
+        actions=[_build_action_decision_out(decision) for decision in decisions.actions[debt.id].values()],
         transactions=[_build_debt_transaction_out(transaction) for transaction in transactions],
         charges=[schemas.DebtChargeOut.model_validate(charge) for charge in charges],
         ledger_entries=[schemas.DebtLedgerEntryOut.model_validate(entry) for entry in reversed(ledger_entries)],
-        activity=[_build_activity_item(db, debt, entry) for entry in ledger_entries],
+        activity=[
+            _build_activity_item(entry, decisions.reversals[entry.id])
+            for entry in ledger_entries
+        ],
     )
 
 
@@ -1784,12 +1822,10 @@ def get_debt_details(
 def update_debt(
     debt_id: int,
     payload: schemas.DebtUpdate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_rate_limit_headers(response, enforce_debts_write_rate_limit(current_user.id))
     debt = _get_owned_debt_or_404(db, current_user.id, debt_id)
 
     if _is_debt_archived(debt):
@@ -1934,11 +1970,9 @@ def update_debt(
 @router.delete("/{debt_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_debt(
     debt_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    _apply_rate_limit_headers(response, enforce_debts_write_rate_limit(current_user.id))
     debt = _get_owned_debt_or_404(db, current_user.id, debt_id)
 
     if _is_debt_archived(debt):
@@ -1966,12 +2000,10 @@ def delete_debt(
 @router.post("/transactions", response_model=schemas.DebtTransactionOut, status_code=status.HTTP_201_CREATED)
 def create_transaction(
     payload: schemas.DebtTransactionCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_rate_limit_headers(response, enforce_debts_write_rate_limit(current_user.id))
     debt = _get_owned_debt_or_404(db, current_user.id, payload.debt_id)
 
     if _is_debt_archived(debt) or _debt_lifecycle_status(debt) != schemas.DebtLifecycleStatus.OPEN:
@@ -2007,12 +2039,9 @@ def create_transaction(
 @router.delete("/transactions/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_transaction(
     transaction_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    _apply_rate_limit_headers(response, enforce_debts_write_rate_limit(current_user.id))
-
     transaction = (
         db.query(models.DebtTransaction)
         .options(joinedload(models.DebtTransaction.wallet))
@@ -2058,12 +2087,10 @@ def delete_transaction(
 def record_debt_payment(
     debt_id: int,
     payload: schemas.DebtPaymentCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_rate_limit_headers(response, enforce_debts_write_rate_limit(current_user.id))
     debt = _get_owned_debt_or_404(db, current_user.id, debt_id)
     _raise_policy_denied(evaluate_debt_action(db, debt, models.DebtActionKind.RECORD_PAYMENT))
 
@@ -2091,12 +2118,10 @@ def record_debt_payment(
 def add_charge(
     debt_id: int,
     payload: schemas.DebtAddChargeRequest,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_rate_limit_headers(response, enforce_debts_write_rate_limit(current_user.id))
     debt = _get_owned_debt_or_404(db, current_user.id, debt_id)
     _raise_policy_denied(evaluate_debt_action(db, debt, models.DebtActionKind.ADD_CHARGE))
 
@@ -2132,23 +2157,20 @@ def add_charge(
 def add_debt_charge(
     debt_id: int,
     payload: schemas.DebtAddChargeRequest,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    return add_charge(debt_id, payload, response, db, current_user, user_tz)
+    return add_charge(debt_id, payload, db, current_user, user_tz)
 
 
 @router.post("/{debt_id}/forgive", response_model=schemas.DebtOut)
 def forgive_debt(
     debt_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_rate_limit_headers(response, enforce_debts_write_rate_limit(current_user.id))
     debt = _get_owned_debt_or_404(db, current_user.id, debt_id)
     _raise_policy_denied(evaluate_debt_action(db, debt, models.DebtActionKind.FORGIVE_FULL))
 
@@ -2182,12 +2204,10 @@ def forgive_debt(
 def forgive_debt_amount(
     debt_id: int,
     payload: schemas.DebtForgivenessCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_rate_limit_headers(response, enforce_debts_write_rate_limit(current_user.id))
     debt = _get_owned_debt_or_404(db, current_user.id, debt_id)
     remaining = int(debt.remaining_amount or 0)
     forgiveness_amount = int(payload.amount or remaining)
@@ -2237,12 +2257,10 @@ def forgive_debt_amount(
 def adjust_debt_balance(
     debt_id: int,
     payload: schemas.DebtBalanceAdjustmentCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_rate_limit_headers(response, enforce_debts_write_rate_limit(current_user.id))
     debt = _get_owned_debt_or_404(db, current_user.id, debt_id)
     _raise_policy_denied(evaluate_debt_action(db, debt, models.DebtActionKind.ADJUST_BALANCE))
 
@@ -2273,12 +2291,10 @@ def reverse_debt_ledger_entry(
     debt_id: int,
     entry_id: int,
     payload: schemas.DebtLedgerEntryReverseCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_rate_limit_headers(response, enforce_debts_write_rate_limit(current_user.id))
     debt = _get_owned_debt_or_404(db, current_user.id, debt_id)
     entry = (
         db.query(models.DebtLedgerEntry)
@@ -2338,11 +2354,9 @@ def reverse_debt_ledger_entry(
 def update_debt_formal_details(
     debt_id: int,
     payload: schemas.DebtFormalDetailsUpdate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    _apply_rate_limit_headers(response, enforce_debts_write_rate_limit(current_user.id))
     debt = _get_owned_debt_or_404(db, current_user.id, debt_id)
     if _is_debt_archived(debt):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="debts.formal_details.archived_immutable")
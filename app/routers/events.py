@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+
+from .. import oauth2
+from ..realtime import stream_events
+
+router = APIRouter(
+    prefix="/events",
+    tags=["Events"]
+)
+
+
+@router.get("/stream")
+async def stream(
+    request: Request,
+    token: str = Depends(oauth2.oauth2_scheme),
+):
+    """Server-Sent Events for the signed-in user.
+
+    Emits ``notification.created``, ``notifications.unread_count`` and
+    ``wallet.balance`` events as writes commit. The token is checked without
+    a database session, so an open stream holds no pooled connection; the
+    stream closes after ``sse_max_stream_seconds`` and the client reconnects
+    with a fresh token.
+    """
+    user_id = oauth2.peek_access_token_user_id(token)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="auth.credentials_invalid",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return StreamingResponse(
+        stream_events(int(user_id), is_disconnected=request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
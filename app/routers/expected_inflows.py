@@ -1,10 +1,12 @@
 from datetime import date
 from typing import Literal
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app import models, oauth2, schemas
+from app.etag import etag_precondition
+from app.json_responses import schema_response
 from app.session import get_db
 from app.services import expected_inflow_service as service
 from app.timezone import get_effective_user_timezone, today_in_tz
@@ -29,19 +31,23 @@ def _serialize(
     return service.serialize_promise(promise, today=today, include_detail=include_detail)
 
 
-@router.get("", response_model=list[schemas.ExpectedInflowPromiseOut])
+@router.get("", response_model=schemas.ExpectedInflowPromisePage, dependencies=[Depends(etag_precondition)])
 def list_expected_inflows(
+    response: Response,
     budget_year: int | None = Query(default=None, ge=schemas.MIN_BUDGET_YEAR),
     budget_month: int | None = Query(default=None, ge=1, le=12),
     view: Literal["all", "active", "history"] = "all",
     kind: models.ExpectedInflowKind | None = None,
     search: str | None = Query(default=None, min_length=1, max_length=100),
     display_state: models.PromiseDisplayState | None = Query(default=None),
+    limit: int | None = Query(default=None, ge=1, le=200),
+    cursor: str | None = Query(default=None, max_length=100),
+    include_detail: bool = False,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz=Depends(get_effective_user_timezone),
 ):
-    return service.list_promises(
+    page = service.list_promises(
         db,
         current_user.id,
         today=_today(user_tz),
@@ -51,26 +57,35 @@ def list_expected_inflows(
         kind=kind,
         search=search,
         display_state=display_state,
+        limit=limit,
+        cursor=cursor,
+        include_detail=include_detail,
     )
+    return schema_response(page, response=response)
 
 
-@router.get("/cashflow", response_model=list[schemas.ExpectedInflowCashflowRowOut])
+@router.get("/cashflow", response_model=schemas.ExpectedInflowCashflowPage, dependencies=[Depends(etag_precondition)])
 def list_cashflow(
     budget_year: int = Query(ge=schemas.MIN_BUDGET_YEAR),
     budget_month: int = Query(ge=1, le=12),
     kind: models.ExpectedInflowKind | None = None,
+    limit: int | None = Query(default=None, ge=1, le=500),
+    cursor: str | None = Query(default=None, max_length=100),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz=Depends(get_effective_user_timezone),
 ):
-    return service.list_cashflow(
+    page = service.list_cashflow(
         db,
         current_user.id,
         today=_today(user_tz),
         budget_year=budget_year,
         budget_month=budget_month,
         kind=kind,
+        limit=limit,
+        cursor=cursor,
     )
+    return page
 
 
 @router.get("/timeline", response_model=list[schemas.ExpectedInflowTimelineItemOut])
@@ -11,7 +11,6 @@ from sqlalchemy import func
 # pyrefly: ignore [missing-import]
 from sqlalchemy.orm import Session, selectinload
 
-from app.redis_rate_limiter import check_and_consume, consume_token_bucket
 from app.services.recurring_schedule_service import calculate_next_due_date
 from app.timezone import get_effective_user_timezone, now_in_tz, resolve_effective_timezone, today_in_tz
 from app.utils import check_budget_alerts
@@ -41,6 +40,8 @@ from ..services.session_draft_service import (
     get_owned_session_wallet_allocation_or_404,
     validate_session_item_links,
 )
+from ..etag import etag_precondition
+from ..json_responses import schema_response
 from ..session import get_db
 from .wallets import _get_owned_wallet_or_404
 
@@ -50,8 +51,6 @@ router = APIRouter(
 )
 
 CSV_FORMULA_PREFIXES = ("=", "+", "-", "@")
-EXPENSE_WRITE_BUCKET_CAPACITY = 10
-EXPENSE_WRITE_REFILL_RATE = 10 / 60
 EXPENSE_MONTH_LIMIT = 1000
 EXPENSE_FEED_VIEWS = {"all", "quick", "sessions", "groups", "refunds", "linked"}
 
@@ -65,45 +64,6 @@ def sanitize_csv_cell(value: str) -> str:
     return text
 
 
-def enforce_expense_write_rate_limit(user_id: int) -> dict[str, str]:
-    rl = consume_token_bucket(
-        scope="expenses_write",
-        identifier=str(user_id),
-        capacity=EXPENSE_WRITE_BUCKET_CAPACITY,
-        refill_rate_per_second=EXPENSE_WRITE_REFILL_RATE,
-    )
-    headers = {
-        "X-RateLimit-Limit": str(rl.limit),
-        "X-RateLimit-Remaining": str(rl.remaining),
-        "X-RateLimit-Reset": str(rl.reset_seconds),
-    }
-    if not rl.allowed:
-        headers["Retry-After"] = str(rl.reset_seconds)
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="expenses.write_rate_limited",
-            headers=headers,
-        )
-    return headers
-
-
-def enforce_export_rate_limit(user_id: int) -> dict[str, str]:
-    rl = check_and_consume(scope="export_csv", identifier=str(user_id))
-    headers = {
-        "X-RateLimit-Limit": str(rl.limit),
-        "X-RateLimit-Remaining": str(rl.remaining),
-        "X-RateLimit-Reset": str(rl.reset_seconds),
-    }
-    if not rl.allowed:
-        headers["Retry-After"] = str(rl.reset_seconds)
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="export.too_many_requests",
-            headers=headers,
-        )
-    return headers
-
-
 def resolve_budget_for_expense_month(
     db: Session,
     user_id: int,
@@ -834,16 +794,12 @@ def _build_expense_feed(
 @router.post("/", response_model=schemas.ExpenseOut, status_code=status.HTTP_201_CREATED)
 def create_expense(
     expense: schemas.ExpenseCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
     local_today = today_in_tz(user_tz)
     expense_date = expense.date or local_today
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
 
     # Enforce user-timezone normal logging boundary with grace window
     from app.timezone import validate_normal_logging_date
@@ -949,8 +905,9 @@ def create_expense(
     return _build_expense_out(created, {}, _asset_ids_by_event(db, current_user.id))
 
 
-@router.get("/", response_model=schemas.PaginatedExpenseFeedOut)
+@router.get("/", response_model=schemas.PaginatedExpenseFeedOut, dependencies=[Depends(etag_precondition)])
 def get_expenses(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
@@ -979,12 +936,14 @@ def get_expenses(
 
     total = len(items)
     paginated = items[skip:skip + limit]
-    return schemas.PaginatedExpenseFeedOut(total=total, items=paginated)
+    return schema_response(
+        schemas.PaginatedExpenseFeedOut(total=total, items=paginated),
+        response=response,
+    )
 
 
 @router.get("/export")
 def export_csv_expense(
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     category: Optional[str] = None,
@@ -993,10 +952,6 @@ def export_csv_expense(
     sort: str = "newest",
     lang: Optional[str] = None,
 ):
-    rate_headers = enforce_export_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     CSV_TRANSLATIONS = {
         "uz": {
             "categories": {
@@ -1125,7 +1080,6 @@ def export_csv_expense(
 @router.post("/session-drafts", response_model=schemas.SessionDraftOut, status_code=status.HTTP_201_CREATED)
 def create_session_draft(
     payload: schemas.SessionDraftCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
@@ -1133,9 +1087,6 @@ def create_session_draft(
     if payload.date > today_in_tz(user_tz):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="expenses.date_in_future")
 
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
 
     draft = models.ExpenseSessionDraft(
         owner_id=current_user.id,
@@ -1216,15 +1167,10 @@ def get_session_draft(
 def update_session_draft(
     draft_id: int,
     payload: schemas.SessionDraftUpdate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     draft = get_owned_session_draft_or_404(db, current_user.id, draft_id)
     ensure_draft_editable(draft)
 
@@ -1247,14 +1193,9 @@ def update_session_draft(
 @router.post("/session-drafts/{draft_id}/pause", response_model=schemas.SessionDraftOut)
 def pause_session_draft(
     draft_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     draft = get_owned_session_draft_or_404(db, current_user.id, draft_id)
     ensure_draft_editable(draft)
     draft.status = models.ExpenseSessionDraftStatus.PAUSED
@@ -1265,14 +1206,9 @@ def pause_session_draft(
 @router.post("/session-drafts/{draft_id}/resume", response_model=schemas.SessionDraftOut)
 def resume_session_draft(
     draft_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     draft = get_owned_session_draft_or_404(db, current_user.id, draft_id)
     ensure_draft_editable(draft)
     draft.status = models.ExpenseSessionDraftStatus.ACTIVE
@@ -1283,14 +1219,9 @@ def resume_session_draft(
 @router.post("/session-drafts/{draft_id}/abandon", response_model=schemas.SessionDraftOut)
 def abandon_session_draft(
     draft_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     draft = get_owned_session_draft_or_404(db, current_user.id, draft_id)
     ensure_draft_editable(draft)
     draft.status = models.ExpenseSessionDraftStatus.ABANDONED
@@ -1301,14 +1232,9 @@ def abandon_session_draft(
 @router.delete("/session-drafts/{draft_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_session_draft(
     draft_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     draft = get_owned_session_draft_or_404(db, current_user.id, draft_id)
     if draft.status == models.ExpenseSessionDraftStatus.FINALIZED:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="expenses.session_draft_finalized")
@@ -1321,14 +1247,9 @@ def delete_session_draft(
 def add_session_draft_item(
     draft_id: int,
     payload: schemas.SessionDraftItemCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     draft = get_owned_session_draft_or_404(db, current_user.id, draft_id)
     ensure_draft_editable(draft)
     validate_session_item_links(
@@ -1362,14 +1283,9 @@ def update_session_draft_item(
     draft_id: int,
     item_id: int,
     payload: schemas.SessionDraftItemUpdate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     draft = get_owned_session_draft_or_404(db, current_user.id, draft_id)
     ensure_draft_editable(draft)
     item = get_owned_session_draft_item_or_404(db, current_user.id, draft_id, item_id)
@@ -1405,14 +1321,9 @@ def update_session_draft_item(
 def delete_session_draft_item(
     draft_id: int,
     item_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     draft = get_owned_session_draft_or_404(db, current_user.id, draft_id)
     ensure_draft_editable(draft)
     item = get_owned_session_draft_item_or_404(db, current_user.id, draft_id, item_id)
@@ -1429,14 +1340,9 @@ def delete_session_draft_item(
 def add_session_wallet_allocation(
     draft_id: int,
     payload: schemas.SessionDraftWalletAllocationCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     draft = get_owned_session_draft_or_404(db, current_user.id, draft_id)
     ensure_draft_editable(draft)
     wallet = _get_owned_wallet_or_404(db, current_user.id, payload.wallet_id)
@@ -1470,14 +1376,9 @@ def update_session_wallet_allocation(
     draft_id: int,
     allocation_id: int,
     payload: schemas.SessionDraftWalletAllocationUpdate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     draft = get_owned_session_draft_or_404(db, current_user.id, draft_id)
     ensure_draft_editable(draft)
     allocation = get_owned_session_wallet_allocation_or_404(db, current_user.id, draft_id, allocation_id)
@@ -1492,14 +1393,9 @@ def update_session_wallet_allocation(
 def delete_session_wallet_allocation(
     draft_id: int,
     allocation_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     draft = get_owned_session_draft_or_404(db, current_user.id, draft_id)
     ensure_draft_editable(draft)
     allocation = get_owned_session_wallet_allocation_or_404(db, current_user.id, draft_id, allocation_id)
@@ -1512,14 +1408,9 @@ def delete_session_wallet_allocation(
 def add_session_split(
     draft_id: int,
     payload: schemas.SessionDraftSplitCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     draft = get_owned_session_draft_or_404(db, current_user.id, draft_id)
     ensure_draft_editable(draft)
     db.add(
@@ -1539,14 +1430,9 @@ def update_session_split(
     draft_id: int,
     split_id: int,
     payload: schemas.SessionDraftSplitUpdate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     draft = get_owned_session_draft_or_404(db, current_user.id, draft_id)
     ensure_draft_editable(draft)
     split = get_owned_session_split_or_404(db, current_user.id, draft_id, split_id)
@@ -1563,14 +1449,9 @@ def update_session_split(
 def delete_session_split(
     draft_id: int,
     split_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     draft = get_owned_session_draft_or_404(db, current_user.id, draft_id)
     ensure_draft_editable(draft)
     split = get_owned_session_split_or_404(db, current_user.id, draft_id, split_id)
@@ -1582,15 +1463,10 @@ def delete_session_split(
 @router.post("/session-drafts/{draft_id}/finalize", response_model=schemas.ExpenseOut, status_code=status.HTTP_201_CREATED)
 def finalize_expense_session_draft(
     draft_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     local_today = today_in_tz(user_tz)
     draft = get_owned_session_draft_or_404(db, current_user.id, draft_id)
     if draft.date > local_today:
@@ -1618,14 +1494,9 @@ def finalize_expense_session_draft(
 @router.post("/merge-groups", response_model=schemas.ExpenseMergeGroupDetailOut, status_code=status.HTTP_201_CREATED)
 def create_expense_merge_group(
     payload: schemas.ExpenseMergeGroupCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     events = _validate_merge_group_events(db, current_user.id, payload.expense_ids)
     group = models.ExpenseMergeGroup(
         owner_id=current_user.id,
@@ -1679,14 +1550,9 @@ def get_expense_merge_group(
 def update_expense_merge_group(
     group_id: int,
     payload: schemas.ExpenseMergeGroupUpdate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     group = _get_owned_merge_group_or_404(db, current_user.id, group_id)
     update_data = payload.model_dump(exclude_unset=True)
     for field, value in update_data.items():
@@ -1704,14 +1570,9 @@ def update_expense_merge_group(
 def add_expenses_to_merge_group(
     group_id: int,
     payload: schemas.ExpenseMergeGroupItemsRequest,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     group = _get_owned_merge_group_or_404(db, current_user.id, group_id)
     events = _validate_merge_group_events(db, current_user.id, payload.expense_ids, allow_group_id=group.id)
     for event in events:
@@ -1733,10 +1594,6 @@ def remove_expense_from_merge_group(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     group = _get_owned_merge_group_or_404(db, current_user.id, group_id)
     event = _get_owned_event_or_404(
         db,
@@ -1778,10 +1635,6 @@ def delete_expense_merge_group(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     group = _get_owned_merge_group_or_404(db, current_user.id, group_id)
     for event in list(group.events):
         event.merge_group_id = None
@@ -1821,14 +1674,9 @@ def get_expense_detail(
 def update_expense(
     id: int,
     expense: schemas.ExpenseUpdate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     event = _get_owned_event_or_404(
         db,
         current_user.id,
@@ -1874,15 +1722,10 @@ def update_expense(
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_expense(
     id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     event = _get_owned_event_any_status_or_404(
         db,
         current_user.id,
@@ -1982,14 +1825,9 @@ def delete_expense(
 def mark_expense_as_asset(
     id: int,
     payload: schemas.ExpenseMarkAssetRequest,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     event = _get_owned_event_or_404(
         db,
         current_user.id,
@@ -2027,7 +1865,6 @@ def mark_expense_as_asset(
 def mark_expense_as_recurring(
     id: int,
     payload: schemas.ExpenseMarkRecurringRequest,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
@@ -2035,9 +1872,6 @@ def mark_expense_as_recurring(
     if not current_user.is_premium:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="recurring_expenses.premium_required")
 
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
 
     event = _get_owned_event_or_404(
         db,
@@ -2124,14 +1958,9 @@ def mark_expense_as_recurring(
 def split_expense(
     id: int,
     payload: schemas.ExpenseSplitRequest,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_expense_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     event = _get_owned_event_or_404(
         db,
         current_user.id,
@@ -17,6 +17,7 @@ from ..services.expense_posting_service import post_expense_event
 from ..services.goal_funding_service import (
     build_goal_funding_summary,
     build_goal_with_progress,
+    build_goals_with_progress,
     get_next_payment_plan_goal_payment,
     get_goal_consumed_amount,
     get_goal_funded_amount,
@@ -41,8 +42,9 @@ from ..services.wallet_fee_service import (
     validate_linked_fee_goal_protection,
 )
 from ..services.wallet_service import WalletService
-from ..redis_rate_limiter import consume_token_bucket
 from ..savings_balances import ensure_premium_user
+from ..etag import etag_precondition
+from ..json_responses import schema_response
 from ..session import get_db
 from ..timezone import get_effective_user_timezone, today_in_tz
 
@@ -53,57 +55,9 @@ router = APIRouter(
 
 GOALS_ACTIVE_LIMIT = 20
 GOALS_ARCHIVED_LIMIT = 100
-GOAL_LIFECYCLE_WRITE_BUCKET_CAPACITY = 10
-GOAL_LIFECYCLE_WRITE_REFILL_RATE = 10 / 60
-GOAL_MONEY_WRITE_BUCKET_CAPACITY = 20
-GOAL_MONEY_WRITE_REFILL_RATE = 20 / 60
 MAX_PLANNED_PURCHASE_PAYMENT_WALLETS = 3
 
 
-def enforce_goal_lifecycle_write_rate_limit(user_id: int) -> dict[str, str]:
-    rl = consume_token_bucket(
-        scope="goals_lifecycle_write",
-        identifier=str(user_id),
-        capacity=GOAL_LIFECYCLE_WRITE_BUCKET_CAPACITY,
-        refill_rate_per_second=GOAL_LIFECYCLE_WRITE_REFILL_RATE,
-    )
-    headers = {
-        "X-RateLimit-Limit": str(rl.limit),
-        "X-RateLimit-Remaining": str(rl.remaining),
-        "X-RateLimit-Reset": str(rl.reset_seconds),
-    }
-    if not rl.allowed:
-        headers["Retry-After"] = str(rl.reset_seconds)
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="goals.write_rate_limited",
-            headers=headers,
-        )
-    return headers
-
-
-def enforce_goal_money_write_rate_limit(user_id: int) -> dict[str, str]:
-    rl = consume_token_bucket(
-        scope="goals_money_write",
-        identifier=str(user_id),
-        capacity=GOAL_MONEY_WRITE_BUCKET_CAPACITY,
-        refill_rate_per_second=GOAL_MONEY_WRITE_REFILL_RATE,
-    )
-    headers = {
-        "X-RateLimit-Limit": str(rl.limit),
-        "X-RateLimit-Remaining": str(rl.remaining),
-        "X-RateLimit-Reset": str(rl.reset_seconds),
-    }
-    if not rl.allowed:
-        headers["Retry-After"] = str(rl.reset_seconds)
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="goals.write_rate_limited",
-            headers=headers,
-        )
-    return headers
-
-
 def _count_goals_by_status(db: Session, user_id: int, status_value: models.GoalStatus) -> int:
     return (
         db.query(func.count(models.Goals.id))
@@ -541,6 +495,7 @@ def _get_project_summary_or_404(
                 db,
                 user_id,
                 default_budget_date=default_budget_date,
+                project_id=project_id,
             )
             if item.id == project_id
         ),
@@ -1378,8 +1333,9 @@ def _archive_goal_and_release_funds(
     )
 
 
-@router.get("/", response_model=list[schemas.GoalWithProgressOut])
+@router.get("/", response_model=list[schemas.GoalWithProgressOut], dependencies=[Depends(etag_precondition)])
 def list_goals(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
@@ -1392,10 +1348,14 @@ def list_goals(
         .order_by(models.Goals.created_at.desc())
         .all()
     )
-    return [_get_goal_with_progress(db, current_user.id, goal, today=today) for goal in goals]
+    return schema_response(
+        build_goals_with_progress(db, current_user.id, goals, today=today),
+        list[schemas.GoalWithProgressOut],
+        response=response,
+    )
 
 
-@router.get("/funding-summary", response_model=schemas.GoalFundingSummaryOut)
+@router.get("/funding-summary", response_model=schemas.GoalFundingSummaryOut, dependencies=[Depends(etag_precondition)])
 def get_goal_funding_summary(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
@@ -1419,15 +1379,11 @@ def get_goal_activity(
 @router.post("/", response_model=schemas.GoalWithProgressOut, status_code=status.HTTP_201_CREATED)
 def create_goal(
     payload: schemas.GoalCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
     ensure_premium_user(current_user)
-    rate_headers = enforce_goal_lifecycle_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
     if payload.intent == models.GoalIntent.FUND_PROJECT:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1491,15 +1447,11 @@ def create_goal(
 def update_goal(
     goal_id: int,
     payload: schemas.GoalUpdate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
     ensure_premium_user(current_user)
-    rate_headers = enforce_goal_lifecycle_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
 
     today = today_in_tz(user_tz)
     goal = _get_owned_goal_or_404(db, current_user.id, goal_id)
@@ -1660,15 +1612,11 @@ def update_goal(
 @router.post("/{goal_id}/archive", response_model=schemas.GoalWithProgressOut)
 def archive_goal(
     goal_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
     ensure_premium_user(current_user)
-    rate_headers = enforce_goal_lifecycle_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
 
     goal = _get_owned_goal_or_404(db, current_user.id, goal_id)
     if goal.status != models.GoalStatus.ARCHIVED:
@@ -1688,15 +1636,11 @@ def archive_goal(
 @router.post("/{goal_id}/restore", response_model=schemas.GoalWithProgressOut)
 def restore_goal(
     goal_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
     ensure_premium_user(current_user)
-    rate_headers = enforce_goal_lifecycle_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
 
     goal = _get_owned_goal_or_404(db, current_user.id, goal_id)
     funded_amount = get_goal_funded_amount(db, current_user.id, goal.id)
@@ -1724,14 +1668,10 @@ def restore_goal(
 @router.delete("/{goal_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_goal(
     goal_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
     ensure_premium_user(current_user)
-    rate_headers = enforce_goal_lifecycle_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
 
     goal = _get_owned_goal_or_404(db, current_user.id, goal_id)
     funded_amount = get_goal_funded_amount(db, current_user.id, goal.id)
@@ -1759,15 +1699,11 @@ def delete_goal(
 def allocate_to_goal(
     goal_id: int,
     payload: schemas.GoalAllocationCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
     ensure_premium_user(current_user)
-    rate_headers = enforce_goal_money_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
 
     goal = _get_owned_goal_or_404(db, current_user.id, goal_id)
     _raise_if_goal_saving_phase_read_only(goal)
@@ -1834,27 +1770,22 @@ def allocate_to_goal(
 def contribute_to_goal(
     goal_id: int,
     payload: schemas.GoalAllocationCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    return allocate_to_goal(goal_id, payload, response, db, current_user, user_tz)
+    return allocate_to_goal(goal_id, payload, db, current_user, user_tz)
 
 
 @router.post("/{goal_id}/allocations/move", response_model=schemas.GoalFundingMoveOut)
 def move_goal_funding_to_wallet(
     goal_id: int,
     payload: schemas.GoalFundingMoveCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
     ensure_premium_user(current_user)
-    rate_headers = enforce_goal_money_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
 
     goal = _get_owned_goal_or_404(db, current_user.id, goal_id)
     _raise_if_goal_saving_phase_read_only(goal)
@@ -2035,15 +1966,11 @@ def move_goal_funding_to_wallet(
 def use_reserve_goal(
     goal_id: int,
     payload: schemas.GoalUseReserveCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
     ensure_premium_user(current_user)
-    rate_headers = enforce_goal_money_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
 
     goal = _get_owned_goal_or_404(db, current_user.id, goal_id)
     if goal.intent != models.GoalIntent.RESERVE:
@@ -2141,15 +2068,11 @@ def use_reserve_goal(
 def record_planned_purchase_goal(
     goal_id: int,
     payload: schemas.GoalUsePlannedPurchaseCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
     ensure_premium_user(current_user)
-    rate_headers = enforce_goal_money_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
 
     goal = _get_owned_goal_or_404(db, current_user.id, goal_id)
     if goal.intent != models.GoalIntent.PLANNED_PURCHASE:
@@ -2356,15 +2279,11 @@ def record_planned_purchase_goal(
 def pay_linked_debt_from_goal(
     goal_id: int,
     payload: schemas.GoalDebtPaymentCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
     ensure_premium_user(current_user)
-    rate_headers = enforce_goal_money_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
 
     goal = (
         db.query(models.Goals)
@@ -2493,15 +2412,11 @@ def pay_linked_debt_from_goal(
 def graduate_goal_to_project(
     goal_id: int,
     payload: schemas.GoalGraduateCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
     ensure_premium_user(current_user)
-    rate_headers = enforce_goal_money_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
 
     goal = _get_owned_goal_or_404(db, current_user.id, goal_id)
     if goal.status == models.GoalStatus.ARCHIVED:
@@ -2587,15 +2502,11 @@ def graduate_goal_to_project(
 def release_goal_to_project(
     goal_id: int,
     payload: schemas.GoalProjectReleaseCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
     ensure_premium_user(current_user)
-    rate_headers = enforce_goal_money_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
 
     goal = _get_owned_goal_or_404(db, current_user.id, goal_id)
     _raise_if_goal_saving_phase_read_only(goal)
@@ -2652,15 +2563,11 @@ def release_goal_to_project(
 def return_goal_allocation(
     goal_id: int,
     payload: schemas.GoalAllocationReturnCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
     ensure_premium_user(current_user)
-    rate_headers = enforce_goal_money_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
 
     goal = _get_owned_goal_or_404(db, current_user.id, goal_id)
     _raise_if_goal_saving_phase_read_only(goal)
@@ -2711,27 +2618,22 @@ def return_goal_allocation(
 def return_from_goal(
     goal_id: int,
     payload: schemas.GoalAllocationReturnCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    return return_goal_allocation(goal_id, payload, response, db, current_user, user_tz)
+    return return_goal_allocation(goal_id, payload, db, current_user, user_tz)
 
 
 @router.post("/{goal_id}/allocations/consume", response_model=schemas.GoalWithProgressOut)
 def consume_goal_allocation(
     goal_id: int,
     payload: schemas.GoalAllocationConsumeCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
     ensure_premium_user(current_user)
-    rate_headers = enforce_goal_money_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
 
     goal = _get_owned_goal_or_404(db, current_user.id, goal_id)
     _raise_if_goal_saving_phase_read_only(goal)
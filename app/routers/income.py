@@ -2,12 +2,14 @@ from datetime import date, tzinfo
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
-from sqlalchemy import func
+from sqlalchemy import String, and_, case, cast, exists, func, literal, or_, select
 from sqlalchemy.orm import Session, selectinload
 
-from app.redis_rate_limiter import consume_token_bucket
 from app.timezone import get_effective_user_timezone, today_in_tz
 from .. import models, oauth2, schemas
+from ..etag import etag_precondition
+from ..json_responses import schema_response
+from ..keyset import keyset_after, next_cursor
 from ..session import get_db
 from ..services.debt_service import reconcile_debt
 from ..services.financial_event_ledger_service import (
@@ -17,15 +19,12 @@ from ..services.financial_event_ledger_service import (
     validate_wallet_epochs,
     void_financial_event,
 )
+from ..services.income_source_stats_service import get_income_source_stats
 from ..services.wallet_service import WalletService
 from .wallets import _get_owned_wallet_or_404
 
 INCOME_SOURCE_LIMIT = 20
 INCOME_ENTRY_MONTH_LIMIT = 300
-INCOME_SOURCE_WRITE_BUCKET_CAPACITY = 10
-INCOME_SOURCE_WRITE_REFILL_RATE = 10 / 60
-INCOME_ENTRY_WRITE_BUCKET_CAPACITY = 20
-INCOME_ENTRY_WRITE_REFILL_RATE = 20 / 60
 
 router = APIRouter(
     prefix="/income",
@@ -46,50 +45,6 @@ MONEY_IN_EVENT_TYPES = (
 )
 
 
-def _rate_limit_headers(rl) -> dict[str, str]:
-    return {
-        "X-RateLimit-Limit": str(rl.limit),
-        "X-RateLimit-Remaining": str(rl.remaining),
-        "X-RateLimit-Reset": str(rl.reset_seconds),
-    }
-
-
-def enforce_income_source_write_rate_limit(user_id: int) -> dict[str, str]:
-    rl = consume_token_bucket(
-        scope="income_sources_write",
-        identifier=str(user_id),
-        capacity=INCOME_SOURCE_WRITE_BUCKET_CAPACITY,
-        refill_rate_per_second=INCOME_SOURCE_WRITE_REFILL_RATE,
-    )
-    headers = _rate_limit_headers(rl)
-    if not rl.allowed:
-        headers["Retry-After"] = str(rl.reset_seconds)
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="income.sources_write_rate_limited",
-            headers=headers,
-        )
-    return headers
-
-
-def enforce_income_entry_write_rate_limit(user_id: int) -> dict[str, str]:
-    rl = consume_token_bucket(
-        scope="income_entries_write",
-        identifier=str(user_id),
-        capacity=INCOME_ENTRY_WRITE_BUCKET_CAPACITY,
-        refill_rate_per_second=INCOME_ENTRY_WRITE_REFILL_RATE,
-    )
-    headers = _rate_limit_headers(rl)
-    if not rl.allowed:
-        headers["Retry-After"] = str(rl.reset_seconds)
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="income.entries_write_rate_limited",
-            headers=headers,
-        )
-    return headers
-
-
 def _get_owned_source_or_404(db: Session, user_id: int, source_id: int) -> models.IncomeSource:
     source = (
         db.query(models.IncomeSource)
@@ -513,30 +468,153 @@ def _build_money_in_item(
     )
 
 
-def _money_in_matches_search(item: schemas.MoneyInItemOut, search: str | None) -> bool:
-    needle = (search or "").strip().casefold()
-    if not needle:
-        return True
-
-    haystack = [
-        item.title,
-        item.description,
-        item.source_name,
-        item.kind.value,
-        item.event_type.value if item.event_type else None,
-        str(item.reference_type) if item.reference_type else None,
-        item.original_domain.replace("_", " ") if item.original_domain else None,
-        f"debt {item.debt_id}" if item.debt_id else None,
-        f"asset {item.asset_id}" if item.asset_id else None,
+def _money_in_like(needle: str) -> str:
+    escaped = needle.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _money_in_sql_columns(user_id: int):
+    """Correlated SQL expressions mirroring the Python money-in helpers.
+
+    Returns ``(amount, debt_id, kind, domain)`` for the outer FinancialEvent
+    row: the positive wallet-leg total, the first debt entity leg, and the
+    ``_classify_money_in_event`` kind and original domain.
+    """
+    event = models.FinancialEvent
+    amount = (
+        select(func.sum(models.WalletLedger.amount))
+        .where(models.WalletLedger.event_id == event.id, models.WalletLedger.amount > 0)
+        .scalar_subquery()
+    )
+    debt_id = (
+        select(models.EntityLedger.debt_id)
+        .where(models.EntityLedger.event_id == event.id, models.EntityLedger.debt_id.isnot(None))
+        .order_by(models.EntityLedger.id.asc())
+        .limit(1)
+        .correlate(event)
+        .scalar_subquery()
+    )
+    debt_type = (
+        select(models.Debt.debt_type)
+        .where(models.Debt.id == debt_id, models.Debt.owner_id == user_id)
+        .scalar_subquery()
+    )
+    has_sold_asset = exists().where(
+        models.Asset.owner_id == user_id,
+        models.Asset.sale_event_id == event.id,
+    )
+    is_debt = event.event_type == models.TransactionType.DEBT_SETTLEMENT
+    is_sale = and_(
+        event.event_type == models.TransactionType.INCOME,
+        or_(has_sold_asset, event.reference_type == models.ReferenceType.ASSET_SALE),
+    )
+    kind = case(
+        (event.event_type == models.TransactionType.REFUND, schemas.MoneyInKind.RETURNED.value),
+        (event.event_type == models.TransactionType.ADJUSTMENT, schemas.MoneyInKind.ADJUSTMENT.value),
+        (event.event_type == models.TransactionType.NEUTRAL_FLOW, schemas.MoneyInKind.RETURNED.value),
+        (
+            and_(is_debt, event.reference_type == models.ReferenceType.LOAN_DISBURSEMENT),
+            schemas.MoneyInKind.BORROWED.value,
+        ),
+        (and_(is_debt, debt_type == models.DebtType.OWING), schemas.MoneyInKind.BORROWED.value),
+        (
+            and_(
+                is_debt,
+                event.reference_type.in_((models.ReferenceType.DEBT_INCOME, models.ReferenceType.DEBT_CHARGE)),
+            ),
+            schemas.MoneyInKind.INCOME.value,
+        ),
+        (is_debt, schemas.MoneyInKind.RETURNED.value),
+        (is_sale, schemas.MoneyInKind.SOLD.value),
+        else_=schemas.MoneyInKind.INCOME.value,
+    )
+    domain = case(
+        (event.event_type == models.TransactionType.REFUND, "expense_refund"),
+        (event.event_type == models.TransactionType.ADJUSTMENT, "wallet_adjustment"),
+        (event.event_type == models.TransactionType.NEUTRAL_FLOW, "neutral_flow"),
+        (is_debt, "debt"),
+        (is_sale, "asset"),
+        else_="income",
+    )
+    return amount, debt_id, kind, domain
+
+
+def _money_in_search_clause(search: str, *, user_id: int, debt_id, kind, domain):
+    """SQL form of the money-in search over the item's visible fields.
+
+    Event title/description use ILIKE so Postgres can serve them from the
+    trigram indexes; the fixed vocabularies (kind, event type, domain) are
+    matched in Python and become IN filters.
+    """
+    needle = search.strip().casefold()
+    pattern = _money_in_like(needle)
+    event = models.FinancialEvent
+
+    def matches(column):
+        return column.ilike(pattern, escape="\\")
+
+    clauses = [
+        matches(event.title),
+        matches(event.description),
+        matches(event.reference_type),
+        exists().where(
+            models.EntityLedger.event_id == event.id,
+            models.EntityLedger.income_source_id == models.IncomeSource.id,
+            matches(models.IncomeSource.name),
+        ),
+        exists().where(models.Debt.id == debt_id, models.Debt.owner_id == user_id, matches(models.Debt.counterparty_name)),
+        exists().where(
+            models.Asset.owner_id == user_id,
+            models.Asset.sale_event_id == event.id,
+            event.event_type == models.TransactionType.INCOME,
+            matches(models.Asset.title),
+        ),
+        exists().where(
+            models.WalletLedger.event_id == event.id,
+            models.WalletLedger.amount > 0,
+            models.WalletLedger.wallet_id == models.Wallet.id,
+            matches(models.Wallet.name),
+        ),
+        matches(literal("debt ").concat(cast(debt_id, String))),
+        matches(
+            literal("asset ").concat(
+                cast(
+                    select(models.Asset.id)
+                    .where(
+                        models.Asset.owner_id == user_id,
+                        models.Asset.sale_event_id == event.id,
+                        event.event_type == models.TransactionType.INCOME,
+                    )
+                    .limit(1)
+                    .scalar_subquery(),
+                    String,
+                )
+            )
+        ),
+    ]
+    matching_kinds = [item.value for item in schemas.MoneyInKind if item != schemas.MoneyInKind.ALL and needle in item.value]
+    if matching_kinds:
+        clauses.append(kind.in_(matching_kinds))
+    matching_types = [item for item in MONEY_IN_EVENT_TYPES if needle in item.value.casefold()]
+    if matching_types:
+        clauses.append(event.event_type.in_(matching_types))
+    matching_domains = [
+        item
+        for item in ("expense_refund", "wallet_adjustment", "neutral_flow", "debt", "asset", "income")
+        if needle in item.replace("_", " ")
     ]
-    haystack.extend(wallet.wallet_name for wallet in item.wallet_allocations)
-    return any(needle in str(value).casefold() for value in haystack if value)
+    if matching_domains:
+        clauses.append(domain.in_(matching_domains))
+    return or_(*clauses)
 
 
-@money_in_router.get("", response_model=schemas.PaginatedMoneyInOut)
+@money_in_router.get("", response_model=schemas.PaginatedMoneyInOut, dependencies=[Depends(etag_precondition)])
 def list_money_in(
+    response: Response,
     limit: int = Query(default=20, ge=1, le=100),
     skip: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None),
+    include_total: bool = Query(default=False),
     kind: schemas.MoneyInKind = Query(default=schemas.MoneyInKind.ALL),
     search: str | None = Query(default=None, max_length=100),
     start_date: date | None = Query(default=None),
@@ -549,13 +627,43 @@ def list_money_in(
     if start_date and end_date and start_date > end_date:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="money_in.start_after_end")
 
-    query = _money_in_event_query(db, current_user.id)
+    amount, debt_id, kind_column, domain = _money_in_sql_columns(current_user.id)
+    query = _money_in_event_query(db, current_user.id).filter(func.coalesce(amount, 0) > 0)
     if start_date is not None:
         query = query.filter(models.FinancialEvent.date >= start_date)
     if end_date is not None:
         query = query.filter(models.FinancialEvent.date <= end_date)
+    if kind != schemas.MoneyInKind.ALL:
+        query = query.filter(kind_column == kind.value)
+    if search and search.strip():
+        query = query.filter(
+            _money_in_search_clause(search, user_id=current_user.id, debt_id=debt_id, kind=kind_column, domain=domain)
+        )
 
-    events = query.order_by(models.FinancialEvent.date.desc(), models.FinancialEvent.id.desc()).all()
+    # Counting runs the amount/kind/search subqueries over the whole range, so
+    # it is opt-in and never repeated on cursor pages.
+    total = query.count() if include_total and cursor is None else None
+    if cursor is not None:
+        query = query.filter(
+            keyset_after(
+                db,
+                models.FinancialEvent,
+                owner_id=current_user.id,
+                cursor=cursor,
+                order_by=(models.FinancialEvent.date, models.FinancialEvent.created_at),
+                invalid_detail="money_in.cursor_invalid",
+            )
+        )
+    query = query.order_by(
+        models.FinancialEvent.date.desc(),
+        models.FinancialEvent.created_at.desc(),
+        models.FinancialEvent.id.desc(),
+    )
+    if cursor is None:
+        query = query.offset(skip)
+    events = query.limit(limit + 1).all()
+    has_more = len(events) > limit
+    events = events[:limit]
 
     sale_event_ids = {int(event.id) for event in events if event.event_type == models.TransactionType.INCOME}
     assets_by_sale_event_id: dict[int, models.Asset] = {}
@@ -596,20 +704,20 @@ def list_money_in(
             asset=assets_by_sale_event_id.get(int(event.id)),
             debt=debts_by_id.get(_money_in_debt_id(event)),
         )
-        if item is None:
-            continue
-        if kind != schemas.MoneyInKind.ALL and item.kind != kind:
-            continue
-        if not _money_in_matches_search(item, search):
-            continue
-        items.append(item)
-
-    items.sort(key=lambda item: (item.date, item.created_at, item.id), reverse=True)
-    total = len(items)
-    return schemas.PaginatedMoneyInOut(total=total, items=items[skip:skip + limit])
+        if item is not None:
+            items.append(item)
+
+    return schema_response(
+        schemas.PaginatedMoneyInOut(
+            total=total,
+            items=items,
+            next_cursor=next_cursor(events, has_more),
+        ),
+        response=response,
+    )
 
 
-@router.get("/sources", response_model=List[schemas.IncomeSourceOut])
+@router.get("/sources", response_model=List[schemas.IncomeSourceOut], dependencies=[Depends(etag_precondition)])
 def list_income_sources(
     include_inactive: bool = Query(default=False),
     db: Session = Depends(get_db),
@@ -639,42 +747,22 @@ def get_income_source_analytics(
     if source is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="income.source_not_found")
 
-    # EARNED promises linked to this source (active + closed).
-    # Eager-load schedules so we can sum received_amount without N+1.
-    earned_promises = (
-        db.query(models.ExpectedInflowPromise)
-        .options(selectinload(models.ExpectedInflowPromise.schedules))
+    # Counters are kept current by income_source_stats_service as entries are
+    # posted and promises realized; only the promise ids are read here.
+    stats = get_income_source_stats(db, source_id)
+    promise_ids = [
+        int(promise_id)
+        for (promise_id,) in db.query(models.ExpectedInflowPromise.id)
         .filter(
             models.ExpectedInflowPromise.owner_id == current_user.id,
             models.ExpectedInflowPromise.source_id == source_id,
             models.ExpectedInflowPromise.kind == models.ExpectedInflowKind.EARNED.value,
         )
+        .order_by(models.ExpectedInflowPromise.id)
         .all()
-    )
-
-    promise_count = len(earned_promises)
-    promise_ids = [int(p.id) for p in earned_promises]
-    lifetime_expected = sum(int(p.original_amount) for p in earned_promises)
-    lifetime_received = 0
-    outstanding_expected = 0
-
-    for promise in earned_promises:
-        for schedule in promise.schedules or []:
-            # Use denormalised received_amount column (same as service.received_amount).
-            received = int(schedule.received_amount or 0)
-            lifetime_received += received
-            remaining = max(int(schedule.amount) - received, 0)
-            # Only count non-superseded schedules toward outstanding
-            if remaining > 0 and schedule.close_reason != "RESCHEDULED":
-                outstanding_expected += remaining
-
-    # Money In entries linked to this source via entity leg income_source_id
-    entity_rows = db.query(models.EntityLedger).filter(
-        models.EntityLedger.income_source_id == source_id,
-    ).all()
-    entry_ids = {int(row.event_id) for row in entity_rows}
-    entry_count = len(entry_ids)
-    entry_total_received = int(sum(int(row.amount) for row in entity_rows))
+    ]
+    lifetime_received = stats["lifetime_received"]
+    outstanding_expected = stats["outstanding_expected"]
 
     # Reliability: received / (received + outstanding) across active promises
     total_active_material = lifetime_received + outstanding_expected
@@ -688,12 +776,12 @@ def get_income_source_analytics(
         id=int(source.id),
         name=source.name,
         is_active=bool(source.is_active),
-        promise_count=promise_count,
-        lifetime_expected=lifetime_expected,
+        promise_count=stats["promise_count"],
+        lifetime_expected=stats["lifetime_expected"],
         lifetime_received=lifetime_received,
         outstanding_expected=outstanding_expected,
-        entry_count=entry_count,
-        entry_total_received=entry_total_received,
+        entry_count=stats["entry_count"],
+        entry_total_received=stats["entry_total_received"],
         reliability_pct=reliability_pct,
         promise_ids=promise_ids,
         created_at=source.created_at,
@@ -704,14 +792,9 @@ def get_income_source_analytics(
 @router.post("/sources", response_model=schemas.IncomeSourceOut, status_code=status.HTTP_201_CREATED)
 def create_income_source(
     payload: schemas.IncomeSourceCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_income_source_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     source_count = (
         db.query(func.count(models.IncomeSource.id))
         .filter(models.IncomeSource.owner_id == current_user.id)
@@ -743,13 +826,9 @@ def create_income_source(
 def update_income_source(
     source_id: int,
     payload: schemas.IncomeSourceUpdate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_income_source_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
     source = _get_owned_source_or_404(db, current_user.id, source_id)
 
     duplicate = (
@@ -778,9 +857,6 @@ def delete_income_source(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_income_source_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
     source = _get_owned_source_or_404(db, current_user.id, source_id)
     db.delete(source)
     db.commit()
@@ -792,13 +868,9 @@ def delete_income_source(
 def update_income_source_active_state(
     source_id: int,
     payload: schemas.IncomeSourceStatusUpdate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_income_source_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
     source = _get_owned_source_or_404(db, current_user.id, source_id)
     source.is_active = payload.is_active
     db.commit()
@@ -806,7 +878,7 @@ def update_income_source_active_state(
     return source
 
 
-@router.get("/entries", response_model=schemas.PaginatedIncomeEntriesOut)
+@router.get("/entries", response_model=schemas.PaginatedIncomeEntriesOut, dependencies=[Depends(etag_precondition)])
 def list_income_entries(
     limit: int = Query(default=20, ge=1, le=100),
     skip: int = Query(default=0, ge=0),
@@ -845,16 +917,12 @@ def list_income_entries(
 @router.post("/entries", response_model=schemas.IncomeEntryOut, status_code=status.HTTP_201_CREATED)
 def create_income_entry(
     payload: schemas.IncomeEntryCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
     today = today_in_tz(user_tz)
     current_month_start = today.replace(day=1)
-    rate_headers = enforce_income_entry_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
 
     _validate_entry_date_in_current_month(payload.date, today)
     _ensure_source_belongs_to_user(db, current_user.id, payload.source_id)
@@ -908,14 +976,10 @@ def create_income_entry(
 def update_income_entry(
     entry_id: int,
     payload: schemas.IncomeEntryUpdate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    rate_headers = enforce_income_entry_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
     _validate_entry_date_in_current_month(payload.date, today_in_tz(user_tz))
     _ensure_source_belongs_to_user(db, current_user.id, payload.source_id)
     entry = _get_owned_entry_or_404(db, current_user.id, entry_id)
@@ -991,10 +1055,6 @@ def delete_income_entry(
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    rate_headers = enforce_income_entry_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     # Look up the event regardless of status so we can distinguish
     # "not found" from "already voided".
     entry = _get_owned_entry_any_status_or_404(db, current_user.id, entry_id)
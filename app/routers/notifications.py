@@ -1,12 +1,15 @@
 import logging
-from sqlalchemy import func
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from typing import Optional
 
 from .. import oauth2, models, schemas
+from ..domains.ledger import bump_ledger_version
+from ..etag import etag_precondition
+from ..keyset import keyset_after, next_cursor
+from ..realtime import queue_unread_count, queue_unread_delta
+from ..services.notification_service import get_unread_count as get_owner_unread_count
 from ..session import get_db
-from app.redis_rate_limiter import consume_token_bucket
 
 logger = logging.getLogger(__name__)
 
@@ -15,45 +18,16 @@ router = APIRouter(
     tags=["Notifications"]
 )
 
-NOTIFICATION_READ_BUCKET_CAPACITY = 30
-NOTIFICATION_READ_REFILL_RATE = 30 / 60
 
-
-def enforce_notification_rate_limit(user_id: int) -> dict[str, str]:
-    rl = consume_token_bucket(
-        scope="notifications_read",
-        identifier=str(user_id),
-        capacity=NOTIFICATION_READ_BUCKET_CAPACITY,
-        refill_rate_per_second=NOTIFICATION_READ_REFILL_RATE,
-    )
-    headers = {
-        "X-RateLimit-Limit": str(rl.limit),
-        "X-RateLimit-Remaining": str(rl.remaining),
-        "X-RateLimit-Reset": str(rl.reset_seconds),
-    }
-    if not rl.allowed:
-        headers["Retry-After"] = str(rl.reset_seconds)
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="notifications.rate_limited",
-            headers=headers,
-        )
-    return headers
-
-
-@router.get("/", response_model=schemas.NotificationListOut)
+@router.get("/", response_model=schemas.NotificationListOut, dependencies=[Depends(etag_precondition)])
 def get_notifications(
-    response: Response,
     is_read: Optional[bool] = Query(None, description="Filter by read status"),
     limit: int = Query(20, ge=1, le=100, description="Number of notifications to return"),
     offset: int = Query(0, ge=0, description="Number of notifications to skip"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    rate_headers = enforce_notification_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     query = db.query(models.Notification).filter(
         models.Notification.owner_id == current_user.id
     )
@@ -61,39 +35,50 @@ def get_notifications(
     if is_read is not None:
         query = query.filter(models.Notification.is_read == is_read)
 
-    total = query.count()
-
-    unread_count = db.query(func.count(models.Notification.id)).filter(
-        models.Notification.owner_id == current_user.id,
-        models.Notification.is_read.is_(False),
-    ).scalar() or 0
-
-    notifications = (
-        query
-        .order_by(models.Notification.created_at.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
+    unread_count = get_owner_unread_count(db, current_user.id)
+    # The unread total comes from the counter; other totals are only counted
+    # for the first page, cursor pages omit them.
+    total = None
+    if is_read is False:
+        total = unread_count
+    elif cursor is None:
+        total = query.count()
+
+    if cursor is not None:
+        query = query.filter(
+            keyset_after(
+                db,
+                models.Notification,
+                owner_id=current_user.id,
+                cursor=cursor,
+                order_by=(models.Notification.created_at,),
+                invalid_detail="notifications.cursor_invalid",
+            )
+        )
+    query = query.order_by(
+        models.Notification.created_at.desc(),
+        models.Notification.id.desc(),
     )
+    if cursor is None:
+        query = query.offset(offset)
+    notifications = query.limit(limit + 1).all()
+    has_more = len(notifications) > limit
+    notifications = notifications[:limit]
 
     return schemas.NotificationListOut(
         total=total,
         unread_count=unread_count,
         items=notifications,
+        next_cursor=next_cursor(notifications, has_more),
     )
 
 
-@router.get("/unread-count", response_model=dict)
+@router.get("/unread-count", response_model=dict, dependencies=[Depends(etag_precondition)])
 def get_unread_count(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    count = db.query(func.count(models.Notification.id)).filter(
-        models.Notification.owner_id == current_user.id,
-        models.Notification.is_read.is_(False),
-    ).scalar() or 0
-
-    return {"unread_count": count}
+    return {"unread_count": get_owner_unread_count(db, current_user.id)}
 
 
 @router.post("/mark-read", status_code=status.HTTP_204_NO_CONTENT)
@@ -102,10 +87,13 @@ def mark_notifications_read(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    db.query(models.Notification).filter(
+    marked = db.query(models.Notification).filter(
         models.Notification.owner_id == current_user.id,
         models.Notification.id.in_(payload.notification_ids),
+        models.Notification.is_read.is_(False),
     ).update({"is_read": True}, synchronize_session=False)
+    bump_ledger_version(db, current_user.id)
+    queue_unread_delta(db, current_user.id, -marked)
 
     db.commit()
     return None
@@ -116,10 +104,12 @@ def mark_all_notifications_read(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    db.query(models.Notification).filter(
+    marked = db.query(models.Notification).filter(
         models.Notification.owner_id == current_user.id,
         models.Notification.is_read.is_(False),
     ).update({"is_read": True}, synchronize_session=False)
+    bump_ledger_version(db, current_user.id)
+    queue_unread_delta(db, current_user.id, -marked)
 
     db.commit()
     return None
@@ -161,6 +151,9 @@ def delete_all_notifications(
         query = query.filter(models.Notification.is_read)
 
     query.delete(synchronize_session=False)
+    bump_ledger_version(db, current_user.id)
+    if not is_read:
+        queue_unread_count(db, current_user.id)
     db.commit()
     return None
 
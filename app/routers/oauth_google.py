@@ -9,16 +9,14 @@ import httpx
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 # pyrefly: ignore [missing-import]
 from fastapi.responses import RedirectResponse
-# pyrefly: ignore [missing-import]
-from google.auth.transport import requests as google_requests
-# pyrefly: ignore [missing-import]
-from google.oauth2 import id_token
 from jose import JWTError, jwt
 # pyrefly: ignore [missing-import]
 from sqlalchemy.orm import Session
 
 from app import models, oauth2, utils, schemas
 from app.audit import log_security_event, SecurityAction, SecurityStatus
+from app.google_keys import verify_google_id_token
+from app.http_clients import get_sync_client
 from app.session import get_db
 from config import settings
 
@@ -104,7 +102,7 @@ def google_callback(code: str, state: str, request: Request, response: Response,
 
     for attempt in range(GOOGLE_TOKEN_MAX_RETRIES + 1):
         try:
-            token_resp = httpx.post(
+            token_resp = get_sync_client().post(
                 GOOGLE_TOKEN_URL,
                 data=token_request_data,
                 timeout=GOOGLE_TOKEN_TIMEOUT_SECONDS,
@@ -126,12 +124,7 @@ def google_callback(code: str, state: str, request: Request, response: Response,
     if not raw_id_token:
         raise HTTPException(status_code=400, detail="auth.google_id_token_missing")
 
-    idinfo = id_token.verify_oauth2_token(
-        raw_id_token,
-        google_requests.Request(),
-        settings.google_client_id,
-        clock_skew_in_seconds=10,
-    )
+    idinfo = verify_google_id_token(raw_id_token, settings.google_client_id)
 
     # nonce check (important)
     if idinfo.get("nonce") != nonce_expected:
@@ -208,11 +201,7 @@ def google_login_native(req: schemas.GoogleNativeAuthRequest, request: Request,
     try:
         # Verify the token. We omit 'audience' check here to handle it manually
         # against multiple valid client IDs (web, ios, android).
-        idinfo = id_token.verify_oauth2_token(
-            req.id_token,
-            google_requests.Request(),
-            clock_skew_in_seconds=10,
-        )
+        idinfo = verify_google_id_token(req.id_token)
     except Exception:
         raise HTTPException(status_code=400, detail="auth.google_id_token_invalid")
 
@@ -1,7 +1,7 @@
 from datetime import date, datetime, timezone, tzinfo
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, status
 # pyrefly: ignore [missing-import]
 from sqlalchemy import func
 # pyrefly: ignore [missing-import]
@@ -21,12 +21,12 @@ from app.domains.payment_plans import (
     generate_schedule_preview,
 )
 from .. import models, oauth2, schemas
-from ..redis_rate_limiter import consume_token_bucket
 from ..services.debt_service import (
     reconcile_debt,
 )
 from ..services.session_draft_service import validate_session_item_links
 from ..services.wallet_service import WalletService
+from ..etag import etag_precondition
 from ..session import get_db
 from .debts import (
     _create_financial_event_reversal,
@@ -38,33 +38,9 @@ router = APIRouter(
     tags=["PaymentPlans (Nasiya)"],
 )
 
-PAYMENT_PLANS_WRITE_BUCKET_CAPACITY = 20
-PAYMENT_PLANS_WRITE_REFILL_RATE = 20 / 60
 PAYMENT_PLAN_SETUP_UPDATE_FIELDS = {"total_price", "down_payment", "months", "frequency", "start_date"}
 
 
-def enforce_payment_plans_write_rate_limit(user_id: int) -> dict[str, str]:
-    rl = consume_token_bucket(
-        scope="payment_plans_write",
-        identifier=str(user_id),
-        capacity=PAYMENT_PLANS_WRITE_BUCKET_CAPACITY,
-        refill_rate_per_second=PAYMENT_PLANS_WRITE_REFILL_RATE,
-    )
-    headers = {
-        "X-RateLimit-Limit": str(rl.limit),
-        "X-RateLimit-Remaining": str(rl.remaining),
-        "X-RateLimit-Reset": str(rl.reset_seconds),
-    }
-    if not rl.allowed:
-        headers["Retry-After"] = str(rl.reset_seconds)
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="payment_plans.write_rate_limited",
-            headers=headers,
-        )
-    return headers
-
-
 def _get_owned_plan_or_404(db: Session, user_id: int, plan_id: int) -> models.PaymentPlan:
     plan = (
         db.query(models.PaymentPlan)
@@ -1088,8 +1064,7 @@ def _create_payment_plan_in_transaction(
     return plan
 
 
-
-@router.get("/summary", response_model=schemas.PaymentPlanSummaryOut)
+@router.get("/summary", response_model=schemas.PaymentPlanSummaryOut, dependencies=[Depends(etag_precondition)])
 def get_payment_plan_summary(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
@@ -1323,15 +1298,10 @@ def preview_payment_plan_schedule(
 @router.post("", response_model=schemas.PaymentPlanWithPaymentsOut, status_code=status.HTTP_201_CREATED)
 def create_payment_plan(
     payload: schemas.PaymentPlanCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    rate_headers = enforce_payment_plans_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
-
     plan = _create_payment_plan_in_transaction(
         db,
         current_user.id,
@@ -1343,7 +1313,7 @@ def create_payment_plan(
     return _build_enriched_plan_response(plan, user_tz)
 
 
-@router.get("", response_model=schemas.PaymentPlanListOut)
+@router.get("", response_model=schemas.PaymentPlanListOut, dependencies=[Depends(etag_precondition)])
 def list_payment_plans(
     status: Optional[models.PaymentPlanStatus] = None,
     limit: int = 50,
@@ -1390,15 +1360,10 @@ def get_payment_plan_details(
 def update_payment_plan(
     plan_id: int,
     payload: schemas.PaymentPlanUpdate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    rate_headers = enforce_payment_plans_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
-
     plan = _get_owned_plan_or_404(db, current_user.id, plan_id)
     if plan.status == models.PaymentPlanStatus.ARCHIVED:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="payment_plans.archived_locked")
@@ -1445,15 +1410,10 @@ def update_payment_plan(
 @router.post("/{plan_id}/payments/undo-latest", response_model=schemas.PaymentPlanDetailsOut)
 def undo_latest_payment_plan_payment(
     plan_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    rate_headers = enforce_payment_plans_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
-
     plan = _get_owned_plan_or_404(db, current_user.id, plan_id)
     if plan.status == models.PaymentPlanStatus.ARCHIVED:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="payment_plans.archived_locked")
@@ -1595,15 +1555,10 @@ def undo_latest_payment_plan_payment(
 def record_payment_plan_payment(
     plan_id: int,
     payload: schemas.PaymentPlanPaymentRecordCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    rate_headers = enforce_payment_plans_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
-
     plan = _get_owned_plan_or_404(db, current_user.id, plan_id)
     if plan.status == models.PaymentPlanStatus.ARCHIVED:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="payment_plans.archived_locked")
@@ -1736,15 +1691,10 @@ def record_payment_plan_payment(
 def mark_payment_paid(
     payment_id: int,
     payload: schemas.MarkPaidIn,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    rate_headers = enforce_payment_plans_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
-
     payment = (
         db.query(models.PaymentPlanPayment)
         .options(
@@ -1873,21 +1823,14 @@ def mark_payment_paid(
     return _enrich_payment_response(payment, user_tz)
 
 
-
-
 @router.post("/payments/{payment_id}/write-off", response_model=schemas.PaymentPlanPaymentOut)
 def write_off_payment(
     payment_id: int,
     payload: schemas.PaymentPlanRowWriteOffIn = schemas.PaymentPlanRowWriteOffIn(),
-    response: Response = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    rate_headers = enforce_payment_plans_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
-
     payment = (
         db.query(models.PaymentPlanPayment)
         .options(
@@ -1984,7 +1927,6 @@ def write_off_payment(
 @router.post("/payments/{payment_id}/undo-write-off", response_model=schemas.PaymentPlanPaymentOut)
 def undo_write_off_payment(
     payment_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
@@ -1994,9 +1936,6 @@ def undo_write_off_payment(
     The original WRITE_OFF entry is preserved. Row written_off_amount is
     restored. No wallet movement is created (write-offs never touched wallets).
     """
-    rate_headers = enforce_payment_plans_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
 
     payment = (
         db.query(models.PaymentPlanPayment)
@@ -2128,20 +2067,14 @@ def undo_write_off_payment(
     return _enrich_payment_response(payment, user_tz)
 
 
-
 @router.post("/{plan_id}/charges", response_model=schemas.PaymentPlanWithPaymentsOut, status_code=status.HTTP_201_CREATED)
 def add_payment_plan_charge(
     plan_id: int,
     payload: schemas.PaymentPlanChargeCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    rate_headers = enforce_payment_plans_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
-
     plan = _get_owned_plan_or_404(db, current_user.id, plan_id)
     if plan.status == models.PaymentPlanStatus.ARCHIVED:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="payment_plans.archived_locked")
@@ -2203,7 +2136,6 @@ def add_payment_plan_charge(
 @router.post("/{plan_id}/charges/undo-latest", response_model=schemas.PaymentPlanDetailsOut)
 def undo_latest_charge(
     plan_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
@@ -2213,9 +2145,6 @@ def undo_latest_charge(
     The original CHARGE entry and charge row are preserved. Only the most
     recent unreversed CHARGE entry may be reversed.
     """
-    rate_headers = enforce_payment_plans_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
 
     plan = _get_owned_plan_or_404(db, current_user.id, plan_id)
     if plan.status == models.PaymentPlanStatus.ARCHIVED:
@@ -2317,7 +2246,6 @@ def undo_latest_charge(
 def write_off_plan(
     plan_id: int,
     payload: schemas.PaymentPlanWriteOffIn,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
@@ -2330,9 +2258,6 @@ def write_off_plan(
     No wallet money moves. Each touched row gets a WRITE_OFF ledger entry
     and an allocation record.
     """
-    rate_headers = enforce_payment_plans_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
 
     plan = _get_owned_plan_or_404(db, current_user.id, plan_id)
     if plan.status == models.PaymentPlanStatus.ARCHIVED:
@@ -2425,7 +2350,6 @@ def write_off_plan(
 @router.post("/{plan_id}/archive", response_model=schemas.PaymentPlanWithPaymentsOut)
 def archive_payment_plan(
     plan_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
@@ -2436,9 +2360,6 @@ def archive_payment_plan(
     allocations, ledger entries, balances, lifecycle, or time status.
     An archived plan can be restored (unarchived).
     """
-    rate_headers = enforce_payment_plans_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
 
     plan = _get_owned_plan_or_404(db, current_user.id, plan_id)
     if plan.archived_at is not None:
@@ -2453,7 +2374,6 @@ def archive_payment_plan(
 @router.post("/{plan_id}/unarchive", response_model=schemas.PaymentPlanWithPaymentsOut)
 def unarchive_payment_plan(
     plan_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
@@ -2463,9 +2383,6 @@ def unarchive_payment_plan(
     Restoring does not change rows, allocations, ledger entries, balances,
     lifecycle, or time status. It simply clears the archive timestamp.
     """
-    rate_headers = enforce_payment_plans_write_rate_limit(current_user.id)
-    for key, value in rate_headers.items():
-        response.headers[key] = value
 
     plan = _get_owned_plan_or_404(db, current_user.id, plan_id)
     if plan.archived_at is None:
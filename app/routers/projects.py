@@ -7,7 +7,6 @@ from sqlalchemy.orm import Session
 # pyrefly: ignore [missing-import]
 from sqlalchemy import func
 
-from app.redis_rate_limiter import consume_token_bucket
 from app.timezone import get_effective_user_timezone, today_in_tz
 
 from .. import models, oauth2, schemas
@@ -53,6 +52,7 @@ from ..services.overlay_project_service import (
     validate_overlay_project_category_reservation,
     validate_overlay_project_subcategory_reservation,
 )
+from ..etag import etag_precondition
 from ..session import get_db
 
 router = APIRouter(
@@ -60,36 +60,6 @@ router = APIRouter(
     tags=["Projects"],
 )
 
-PROJECT_WRITE_BUCKET_CAPACITY = 10
-PROJECT_WRITE_REFILL_RATE = 10 / 60
-
-
-def enforce_project_write_rate_limit(user_id: int) -> dict[str, str]:
-    rl = consume_token_bucket(
-        scope="projects_write",
-        identifier=str(user_id),
-        capacity=PROJECT_WRITE_BUCKET_CAPACITY,
-        refill_rate_per_second=PROJECT_WRITE_REFILL_RATE,
-    )
-    headers = {
-        "X-RateLimit-Limit": str(rl.limit),
-        "X-RateLimit-Remaining": str(rl.remaining),
-        "X-RateLimit-Reset": str(rl.reset_seconds),
-    }
-    if not rl.allowed:
-        headers["Retry-After"] = str(rl.reset_seconds)
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="projects.write_rate_limited",
-            headers=headers,
-        )
-    return headers
-
-
-def _apply_headers(response: Response, headers: dict[str, str]) -> None:
-    for key, value in headers.items():
-        response.headers[key] = value
-
 
 def _get_owned_goal_or_404(db: Session, user_id: int, goal_id: int) -> models.Goals:
     goal = db.query(models.Goals).filter(models.Goals.id ==
@@ -116,6 +86,7 @@ def _project_detail_out(
             budget_year,
             budget_month,
             default_budget_date=default_budget_date,
+            project_id=project_id,
         )
     }
     summary = summaries.get(project_id)
@@ -167,13 +138,10 @@ def _validate_isolated_category_allocations(
 @router.post("", response_model=schemas.ProjectBudgetOut, status_code=status.HTTP_201_CREATED)
 def create_project(
     payload: schemas.ProjectCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
-
     if payload.origin_goal_id is not None:
         _get_owned_goal_or_404(db, current_user.id, payload.origin_goal_id)
         existing = (
@@ -324,10 +292,11 @@ def create_project(
     return _project_detail_out(db, current_user.id, project.id, default_budget_date=today_in_tz(user_tz))
 
 
-@router.get("", response_model=List[schemas.ProjectBudgetOut])
+@router.get("", response_model=List[schemas.ProjectBudgetOut], dependencies=[Depends(etag_precondition)])
 def list_projects(
     budget_year: int | None = None,
     budget_month: int | None = None,
+    include_history: bool = False,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
@@ -338,18 +307,16 @@ def list_projects(
         budget_year,
         budget_month,
         default_budget_date=today_in_tz(user_tz),
+        include_history=include_history,
     )
 
 
 @router.post("/overlay", response_model=schemas.ProjectBudgetOut, status_code=status.HTTP_201_CREATED)
 def create_overlay_project(
     payload: schemas.ProjectOverlayCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
-
     seen_categories: set[models.ExpenseCategory] = set()
     for item in payload.category_reservations:
         validate_active_expense_category(
@@ -469,12 +436,10 @@ def get_project(
 def top_up_isolated_project(
     project_id: int,
     payload: schemas.ProjectTopUpRequest,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
     project = get_owned_project_or_404(db, current_user.id, project_id)
     apply_isolated_project_top_up(
         db, current_user.id, project, payload.wallet_allocations)
@@ -486,12 +451,10 @@ def top_up_isolated_project(
 def allocate_isolated_project_category_funding(
     project_id: int,
     payload: schemas.ProjectCategoryAllocationRequest,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
     project = get_owned_project_or_404(db, current_user.id, project_id)
     apply_isolated_project_category_allocation(
         db,
@@ -507,12 +470,10 @@ def allocate_isolated_project_category_funding(
 def allocate_isolated_project_subcategory_funding(
     project_id: int,
     payload: schemas.ProjectSubcategoryAllocationRequest,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
     project = get_owned_project_or_404(db, current_user.id, project_id)
     apply_isolated_project_subcategory_allocation(
         db,
@@ -531,12 +492,10 @@ def allocate_isolated_project_subcategory_funding(
 def rebalance_isolated_project_funding(
     project_id: int,
     payload: schemas.ProjectRebalanceRequest,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
     project = get_owned_project_or_404(db, current_user.id, project_id)
     apply_isolated_project_rebalance(db, current_user.id, project, payload)
     db.commit()
@@ -557,11 +516,9 @@ def get_project_delete_preview(
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_project(
     project_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
     project = get_owned_project_or_404(db, current_user.id, project_id)
     delete_pristine_overlay_project(db, project)
     db.commit()
@@ -572,12 +529,10 @@ def delete_project(
 def resolve_project_deletion(
     project_id: int,
     payload: schemas.ProjectDeletionResolutionRequest,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
     project = get_owned_project_or_404(db, current_user.id, project_id)
     validate_overlay_project_deletion_target(project)
 
@@ -611,12 +566,10 @@ def resolve_project_deletion(
 def update_project(
     project_id: int,
     payload: schemas.ProjectUpdate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
     project = get_owned_project_or_404(db, current_user.id, project_id)
     ensure_project_typology_details(db, project)
     validate_project_editable(project)
@@ -681,12 +634,10 @@ def update_project(
 @router.post("/{project_id}/stop", response_model=schemas.ProjectBudgetOut)
 def stop_project(
     project_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
     project = get_owned_project_or_404(db, current_user.id, project_id)
     if project.status != models.ProjectStatus.ACTIVE:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
@@ -699,12 +650,10 @@ def stop_project(
 @router.post("/{project_id}/resume", response_model=schemas.ProjectBudgetOut)
 def resume_project(
     project_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
     project = get_owned_project_or_404(db, current_user.id, project_id)
     if project.status != models.ProjectStatus.STOPPED:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
@@ -718,12 +667,10 @@ def resume_project(
 def complete_project(
     project_id: int,
     payload: schemas.ProjectLifecycleRequest,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
     project = get_owned_project_or_404(db, current_user.id, project_id)
     if project.status not in (models.ProjectStatus.ACTIVE, models.ProjectStatus.STOPPED):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
@@ -767,12 +714,10 @@ def get_project_wrap_up_summary(
 @router.post("/{project_id}/archive", response_model=schemas.ProjectBudgetOut)
 def archive_project(
     project_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
     project = get_owned_project_or_404(db, current_user.id, project_id)
     if project.status == models.ProjectStatus.ARCHIVED:
         raise HTTPException(
@@ -785,12 +730,10 @@ def archive_project(
 @router.post("/{project_id}/reopen", response_model=schemas.ProjectBudgetOut)
 def reopen_project(
     project_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
     project = get_owned_project_or_404(db, current_user.id, project_id)
     if project.status == models.ProjectStatus.ACTIVE:
         raise HTTPException(
@@ -805,12 +748,10 @@ def reopen_project(
 def create_project_category_limit(
     project_id: int,
     payload: schemas.ProjectCategoryLimitCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
     validate_active_expense_category(
         payload.category,
         error_detail="projects.validation.real_expense_category_required",
@@ -896,12 +837,10 @@ def update_project_category_limit(
     project_id: int,
     category: models.ExpenseCategory,
     payload: schemas.ProjectCategoryLimitUpdate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
     project = get_owned_project_or_404(db, current_user.id, project_id)
     validate_project_editable(project)
     budget_year = payload.budget_year
@@ -966,14 +905,12 @@ def update_project_category_limit(
 def delete_project_category_limit(
     project_id: int,
     category: models.ExpenseCategory,
-    response: Response,
     budget_year: int | None = None,
     budget_month: int | None = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
     project = get_owned_project_or_404(db, current_user.id, project_id)
     validate_project_editable(project)
     if is_isolated_project(project):
@@ -1206,12 +1143,10 @@ def list_project_subcategories(
 def create_project_subcategory(
     project_id: int,
     payload: schemas.ProjectSubcategoryCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
     validate_active_expense_category(
         payload.category,
         error_detail="projects.validation.real_expense_category_required",
@@ -1348,12 +1283,10 @@ def update_project_subcategory(
     project_id: int,
     subcategory_id: int,
     payload: schemas.ProjectSubcategoryUpdate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
     project = get_owned_project_or_404(db, current_user.id, project_id)
     validate_project_editable(project)
     if is_isolated_project(project):
@@ -1501,12 +1434,10 @@ def update_project_subcategory(
 def delete_project_subcategory(
     project_id: int,
     subcategory_id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    _apply_headers(response, enforce_project_write_rate_limit(current_user.id))
     project = get_owned_project_or_404(db, current_user.id, project_id)
     validate_project_editable(project)
     if is_isolated_project(project):
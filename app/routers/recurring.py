@@ -1,13 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, status
 # pyrefly: ignore [missing-import]
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import tzinfo
 
 from app import models, schemas, oauth2
+from app.etag import etag_precondition
 from app.session import get_db
 from app.timezone import get_effective_user_timezone, today_in_tz
-from app.redis_rate_limiter import consume_token_bucket
 from app.services.recurring_occurrence_service import (
     apply_template_rule_updates,
     archive_template,
@@ -22,31 +22,6 @@ from app.services.recurring_projection_service import (
     validate_projection_horizons,
 )
 
-RECURRING_WRITE_BUCKET_CAPACITY = 10
-RECURRING_WRITE_REFILL_RATE = 10 / 60
-
-
-def enforce_recurring_write_rate_limit(user_id: int) -> dict[str, str]:
-    rl = consume_token_bucket(
-        scope="recurring_write",
-        identifier=str(user_id),
-        capacity=RECURRING_WRITE_BUCKET_CAPACITY,
-        refill_rate_per_second=RECURRING_WRITE_REFILL_RATE,
-    )
-    headers = {
-        "X-RateLimit-Limit": str(rl.limit),
-        "X-RateLimit-Remaining": str(rl.remaining),
-        "X-RateLimit-Reset": str(rl.reset_seconds),
-    }
-    if not rl.allowed:
-        headers["Retry-After"] = str(rl.reset_seconds)
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="recurring_expenses.write_rate_limited",
-            headers=headers,
-        )
-    return headers
-
 
 def _serialize_recurring_out(
     recurring: models.RecurringExpense,
@@ -101,7 +76,6 @@ def _get_owned_recurring_or_404(
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=schemas.RecurringExpenseOut)
 def create_recurring_expense(
     expense: schemas.RecurringExpenseCreate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_premium_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
@@ -117,9 +91,6 @@ def create_recurring_expense(
     │ future (this or next month)  │ Just save template; scheduler fires on due date│
     └──────────────────────────────┴────────────────────────────────────────────────┘
     """
-    rate_headers = enforce_recurring_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
 
     active_template_count = db.query(models.RecurringExpense).filter(
         models.RecurringExpense.owner_id == current_user.id,
@@ -183,7 +154,7 @@ def create_recurring_expense(
     return _serialize_recurring_out(new_recurring, user_tz)
 
 
-@router.get("/", response_model=List[schemas.RecurringExpenseOut])
+@router.get("/", response_model=List[schemas.RecurringExpenseOut], dependencies=[Depends(etag_precondition)])
 def get_recurring_expenses(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_premium_user),
@@ -296,15 +267,10 @@ def preview_recurring_projections(
 def save_recurring_projection_horizons(
     id: int,
     payload: schemas.RecurringProjectionHorizonListIn,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_premium_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    rate_headers = enforce_recurring_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
-
     recurring = _get_owned_recurring_or_404(db, current_user.id, id)
     horizons = validate_projection_horizons(recurring.frequency, payload.horizons)
     recurring.custom_projection_horizons = horizons
@@ -320,14 +286,10 @@ def save_recurring_projection_horizons(
 def update_recurring_expense(
     id: int,
     updated_expense: schemas.RecurringExpenseUpdate,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_premium_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
-    rate_headers = enforce_recurring_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
     recurring = get_owned_template(db, current_user.id, id, lock=True)
     update_data = updated_expense.model_dump(exclude_unset=True)
     next_wallet_id = update_data.get("wallet_id", recurring.wallet_id)
@@ -352,15 +314,11 @@ def update_recurring_expense(
 def toggle_recurring_status(
     id: int,
     payload: schemas.RecurringStatusToggle,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_premium_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
 ):
     """Toggle the status between ACTIVE and DISABLED."""
-    rate_headers = enforce_recurring_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
     recurring = get_owned_template(db, current_user.id, id, lock=True)
     old_status = recurring.status
     set_template_active(
@@ -409,7 +367,6 @@ def skip_occurrence_endpoint(
 def change_recurring_wallet(
     id: int,
     payload: schemas.RecurringChangeWallet,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_premium_user),
     user_tz: tzinfo = Depends(get_effective_user_timezone),
@@ -418,9 +375,6 @@ def change_recurring_wallet(
     Swap the wallet for a recurring template. 
     If the template was failing (RETRYING/PAUSED), it automatically resets to ACTIVE.
     """
-    rate_headers = enforce_recurring_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
     
     recurring = get_owned_template(db, current_user.id, id, lock=True)
     new_wallet = validate_preferred_wallet(
@@ -451,13 +405,9 @@ def change_recurring_wallet(
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_recurring_expense(
     id: int,
-    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_premium_user)
 ):
-    rate_headers = enforce_recurring_write_rate_limit(current_user.id)
-    for k, v in rate_headers.items():
-        response.headers[k] = v
     recurring = get_owned_template(db, current_user.id, id, lock=True)
     archive_template(recurring)
     db.commit()
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 
 from .. import models, oauth2, schemas
 from ..savings_balances import build_savings_summary, ensure_premium_user
+from ..etag import etag_precondition
 from ..session import get_db
 
 router = APIRouter(
@@ -11,7 +12,7 @@ router = APIRouter(
 )
 
 
-@router.get("/summary", response_model=schemas.GoalFundingSummaryOut)
+@router.get("/summary", response_model=schemas.GoalFundingSummaryOut, dependencies=[Depends(etag_precondition)])
 def get_savings_summary(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List, Optional
 
+from app.etag import etag_precondition
 from app.session import get_db
 # pyrefly: ignore [missing-import]
 from app.oauth2 import get_current_user
@@ -23,7 +24,7 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=List[UserSubcategoryOut])
+@router.get("/", response_model=List[UserSubcategoryOut], dependencies=[Depends(etag_precondition)])
 def get_user_subcategories(
     category: Optional[ExpenseCategory] = Query(None, description="Filter by category"),
     db: Session = Depends(get_db),
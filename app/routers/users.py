@@ -16,7 +16,8 @@ from .. import models, schemas, utils
 from ..session import get_db
 from app.audit import log_security_event, SecurityAction, SecurityStatus
 from app.redis_rate_limiter import check_and_consume, consume_token_bucket, redis_client
-from app.email_service import send_verification_email
+from app.email_outbox import email_delivery_configured, enqueue_email
+from app.email_service import verification_email
 from app.email_verification import build_verify_email_link, issue_email_verification_token
 from app.timezone import _safe_zoneinfo
 from config import settings
@@ -215,9 +216,11 @@ def create_user(
 
     db.refresh(new_user)
     if not new_user.is_verified:
-        raw_token = issue_email_verification_token(db, new_user)
+        raw_token = issue_email_verification_token(db, new_user, commit=False)
         verify_link = build_verify_email_link(raw_token)
-        sent = send_verification_email(new_user.email, verify_link, idempotency_key=raw_token)
+        enqueue_email(db, verification_email(new_user.email, verify_link, idempotency_key=raw_token))
+        db.commit()
+        sent = email_delivery_configured()
         if not sent and not settings.is_production:
             logger.info("Email verification link fallback for %s: %s", new_user.email, verify_link)
         out_data = build_user_out(new_user, verification_email_sent=sent)
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from .. import models, oauth2, schemas
+from ..etag import etag_precondition
 from ..session import get_db
 from ..services.goal_funding_service import (
     get_wallet_goal_allocated_amount,
@@ -114,7 +115,7 @@ def _build_transfer_out(
         fee_event_id=fee_event.id if fee_event else None,
     )
 
-@router.get("", response_model=List[schemas.WalletOut])
+@router.get("", response_model=List[schemas.WalletOut], dependencies=[Depends(etag_precondition)])
 def list_wallets(
     include_archived: bool = True,
     db: Session = Depends(get_db),
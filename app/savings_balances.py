@@ -1,6 +1,7 @@
 from fastapi import HTTPException, status
 
 from app import models
+from app.read_cache import cached_read
 from app.services.obligation_source_service import regular_debt_obligation_filters
 from app.services.goal_funding_service import (
     build_goal_funding_summary,
@@ -20,6 +21,7 @@ def build_savings_summary(db, user_id: int):
     return build_goal_funding_summary(db, user_id)
 
 
+@cached_read("net_position")
 def get_net_position(db, user_id: int) -> int:
     total_physical_balance = get_total_balance(db, user_id)
 
@@ -1,26 +1,40 @@
 import logging
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import partial
+from typing import Callable
 from zoneinfo import ZoneInfo
 
 try:  # pyright: ignore[reportMissingImports]
+    from apscheduler.events import EVENT_JOB_SUBMITTED
+    from apscheduler.executors.pool import ThreadPoolExecutor as JobThreadPoolExecutor
     from apscheduler.schedulers.asyncio import AsyncIOScheduler
+    from apscheduler.triggers.cron import CronTrigger
     from apscheduler.triggers.interval import IntervalTrigger  # pyright: ignore[reportMissingImports]
 except Exception:  # pragma: no cover - optional local dependency
     AsyncIOScheduler = None
+    CronTrigger = None
     IntervalTrigger = None
 
 # pyrefly: ignore [missing-import]
 from sqlalchemy.exc import ProgrammingError
 # pyrefly: ignore [missing-import]
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from app import models
+from app.email_outbox import dispatch_email_outbox, purge_settled_emails
+from app.services.notification_service import purge_read_notifications
 from app.services.recurring_occurrence_service import (
     create_pending_due_occurrence,
     notify_pending_confirmation_once,
 )
+from app.scheduler_leadership import LeaderElector
 from app.session import SessionLocal
 from app.timezone import today_in_tz
+from config import settings
 
 
 logger = logging.getLogger(__name__)
@@ -35,88 +49,457 @@ def _user_local_today(template: models.RecurringExpense):
     return today_in_tz(user_timezone)
 
 
+@dataclass
+class JobRunStats:
+    runs: int = 0
+    skipped: int = 0
+    failures: int = 0
+    processed: int = 0
+    last_processed: int = 0
+    last_duration_seconds: float = 0.0
+    max_duration_seconds: float = 0.0
+    last_lag_seconds: float = 0.0
+    max_lag_seconds: float = 0.0
+    last_run_at: datetime | None = None
 
 
+_job_stats: dict[str, JobRunStats] = {}
+_scheduled_run_times: dict[str, datetime] = {}
+_stats_lock = threading.Lock()
 
-def process_due_recurring_expenses(db: Session | None = None) -> None:
-    """Materialize pending occurrences for due templates."""
+
+def get_scheduler_job_stats() -> dict[str, dict]:
+    """Return per-job run counters, durations and start lag for this process.
+
+    `skipped` counts runs this instance left to the leader.
+    """
+    with _stats_lock:
+        return {
+            job_id: {
+                "runs": stats.runs,
+                "skipped": stats.skipped,
+                "failures": stats.failures,
+                "processed": stats.processed,
+                "last_processed": stats.last_processed,
+                "last_duration_seconds": stats.last_duration_seconds,
+                "max_duration_seconds": stats.max_duration_seconds,
+                "last_lag_seconds": stats.last_lag_seconds,
+                "max_lag_seconds": stats.max_lag_seconds,
+                "last_run_at": stats.last_run_at,
+            }
+            for job_id, stats in _job_stats.items()
+        }
+
+
+def reset_scheduler_job_stats() -> None:
+    with _stats_lock:
+        _job_stats.clear()
+        _scheduled_run_times.clear()
+
+
+def _record_submission(event) -> None:
+    if event.scheduled_run_times:
+        with _stats_lock:
+            _scheduled_run_times[event.job_id] = max(event.scheduled_run_times)
+
+
+def run_leader_job(
+    job_id: str,
+    job: Callable[[], int | None],
+    elector: LeaderElector | None = None,
+) -> int | None:
+    """Run *job* only on the leader instance and record its metrics.
+
+    Lag is measured from the trigger's scheduled run time to the actual start.
+    Jobs report their processed item count by returning an int.
+    """
+    if elector is not None and not (elector.is_leader() or elector.heartbeat()):
+        with _stats_lock:
+            _job_stats.setdefault(job_id, JobRunStats()).skipped += 1
+            _scheduled_run_times.pop(job_id, None)
+        return None
+
+    started_at = datetime.now(timezone.utc)
+    with _stats_lock:
+        scheduled_at = _scheduled_run_times.pop(job_id, None)
+    lag_seconds = max(0.0, (started_at - scheduled_at).total_seconds()) if scheduled_at else 0.0
+
+    started = time.perf_counter()
+    failed = False
+    processed = None
+    try:
+        processed = job()
+        return processed
+    except Exception:
+        failed = True
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        count = processed if isinstance(processed, int) else 0
+        with _stats_lock:
+            stats = _job_stats.setdefault(job_id, JobRunStats())
+            stats.runs += 1
+            stats.failures += int(failed)
+            stats.processed += count
+            stats.last_processed = count
+            stats.last_duration_seconds = round(duration, 4)
+            stats.max_duration_seconds = max(stats.max_duration_seconds, stats.last_duration_seconds)
+            stats.last_lag_seconds = round(lag_seconds, 4)
+            stats.max_lag_seconds = max(stats.max_lag_seconds, stats.last_lag_seconds)
+            stats.last_run_at = started_at
+        logger.info(
+            "Scheduled job %s finished in %.3fs (processed=%s, lag=%.1fs, failed=%s).",
+            job_id,
+            duration,
+            count,
+            lag_seconds,
+            failed,
+        )
+
+
+def _claim_template_chunk(
+    db_session: Session,
+    template_ids: list[int],
+) -> list[models.RecurringExpense]:
+    """Lock the chunk's still-active templates, skipping rows locked elsewhere.
+
+    Skipped templates are picked up by the next run. The owner is joined in so
+    `owner.timezone` does not lazy-load once per template.
+    """
+    return (
+        db_session.query(models.RecurringExpense)
+        .options(joinedload(models.RecurringExpense.owner, innerjoin=True))
+        .filter(
+            models.RecurringExpense.id.in_(template_ids),
+            models.RecurringExpense.status == models.RecurringStatus.ACTIVE,
+            models.RecurringExpense.archived_at.is_(None),
+        )
+        .order_by(models.RecurringExpense.id)
+        .with_for_update(skip_locked=True, of=models.RecurringExpense)
+        .all()
+    )
+
+
+def _process_template_chunk(db_session: Session, template_ids: list[int]) -> int:
+    processed = 0
+    for template in _claim_template_chunk(db_session, template_ids):
+        template_id = template.id
+        try:
+            with db_session.begin_nested():
+                local_today = _user_local_today(template)
+                if template.next_due_date > local_today:
+                    continue
+
+                occurrence = create_pending_due_occurrence(
+                    db_session,
+                    template,
+                    local_today=local_today,
+                )
+                notify_pending_confirmation_once(db_session, template, occurrence)
+                processed += 1
+        except Exception as exc:
+            logger.error("Recurring template %s failed: %s", template_id, exc)
+
+    db_session.commit()
+    return processed
+
+
+def _process_template_chunk_in_session(template_ids: list[int]) -> int:
+    db_session = SessionLocal()
+    try:
+        return _process_template_chunk(db_session, template_ids)
+    except Exception as exc:
+        db_session.rollback()
+        logger.error("Recurring template chunk %s..%s failed: %s", template_ids[0], template_ids[-1], exc)
+        raise
+    finally:
+        db_session.close()
+
+
+def _zone_today(timezone_name: str):
+    try:
+        return today_in_tz(ZoneInfo(timezone_name))
+    except Exception:
+        return today_in_tz(ZoneInfo("UTC"))
+
+
+def _active_template_query(db_session: Session):
+    return (
+        db_session.query(models.RecurringExpense.id)
+        .join(models.User, models.RecurringExpense.owner_id == models.User.id)
+        .filter(
+            models.RecurringExpense.status == models.RecurringStatus.ACTIVE,
+            models.RecurringExpense.archived_at.is_(None),
+            models.User.is_premium,
+        )
+    )
+
+
+def recurring_timezone_buckets(db_session: Session) -> list[str]:
+    """IANA timezones of premium owners with active recurring templates."""
+    rows = (
+        _active_template_query(db_session)
+        .with_entities(models.User.timezone)
+        .distinct()
+        .all()
+    )
+    return sorted(row[0] for row in rows)
+
+
+def _due_template_ids(db_session: Session, timezone_name: str) -> list[int]:
+    local_today = _zone_today(timezone_name)
+    return [
+        row[0]
+        for row in (
+            _active_template_query(db_session)
+            .filter(
+                models.User.timezone == timezone_name,
+                models.RecurringExpense.next_due_date <= local_today,
+            )
+            .order_by(models.RecurringExpense.id)
+            .all()
+        )
+    ]
+
+
+def process_due_recurring_expenses(
+    db: Session | None = None,
+    *,
+    timezone_name: str | None = None,
+) -> int:
+    """Materialize pending occurrences for due templates; return how many were recorded.
+
+    Templates are listed per owner-timezone bucket, and only those due by the
+    bucket's local today are touched. Pass *timezone_name* to process a single
+    bucket (the local-midnight runs); otherwise every bucket is swept.
+
+    Templates are claimed and committed in chunks of
+    `recurring_scheduler_chunk_size`. Without an explicit *db*, chunks run on
+    a pool of `recurring_scheduler_workers` threads, each with its own session.
+    """
     db_session = db or SessionLocal()
     try:
         try:
+            buckets = [timezone_name] if timezone_name else recurring_timezone_buckets(db_session)
             template_ids = [
-                row[0]
-                for row in (
-                    db_session.query(models.RecurringExpense.id)
-                    .join(models.User, models.RecurringExpense.owner_id == models.User.id)
-                    .filter(
-                        models.RecurringExpense.status == models.RecurringStatus.ACTIVE,
-                        models.RecurringExpense.archived_at.is_(None),
-                        models.User.is_premium,
-                    )
-                    .all()
-                )
+                template_id
+                for bucket in buckets
+                for template_id in _due_template_ids(db_session, bucket)
             ]
         except ProgrammingError:
             logger.warning("Recurring tables are not ready; skipping due processing.")
             db_session.rollback()
-            return
-
-        processed = 0
-        for template_id in template_ids:
-            try:
-                with db_session.begin_nested():
-                    template = (
-                        db_session.query(models.RecurringExpense)
-                        .filter(
-                            models.RecurringExpense.id == template_id,
-                            models.RecurringExpense.status == models.RecurringStatus.ACTIVE,
-                            models.RecurringExpense.archived_at.is_(None),
-                        )
-                        .with_for_update()
-                        .first()
-                    )
-                    if template is None:
-                        continue
-
-                    local_today = _user_local_today(template)
-                    if template.next_due_date > local_today:
-                        continue
-
-                    occurrence = create_pending_due_occurrence(
-                        db_session,
-                        template,
-                        local_today=local_today,
-                    )
-                    notify_pending_confirmation_once(db_session, template, occurrence)
-                    processed += 1
-            except Exception as exc:
-                logger.error("Recurring template %s failed: %s", template_id, exc)
+            return 0
 
+        # Release the listing transaction before workers start locking rows.
         db_session.commit()
+        chunk_size = max(1, settings.recurring_scheduler_chunk_size)
+        chunks = [
+            template_ids[index:index + chunk_size]
+            for index in range(0, len(template_ids), chunk_size)
+        ]
+        if db is not None:
+            processed = sum(_process_template_chunk(db_session, chunk) for chunk in chunks)
+        elif chunks:
+            workers = max(1, min(settings.recurring_scheduler_workers, len(chunks)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="recurring") as pool:
+                processed = sum(pool.map(_process_template_chunk_in_session, chunks))
+        else:
+            processed = 0
+
         if processed:
             logger.info("Recurring scheduler recorded %s occurrence(s).", processed)
+        return processed
     except Exception as exc:
         db_session.rollback()
         logger.error("Fatal recurring scheduler error: %s", exc)
+        raise
+    finally:
+        if db is None:
+            db_session.close()
+
+
+def purge_old_read_notifications(db: Session | None = None) -> int:
+    """Retention sweep: delete read notifications past `notification_retention_days`."""
+    db_session = db or SessionLocal()
+    try:
+        purged = purge_read_notifications(db_session)
+        if purged:
+            logger.info("Notification retention removed %s read notification(s).", purged)
+        return purged
+    except Exception as exc:
+        db_session.rollback()
+        logger.error("Notification retention sweep failed: %s", exc)
+        raise
+    finally:
+        if db is None:
+            db_session.close()
+
+
+def dispatch_pending_emails(db: Session | None = None) -> int:
+    """Send due email outbox rows (see app/email_outbox.py)."""
+    db_session = db or SessionLocal()
+    try:
+        return dispatch_email_outbox(db_session)
+    except Exception as exc:
+        db_session.rollback()
+        logger.error("Email outbox dispatch failed: %s", exc)
+        raise
     finally:
         if db is None:
             db_session.close()
 
 
+def purge_old_settled_emails(db: Session | None = None) -> int:
+    """Retention sweep: delete settled outbox rows past `email_outbox_retention_days`."""
+    db_session = db or SessionLocal()
+    try:
+        purged = purge_settled_emails(db_session)
+        if purged:
+            logger.info("Email outbox retention removed %s settled row(s).", purged)
+        return purged
+    except Exception as exc:
+        db_session.rollback()
+        logger.error("Email outbox retention sweep failed: %s", exc)
+        raise
+    finally:
+        if db is None:
+            db_session.close()
+
+
+RECURRING_MIDNIGHT_JOB_PREFIX = "process_recurring_expenses:"
+
+
+def sync_recurring_timezone_jobs(scheduler, elector: LeaderElector | None = None) -> None:
+    """Keep exactly one local-midnight run per owner-timezone bucket.
+
+    Buckets with an unknown zone name have no midnight job; their owners fall
+    back to UTC and are covered by the hourly sweep.
+    """
+    db_session = SessionLocal()
+    try:
+        buckets = recurring_timezone_buckets(db_session)
+    except Exception as exc:
+        logger.warning("Could not list recurring timezone buckets: %s", exc)
+        return
+    finally:
+        db_session.close()
+
+    wanted = {}
+    for timezone_name in buckets:
+        try:
+            wanted[f"{RECURRING_MIDNIGHT_JOB_PREFIX}{timezone_name}"] = (timezone_name, ZoneInfo(timezone_name))
+        except Exception:
+            continue
+
+    for job in scheduler.get_jobs():
+        if job.id.startswith(RECURRING_MIDNIGHT_JOB_PREFIX) and job.id not in wanted:
+            job.remove()
+    for job_id, (timezone_name, zone) in wanted.items():
+        if scheduler.get_job(job_id) is not None:
+            continue
+        scheduler.add_job(
+            run_leader_job,
+            args=[job_id, partial(process_due_recurring_expenses, timezone_name=timezone_name), elector],
+            trigger=CronTrigger(hour=0, minute=0, second=5, timezone=zone),
+            id=job_id,
+            name=f"Recurring occurrences at {timezone_name} midnight",
+            misfire_grace_time=3600,
+            coalesce=True,
+        )
+
+
 def start_scheduler():
-    if AsyncIOScheduler is None or IntervalTrigger is None:
+    if AsyncIOScheduler is None or IntervalTrigger is None or CronTrigger is None:
         logger.warning("APScheduler is not installed. Recurring background scheduler is disabled.")
         return None
 
-    scheduler = AsyncIOScheduler()
+    elector = LeaderElector() if settings.scheduler_leader_election_enabled else None
+
+    # Synchronous jobs run on their own thread pool, never on the event loop
+    # that serves async routes. The lease heartbeat has a thread of its own so
+    # a long job can never delay it past the lease TTL.
+    scheduler = AsyncIOScheduler(
+        executors={
+            "default": JobThreadPoolExecutor(max_workers=2),
+            "lease": JobThreadPoolExecutor(max_workers=1),
+        },
+    )
+    scheduler.add_listener(_record_submission, EVENT_JOB_SUBMITTED)
+    if elector is not None:
+        scheduler.add_job(
+            elector.heartbeat,
+            trigger=IntervalTrigger(seconds=elector.heartbeat_interval_seconds),
+            id="scheduler_leader_heartbeat",
+            name="Scheduler leader lease heartbeat",
+            replace_existing=True,
+            next_run_time=datetime.now(),
+            executor="lease",
+            # A late beat still renews the lease as long as it has not expired.
+            misfire_grace_time=max(1, int(elector.ttl_seconds)),
+            coalesce=True,
+        )
+
+    # Every instance tracks the buckets so any of them can take over as leader.
+    scheduler.add_job(
+        sync_recurring_timezone_jobs,
+        args=[scheduler, elector],
+        trigger=IntervalTrigger(hours=1),
+        id="sync_recurring_timezone_jobs",
+        name="Hourly recurring timezone bucket sync",
+        replace_existing=True,
+        next_run_time=datetime.now(),
+    )
+    # Catch-up sweep for missed midnights and templates created already due.
     scheduler.add_job(
-        process_due_recurring_expenses,
+        run_leader_job,
+        args=["process_recurring_expenses", process_due_recurring_expenses, elector],
         trigger=IntervalTrigger(hours=1),
         id="process_recurring_expenses",
-        name="Hourly recurring occurrence check",
+        name="Hourly recurring occurrence sweep",
         replace_existing=True,
         next_run_time=datetime.now(),
     )
+    scheduler.add_job(
+        run_leader_job,
+        args=["dispatch_email_outbox", dispatch_pending_emails, elector],
+        trigger=IntervalTrigger(seconds=settings.email_dispatch_interval_seconds),
+        id="dispatch_email_outbox",
+        name="Email outbox dispatcher",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.add_job(
+        run_leader_job,
+        args=["purge_read_notifications", purge_old_read_notifications, elector],
+        # Off-peak, at a fixed time, so restarts neither skip nor repeat it.
+        trigger=CronTrigger(hour=3, minute=15, timezone=timezone.utc),
+        id="purge_read_notifications",
+        name="Daily read notification retention sweep",
+        replace_existing=True,
+        misfire_grace_time=3600,
+        coalesce=True,
+    )
+    scheduler.add_job(
+        run_leader_job,
+        args=["purge_settled_emails", purge_old_settled_emails, elector],
+        trigger=CronTrigger(hour=3, minute=45, timezone=timezone.utc),
+        id="purge_settled_emails",
+        name="Daily email outbox retention sweep",
+        replace_existing=True,
+        misfire_grace_time=3600,
+        coalesce=True,
+    )
     scheduler.start()
+    scheduler.leader_elector = elector
     logger.info("Recurring occurrence scheduler started.")
     return scheduler
+
+
+def stop_scheduler(scheduler) -> None:
+    scheduler.shutdown()
+    # Hand the lease over immediately instead of waiting for it to expire.
+    elector = getattr(scheduler, "leader_elector", None)
+    if elector is not None:
+        elector.release()
@@ -0,0 +1,101 @@
+"""Leader election for background jobs.
+
+Every API worker starts its own scheduler, but only the holder of a Redis
+lease runs jobs. The leader renews the lease every third of its TTL; if the
+leader dies, the lease lapses and the next follower heartbeat takes over.
+A graceful shutdown releases the lease so failover is immediate.
+
+Leadership is judged locally against the time the lease was last confirmed,
+so a leader cut off from Redis stops running jobs before its lease can expire
+and be granted to another instance.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+
+from app.redis_rate_limiter import redis_client
+from config import settings
+
+
+logger = logging.getLogger(__name__)
+
+LEASE_KEY = "scheduler:leader"
+
+RENEW_LEASE_SCRIPT = redis_client.register_script(
+    """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+  return redis.call("PEXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+)
+
+RELEASE_LEASE_SCRIPT = redis_client.register_script(
+    """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+  return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+)
+
+
+def _instance_token() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaderElector:
+    """Holds (or competes for) the scheduler lease for this process."""
+
+    def __init__(
+        self,
+        key: str = LEASE_KEY,
+        ttl_seconds: float | None = None,
+        token: str | None = None,
+    ) -> None:
+        self.key = key
+        self.ttl_seconds = ttl_seconds or settings.scheduler_lease_ttl_seconds
+        self.token = token or _instance_token()
+        self._lease_deadline = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def heartbeat_interval_seconds(self) -> float:
+        return max(1.0, self.ttl_seconds / 3)
+
+    def is_leader(self) -> bool:
+        with self._lock:
+            return time.monotonic() < self._lease_deadline
+
+    def heartbeat(self) -> bool:
+        """Renew the lease if this instance holds it, otherwise try to acquire it."""
+        ttl_ms = int(self.ttl_seconds * 1000)
+        confirmed_at = time.monotonic()
+        try:
+            held = bool(
+                RENEW_LEASE_SCRIPT(keys=[self.key], args=[self.token, ttl_ms])
+                or redis_client.set(self.key, self.token, nx=True, px=ttl_ms)
+            )
+        except Exception as exc:
+            logger.warning("Scheduler lease heartbeat failed: %s", exc)
+            return self.is_leader()
+
+        with self._lock:
+            was_leader = time.monotonic() < self._lease_deadline
+            self._lease_deadline = confirmed_at + self.ttl_seconds if held else 0.0
+        if held and not was_leader:
+            logger.info("Scheduler leadership acquired by %s.", self.token)
+        elif was_leader and not held:
+            logger.warning("Scheduler leadership lost by %s.", self.token)
+        return held
+
+    def release(self) -> None:
+        with self._lock:
+            self._lease_deadline = 0.0
+        try:
+            RELEASE_LEASE_SCRIPT(keys=[self.key], args=[self.token])
+        except Exception as exc:
+            logger.warning("Scheduler lease release failed: %s", exc)
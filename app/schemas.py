@@ -933,6 +933,16 @@ class ExpectedInflowCashflowRowOut(BaseModel):
     promise_is_open: bool
 
 
+class ExpectedInflowPromisePage(BaseModel):
+    items: List[ExpectedInflowPromiseOut]
+    next_cursor: Optional[str] = None
+
+
+class ExpectedInflowCashflowPage(BaseModel):
+    items: List[ExpectedInflowCashflowRowOut]
+    next_cursor: Optional[str] = None
+
+
 class MoneyInKind(str, Enum):
     ALL = "all"
     INCOME = "income"
@@ -971,8 +981,9 @@ class MoneyInItemOut(BaseModel):
 
 
 class PaginatedMoneyInOut(BaseModel):
-    total: int
+    total: Optional[int] = None  # only with include_total=true, never on cursor pages
     items: List[MoneyInItemOut]
+    next_cursor: Optional[str] = None
 
 
 class SavingsTransactionCreate(BaseModel):
@@ -3451,9 +3462,10 @@ class NotificationOut(BaseModel):
 
 
 class NotificationListOut(BaseModel):
-    total: int
+    total: Optional[int] = None  # null on cursor pages
     unread_count: int
     items: List[NotificationOut]
+    next_cursor: Optional[str] = None
 
 
 class NotificationMarkRead(BaseModel):
@@ -3854,6 +3866,7 @@ class DebtWithTransactionsOut(DebtOut):
 class DebtListOut(BaseModel):
     total: int
     items: List[DebtOut]
+    next_cursor: Optional[str] = None
 
 
 class DebtSummaryOut(BaseModel):
@@ -4199,6 +4212,7 @@ class TimelineEventType(str, Enum):
 class TimelineEventSourceType(str, Enum):
     EXPECTED_INCOME = "EXPECTED_INCOME"
     RECURRING_OCCURRENCE = "RECURRING_OCCURRENCE"
+    RECURRING_TEMPLATE = "RECURRING_TEMPLATE"
     DEBT = "DEBT"
     PAYMENT_PLAN_PAYMENT = "PAYMENT_PLAN_PAYMENT"
 
@@ -4227,6 +4241,11 @@ class TimelineEvent(BaseModel):
 class TimelineEventList(BaseModel):
     items: List[TimelineEvent]
 
+
+class TimelineEventPage(BaseModel):
+    items: List[TimelineEvent]
+    next_cursor: Optional[str] = None
+
 # --- Subcategories ---
 
 
@@ -0,0 +1,84 @@
+"""Security response headers as a pure ASGI middleware.
+
+The header list (including the CSP built from `settings.cors_origins_list`)
+is computed once at startup by `build_security_headers`. Unlike an
+`@app.middleware("http")` function, `SecurityHeadersMiddleware` only rewrites
+the `http.response.start` message, so response bodies — including
+`StreamingResponse` exports — pass through unbuffered.
+"""
+from config import settings
+
+
+def build_content_security_policy(cors_origins: list[str], is_production: bool) -> str:
+    connect_sources = ["'self'"] + cors_origins
+    csp_parts = [
+        "default-src 'self'",
+        "base-uri 'self'",
+        "frame-ancestors 'none'",
+        "object-src 'none'",
+        "form-action 'self'",
+        "script-src 'self'",
+        "style-src 'self' 'unsafe-inline'",
+        "img-src 'self' data: blob:",
+        "font-src 'self' data:",
+        f"connect-src {' '.join(connect_sources)}",
+    ]
+    if is_production:
+        csp_parts.append("upgrade-insecure-requests")
+    return "; ".join(csp_parts)
+
+
+def build_security_headers(
+    cors_origins: list[str] | None = None,
+    is_production: bool | None = None,
+) -> list[tuple[bytes, bytes]]:
+    """Return the raw (lower-cased name, value) header pairs to inject."""
+    if cors_origins is None:
+        cors_origins = settings.cors_origins_list
+    if is_production is None:
+        is_production = settings.is_production
+
+    headers = {
+        "Content-Security-Policy": build_content_security_policy(cors_origins, is_production),
+        "X-Content-Type-Options": "nosniff",
+        "X-Frame-Options": "DENY",
+        "Referrer-Policy": "no-referrer",
+        "Permissions-Policy": "camera=(), microphone=(), geolocation=()",
+        "Cross-Origin-Opener-Policy": "same-origin",
+        "Cross-Origin-Resource-Policy": "same-origin",
+    }
+    if is_production:
+        headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+    return [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in headers.items()
+    ]
+
+
+class SecurityHeadersMiddleware:
+    """Pure ASGI middleware appending a precomputed security header list.
+
+    Headers already set by the application under the same names are
+    replaced, matching the previous `response.headers[...] = ...` behaviour.
+    """
+
+    def __init__(self, app, headers: list[tuple[bytes, bytes]] | None = None):
+        self.app = app
+        self.headers = headers if headers is not None else build_security_headers()
+        self.header_names = frozenset(name for name, _value in self.headers)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_security_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    header
+                    for header in message.get("headers", [])
+                    if header[0] not in self.header_names
+                ] + self.headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_security_headers)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, timedelta
 
 # pyrefly: ignore [missing-import]
 from sqlalchemy import and_, or_, select
@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 
 from app import models
 from app.services.obligation_source_service import regular_debt_obligation_filters
+from app.services.recurring_projection_service import project_owner_obligations
 
 
 @dataclass(frozen=True)
@@ -64,9 +65,8 @@ def build_category_floor_warnings(
     """
     Build non-binding monthly category warnings from authoritative obligations.
 
-    Issue 4 will replace the narrow recurring preview with the shared recurring
-    occurrence projector. Keeping that adapter isolated prevents schedule rules
-    from leaking into budget summary orchestration.
+    Recurring obligations come from the shared owner-level projector, so the
+    cost does not grow with the number of templates.
     """
 
     reasons_by_category: dict[models.ExpenseCategory, list[CategoryFloorReason]] = {}
@@ -99,28 +99,16 @@ def build_category_floor_warnings(
         )
 
     if include_recurring:
-        from app.services.recurring_projection_service import project_occurrences_for_range
-        from datetime import timedelta
-        recurring_rows = (
-            db.query(models.RecurringExpense)
-            .filter(
-                models.RecurringExpense.owner_id == owner_id,
-                models.RecurringExpense.status == models.RecurringStatus.ACTIVE,
+        projection = project_owner_obligations(db, owner_id, start, end - timedelta(days=1))
+        for occ in projection.occurrences:
+            add_reason(
+                occ.category,
+                kind="RECURRING",
+                source_id=occ.source_id,
+                title=occ.title,
+                due_date=occ.due_date,
+                amount=occ.amount,
             )
-            .all()
-        )
-        inclusive_end = end - timedelta(days=1)
-        for recurring in recurring_rows:
-            projected = project_occurrences_for_range(db, recurring, start, inclusive_end)
-            for occ in projected:
-                add_reason(
-                    occ.category,
-                    kind="RECURRING",
-                    source_id=occ.source_id,
-                    title=occ.title,
-                    due_date=occ.due_date,
-                    amount=occ.amount,
-                )
 
     payment_plan_rows = (
         db.query(models.PaymentPlanPayment)
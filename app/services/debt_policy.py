@@ -7,8 +7,10 @@ import ...`` statements continue to work during the package transition.
 
 from app.domains.debt import (
     DebtActionDecision,
+    DebtPolicyDecisions,
     evaluate_debt_action,
     evaluate_debt_actions,
+    evaluate_debt_policies,
     evaluate_ledger_entry_reversal,
     is_archived_debt,
     is_closed_debt,
@@ -20,8 +22,10 @@ from app.domains.debt import (
 
 __all__ = [
     "DebtActionDecision",
+    "DebtPolicyDecisions",
     "evaluate_debt_action",
     "evaluate_debt_actions",
+    "evaluate_debt_policies",
     "evaluate_ledger_entry_reversal",
     "is_archived_debt",
     "is_closed_debt",
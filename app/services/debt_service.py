@@ -7,6 +7,7 @@ import ...`` statements continue to work during the package transition.
 
 from app.domains.debt import (
     POSTED_DEBT_LEDGER_STATUS,
+    build_debt_summary,
     create_debt_ledger_entry,
     get_debt_total_charges,
     get_debt_total_charges_by_debt_ids,
@@ -19,6 +20,7 @@ from app.domains.debt import (
 
 __all__ = [
     "POSTED_DEBT_LEDGER_STATUS",
+    "build_debt_summary",
     "create_debt_ledger_entry",
     "get_debt_total_charges",
     "get_debt_total_charges_by_debt_ids",
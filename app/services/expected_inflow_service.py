@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import date, datetime, timezone
 
 from fastapi import HTTPException, status
-from sqlalchemy import func
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session, selectinload
 
 from app import models, schemas
+from app.keyset import keyset_after, next_cursor as keyset_next_cursor
 from app.services.debt_payment_service import create_debt_payment
 from app.services.debt_service import create_debt_ledger_entry, reconcile_debt
 from app.services.financial_event_ledger_service import (
@@ -25,6 +27,8 @@ ACTIVE_STATUSES = {
     models.ExpectedIncomeStatus.EXPECTED,
     models.ExpectedIncomeStatus.PARTIALLY_RECEIVED,
 }
+# close_reason values that end a schedule regardless of its amounts
+STRUCTURAL_CLOSE_REASONS = {"RESCHEDULED", "CANCELLED", "RESCHEDULE_REVERSED"}
 TERMINAL_STATUSES = {
     models.ExpectedIncomeStatus.RESOLVED,
     models.ExpectedIncomeStatus.SUPERSEDED,
@@ -68,7 +72,7 @@ def _valid_realization(realization: models.ExpectedInflowRealization) -> bool:
     )
 
 
-def received_amount(row: models.ExpectedIncome) -> int:
+def _derived_received_amount(row: models.ExpectedIncome) -> int:
     allocations = list(row.realization_allocations or [])
     if not allocations:
         return int(row.received_amount or 0)
@@ -81,7 +85,7 @@ def received_amount(row: models.ExpectedIncome) -> int:
     )
 
 
-def written_off_amount(row: models.ExpectedIncome) -> int:
+def _derived_written_off_amount(row: models.ExpectedIncome) -> int:
     return int(sum(
         int(write_off.amount)
         for write_off in row.write_offs or []
@@ -89,8 +93,25 @@ def written_off_amount(row: models.ExpectedIncome) -> int:
     ))
 
 
+def _derived_schedule_totals(row: models.ExpectedIncome) -> tuple[int, int, int]:
+    """(received, written off, outstanding) recomputed from realizations and write-offs."""
+    received = _derived_received_amount(row)
+    written_off = _derived_written_off_amount(row)
+    return received, written_off, max(int(row.amount) - received - written_off, 0)
+
+
+# Reads use the columns kept current by _sync_schedule/_sync_promise on every
+# mutation; verify_promise_aggregates compares them against the facts.
+def received_amount(row: models.ExpectedIncome) -> int:
+    return int(row.received_amount or 0)
+
+
+def written_off_amount(row: models.ExpectedIncome) -> int:
+    return int(row.written_off_amount or 0)
+
+
 def remaining_amount(row: models.ExpectedIncome) -> int:
-    return max(int(row.amount) - received_amount(row) - written_off_amount(row), 0)
+    return int(row.outstanding_amount or 0)
 
 
 def active_backing_amount(row: models.ExpectedIncome) -> int:
@@ -181,13 +202,19 @@ def serialize_inflow(row: models.ExpectedIncome, *, today: date) -> schemas.Expe
     )
 
 
-def inflow_query(db: Session):
-    return db.query(models.ExpectedIncome).options(
+def inflow_query(db: Session, *, include_detail: bool = True):
+    """Schedules with their source objects; ``include_detail`` adds the realization
+    and write-off history that serialize_inflow and mutations need."""
+    query = db.query(models.ExpectedIncome).options(
         selectinload(models.ExpectedIncome.promise),
         selectinload(models.ExpectedIncome.source),
         selectinload(models.ExpectedIncome.debt),
         selectinload(models.ExpectedIncome.asset),
         selectinload(models.ExpectedIncome.refund_event),
+    )
+    if not include_detail:
+        return query
+    return query.options(
         selectinload(models.ExpectedIncome.realization_allocations)
         .selectinload(models.ExpectedInflowRealizationAllocation.realization)
         .selectinload(models.ExpectedInflowRealization.event_links)
@@ -343,6 +370,8 @@ def update_inflow(
         if received_amount(row) > 0 or row.children:
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="expected_inflow.amount_locked")
         row.amount = int(payload.amount)
+        _sync_schedule(row)
+        _sync_promise(row.promise)
     if payload.due_date is not None:
         validate_planning_date(payload.due_date, today=today)
         if (
@@ -602,7 +631,14 @@ def _post_source(
 
 # Promise aggregate API. `ExpectedIncome` remains the physical schedule table.
 
-def promise_query(db: Session):
+def promise_query(db: Session, *, include_detail: bool = True):
+    """Promises with everything serialization needs.
+
+    Amounts are derived from realization allocations, so that chain is always
+    loaded. The Promise-level realization history (receipt activity and the
+    events behind it) is only loaded when ``include_detail`` is set; list views
+    need just the linked event ids.
+    """
     schedule_realizations = (
         selectinload(models.ExpectedInflowPromise.schedules)
         .selectinload(models.ExpectedIncome.realization_allocations)
@@ -610,6 +646,14 @@ def promise_query(db: Session):
         .selectinload(models.ExpectedInflowRealization.event_links)
         .selectinload(models.ExpectedInflowRealizationEvent.financial_event)
     )
+    promise_realizations = (
+        selectinload(models.ExpectedInflowPromise.realizations)
+        .selectinload(models.ExpectedInflowRealization.event_links)
+    )
+    if include_detail:
+        promise_realizations = promise_realizations.selectinload(
+            models.ExpectedInflowRealizationEvent.financial_event
+        )
     return db.query(models.ExpectedInflowPromise).options(
         selectinload(models.ExpectedInflowPromise.source),
         selectinload(models.ExpectedInflowPromise.debt),
@@ -618,9 +662,7 @@ def promise_query(db: Session):
         selectinload(models.ExpectedInflowPromise.schedules).selectinload(models.ExpectedIncome.write_offs),
         selectinload(models.ExpectedInflowPromise.schedules).selectinload(models.ExpectedIncome.children),
         schedule_realizations,
-        selectinload(models.ExpectedInflowPromise.realizations)
-        .selectinload(models.ExpectedInflowRealization.event_links)
-        .selectinload(models.ExpectedInflowRealizationEvent.financial_event),
+        promise_realizations,
         selectinload(models.ExpectedInflowPromise.write_offs),
     )
 
@@ -708,34 +750,37 @@ def _schedule_is_active(schedule: models.ExpectedIncome) -> bool:
 
 
 def promise_received_amount(promise: models.ExpectedInflowPromise) -> int:
-    return int(sum(received_amount(schedule) for schedule in promise.schedules or []))
+    return int(promise.received_amount or 0)
 
 
 def promise_written_off_amount(promise: models.ExpectedInflowPromise) -> int:
-    return int(sum(
-        int(write_off.amount)
-        for write_off in promise.write_offs or []
-        if write_off.reversed_at is None
-    ))
+    return int(promise.written_off_amount or 0)
 
 
 def promise_outstanding_amount(promise: models.ExpectedInflowPromise) -> int:
-    return int(sum(
-        remaining_amount(schedule)
-        for schedule in promise.schedules or []
-        if _schedule_is_active(schedule)
-    ))
+    return int(promise.outstanding_amount or 0)
 
 
 def promise_lifecycle(promise: models.ExpectedInflowPromise) -> models.ExpectedInflowPromiseStatus:
     """Stored lifecycle: OPEN when outstanding > 0; CLOSED otherwise.
-    Derived from immutable financial facts."""
-    outstanding = promise_outstanding_amount(promise)
-    return (
-        models.ExpectedInflowPromiseStatus.OPEN
-        if outstanding > 0
-        else models.ExpectedInflowPromiseStatus.CLOSED
-    )
+    Maintained from immutable financial facts by _sync_promise."""
+    return models.ExpectedInflowPromiseStatus(promise.status)
+
+
+def _derived_promise_totals(promise: models.ExpectedInflowPromise) -> tuple[int, int, int]:
+    """(received, written off, outstanding) summed from the schedules' facts.
+
+    Outstanding counts only schedules that are still open, i.e. not closed by a
+    reschedule, cancellation or reschedule reversal.
+    """
+    received = written_off = outstanding = 0
+    for schedule in promise.schedules or []:
+        schedule_received, schedule_written_off, schedule_outstanding = _derived_schedule_totals(schedule)
+        received += schedule_received
+        written_off += schedule_written_off
+        if schedule.close_reason not in STRUCTURAL_CLOSE_REASONS:
+            outstanding += schedule_outstanding
+    return received, written_off, outstanding
 
 
 def _is_cancelled(promise: models.ExpectedInflowPromise) -> bool:
@@ -781,16 +826,16 @@ def promise_is_pristine(promise: models.ExpectedInflowPromise) -> bool:
 
 
 def _sync_schedule(schedule: models.ExpectedIncome) -> None:
+    received, written_off, remaining = _derived_schedule_totals(schedule)
+    schedule.received_amount = received
+    schedule.written_off_amount = written_off
+    schedule.outstanding_amount = remaining
     if schedule.close_reason == "RESCHEDULED":
         schedule.status = models.ExpectedIncomeStatus.SUPERSEDED
         return
-    if schedule.close_reason == "CANCELLED":
+    if schedule.close_reason in ("CANCELLED", "RESCHEDULE_REVERSED"):
         schedule.status = models.ExpectedIncomeStatus.CANCELLED
         return
-    received = received_amount(schedule)
-    written_off = written_off_amount(schedule)
-    remaining = max(int(schedule.amount) - received - written_off, 0)
-    schedule.received_amount = received
     if remaining == 0:
         if written_off > 0:
             schedule.status = models.ExpectedIncomeStatus.WRITTEN_OFF
@@ -810,7 +855,15 @@ def _sync_schedule(schedule: models.ExpectedIncome) -> None:
 
 
 def _sync_promise(promise: models.ExpectedInflowPromise) -> None:
-    lifecycle = promise_lifecycle(promise)
+    received, written_off, outstanding = _derived_promise_totals(promise)
+    promise.received_amount = received
+    promise.written_off_amount = written_off
+    promise.outstanding_amount = outstanding
+    lifecycle = (
+        models.ExpectedInflowPromiseStatus.OPEN
+        if outstanding > 0
+        else models.ExpectedInflowPromiseStatus.CLOSED
+    )
     promise.status = lifecycle.value
     if lifecycle == models.ExpectedInflowPromiseStatus.CLOSED:
         promise.closed_at = promise.closed_at or datetime.now(timezone.utc)
@@ -818,6 +871,127 @@ def _sync_promise(promise: models.ExpectedInflowPromise) -> None:
         promise.closed_at = None
 
 
+def sync_aggregates_for_voided_events(db: Session, event_ids) -> None:
+    """Re-sync the schedules and Promises funded by realizations of *event_ids*.
+
+    A realization stops counting once any of its linked events is voided, so
+    ``void_financial_event`` calls this to keep the stored aggregates in step
+    within the same transaction.
+    """
+    event_ids = {int(event_id) for event_id in event_ids}
+    if not event_ids:
+        return
+    realized = (
+        db.query(
+            models.ExpectedInflowRealization.promise_id,
+            models.ExpectedInflowRealizationAllocation.expected_inflow_id,
+        )
+        .join(
+            models.ExpectedInflowRealizationEvent,
+            models.ExpectedInflowRealizationEvent.realization_id == models.ExpectedInflowRealization.id,
+        )
+        .outerjoin(
+            models.ExpectedInflowRealizationAllocation,
+            models.ExpectedInflowRealizationAllocation.realization_id == models.ExpectedInflowRealization.id,
+        )
+        .filter(models.ExpectedInflowRealizationEvent.financial_event_id.in_(event_ids))
+        .all()
+    )
+    schedule_ids = {int(schedule_id) for _, schedule_id in realized if schedule_id is not None}
+    promise_ids = {int(promise_id) for promise_id, _ in realized if promise_id is not None}
+    if schedule_ids:
+        schedules = (
+            db.query(models.ExpectedIncome)
+            .options(
+                selectinload(models.ExpectedIncome.realization_allocations)
+                .selectinload(models.ExpectedInflowRealizationAllocation.realization)
+                .selectinload(models.ExpectedInflowRealization.event_links)
+                .selectinload(models.ExpectedInflowRealizationEvent.financial_event),
+                selectinload(models.ExpectedIncome.write_offs),
+            )
+            .filter(models.ExpectedIncome.id.in_(schedule_ids))
+            .all()
+        )
+        for schedule in schedules:
+            _sync_schedule(schedule)
+            if schedule.promise_id is not None:
+                promise_ids.add(int(schedule.promise_id))
+    if promise_ids:
+        promises = (
+            promise_query(db, include_detail=False)
+            .filter(models.ExpectedInflowPromise.id.in_(promise_ids))
+            .all()
+        )
+        for promise in promises:
+            _sync_promise(promise)
+
+
+@dataclass(frozen=True)
+class PromiseAggregateDrift:
+    """One stored aggregate that disagrees with the facts it summarizes."""
+
+    promise_id: int
+    schedule_id: int | None
+    field: str
+    stored: int | str | None
+    derived: int | str
+
+
+def verify_promise_aggregates(
+    db: Session,
+    *,
+    owner_id: int,
+    repair: bool = False,
+) -> list[PromiseAggregateDrift]:
+    """Compare stored Promise and schedule aggregates with realizations and write-offs.
+
+    The columns move inside this service's commands and when
+    ``void_financial_event`` voids a realized event, so drift means a fact
+    changed underneath them (for example a bulk update) or a row predates the
+    columns. With ``repair`` every drifted
+    Promise is re-synced; the caller commits.
+    """
+    drifts: list[PromiseAggregateDrift] = []
+    promises = promise_query(db).filter(models.ExpectedInflowPromise.owner_id == owner_id).all()
+    for promise in promises:
+        promise_drifts: list[PromiseAggregateDrift] = []
+        for schedule in promise.schedules or []:
+            derived = dict(zip(
+                ("received_amount", "written_off_amount", "outstanding_amount"),
+                _derived_schedule_totals(schedule),
+            ))
+            promise_drifts.extend(
+                PromiseAggregateDrift(int(promise.id), int(schedule.id), field, getattr(schedule, field), value)
+                for field, value in derived.items()
+                if int(getattr(schedule, field) or 0) != value
+            )
+        received, written_off, outstanding = _derived_promise_totals(promise)
+        lifecycle = (
+            models.ExpectedInflowPromiseStatus.OPEN
+            if outstanding > 0
+            else models.ExpectedInflowPromiseStatus.CLOSED
+        )
+        derived = {
+            "received_amount": received,
+            "written_off_amount": written_off,
+            "outstanding_amount": outstanding,
+            "status": lifecycle.value,
+        }
+        promise_drifts.extend(
+            PromiseAggregateDrift(int(promise.id), None, field, getattr(promise, field), value)
+            for field, value in derived.items()
+            if getattr(promise, field) != value
+        )
+        if promise_drifts and repair:
+            for schedule in promise.schedules or []:
+                _sync_schedule(schedule)
+            _sync_promise(promise)
+        drifts.extend(promise_drifts)
+    if repair:
+        db.flush()
+    return drifts
+
+
 def _serialize_schedule(schedule: models.ExpectedIncome, *, today: date) -> schemas.ExpectedInflowScheduleOut:
     stored_status = _schedule_state(schedule)
     remaining = remaining_amount(schedule)
@@ -1022,6 +1196,18 @@ def serialize_promise(
     )
 
 
+CURSOR_INVALID = "expected_inflow.cursor_invalid"
+
+
+def _month_schedules(owner_id: int, budget_year: int, budget_month: int):
+    """Schedules of one budget month; served by ix_expected_incomes_owner_month_status."""
+    return select(models.ExpectedIncome.promise_id).where(
+        models.ExpectedIncome.owner_id == owner_id,
+        models.ExpectedIncome.budget_year == budget_year,
+        models.ExpectedIncome.budget_month == budget_month,
+    )
+
+
 def list_promises(
     db: Session,
     owner_id: int,
@@ -1033,8 +1219,19 @@ def list_promises(
     kind: models.ExpectedInflowKind | None = None,
     search: str | None = None,
     display_state: models.PromiseDisplayState | None = None,
-) -> list[schemas.ExpectedInflowPromiseOut]:
-    query = promise_query(db).filter(models.ExpectedInflowPromise.owner_id == owner_id)
+    limit: int | None = None,
+    cursor: str | None = None,
+    include_detail: bool = False,
+) -> schemas.ExpectedInflowPromisePage:
+    """Promises newest first, keyset-paged on (created_at, id).
+
+    Owner, kind, search and the budget month are filtered in SQL. ``view`` and
+    ``display_state`` depend on derived amounts, so candidates are scanned in
+    ``limit + 1`` batches and filtered after serialization until the page is full.
+    """
+    query = promise_query(db, include_detail=include_detail).filter(
+        models.ExpectedInflowPromise.owner_id == owner_id
+    )
     if kind is not None:
         query = query.filter(models.ExpectedInflowPromise.kind == kind.value)
     if search:
@@ -1042,35 +1239,60 @@ def list_promises(
         query = query.filter(
             models.ExpectedInflowPromise.title.ilike(pattern)
         )
-    promises = query.order_by(models.ExpectedInflowPromise.created_at.desc()).all()
-    outputs: list[schemas.ExpectedInflowPromiseOut] = []
-    for promise in promises:
-        output = serialize_promise(
-            promise,
-            today=today,
-            period_year=budget_year,
-            period_month=budget_month,
-            include_detail=False,
+    month_mode = budget_year is not None or budget_month is not None
+    if month_mode:
+        # Cashflow mode: only Promises with a schedule in the selected month
+        query = query.filter(
+            models.ExpectedInflowPromise.id.in_(_month_schedules(owner_id, budget_year, budget_month))
         )
-        # Agreements mode: no month filtering, optional display_state filter
-        if budget_year is None and budget_month is None:
-            if display_state is not None and output.display_state != display_state:
-                continue
-        else:
-            # Cashflow mode: month filtering
-            has_period_schedule = any(
-                schedule.budget_year == budget_year and schedule.budget_month == budget_month
-                for schedule in promise.schedules or []
+    query = query.order_by(
+        models.ExpectedInflowPromise.created_at.desc(),
+        models.ExpectedInflowPromise.id.desc(),
+    )
+    after_cursor = cursor
+    batch_size = limit + 1 if limit is not None else None
+
+    outputs: list[schemas.ExpectedInflowPromiseOut] = []
+    while True:
+        batch_query = query
+        if after_cursor:
+            batch_query = batch_query.filter(keyset_after(
+                db,
+                models.ExpectedInflowPromise,
+                owner_id=owner_id,
+                cursor=after_cursor,
+                order_by=(models.ExpectedInflowPromise.created_at,),
+                invalid_detail=CURSOR_INVALID,
+            ))
+        if batch_size is not None:
+            batch_query = batch_query.limit(batch_size)
+        promises = batch_query.all()
+        for promise in promises:
+            output = serialize_promise(
+                promise,
+                today=today,
+                period_year=budget_year,
+                period_month=budget_month,
+                include_detail=include_detail,
             )
-            if not has_period_schedule:
+            # Agreements mode: optional display_state filter
+            if not month_mode and display_state is not None and output.display_state != display_state:
                 continue
-        is_active = output.status == models.ExpectedInflowPromiseStatus.OPEN
-        if view == "active" and not is_active:
-            continue
-        if view == "history" and is_active:
-            continue
-        outputs.append(output)
-    return outputs
+            is_active = output.status == models.ExpectedInflowPromiseStatus.OPEN
+            if view == "active" and not is_active:
+                continue
+            if view == "history" and is_active:
+                continue
+            outputs.append(output)
+        if batch_size is None or len(promises) < batch_size or len(outputs) > limit:
+            break
+        after_cursor = str(promises[-1].id)
+
+    next_cursor = None
+    if limit is not None and len(outputs) > limit:
+        outputs = outputs[:limit]
+        next_cursor = str(outputs[-1].id)
+    return schemas.ExpectedInflowPromisePage(items=outputs, next_cursor=next_cursor)
 
 
 def list_cashflow(
@@ -1081,38 +1303,75 @@ def list_cashflow(
     budget_year: int,
     budget_month: int,
     kind: models.ExpectedInflowKind | None = None,
-) -> list[schemas.ExpectedInflowCashflowRowOut]:
-    """Return schedule chunks due in the selected month with parent Promise context."""
-    query = promise_query(db).filter(models.ExpectedInflowPromise.owner_id == owner_id)
+    limit: int | None = None,
+    cursor: str | None = None,
+) -> schemas.ExpectedInflowCashflowPage:
+    """Return schedule chunks due in the selected month with parent Promise context.
+
+    The month's schedules are selected and keyset-paged on (due_date, id) in SQL;
+    only the Promises behind the page are loaded for amounts and labels.
+    """
+    query = (
+        db.query(models.ExpectedIncome)
+        .join(models.ExpectedIncome.promise)
+        .filter(
+            models.ExpectedIncome.owner_id == owner_id,
+            models.ExpectedIncome.budget_year == budget_year,
+            models.ExpectedIncome.budget_month == budget_month,
+            # Omit superseded schedules (they're part of reschedule history)
+            models.ExpectedIncome.status != models.ExpectedIncomeStatus.SUPERSEDED,
+        )
+    )
     if kind is not None:
         query = query.filter(models.ExpectedInflowPromise.kind == kind.value)
-    promises = query.order_by(models.ExpectedInflowPromise.created_at.desc()).all()
+    if cursor:
+        query = query.filter(keyset_after(
+            db,
+            models.ExpectedIncome,
+            owner_id=owner_id,
+            cursor=cursor,
+            order_by=(models.ExpectedIncome.due_date,),
+            invalid_detail=CURSOR_INVALID,
+            descending=False,
+        ))
+    query = query.order_by(models.ExpectedIncome.due_date, models.ExpectedIncome.id)
+    if limit is not None:
+        query = query.limit(limit + 1)
+    schedules = query.all()
+    has_more = limit is not None and len(schedules) > limit
+    if has_more:
+        schedules = schedules[:limit]
+    next_cursor = keyset_next_cursor(schedules, has_more)
+
+    promise_ids = {int(schedule.promise_id) for schedule in schedules}
+    promises = {
+        int(promise.id): promise
+        for promise in promise_query(db, include_detail=False).filter(
+            models.ExpectedInflowPromise.id.in_(promise_ids)
+        )
+    } if promise_ids else {}
     rows: list[schemas.ExpectedInflowCashflowRowOut] = []
-    for promise in promises:
-        for schedule in promise.schedules or []:
-            if schedule.budget_year != budget_year or schedule.budget_month != budget_month:
-                continue
-            # Omit superseded schedules (they're part of reschedule history)
-            if _schedule_structural_state(schedule) == models.ExpectedIncomeStatus.SUPERSEDED:
-                continue
-            read_state = schedule_read_state(schedule, today=today)
-            rows.append(schemas.ExpectedInflowCashflowRowOut(
-                schedule_id=int(schedule.id),
-                promise_id=int(promise.id),
-                promise_title=promise.title,
-                source_label=_promise_source_label(promise),
-                kind=_promise_kind(promise),
-                amount=int(schedule.amount),
-                received_amount=received_amount(schedule),
-                remaining_amount=remaining_amount(schedule),
-                due_date=schedule.due_date,
-                budget_year=int(schedule.budget_year),
-                budget_month=int(schedule.budget_month),
-                read_state=read_state,
-                is_overdue=_schedule_is_active(schedule) and schedule.due_date < today,
-                promise_is_open=promise_lifecycle(promise) == models.ExpectedInflowPromiseStatus.OPEN,
-            ))
-    return sorted(rows, key=lambda r: (r.due_date, r.schedule_id))
+    for schedule in schedules:
+        # The Promise load populates this schedule's allocations and write-offs.
+        promise = promises[int(schedule.promise_id)]
+        read_state = schedule_read_state(schedule, today=today)
+        rows.append(schemas.ExpectedInflowCashflowRowOut(
+            schedule_id=int(schedule.id),
+            promise_id=int(promise.id),
+            promise_title=promise.title,
+            source_label=_promise_source_label(promise),
+            kind=_promise_kind(promise),
+            amount=int(schedule.amount),
+            received_amount=received_amount(schedule),
+            remaining_amount=remaining_amount(schedule),
+            due_date=schedule.due_date,
+            budget_year=int(schedule.budget_year),
+            budget_month=int(schedule.budget_month),
+            read_state=read_state,
+            is_overdue=_schedule_is_active(schedule) and schedule.due_date < today,
+            promise_is_open=promise_lifecycle(promise) == models.ExpectedInflowPromiseStatus.OPEN,
+        ))
+    return schemas.ExpectedInflowCashflowPage(items=rows, next_cursor=next_cursor)
 
 
 def _source_title(kind: models.ExpectedInflowKind, source_object) -> str:
@@ -1147,6 +1406,9 @@ def create_promise(
         title=(payload.title.strip() if payload.title else _source_title(payload.kind, source_object))[:100],
         original_amount=int(payload.amount),
         status=models.ExpectedInflowPromiseStatus.OPEN.value,
+        received_amount=0,
+        written_off_amount=0,
+        outstanding_amount=int(payload.amount),
         backing_eligible=bool(backing_eligible),
         note=payload.note.strip() if payload.note else None,
     )
@@ -1162,6 +1424,8 @@ def create_promise(
         refund_event_id=payload.refund_event_id,
         amount=int(payload.amount),
         received_amount=0,
+        written_off_amount=0,
+        outstanding_amount=int(payload.amount),
         due_date=payload.due_date,
         budget_year=payload.due_date.year,
         budget_month=payload.due_date.month,
@@ -1204,6 +1468,8 @@ def update_promise(
     if "note" in fields:
         promise.note = payload.note.strip() if payload.note else None
         schedule.note = promise.note
+    _sync_schedule(schedule)
+    _sync_promise(promise)
     db.flush()
 
 
@@ -1343,7 +1609,7 @@ def realize_promise(
     db.flush()
     if _promise_kind(promise) == models.ExpectedInflowKind.ASSET_SALE:
         for schedule in schedules:
-            remainder = remaining_amount(schedule)
+            _, _, remainder = _derived_schedule_totals(schedule)
             if remainder > 0:
                 schedule.write_offs.append(models.ExpectedInflowWriteOff(
                     owner_id=owner_id,
@@ -1406,6 +1672,8 @@ def reschedule_promise(
             parent_id=int(source.id),
             amount=int(allocation.amount),
             received_amount=0,
+            written_off_amount=0,
+            outstanding_amount=int(allocation.amount),
             due_date=allocation.due_date,
             budget_year=allocation.due_date.year,
             budget_month=allocation.due_date.month,
@@ -1413,7 +1681,7 @@ def reschedule_promise(
             backing_eligible=bool(promise.backing_eligible),
             note=allocation.note or payload.note or source.note,
         )
-        db.add(replacement)
+        promise.schedules.append(replacement)
         replacements.append(replacement)
     source.status = models.ExpectedIncomeStatus.SUPERSEDED
     source.close_reason = "RESCHEDULED"
@@ -1639,6 +1907,7 @@ def reverse_reschedule(
     source.status = models.ExpectedIncomeStatus.EXPECTED
     source.close_reason = None
     source.closed_at = None
+    _sync_schedule(source)
     # Close children through an auditable structural correction.
     now = datetime.now(timezone.utc)
     for child in children:
@@ -0,0 +1,257 @@
+"""Materialized goal funding per (goal, wallet).
+
+``goal_wallet_balances`` keeps running totals of the append-only
+``GoalContributions`` (allocated / returned / consumed) and
+``GoalProjectRelease`` (released) rows, so goal protection checks read one
+indexed row or a small grouped sum instead of replaying every contribution.
+
+The totals are maintained by mapper listeners that upsert on the flushing
+connection, inside the same transaction as the contribution or release row.
+Every write path — ``record_goal_contribution``, the goal allocation moves and
+releases, graduation, and rows added directly through the ORM — is covered
+without callers having to remember a second write. Bulk ``Query.delete()`` /
+``Query.update()`` and database-level cascades bypass the listeners; run
+``rebuild_goal_wallet_balances`` after such maintenance.
+
+Releases recorded without a wallet cannot be attributed to a balance row and
+are not materialized.
+
+Verify or rebuild from the command line::
+
+    python -m app.services.goal_balance_service [--rebuild] [--owner-id ID]
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+
+# pyrefly: ignore [missing-import]
+from sqlalchemy import case, delete, event, func, insert, update
+# pyrefly: ignore [missing-import]
+from sqlalchemy.dialects import postgresql, sqlite
+# pyrefly: ignore [missing-import]
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+BALANCE_FIELDS = ("allocated", "returned", "consumed", "released")
+
+_CONTRIBUTION_FIELDS = {
+    models.GoalContributionType.ALLOCATE: "allocated",
+    models.GoalContributionType.RETURN: "returned",
+    models.GoalContributionType.CONSUME: "consumed",
+}
+
+
+def funded_expression():
+    """SQL expression for a balance row's net funding (allocated minus returned and consumed)."""
+    balance = models.GoalWalletBalance
+    return balance.allocated - balance.returned - balance.consumed
+
+
+def _apply_delta(connection, *, owner_id: int, goal_id: int, wallet_id: int, field: str, delta: int) -> None:
+    table = models.GoalWalletBalance.__table__
+    if delta < 0:
+        # Removals only happen while the goal itself is being deleted; the
+        # balance row may already be gone, so never recreate it.
+        connection.execute(
+            update(table)
+            .where(table.c.goal_id == int(goal_id), table.c.wallet_id == int(wallet_id))
+            .values({field: table.c[field] + int(delta)})
+        )
+        return
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    values = {name: 0 for name in BALANCE_FIELDS}
+    values[field] = int(delta)
+    statement = dialect.insert(table).values(
+        goal_id=int(goal_id),
+        wallet_id=int(wallet_id),
+        owner_id=int(owner_id),
+        **values,
+    )
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[table.c.goal_id, table.c.wallet_id],
+            set_={field: table.c[field] + int(delta)},
+        )
+    )
+
+
+def _apply_contribution(connection, contribution: models.GoalContributions, sign: int) -> None:
+    field = _CONTRIBUTION_FIELDS.get(models.GoalContributionType(contribution.contribution_type))
+    if field is None:
+        return
+    _apply_delta(
+        connection,
+        owner_id=contribution.owner_id,
+        goal_id=contribution.goal_id,
+        wallet_id=contribution.wallet_id,
+        field=field,
+        delta=sign * int(contribution.amount or 0),
+    )
+
+
+def _apply_release(connection, release: models.GoalProjectRelease, sign: int) -> None:
+    if release.wallet_id is None:
+        return
+    _apply_delta(
+        connection,
+        owner_id=release.owner_id,
+        goal_id=release.goal_id,
+        wallet_id=release.wallet_id,
+        field="released",
+        delta=sign * int(release.amount or 0),
+    )
+
+
+@event.listens_for(models.GoalContributions, "after_insert")
+def _contribution_inserted(mapper, connection, target) -> None:
+    _apply_contribution(connection, target, 1)
+
+
+@event.listens_for(models.GoalContributions, "after_delete")
+def _contribution_deleted(mapper, connection, target) -> None:
+    _apply_contribution(connection, target, -1)
+
+
+@event.listens_for(models.GoalProjectRelease, "after_insert")
+def _release_inserted(mapper, connection, target) -> None:
+    _apply_release(connection, target, 1)
+
+
+@event.listens_for(models.GoalProjectRelease, "after_delete")
+def _release_deleted(mapper, connection, target) -> None:
+    _apply_release(connection, target, -1)
+
+
+def _ledger_totals(db: Session, owner_id: int | None) -> dict[tuple[int, int], dict[str, int]]:
+    """Balances recomputed from the contribution and release rows."""
+    contribution = models.GoalContributions
+    release = models.GoalProjectRelease
+    contribution_query = db.query(
+        contribution.owner_id,
+        contribution.goal_id,
+        contribution.wallet_id,
+        *(
+            func.coalesce(func.sum(case(
+                (contribution.contribution_type == contribution_type, contribution.amount),
+                else_=0,
+            )), 0)
+            for contribution_type in _CONTRIBUTION_FIELDS
+        ),
+    ).group_by(contribution.owner_id, contribution.goal_id, contribution.wallet_id)
+    release_query = db.query(
+        release.owner_id,
+        release.goal_id,
+        release.wallet_id,
+        func.coalesce(func.sum(release.amount), 0),
+    ).filter(release.wallet_id.isnot(None)).group_by(release.owner_id, release.goal_id, release.wallet_id)
+    if owner_id is not None:
+        contribution_query = contribution_query.filter(contribution.owner_id == owner_id)
+        release_query = release_query.filter(release.owner_id == owner_id)
+
+    totals: dict[tuple[int, int], dict[str, int]] = {}
+
+    def _row(owner: int, goal_id: int, wallet_id: int) -> dict[str, int]:
+        return totals.setdefault(
+            (int(goal_id), int(wallet_id)),
+            {"owner_id": int(owner), **{name: 0 for name in BALANCE_FIELDS}},
+        )
+
+    for owner, goal_id, wallet_id, *amounts in contribution_query.all():
+        row = _row(owner, goal_id, wallet_id)
+        for field, amount in zip(_CONTRIBUTION_FIELDS.values(), amounts):
+            row[field] = int(amount or 0)
+    for owner, goal_id, wallet_id, amount in release_query.all():
+        _row(owner, goal_id, wallet_id)["released"] = int(amount or 0)
+    return totals
+
+
+@dataclass(frozen=True)
+class GoalWalletBalanceDrift:
+    goal_id: int
+    wallet_id: int
+    field: str
+    stored: int
+    expected: int
+
+
+def verify_goal_wallet_balances(db: Session, *, owner_id: int | None = None) -> list[GoalWalletBalanceDrift]:
+    """Compare stored balances with the contribution and release history."""
+    db.flush()
+    expected = _ledger_totals(db, owner_id)
+    # Column rows, not entities: the listeners write through Core, so
+    # identity-mapped GoalWalletBalance objects may hold stale values.
+    balance = models.GoalWalletBalance
+    query = db.query(balance.goal_id, balance.wallet_id, *(balance.__table__.c[name] for name in BALANCE_FIELDS))
+    if owner_id is not None:
+        query = query.filter(balance.owner_id == owner_id)
+    stored = {
+        (int(goal_id), int(wallet_id)): dict(zip(BALANCE_FIELDS, amounts))
+        for goal_id, wallet_id, *amounts in query.all()
+    }
+
+    drifts: list[GoalWalletBalanceDrift] = []
+    for key in sorted(set(expected) | set(stored)):
+        row = stored.get(key, {})
+        for field in BALANCE_FIELDS:
+            stored_value = int(row.get(field) or 0)
+            expected_value = expected.get(key, {}).get(field, 0)
+            if stored_value != expected_value:
+                drifts.append(GoalWalletBalanceDrift(key[0], key[1], field, stored_value, expected_value))
+    return drifts
+
+
+def rebuild_goal_wallet_balances(db: Session, *, owner_id: int | None = None) -> int:
+    """Replace stored balances with totals recomputed from history; the caller commits.
+
+    Returns the number of balance rows written.
+    """
+    db.flush()
+    statement = delete(models.GoalWalletBalance)
+    if owner_id is not None:
+        statement = statement.where(models.GoalWalletBalance.owner_id == owner_id)
+    db.execute(statement)
+    totals = _ledger_totals(db, owner_id)
+    if totals:
+        db.execute(
+            insert(models.GoalWalletBalance.__table__),
+            [
+                {"goal_id": goal_id, "wallet_id": wallet_id, **values}
+                for (goal_id, wallet_id), values in totals.items()
+            ],
+        )
+    db.expire_all()
+    return len(totals)
+
+
+def main(argv: list[str] | None = None) -> int:
+    from app.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Verify or rebuild goal_wallet_balances.")
+    parser.add_argument("--rebuild", action="store_true", help="rewrite balances from history")
+    parser.add_argument("--owner-id", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        drifts = verify_goal_wallet_balances(db, owner_id=args.owner_id)
+        for drift in drifts:
+            print(
+                f"goal={drift.goal_id} wallet={drift.wallet_id} {drift.field}: "
+                f"stored={drift.stored} expected={drift.expected}"
+            )
+        print(f"{len(drifts)} drifted value(s).")
+        if args.rebuild:
+            written = rebuild_goal_wallet_balances(db, owner_id=args.owner_id)
+            db.commit()
+            print(f"Rebuilt {written} balance row(s).")
+            return 0
+        return 1 if drifts else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
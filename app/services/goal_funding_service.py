@@ -2,11 +2,15 @@ from datetime import date
 
 from fastapi import HTTPException, status
 # pyrefly: ignore [missing-import]
+from sqlalchemy import func
+# pyrefly: ignore [missing-import]
 from sqlalchemy.orm import Session
 
+from .goal_balance_service import funded_expression
 from .wallet_value_service import can_hold_goal_funds
 
 from app import models, schemas
+from app.read_cache import cached_read
 
 PAYMENT_PLAN_GOAL_TARGET_STATUSES = (
     models.PaymentPlanPaymentStatus.PENDING,
@@ -23,30 +27,8 @@ def _payment_plan_payment_remaining(payment: models.PaymentPlanPayment) -> int:
     )
 
 
-def _contribution_delta(contribution: models.GoalContributions) -> int:
-    amount = int(contribution.amount or 0)
-    if contribution.contribution_type == models.GoalContributionType.ALLOCATE:
-        return amount
-    if contribution.contribution_type in (
-        models.GoalContributionType.RETURN,
-        models.GoalContributionType.CONSUME,
-    ):
-        return -amount
-    return 0
-
-
-def _goal_contributions(
-    db: Session,
-    user_id: int,
-    goal_id: int | None = None,
-    wallet_id: int | None = None,
-) -> list[models.GoalContributions]:
-    query = db.query(models.GoalContributions).filter(models.GoalContributions.owner_id == user_id)
-    if goal_id is not None:
-        query = query.filter(models.GoalContributions.goal_id == goal_id)
-    if wallet_id is not None:
-        query = query.filter(models.GoalContributions.wallet_id == wallet_id)
-    return query.all()
+def _goal_balances(db: Session, user_id: int, *columns):
+    return db.query(*columns).filter(models.GoalWalletBalance.owner_id == user_id)
 
 
 def is_wallet_goal_funding_eligible(wallet: models.Wallet) -> bool:
@@ -59,25 +41,33 @@ def get_total_balance(db: Session, user_id: int) -> int:
 
 
 def get_goal_funded_amount(db: Session, user_id: int, goal_id: int) -> int:
-    total = sum(_contribution_delta(item) for item in _goal_contributions(db, user_id, goal_id=goal_id))
-    return max(int(total), 0)
+    total = (
+        _goal_balances(db, user_id, func.coalesce(func.sum(funded_expression()), 0))
+        .filter(models.GoalWalletBalance.goal_id == goal_id)
+        .scalar()
+    )
+    return max(int(total or 0), 0)
 
 
 def get_goal_wallet_funded_amount(db: Session, user_id: int, goal_id: int, wallet_id: int) -> int:
-    total = sum(
-        _contribution_delta(item)
-        for item in _goal_contributions(db, user_id, goal_id=goal_id, wallet_id=wallet_id)
+    total = (
+        _goal_balances(db, user_id, funded_expression())
+        .filter(
+            models.GoalWalletBalance.goal_id == goal_id,
+            models.GoalWalletBalance.wallet_id == wallet_id,
+        )
+        .scalar()
     )
-    return max(int(total), 0)
+    return max(int(total or 0), 0)
 
 
 def get_goal_consumed_amount(db: Session, user_id: int, goal_id: int) -> int:
-    total = sum(
-        int(item.amount or 0)
-        for item in _goal_contributions(db, user_id, goal_id=goal_id)
-        if item.contribution_type == models.GoalContributionType.CONSUME
+    total = (
+        _goal_balances(db, user_id, func.coalesce(func.sum(models.GoalWalletBalance.consumed), 0))
+        .filter(models.GoalWalletBalance.goal_id == goal_id)
+        .scalar()
     )
-    return max(int(total), 0)
+    return max(int(total or 0), 0)
 
 
 def get_next_payment_plan_goal_payment(
@@ -129,6 +119,14 @@ def get_goal_payment_plan_target(
         .order_by(models.PaymentPlanPayment.due_date.asc(), models.PaymentPlanPayment.id.asc())
         .all()
     )
+    return _payment_plan_target(plan, payments)
+
+
+def _payment_plan_target(
+    plan: models.PaymentPlan,
+    payments: list[models.PaymentPlanPayment],
+) -> schemas.GoalPaymentPlanTargetOut | None:
+    """Target for the first open payment; ``payments`` are the plan's rows in due order."""
     target = next(
         (
             payment
@@ -156,9 +154,16 @@ def get_goal_payment_plan_target(
 
 
 def get_wallet_goal_allocated_amount(db: Session, user_id: int, wallet_id: int) -> int:
-    total = sum(_contribution_delta(item) for item in _goal_contributions(db, user_id, wallet_id=wallet_id))
-    released_amount = get_wallet_goal_released_amount(db, user_id, wallet_id)
-    return max(int(total) - int(released_amount), 0)
+    total = (
+        _goal_balances(
+            db,
+            user_id,
+            func.coalesce(func.sum(funded_expression() - models.GoalWalletBalance.released), 0),
+        )
+        .filter(models.GoalWalletBalance.wallet_id == wallet_id)
+        .scalar()
+    )
+    return max(int(total or 0), 0)
 
 
 def get_wallet_free_to_spend(db: Session, user_id: int, wallet: models.Wallet) -> int:
@@ -226,18 +231,20 @@ def _wallet_goal_amounts_ordered(
     user_id: int,
     wallet_id: int,
 ) -> list[tuple[models.Goals, int]]:
-    goals = (
-        db.query(models.Goals)
-        .filter(models.Goals.owner_id == user_id)
+    funded = funded_expression()
+    rows = (
+        db.query(models.Goals, funded)
+        .join(models.GoalWalletBalance, models.GoalWalletBalance.goal_id == models.Goals.id)
+        .filter(
+            models.Goals.owner_id == user_id,
+            models.GoalWalletBalance.owner_id == user_id,
+            models.GoalWalletBalance.wallet_id == wallet_id,
+            funded > 0,
+        )
         .order_by(models.Goals.created_at.asc(), models.Goals.id.asc())
         .all()
     )
-    rows: list[tuple[models.Goals, int]] = []
-    for goal in goals:
-        amount = get_goal_wallet_funded_amount(db, user_id, goal.id, wallet_id)
-        if amount > 0:
-            rows.append((goal, amount))
-    return rows
+    return [(goal, int(amount)) for goal, amount in rows]
 
 
 def _resolve_wallet_goal_amount(
@@ -339,43 +346,38 @@ def release_wallet_goal_allocations(
 
 
 def get_goal_released_amount(db: Session, user_id: int, goal_id: int) -> int:
-    released_total = sum(
-        int(item.amount or 0)
-        for item in db.query(models.GoalProjectRelease)
+    # Summed from the release rows: releases without a wallet have no
+    # balance row but still count against the goal.
+    released_total = (
+        db.query(func.coalesce(func.sum(models.GoalProjectRelease.amount), 0))
         .filter(
             models.GoalProjectRelease.owner_id == user_id,
             models.GoalProjectRelease.goal_id == goal_id,
         )
-        .all()
+        .scalar()
     )
-    return max(int(released_total), 0)
+    return max(int(released_total or 0), 0)
 
 
 def get_goal_wallet_released_amount(db: Session, user_id: int, goal_id: int, wallet_id: int) -> int:
-    released_total = sum(
-        int(item.amount or 0)
-        for item in db.query(models.GoalProjectRelease)
+    released_total = (
+        _goal_balances(db, user_id, models.GoalWalletBalance.released)
         .filter(
-            models.GoalProjectRelease.owner_id == user_id,
-            models.GoalProjectRelease.goal_id == goal_id,
-            models.GoalProjectRelease.wallet_id == wallet_id,
+            models.GoalWalletBalance.goal_id == goal_id,
+            models.GoalWalletBalance.wallet_id == wallet_id,
         )
-        .all()
+        .scalar()
     )
-    return max(int(released_total), 0)
+    return max(int(released_total or 0), 0)
 
 
 def get_wallet_goal_released_amount(db: Session, user_id: int, wallet_id: int) -> int:
-    released_total = sum(
-        int(item.amount or 0)
-        for item in db.query(models.GoalProjectRelease)
-        .filter(
-            models.GoalProjectRelease.owner_id == user_id,
-            models.GoalProjectRelease.wallet_id == wallet_id,
-        )
-        .all()
+    released_total = (
+        _goal_balances(db, user_id, func.coalesce(func.sum(models.GoalWalletBalance.released), 0))
+        .filter(models.GoalWalletBalance.wallet_id == wallet_id)
+        .scalar()
     )
-    return max(int(released_total), 0)
+    return max(int(released_total or 0), 0)
 
 
 def get_goal_linked_project_id(db: Session, user_id: int, goal_id: int) -> int | None:
@@ -391,22 +393,26 @@ def get_goal_linked_project_id(db: Session, user_id: int, goal_id: int) -> int |
 
 
 def get_goal_funding_sources(db: Session, user_id: int, goal_id: int) -> list[schemas.GoalFundingSourceOut]:
-    totals_by_wallet: dict[int, int] = {}
-    for contribution in _goal_contributions(db, user_id, goal_id=goal_id):
-        totals_by_wallet[contribution.wallet_id] = totals_by_wallet.get(contribution.wallet_id, 0) + _contribution_delta(contribution)
+    funded = funded_expression()
+    rows = (
+        db.query(models.Wallet, funded, models.GoalWalletBalance.released)
+        .join(models.GoalWalletBalance, models.GoalWalletBalance.wallet_id == models.Wallet.id)
+        .filter(
+            models.Wallet.owner_id == user_id,
+            models.GoalWalletBalance.owner_id == user_id,
+            models.GoalWalletBalance.goal_id == goal_id,
+            funded > 0,
+        )
+        .all()
+    )
 
+    return _funding_sources(rows)
+
+
+def _funding_sources(rows) -> list[schemas.GoalFundingSourceOut]:
+    """Sources from ``(wallet, funded, released)`` rows with positive funding."""
     sources: list[schemas.GoalFundingSourceOut] = []
-    for wallet_id, allocated_amount in totals_by_wallet.items():
-        if allocated_amount <= 0:
-            continue
-        wallet = (
-            db.query(models.Wallet)
-            .filter(models.Wallet.id == wallet_id, models.Wallet.owner_id == user_id)
-            .first()
-        )
-        if wallet is None:
-            continue
-        released_amount = get_goal_wallet_released_amount(db, user_id, goal_id, wallet_id)
+    for wallet, allocated_amount, released_amount in rows:
         sources.append(
             schemas.GoalFundingSourceOut(
                 wallet_id=wallet.id,
@@ -421,6 +427,7 @@ def get_goal_funding_sources(db: Session, user_id: int, goal_id: int) -> list[sc
     return sorted(sources, key=lambda item: item.wallet_name.lower())
 
 
+@cached_read("goal_funding_summary")
 def build_goal_funding_summary(db: Session, user_id: int) -> schemas.GoalFundingSummaryOut:
     wallets = (
         db.query(models.Wallet)
@@ -435,9 +442,20 @@ def build_goal_funding_summary(db: Session, user_id: int) -> schemas.GoalFunding
     total_available = 0
     total_over_allocated = 0
 
+    allocated_by_wallet = dict(
+        _goal_balances(
+            db,
+            user_id,
+            models.GoalWalletBalance.wallet_id,
+            func.sum(funded_expression() - models.GoalWalletBalance.released),
+        )
+        .group_by(models.GoalWalletBalance.wallet_id)
+        .all()
+    )
+
     for wallet in wallets:
         balance = int(wallet.current_balance or 0)
-        allocated = get_wallet_goal_allocated_amount(db, user_id, wallet.id)
+        allocated = max(int(allocated_by_wallet.get(wallet.id) or 0), 0)
         available_raw = balance - allocated
         over_allocated = max(-available_raw, 0)
         eligible = is_wallet_goal_funding_eligible(wallet)
@@ -630,9 +648,141 @@ def build_goal_with_progress(
     released_amount: int = 0,
     linked_project_id: int | None = None,
     today: date | None = None,
+) -> schemas.GoalWithProgressOut:
+    return _assemble_goal_with_progress(
+        goal,
+        funded_amount=funded_amount,
+        consumed_amount=get_goal_consumed_amount(db, user_id, goal.id),
+        released_amount=released_amount,
+        linked_project_id=linked_project_id,
+        funding_sources=get_goal_funding_sources(db, user_id, goal.id),
+        payment_plan_target=get_goal_payment_plan_target(db, user_id, goal),
+        today=today,
+    )
+
+
+def build_goals_with_progress(
+    db: Session,
+    user_id: int,
+    goals: list[models.Goals],
+    today: date | None = None,
+) -> list[schemas.GoalWithProgressOut]:
+    """Progress for many goals with a fixed number of grouped queries.
+
+    Equivalent to syncing each goal's status and calling
+    ``build_goal_with_progress`` with its funded, released and linked
+    project values, without the per-goal lookups.
+    """
+    goal_ids = [int(goal.id) for goal in goals]
+    if not goal_ids:
+        return []
+
+    funded = funded_expression()
+    funded_by_goal: dict[int, int] = {}
+    consumed_by_goal: dict[int, int] = {}
+    source_rows: dict[int, list[tuple[models.Wallet, int, int]]] = {}
+    for wallet, goal_id, funded_amount, consumed_amount, released_amount in (
+        db.query(
+            models.Wallet,
+            models.GoalWalletBalance.goal_id,
+            funded,
+            models.GoalWalletBalance.consumed,
+            models.GoalWalletBalance.released,
+        )
+        .join(models.GoalWalletBalance, models.GoalWalletBalance.wallet_id == models.Wallet.id)
+        .filter(
+            models.Wallet.owner_id == user_id,
+            models.GoalWalletBalance.owner_id == user_id,
+            models.GoalWalletBalance.goal_id.in_(goal_ids),
+        )
+        .all()
+    ):
+        funded_by_goal[goal_id] = funded_by_goal.get(goal_id, 0) + int(funded_amount)
+        consumed_by_goal[goal_id] = consumed_by_goal.get(goal_id, 0) + int(consumed_amount)
+        if funded_amount > 0:
+            source_rows.setdefault(goal_id, []).append((wallet, funded_amount, released_amount))
+
+    released_by_goal = dict(
+        db.query(models.GoalProjectRelease.goal_id, func.sum(models.GoalProjectRelease.amount))
+        .filter(
+            models.GoalProjectRelease.owner_id == user_id,
+            models.GoalProjectRelease.goal_id.in_(goal_ids),
+        )
+        .group_by(models.GoalProjectRelease.goal_id)
+        .all()
+    )
+    project_by_goal = dict(
+        db.query(models.Project.origin_goal_id, func.min(models.Project.id))
+        .filter(
+            models.Project.owner_id == user_id,
+            models.Project.origin_goal_id.in_(goal_ids),
+        )
+        .group_by(models.Project.origin_goal_id)
+        .all()
+    )
+
+    plan_ids = {
+        int(goal.linked_payment_plan_id)
+        for goal in goals
+        if goal.intent == models.GoalIntent.PAY_OBLIGATION and goal.linked_payment_plan_id is not None
+    }
+    target_by_plan: dict[int, schemas.GoalPaymentPlanTargetOut | None] = {}
+    if plan_ids:
+        payments_by_plan: dict[int, list[models.PaymentPlanPayment]] = {}
+        for payment in (
+            db.query(models.PaymentPlanPayment)
+            .filter(
+                models.PaymentPlanPayment.owner_id == user_id,
+                models.PaymentPlanPayment.plan_id.in_(plan_ids),
+            )
+            .order_by(models.PaymentPlanPayment.due_date.asc(), models.PaymentPlanPayment.id.asc())
+            .all()
+        ):
+            payments_by_plan.setdefault(int(payment.plan_id), []).append(payment)
+        for plan in (
+            db.query(models.PaymentPlan)
+            .filter(models.PaymentPlan.owner_id == user_id, models.PaymentPlan.id.in_(plan_ids))
+            .all()
+        ):
+            target_by_plan[int(plan.id)] = _payment_plan_target(plan, payments_by_plan.get(int(plan.id), []))
+
+    for goal in goals:
+        sync_goal_status(goal, max(funded_by_goal.get(goal.id, 0), 0))
+    db.flush()
+
+    results: list[schemas.GoalWithProgressOut] = []
+    for goal in goals:
+        results.append(
+            _assemble_goal_with_progress(
+                goal,
+                funded_amount=max(funded_by_goal.get(goal.id, 0), 0),
+                consumed_amount=max(consumed_by_goal.get(goal.id, 0), 0),
+                released_amount=max(int(released_by_goal.get(goal.id) or 0), 0),
+                linked_project_id=project_by_goal.get(goal.id),
+                funding_sources=_funding_sources(source_rows.get(goal.id, [])),
+                payment_plan_target=(
+                    target_by_plan.get(int(goal.linked_payment_plan_id))
+                    if goal.intent == models.GoalIntent.PAY_OBLIGATION and goal.linked_payment_plan_id is not None
+                    else None
+                ),
+                today=today,
+            )
+        )
+    return results
+
+
+def _assemble_goal_with_progress(
+    goal: models.Goals,
+    *,
+    funded_amount: int,
+    consumed_amount: int,
+    released_amount: int,
+    linked_project_id: int | None,
+    funding_sources: list[schemas.GoalFundingSourceOut],
+    payment_plan_target: schemas.GoalPaymentPlanTargetOut | None,
+    today: date | None,
 ) -> schemas.GoalWithProgressOut:
     target_amount = int(goal.target_amount or 0)
-    consumed_amount = get_goal_consumed_amount(db, user_id, goal.id)
     is_payment_plan_goal = goal.intent == models.GoalIntent.PAY_OBLIGATION and goal.linked_payment_plan_id is not None
     is_real_world_completed = (
         goal.status == models.GoalStatus.COMPLETED
@@ -680,10 +830,10 @@ def build_goal_with_progress(
     goal_out.remaining_amount = int(remaining_amount)
     goal_out.progress_percent = round(progress_percent, 2)
     goal_out.linked_project_id = int(linked_project_id) if linked_project_id is not None else None
-    goal_out.funding_sources = get_goal_funding_sources(db, user_id, goal.id)
+    goal_out.funding_sources = funding_sources
     goal_out.time_state = time_state
     goal_out.days_until_target = days_until_target
-    goal_out.payment_plan_target = get_goal_payment_plan_target(db, user_id, goal)
+    goal_out.payment_plan_target = payment_plan_target
     return goal_out
 
 
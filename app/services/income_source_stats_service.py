@@ -0,0 +1,331 @@
+"""Materialized per-source income analytics.
+
+``income_source_stats`` keeps one row of running totals per income source:
+the Money In entries linked through ``EntityLedger.income_source_id``
+(distinct events and their summed amount) and the source's EARNED promises
+(count, original amount, and the received / outstanding aggregates that
+expected_inflow_service already keeps on each promise). The analytics card
+reads that row instead of loading every ledger leg and promise schedule.
+
+Mapper listeners record what each flush inserts, updates or deletes, and a
+session ``after_flush`` hook applies the net change on the flushing
+connection, inside the same transaction as the ledger or promise rows. The
+entry count is per event, so it is adjusted from the number of legs each
+touched (source, event) pair has before and after the flush. Bulk
+``Query.delete()`` / ``Query.update()`` and database-level ``SET NULL`` bypass
+the listeners; run ``rebuild_income_source_stats`` after such maintenance.
+
+Verify or rebuild from the command line::
+
+    python -m app.services.income_source_stats_service [--rebuild] [--owner-id ID]
+"""
+from __future__ import annotations
+
+import argparse
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+# pyrefly: ignore [missing-import]
+from sqlalchemy import delete, event, func, insert, literal, select
+# pyrefly: ignore [missing-import]
+from sqlalchemy.dialects import postgresql, sqlite
+# pyrefly: ignore [missing-import]
+from sqlalchemy.orm import Session, attributes, object_session
+
+from app import models
+
+
+STAT_FIELDS = (
+    "entry_count",
+    "entry_total_received",
+    "promise_count",
+    "lifetime_expected",
+    "lifetime_received",
+    "outstanding_expected",
+)
+
+_PENDING_KEY = "income_source_stats_pending"
+
+
+@dataclass
+class _PendingStats:
+    # source_id -> field -> delta
+    deltas: dict[int, dict[str, int]] = field(default_factory=lambda: defaultdict(lambda: defaultdict(int)))
+    # (source_id, event_id) -> net number of legs added by this flush
+    legs: dict[tuple[int, int], int] = field(default_factory=lambda: defaultdict(int))
+
+
+def _pending(target) -> _PendingStats | None:
+    session = object_session(target)
+    if session is None:
+        return None
+    return session.info.setdefault(_PENDING_KEY, _PendingStats())
+
+
+def _previous(target, name: str):
+    """Value of ``name`` as of the last flush, read inside an update listener."""
+    history = attributes.get_history(target, name)
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(target, name)
+
+
+def _record_leg(target, source_id, event_id, amount, sign: int) -> None:
+    if source_id is None:
+        return
+    pending = _pending(target)
+    if pending is None:
+        return
+    pending.legs[(int(source_id), int(event_id))] += sign
+    pending.deltas[int(source_id)]["entry_total_received"] += sign * int(amount or 0)
+
+
+def _record_promise(target, kind, source_id, values: tuple, sign: int) -> None:
+    if source_id is None or kind != models.ExpectedInflowKind.EARNED.value:
+        return
+    pending = _pending(target)
+    if pending is None:
+        return
+    deltas = pending.deltas[int(source_id)]
+    original_amount, received, outstanding = (int(value or 0) for value in values)
+    deltas["promise_count"] += sign
+    deltas["lifetime_expected"] += sign * original_amount
+    deltas["lifetime_received"] += sign * received
+    deltas["outstanding_expected"] += sign * outstanding
+
+
+_PROMISE_VALUES = ("original_amount", "received_amount", "outstanding_amount")
+
+
+@event.listens_for(models.EntityLedger, "after_insert")
+def _leg_inserted(mapper, connection, target) -> None:
+    _record_leg(target, target.income_source_id, target.event_id, target.amount, 1)
+
+
+@event.listens_for(models.EntityLedger, "after_update")
+def _leg_updated(mapper, connection, target) -> None:
+    old = tuple(_previous(target, name) for name in ("income_source_id", "event_id", "amount"))
+    new = (target.income_source_id, target.event_id, target.amount)
+    if old != new:
+        _record_leg(target, *old, -1)
+        _record_leg(target, *new, 1)
+
+
+@event.listens_for(models.EntityLedger, "after_delete")
+def _leg_deleted(mapper, connection, target) -> None:
+    _record_leg(target, target.income_source_id, target.event_id, target.amount, -1)
+
+
+@event.listens_for(models.ExpectedInflowPromise, "after_insert")
+def _promise_inserted(mapper, connection, target) -> None:
+    _record_promise(
+        target, target.kind, target.source_id, tuple(getattr(target, name) for name in _PROMISE_VALUES), 1,
+    )
+
+
+@event.listens_for(models.ExpectedInflowPromise, "after_update")
+def _promise_updated(mapper, connection, target) -> None:
+    names = ("kind", "source_id", *_PROMISE_VALUES)
+    old = tuple(_previous(target, name) for name in names)
+    new = tuple(getattr(target, name) for name in names)
+    if old != new:
+        _record_promise(target, old[0], old[1], old[2:], -1)
+        _record_promise(target, new[0], new[1], new[2:], 1)
+
+
+@event.listens_for(models.ExpectedInflowPromise, "after_delete")
+def _promise_deleted(mapper, connection, target) -> None:
+    _record_promise(
+        target, target.kind, target.source_id, tuple(getattr(target, name) for name in _PROMISE_VALUES), -1,
+    )
+
+
+def _leg_counts(connection, pairs) -> dict[tuple[int, int], int]:
+    ledger = models.EntityLedger.__table__
+    rows = connection.execute(
+        select(ledger.c.income_source_id, ledger.c.event_id, func.count())
+        .where(ledger.c.income_source_id.in_({source_id for source_id, _ in pairs}))
+        .where(ledger.c.event_id.in_({event_id for _, event_id in pairs}))
+        .group_by(ledger.c.income_source_id, ledger.c.event_id)
+    ).all()
+    return {(int(source_id), int(event_id)): int(count) for source_id, event_id, count in rows}
+
+
+def _apply_delta(connection, source_id: int, values: dict[str, int]) -> None:
+    """Add ``values`` to the source's row, creating it while the source still exists."""
+    table = models.IncomeSourceStats.__table__
+    sources = models.IncomeSource.__table__
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(table).from_select(
+        ["source_id", "owner_id", *values],
+        select(
+            sources.c.id,
+            sources.c.owner_id,
+            *(literal(int(delta)) for delta in values.values()),
+        ).where(sources.c.id == int(source_id)),
+    )
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[table.c.source_id],
+            set_={name: table.c[name] + int(delta) for name, delta in values.items()},
+        )
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_pending(session, flush_context) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending is None:
+        return
+    connection = session.connection()
+    legs = {pair: change for pair, change in pending.legs.items() if change}
+    if legs:
+        counts = _leg_counts(connection, legs)
+        for (source_id, event_id), change in legs.items():
+            after = counts.get((source_id, event_id), 0)
+            before = after - change
+            pending.deltas[source_id]["entry_count"] += int(after > 0) - int(before > 0)
+    for source_id, values in pending.deltas.items():
+        values = {name: delta for name, delta in values.items() if delta}
+        if values:
+            _apply_delta(connection, source_id, values)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def source_totals(db: Session, *, owner_id: int | None = None) -> dict[int, dict[str, int]]:
+    """Per-source totals aggregated in SQL from ledger legs and EARNED promises."""
+    source = models.IncomeSource
+    ledger = models.EntityLedger
+    promise = models.ExpectedInflowPromise
+    entry_query = (
+        db.query(
+            source.id,
+            source.owner_id,
+            func.count(func.distinct(ledger.event_id)),
+            func.coalesce(func.sum(ledger.amount), 0),
+        )
+        .join(ledger, ledger.income_source_id == source.id)
+        .group_by(source.id, source.owner_id)
+    )
+    promise_query = (
+        db.query(
+            source.id,
+            source.owner_id,
+            func.count(promise.id),
+            func.coalesce(func.sum(promise.original_amount), 0),
+            func.coalesce(func.sum(promise.received_amount), 0),
+            func.coalesce(func.sum(promise.outstanding_amount), 0),
+        )
+        .join(promise, promise.source_id == source.id)
+        .filter(promise.kind == models.ExpectedInflowKind.EARNED.value)
+        .group_by(source.id, source.owner_id)
+    )
+    if owner_id is not None:
+        entry_query = entry_query.filter(source.owner_id == owner_id)
+        promise_query = promise_query.filter(source.owner_id == owner_id, promise.owner_id == owner_id)
+
+    totals: dict[int, dict[str, int]] = {}
+
+    def _row(source_id: int, owner: int) -> dict[str, int]:
+        return totals.setdefault(int(source_id), {"owner_id": int(owner), **{name: 0 for name in STAT_FIELDS}})
+
+    for source_id, owner, *amounts in entry_query.all():
+        _row(source_id, owner).update(zip(STAT_FIELDS[:2], (int(amount or 0) for amount in amounts)))
+    for source_id, owner, *amounts in promise_query.all():
+        _row(source_id, owner).update(zip(STAT_FIELDS[2:], (int(amount or 0) for amount in amounts)))
+    return totals
+
+
+def get_income_source_stats(db: Session, source_id: int) -> dict[str, int]:
+    """The stored counters for one source; zeros before it has any activity."""
+    # Column row, not an entity: the counters are written through Core.
+    stats = models.IncomeSourceStats
+    row = (
+        db.query(*(stats.__table__.c[name] for name in STAT_FIELDS))
+        .filter(stats.source_id == source_id)
+        .first()
+    )
+    if row is None:
+        return {name: 0 for name in STAT_FIELDS}
+    return {name: int(value or 0) for name, value in zip(STAT_FIELDS, row)}
+
+
+@dataclass(frozen=True)
+class IncomeSourceStatsDrift:
+    source_id: int
+    field: str
+    stored: int
+    expected: int
+
+
+def verify_income_source_stats(db: Session, *, owner_id: int | None = None) -> list[IncomeSourceStatsDrift]:
+    """Compare stored counters with totals recomputed from ledger legs and promises."""
+    db.flush()
+    expected = source_totals(db, owner_id=owner_id)
+    stats = models.IncomeSourceStats
+    query = db.query(stats.source_id, *(stats.__table__.c[name] for name in STAT_FIELDS))
+    if owner_id is not None:
+        query = query.filter(stats.owner_id == owner_id)
+    stored = {int(source_id): dict(zip(STAT_FIELDS, values)) for source_id, *values in query.all()}
+
+    drifts: list[IncomeSourceStatsDrift] = []
+    for source_id in sorted(set(expected) | set(stored)):
+        row = stored.get(source_id, {})
+        for name in STAT_FIELDS:
+            stored_value = int(row.get(name) or 0)
+            expected_value = expected.get(source_id, {}).get(name, 0)
+            if stored_value != expected_value:
+                drifts.append(IncomeSourceStatsDrift(source_id, name, stored_value, expected_value))
+    return drifts
+
+
+def rebuild_income_source_stats(db: Session, *, owner_id: int | None = None) -> int:
+    """Replace stored counters with totals recomputed in SQL; the caller commits.
+
+    Returns the number of stats rows written.
+    """
+    db.flush()
+    statement = delete(models.IncomeSourceStats)
+    if owner_id is not None:
+        statement = statement.where(models.IncomeSourceStats.owner_id == owner_id)
+    db.execute(statement)
+    totals = source_totals(db, owner_id=owner_id)
+    if totals:
+        db.execute(
+            insert(models.IncomeSourceStats.__table__),
+            [{"source_id": source_id, **values} for source_id, values in totals.items()],
+        )
+    db.expire_all()
+    return len(totals)
+
+
+def main(argv: list[str] | None = None) -> int:
+    from app.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Verify or rebuild income_source_stats.")
+    parser.add_argument("--rebuild", action="store_true", help="rewrite counters from ledger legs and promises")
+    parser.add_argument("--owner-id", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        drifts = verify_income_source_stats(db, owner_id=args.owner_id)
+        for drift in drifts:
+            print(f"source={drift.source_id} {drift.field}: stored={drift.stored} expected={drift.expected}")
+        print(f"{len(drifts)} drifted value(s).")
+        if args.rebuild:
+            written = rebuild_income_source_stats(db, owner_id=args.owner_id)
+            db.commit()
+            print(f"Rebuilt {written} stats row(s).")
+            return 0
+        return 1 if drifts else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,172 @@
+"""Unread notification counters and read-notification retention.
+
+Unread counts live in Redis under ``nu:{owner_id}`` so the notification
+bell, the list header and the SSE unread events never run a COUNT per
+request. ``app.realtime`` keeps them current from the write path:
+
+- writes that insert, mark read or delete unread notifications queue a
+  delta, applied with ``INCRBY`` after the transaction commits;
+- owners without a counter, and bulk paths that cannot know their delta,
+  are recounted from the database inside the committing transaction and the
+  counter is set to that value.
+
+Counters expire after ``notification_unread_counter_ttl_seconds``; the next
+read recounts from the database, so any drift (a lost publish, a database
+cascade) heals on that schedule. Redis being unavailable falls back to the
+database count.
+
+``purge_read_notifications`` is the scheduled retention job: it deletes read
+notifications older than ``notification_retention_days`` in batches, so the
+per-owner indexes stay small. Unread notifications are never removed.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+# pyrefly: ignore [missing-import]
+from sqlalchemy import delete, func
+# pyrefly: ignore [missing-import]
+from sqlalchemy.orm import Session
+
+from app import models
+from app.domains.ledger._ledger_version import bump_ledger_version
+from app.redis_rate_limiter import redis_client
+from config import settings
+
+
+logger = logging.getLogger(__name__)
+
+UNREAD_KEY_PREFIX = "nu"
+
+# Adds the delta only while the counter exists; a missing counter is
+# recounted from the database instead of being recreated from a delta.
+INCR_IF_EXISTS_SCRIPT = redis_client.register_script(
+    """
+if redis.call("EXISTS", KEYS[1]) == 1 then
+    return redis.call("INCRBY", KEYS[1], ARGV[1])
+end
+return false
+"""
+)
+
+
+def unread_key(owner_id: int) -> str:
+    return f"{UNREAD_KEY_PREFIX}:{int(owner_id)}"
+
+
+def count_unread_in_db(db: Session, owner_ids) -> dict[int, int]:
+    """Unread notification counts from the database, one grouped query."""
+    owner_ids = sorted({int(owner_id) for owner_id in owner_ids})
+    if not owner_ids:
+        return {}
+    rows = (
+        db.query(models.Notification.owner_id, func.count(models.Notification.id))
+        .filter(
+            models.Notification.owner_id.in_(owner_ids),
+            models.Notification.is_read.is_(False),
+        )
+        .group_by(models.Notification.owner_id)
+        .all()
+    )
+    counts = {int(owner_id): int(count) for owner_id, count in rows}
+    return {owner_id: counts.get(owner_id, 0) for owner_id in owner_ids}
+
+
+def get_unread_count(db: Session, owner_id: int) -> int:
+    """The owner's unread count, seeding the Redis counter from the database on a miss."""
+    key = unread_key(owner_id)
+    try:
+        cached = redis_client.get(key)
+    except Exception as exc:
+        logger.warning("Unread counter read failed: %s", exc)
+        return count_unread_in_db(db, [owner_id])[int(owner_id)]
+    if cached is not None:
+        return max(0, int(cached))
+    count = count_unread_in_db(db, [owner_id])[int(owner_id)]
+    try:
+        # NX: a write that committed meanwhile may already have set it.
+        redis_client.set(key, count, ex=settings.notification_unread_counter_ttl_seconds, nx=True)
+    except Exception as exc:
+        logger.warning("Unread counter seed failed: %s", exc)
+    return count
+
+
+def existing_unread_counters(owner_ids) -> set[int]:
+    """Owners whose counter is present in Redis; empty when Redis is unavailable."""
+    owner_ids = sorted({int(owner_id) for owner_id in owner_ids})
+    if not owner_ids:
+        return set()
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for owner_id in owner_ids:
+            pipe.exists(unread_key(owner_id))
+        present = pipe.execute()
+    except Exception as exc:
+        logger.warning("Unread counter lookup failed: %s", exc)
+        return set()
+    return {owner_id for owner_id, exists in zip(owner_ids, present) if exists}
+
+
+def apply_unread_changes(*, deltas: dict[int, int], counts: dict[int, int]) -> dict[int, int]:
+    """Apply committed deltas and recounts; returns the resulting count per owner.
+
+    Owners whose counter expired between the check and the update are left
+    out, so callers only ever report counts Redis actually holds.
+    """
+    owners = [int(owner_id) for owner_id in deltas]
+    if not owners and not counts:
+        return {}
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for owner_id in owners:
+            INCR_IF_EXISTS_SCRIPT(keys=[unread_key(owner_id)], args=[int(deltas[owner_id])], client=pipe)
+        for owner_id, count in counts.items():
+            pipe.set(unread_key(owner_id), int(count), ex=settings.notification_unread_counter_ttl_seconds)
+        results = pipe.execute()
+    except Exception as exc:
+        logger.warning("Unread counter update failed: %s", exc)
+        return {}
+    applied = {
+        owner_id: max(0, int(value))
+        for owner_id, value in zip(owners, results)
+        if value is not None
+    }
+    applied.update({int(owner_id): int(count) for owner_id, count in counts.items()})
+    return applied
+
+
+def purge_read_notifications(
+    db: Session,
+    *,
+    older_than_days: int | None = None,
+    batch_size: int | None = None,
+    now: datetime | None = None,
+) -> int:
+    """Delete read notifications older than the retention window, committing per batch.
+
+    Returns the number of notifications deleted.
+    """
+    days = settings.notification_retention_days if older_than_days is None else older_than_days
+    size = max(1, settings.notification_retention_batch_size if batch_size is None else batch_size)
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=days)
+    notification = models.Notification
+    deleted = 0
+    while True:
+        rows = (
+            db.query(notification.id, notification.owner_id)
+            .filter(notification.is_read.is_(True), notification.created_at < cutoff)
+            .order_by(notification.id)
+            .limit(size)
+            .all()
+        )
+        if not rows:
+            return deleted
+        db.execute(delete(notification).where(notification.id.in_([row.id for row in rows])))
+        # Bulk delete skips the flush listener; the lists these rows appeared in changed.
+        for owner_id in sorted({int(row.owner_id) for row in rows}):
+            bump_ledger_version(db, owner_id)
+        db.commit()
+        deleted += len(rows)
+        if len(rows) < size:
+            return deleted
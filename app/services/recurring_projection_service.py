@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from bisect import bisect_right
 from dataclasses import dataclass
 from datetime import date, timedelta
 
@@ -10,7 +11,12 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select
 
 from app import models, schemas
-from app.services.recurring_schedule_service import calculate_next_due_date
+from app.services.recurring_schedule_service import (
+    count_due_dates,
+    due_dates_between,
+    first_index_on_or_after,
+    nth_due_date,
+)
 
 
 @dataclass
@@ -21,6 +27,27 @@ class ProjectedOccurrence:
     title: str
     due_date: date
     is_materialized: bool
+    occurrence_id: int | None = None
+    status: models.RecurringOccurrenceStatus | None = None
+
+
+@dataclass
+class OwnerObligationProjection:
+    """Every recurring obligation of one owner within a date range."""
+
+    occurrences: list[ProjectedOccurrence]
+
+    def by_category(self) -> dict[models.ExpenseCategory, int]:
+        totals: dict[models.ExpenseCategory, int] = {}
+        for occurrence in self.occurrences:
+            totals[occurrence.category] = totals.get(occurrence.category, 0) + occurrence.amount
+        return totals
+
+
+INACTIVE_OCCURRENCE_STATUSES = (
+    models.RecurringOccurrenceStatus.SKIPPED,
+    models.RecurringOccurrenceStatus.CANCELLED,
+)
 
 
 DEFAULT_HORIZONS: dict[models.RecurringFrequency, list[tuple[str, int]]] = {
@@ -178,35 +205,228 @@ def project_occurrences_for_range(
             is_materialized=True,
         ))
         
-    curr_date = template.next_due_date
     original_due_day = template.original_due_day or template.start_date.day
-    
-    guard = 0
-    while curr_date and curr_date <= end_date:
-        if curr_date >= start_date:
+    for due_date in due_dates_between(
+        template.next_due_date,
+        template.frequency,
+        start_date,
+        end_date,
+        original_due_day,
+    ):
+        results.append(ProjectedOccurrence(
+            category=template.category,
+            amount=template.amount,
+            source_id=template.id,
+            title=template.title,
+            due_date=due_date,
+            is_materialized=False,
+        ))
+
+    results.sort(key=lambda x: x.due_date)
+    return results
+
+
+OCCURRENCE_HORIZON_DAYS = 365 * 5
+
+
+class HorizonProjector:
+    """Projects one template over any number of horizons from a shared anchor.
+
+    Materialized occurrences are loaded once for the widest horizon and kept as
+    sorted dates with running totals; scheduled dates are counted
+    arithmetically, so each horizon costs O(log n) regardless of frequency.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        recurring: models.RecurringExpense,
+        *,
+        anchor_date: date,
+        until: date,
+    ) -> None:
+        self.recurring = recurring
+        self.anchor_date = anchor_date
+        self.original_due_day = recurring.original_due_day or recurring.start_date.day
+        rows = db.execute(
+            select(
+                models.RecurringOccurrence.scheduled_due_date,
+                models.RecurringOccurrence.status,
+                models.RecurringOccurrence.expected_amount,
+                models.RecurringOccurrence.actual_amount,
+            )
+            .where(models.RecurringOccurrence.template_id == recurring.id)
+            .where(models.RecurringOccurrence.scheduled_due_date >= anchor_date)
+            .where(models.RecurringOccurrence.scheduled_due_date <= until)
+            .where(
+                models.RecurringOccurrence.status.notin_(
+                    (models.RecurringOccurrenceStatus.SKIPPED, models.RecurringOccurrenceStatus.CANCELLED)
+                )
+            )
+            .order_by(models.RecurringOccurrence.scheduled_due_date)
+        ).all()
+        self._dates: list[date] = []
+        self._amounts: list[int] = []
+        self._running_totals: list[int] = [0]
+        for due_date, occurrence_status, expected_amount, actual_amount in rows:
+            amount = expected_amount
+            if occurrence_status == models.RecurringOccurrenceStatus.FULFILLED and actual_amount is not None:
+                amount = actual_amount
+            self._dates.append(due_date)
+            self._amounts.append(amount)
+            self._running_totals.append(self._running_totals[-1] + amount)
+
+    def window(self, end_date: date) -> tuple[int, int]:
+        """Occurrence count and total amount within ``[anchor_date, end_date]``."""
+        materialized = bisect_right(self._dates, end_date)
+        scheduled = count_due_dates(
+            self.recurring.next_due_date,
+            self.recurring.frequency,
+            self.anchor_date,
+            end_date,
+            self.original_due_day,
+        )
+        return (
+            materialized + scheduled,
+            self._running_totals[materialized] + scheduled * self.recurring.amount,
+        )
+
+    def first(self, end_date: date) -> tuple[date, int] | None:
+        """Earliest occurrence date and amount within ``[anchor_date, end_date]``."""
+        candidates = []
+        if self._dates and self._dates[0] <= end_date:
+            candidates.append((self._dates[0], 0, self._amounts[0]))
+        index = first_index_on_or_after(
+            self.recurring.next_due_date,
+            self.recurring.frequency,
+            self.anchor_date,
+            self.original_due_day,
+        )
+        if index is not None:
+            due_date = nth_due_date(
+                self.recurring.next_due_date,
+                self.recurring.frequency,
+                index,
+                self.original_due_day,
+            )
+            if due_date <= end_date:
+                candidates.append((due_date, 1, self.recurring.amount))
+        if not candidates:
+            return None
+        due_date, _order, amount = min(candidates)
+        return due_date, amount
+
+
+def _horizon_end(anchor_date: date, unit: str, value: int) -> date:
+    if unit == "occurrences":
+        return anchor_date + timedelta(days=OCCURRENCE_HORIZON_DAYS)
+    return _exclusive_horizon_end(anchor_date, unit, value) - timedelta(days=1)
+
+
+def build_horizon_projector(
+    db: Session,
+    recurring: models.RecurringExpense,
+    *,
+    horizons: list[dict[str, int | str]],
+    anchor_date: date,
+) -> HorizonProjector:
+    until = max(
+        (_horizon_end(anchor_date, str(horizon["unit"]), int(horizon["value"])) for horizon in horizons),
+        default=anchor_date,
+    )
+    return HorizonProjector(db, recurring, anchor_date=anchor_date, until=until)
+
+
+def project_owner_obligations(
+    db: Session,
+    owner_id: int,
+    start_date: date,
+    end_date: date,
+) -> OwnerObligationProjection:
+    """Project all of an owner's recurring obligations over ``[start_date, end_date]``.
+
+    Two queries regardless of template count: active templates, then every
+    materialized occurrence in the range. Materialized rows win over the
+    schedule for the same template and date; skipped and cancelled ones
+    suppress that date without contributing. Archived templates contribute
+    nothing; a paused template's materialized rows still count. Materialized
+    rows keep the title they were created with.
+    """
+    templates = db.scalars(
+        select(models.RecurringExpense).where(
+            models.RecurringExpense.owner_id == owner_id,
+            models.RecurringExpense.status == models.RecurringStatus.ACTIVE,
+            models.RecurringExpense.archived_at.is_(None),
+        )
+    ).all()
+    occurrence_rows = db.execute(
+        select(
+            models.RecurringOccurrence.id,
+            models.RecurringOccurrence.template_id,
+            models.RecurringOccurrence.scheduled_due_date,
+            models.RecurringOccurrence.status,
+            models.RecurringOccurrence.expected_amount,
+            models.RecurringOccurrence.actual_amount,
+            models.RecurringOccurrence.expected_category,
+            models.RecurringOccurrence.expected_title,
+        )
+        .join(models.RecurringExpense, models.RecurringExpense.id == models.RecurringOccurrence.template_id)
+        .where(models.RecurringOccurrence.owner_id == owner_id)
+        .where(models.RecurringExpense.archived_at.is_(None))
+        .where(models.RecurringOccurrence.scheduled_due_date >= start_date)
+        .where(models.RecurringOccurrence.scheduled_due_date <= end_date)
+    ).all()
+
+    results: list[ProjectedOccurrence] = []
+    materialized: set[tuple[int, date]] = set()
+    for (
+        occurrence_id,
+        template_id,
+        due_date,
+        occurrence_status,
+        expected_amount,
+        actual_amount,
+        expected_category,
+        title,
+    ) in occurrence_rows:
+        materialized.add((template_id, due_date))
+        if occurrence_status in INACTIVE_OCCURRENCE_STATUSES:
+            continue
+        amount = expected_amount
+        if occurrence_status == models.RecurringOccurrenceStatus.FULFILLED and actual_amount is not None:
+            amount = actual_amount
+        results.append(ProjectedOccurrence(
+            category=expected_category,
+            amount=amount,
+            source_id=template_id,
+            title=title,
+            due_date=due_date,
+            is_materialized=True,
+            occurrence_id=occurrence_id,
+            status=occurrence_status,
+        ))
+
+    for template in templates:
+        for due_date in due_dates_between(
+            template.next_due_date,
+            template.frequency,
+            start_date,
+            end_date,
+            template.original_due_day or template.start_date.day,
+        ):
+            if (template.id, due_date) in materialized:
+                continue
             results.append(ProjectedOccurrence(
                 category=template.category,
                 amount=template.amount,
                 source_id=template.id,
                 title=template.title,
-                due_date=curr_date,
+                due_date=due_date,
                 is_materialized=False,
             ))
-            
-        if template.frequency == models.RecurringFrequency.ONE_TIME:
-            break
-            
-        next_due = calculate_next_due_date(curr_date, template.frequency, original_due_day)
-        if next_due <= curr_date:
-            break
-        curr_date = next_due
-        
-        guard += 1
-        if guard > 2000:
-            break
-            
-    results.sort(key=lambda x: x.due_date)
-    return results
+
+    results.sort(key=lambda item: (item.due_date, item.source_id))
+    return OwnerObligationProjection(occurrences=results)
 
 
 def build_projection_rows(
@@ -216,30 +436,27 @@ def build_projection_rows(
     source: str,
     horizons: list[dict[str, int | str]],
     anchor_date: date,
+    projector: HorizonProjector | None = None,
 ) -> list[schemas.RecurringProjectionRowOut]:
+    if projector is None:
+        projector = build_horizon_projector(db, recurring, horizons=horizons, anchor_date=anchor_date)
     rows: list[schemas.RecurringProjectionRowOut] = []
     for horizon in horizons:
         unit = str(horizon["unit"])
         value = int(horizon["value"])
+        horizon_end = _horizon_end(anchor_date, unit, value)
         if unit == "occurrences":
-            safe_end = anchor_date + timedelta(days=365*5)
-            projected = project_occurrences_for_range(db, recurring, anchor_date, safe_end)
-            if projected:
-                first_occ = projected[0]
-                horizon_end = first_occ.due_date
+            first = projector.first(horizon_end)
+            if first is not None:
+                horizon_end, total_amount = first
                 occurrence_count = 1
-                total_amount = first_occ.amount
             else:
                 horizon_end = recurring.next_due_date
                 occurrence_count = 0
                 total_amount = 0
         else:
-            exclusive_end = _exclusive_horizon_end(anchor_date, unit, value)
-            horizon_end = exclusive_end - timedelta(days=1)
-            projected = project_occurrences_for_range(db, recurring, anchor_date, horizon_end)
-            occurrence_count = len(projected)
-            total_amount = sum(p.amount for p in projected)
-            
+            occurrence_count, total_amount = projector.window(horizon_end)
+
         rows.append(
             schemas.RecurringProjectionRowOut(
                 source=source,
@@ -272,6 +489,13 @@ def build_recurring_projection_output(
     ]
     custom = validate_projection_horizons(recurring.frequency, custom_horizons)
     ad_hoc = validate_projection_horizons(recurring.frequency, ad_hoc_horizons or [])
+    # One occurrence query serves every default, custom and ad-hoc horizon.
+    projector = build_horizon_projector(
+        db,
+        recurring,
+        horizons=[*default_horizons, *custom, *ad_hoc],
+        anchor_date=anchor_date,
+    )
     return schemas.RecurringProjectionOut(
         recurring_id=int(recurring.id),
         anchor_date=anchor_date,
@@ -281,6 +505,7 @@ def build_recurring_projection_output(
             source="default",
             horizons=default_horizons,
             anchor_date=anchor_date,
+            projector=projector,
         ),
         custom_projections=build_projection_rows(
             db,
@@ -288,6 +513,7 @@ def build_recurring_projection_output(
             source="custom",
             horizons=custom,
             anchor_date=anchor_date,
+            projector=projector,
         ),
         ad_hoc_projections=build_projection_rows(
             db,
@@ -295,5 +521,6 @@ def build_recurring_projection_output(
             source="ad_hoc",
             horizons=ad_hoc,
             anchor_date=anchor_date,
+            projector=projector,
         ),
     )
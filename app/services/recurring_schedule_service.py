@@ -5,40 +5,139 @@ from datetime import date, timedelta
 from app import models
 
 
-def calculate_next_due_date(
-    current_due_date: date,
+# Step sizes for every recurring frequency except ONE_TIME. nth_due_date,
+# and calculate_next_due_date through it, read only these tables.
+DAY_STEPS: dict[models.RecurringFrequency, int] = {
+    models.RecurringFrequency.DAILY: 1,
+    models.RecurringFrequency.WEEKLY: 7,
+    models.RecurringFrequency.BIWEEKLY: 14,
+}
+
+MONTH_STEPS: dict[models.RecurringFrequency, int] = {
+    models.RecurringFrequency.MONTHLY: 1,
+    models.RecurringFrequency.QUARTERLY: 3,
+    models.RecurringFrequency.SEMI_ANNUALLY: 6,
+    models.RecurringFrequency.YEARLY: 12,
+}
+
+
+def _month_index(value: date) -> int:
+    return value.year * 12 + value.month - 1
+
+
+def _clamped_month_date(month_index: int, day: int) -> date:
+    year, zero_based_month = divmod(month_index, 12)
+    following_year, following_zero_based_month = divmod(month_index + 1, 12)
+    last_day = date(following_year, following_zero_based_month + 1, 1) - timedelta(days=1)
+    return date(year, zero_based_month + 1, min(day, last_day.day))
+
+
+def nth_due_date(
+    first_due_date: date,
     frequency: models.RecurringFrequency,
+    n: int,
     original_due_day: int | None = None,
 ) -> date:
-    """Advance one recurrence while preserving the intended calendar anchor."""
-    if frequency == models.RecurringFrequency.ONE_TIME:
-        return current_due_date
-    if frequency == models.RecurringFrequency.DAILY:
-        return current_due_date + timedelta(days=1)
-    if frequency == models.RecurringFrequency.WEEKLY:
-        return current_due_date + timedelta(weeks=1)
-    if frequency == models.RecurringFrequency.BIWEEKLY:
-        return current_due_date + timedelta(weeks=2)
-
-    month_steps = {
-        models.RecurringFrequency.MONTHLY: 1,
-        models.RecurringFrequency.QUARTERLY: 3,
-        models.RecurringFrequency.SEMI_ANNUALLY: 6,
-        models.RecurringFrequency.YEARLY: 12,
-    }
-    months_to_jump = month_steps.get(frequency)
-    if months_to_jump is None:
+    """Return the n-th (0-based) schedule date counted from ``first_due_date``.
+
+    Equivalent to applying ``calculate_next_due_date`` n times with the same
+    ``original_due_day`` (which defaults to ``first_due_date.day``), so
+    month-based schedules clamp to short months without drifting.
+    """
+    frequency = models.RecurringFrequency(frequency)
+    if n <= 0 or frequency == models.RecurringFrequency.ONE_TIME:
+        return first_due_date
+    if frequency in DAY_STEPS:
+        return first_due_date + timedelta(days=DAY_STEPS[frequency] * n)
+    month_step = MONTH_STEPS.get(frequency)
+    if month_step is None:
         raise ValueError(f"Unsupported recurring frequency: {frequency}")
+    return _clamped_month_date(
+        _month_index(first_due_date) + month_step * n,
+        original_due_day or first_due_date.day,
+    )
+
+
+def first_index_on_or_after(
+    first_due_date: date,
+    frequency: models.RecurringFrequency,
+    target: date,
+    original_due_day: int | None = None,
+) -> int | None:
+    """Index of the first schedule date >= ``target``; None when there is none."""
+    frequency = models.RecurringFrequency(frequency)
+    if target <= first_due_date:
+        return 0
+    if frequency == models.RecurringFrequency.ONE_TIME:
+        return None
+    if frequency in DAY_STEPS:
+        step = DAY_STEPS[frequency]
+        return -(-(target - first_due_date).days // step)
+
+    # The month arithmetic lands within one step of the answer; clamping to a
+    # short month can only move it by that one step.
+    month_step = MONTH_STEPS[frequency]
+    index = max(0, (_month_index(target) - _month_index(first_due_date)) // month_step)
+    while nth_due_date(first_due_date, frequency, index, original_due_day) < target:
+        index += 1
+    while index > 0 and nth_due_date(first_due_date, frequency, index - 1, original_due_day) >= target:
+        index -= 1
+    return index
 
-    target_day = original_due_day or current_due_date.day
-    total_months = current_due_date.year * 12 + current_due_date.month - 1 + months_to_jump
-    new_year, zero_based_month = divmod(total_months, 12)
-    new_month = zero_based_month + 1
 
-    following_year, following_zero_based_month = divmod(total_months + 1, 12)
-    following_month = following_zero_based_month + 1
-    last_day = date(following_year, following_month, 1) - timedelta(days=1)
-    return date(new_year, new_month, min(target_day, last_day.day))
+def due_index_range(
+    first_due_date: date,
+    frequency: models.RecurringFrequency,
+    start_date: date,
+    end_date: date,
+    original_due_day: int | None = None,
+) -> range:
+    """Indices of the schedule dates within ``[start_date, end_date]``."""
+    first = first_index_on_or_after(first_due_date, frequency, start_date, original_due_day)
+    after_end = first_index_on_or_after(
+        first_due_date, frequency, end_date + timedelta(days=1), original_due_day
+    )
+    if first is None:
+        return range(0)
+    if after_end is None:
+        # ONE_TIME: the single date is inside the range.
+        after_end = 1
+    return range(first, max(first, after_end))
+
+
+def count_due_dates(
+    first_due_date: date,
+    frequency: models.RecurringFrequency,
+    start_date: date,
+    end_date: date,
+    original_due_day: int | None = None,
+) -> int:
+    """Number of schedule dates within ``[start_date, end_date]``, in O(1)."""
+    return len(due_index_range(first_due_date, frequency, start_date, end_date, original_due_day))
+
+
+def due_dates_between(
+    first_due_date: date,
+    frequency: models.RecurringFrequency,
+    start_date: date,
+    end_date: date,
+    original_due_day: int | None = None,
+) -> list[date]:
+    """Schedule dates within ``[start_date, end_date]``, without stepping through earlier ones."""
+    return [
+        nth_due_date(first_due_date, frequency, index, original_due_day)
+        for index in due_index_range(first_due_date, frequency, start_date, end_date, original_due_day)
+    ]
+
+
+def calculate_next_due_date(
+    current_due_date: date,
+    frequency: models.RecurringFrequency,
+    original_due_day: int | None = None,
+) -> date:
+    """Advance one recurrence while preserving the intended calendar anchor."""
+    # One step of the closed-form schedule, so both read the same step tables.
+    return nth_due_date(current_due_date, frequency, 1, original_due_day)
 
 
 def first_due_after(
@@ -56,14 +155,17 @@ def first_due_after(
             local_date.day,
         )
 
-    candidate = template.next_due_date
-    while candidate <= local_date:
-        next_candidate = calculate_next_due_date(
-            candidate,
-            template.frequency,
-            template.original_due_day,
-        )
-        if next_candidate <= candidate:
-            break
-        candidate = next_candidate
-    return candidate
+    if template.next_due_date > local_date:
+        return template.next_due_date
+    index = first_index_on_or_after(
+        template.next_due_date,
+        template.frequency,
+        local_date + timedelta(days=1),
+        template.original_due_day,
+    )
+    return nth_due_date(
+        template.next_due_date,
+        template.frequency,
+        index,
+        template.original_due_day,
+    )
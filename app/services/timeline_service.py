@@ -1,151 +1,269 @@
-from typing import List
+from datetime import date, timedelta
+from typing import List, Optional
+
+from fastapi import HTTPException, status
+# pyrefly: ignore [missing-import]
+from sqlalchemy import Integer, String, and_, cast, func, literal, literal_column, null, or_, select, union_all
 # pyrefly: ignore [missing-import]
 from sqlalchemy.orm import Session
 from app import models, schemas
 from app.services.budget_service import month_bounds
 from app.services.obligation_source_service import regular_debt_obligation_filters
+from app.services.recurring_projection_service import project_owner_obligations
+
+TIMELINE_MAX_RANGE_DAYS = 366
+
+_INFLOW = schemas.TimelineEventDirection.INFLOW.value
+_OUTFLOW = schemas.TimelineEventDirection.OUTFLOW.value
+
+# Tie-breakers after (date, direction): a per-source rank and the source row
+# id, both integers so SQL and Python order them identically.
+_KIND_RANK = {
+    schemas.TimelineEventSourceType.EXPECTED_INCOME: 0,
+    schemas.TimelineEventSourceType.RECURRING_OCCURRENCE: 1,
+    schemas.TimelineEventSourceType.RECURRING_TEMPLATE: 2,
+    schemas.TimelineEventSourceType.DEBT: 3,
+    schemas.TimelineEventSourceType.PAYMENT_PLAN_PAYMENT: 4,
+}
+
+_SOURCE_TYPE_BY_EVENT_TYPE = {
+    schemas.TimelineEventType.EXPECTED_INFLOW: schemas.TimelineEventSourceType.EXPECTED_INCOME,
+    schemas.TimelineEventType.RECURRING_EXPENSE: schemas.TimelineEventSourceType.RECURRING_OCCURRENCE,
+    schemas.TimelineEventType.DEBT_PAYMENT: schemas.TimelineEventSourceType.DEBT,
+    schemas.TimelineEventType.PAYMENT_PLAN: schemas.TimelineEventSourceType.PAYMENT_PLAN_PAYMENT,
+}
+
+
+def _event_id(prefix: str, column):
+    return literal(prefix, String) + cast(column, String)
 
-def get_monthly_timeline(
-    db: Session, owner_id: int, budget_year: int, budget_month: int
-) -> schemas.TimelineEventList:
-    start_date, end_date = month_bounds(budget_year, budget_month)
-    events: List[schemas.TimelineEvent] = []
 
-    # pyrefly: ignore [missing-import]
-    from sqlalchemy.orm import contains_eager
-    # 1. Expected Inflows (ExpectedIncome table represents the scheduled dates)
+def _zero_if_null(column):
+    return func.coalesce(column, 0)
+
+
+def _kind(source_type: schemas.TimelineEventSourceType):
+    return literal_column(str(_KIND_RANK[source_type]), Integer).label("kind")
+
+
+def _timeline_union(owner_id: int, start_date: date, end_date: date):
+    """One UNION ALL over the four materialized sources, only the columns a
+    timeline row needs, with remaining amounts computed in SQL.
+
+    Dates are inclusive on both ends.
+    """
+    inflow_remaining = models.ExpectedIncome.amount - _zero_if_null(models.ExpectedIncome.received_amount)
     inflows = (
-        db.query(models.ExpectedIncome)
-        .join(models.ExpectedInflowPromise)
-        .options(contains_eager(models.ExpectedIncome.promise))
-        .filter(
+        select(
+            _event_id("inflow_", models.ExpectedIncome.id).label("event_id"),
+            models.ExpectedIncome.due_date.label("date"),
+            literal(_INFLOW, String).label("direction"),
+            literal(schemas.TimelineEventType.EXPECTED_INFLOW.value, String).label("event_type"),
+            _kind(schemas.TimelineEventSourceType.EXPECTED_INCOME),
+            models.ExpectedInflowPromise.title.label("title"),
+            inflow_remaining.label("amount"),
+            models.ExpectedIncome.id.label("source_id"),
+            cast(null(), Integer).label("debt_id"),
+            cast(null(), Integer).label("payment_plan_id"),
+        )
+        .join(models.ExpectedInflowPromise, models.ExpectedInflowPromise.id == models.ExpectedIncome.promise_id)
+        .where(
             models.ExpectedIncome.owner_id == owner_id,
             models.ExpectedIncome.due_date >= start_date,
             models.ExpectedIncome.due_date <= end_date,
+            models.ExpectedIncome.status.in_(
+                [models.ExpectedIncomeStatus.EXPECTED, models.ExpectedIncomeStatus.PARTIALLY_RECEIVED]
+            ),
+            inflow_remaining > 0,
         )
-        .all()
     )
-    for inflow in inflows:
-        remaining = inflow.amount - (inflow.received_amount or 0)
-        if remaining > 0 and inflow.status in [models.ExpectedIncomeStatus.EXPECTED, models.ExpectedIncomeStatus.PARTIALLY_RECEIVED]:
-            title = inflow.promise.title if inflow.promise else "Expected Inflow"
-            events.append(
-                schemas.TimelineEvent(
-                    id=f"inflow_{inflow.id}",
-                    title=title,
-                    amount=remaining,
-                    direction=schemas.TimelineEventDirection.INFLOW,
-                    event_type=schemas.TimelineEventType.EXPECTED_INFLOW,
-                    date=inflow.due_date,
-                    status="PENDING",
-                    category_id=None,
-                    source_id=inflow.id,
-                    source_type=schemas.TimelineEventSourceType.EXPECTED_INCOME,
-                )
-            )
-
-    # 2. Recurring Occurrences
-    occurrences = (
-        db.query(models.RecurringOccurrence)
-        .filter(
-            models.RecurringOccurrence.owner_id == owner_id,
-            models.RecurringOccurrence.scheduled_due_date >= start_date,
-            models.RecurringOccurrence.scheduled_due_date <= end_date,
-        )
-        .all()
+    recurring = select(
+        _event_id("recurring_", models.RecurringOccurrence.id).label("event_id"),
+        models.RecurringOccurrence.scheduled_due_date.label("date"),
+        literal(_OUTFLOW, String).label("direction"),
+        literal(schemas.TimelineEventType.RECURRING_EXPENSE.value, String).label("event_type"),
+        _kind(schemas.TimelineEventSourceType.RECURRING_OCCURRENCE),
+        models.RecurringOccurrence.expected_title.label("title"),
+        models.RecurringOccurrence.expected_amount.label("amount"),
+        models.RecurringOccurrence.id.label("source_id"),
+        cast(null(), Integer).label("debt_id"),
+        cast(null(), Integer).label("payment_plan_id"),
+    ).where(
+        models.RecurringOccurrence.owner_id == owner_id,
+        models.RecurringOccurrence.scheduled_due_date >= start_date,
+        models.RecurringOccurrence.scheduled_due_date <= end_date,
+        models.RecurringOccurrence.status == models.RecurringOccurrenceStatus.PENDING_CONFIRMATION,
     )
-    for occ in occurrences:
-        if occ.status in [
-            models.RecurringOccurrenceStatus.PENDING_CONFIRMATION,
-        ]:
-            events.append(
-                schemas.TimelineEvent(
-                    id=f"recurring_{occ.id}",
-                    title=occ.expected_title,
-                    amount=occ.expected_amount,
-                    direction=schemas.TimelineEventDirection.OUTFLOW,
-                    event_type=schemas.TimelineEventType.RECURRING_EXPENSE,
-                    date=occ.scheduled_due_date,
-                    status="PENDING",
-                    category_id=None,
-                    source_id=occ.id,
-                    source_type=schemas.TimelineEventSourceType.RECURRING_OCCURRENCE,
-                )
-            )
-
-    # 3. Regular debt obligations. Receivables enter the timeline only through
+    # Regular debt obligations. Receivables enter the timeline only through
     # explicit expected-income rows, not by auto-trusting every open debt owed to the user.
-    debts = (
-        db.query(models.Debt)
-        .filter(
-            models.Debt.owner_id == owner_id,
-            models.Debt.debt_type == models.DebtType.OWING,
-            *regular_debt_obligation_filters(owner_id),
-            models.Debt.expected_return_date >= start_date,
-            models.Debt.expected_return_date < end_date,
-        )
-        .all()
+    debts = select(
+        _event_id("debt_", models.Debt.id).label("event_id"),
+        models.Debt.expected_return_date.label("date"),
+        literal(_OUTFLOW, String).label("direction"),
+        literal(schemas.TimelineEventType.DEBT_PAYMENT.value, String).label("event_type"),
+        _kind(schemas.TimelineEventSourceType.DEBT),
+        (literal("Pay Debt: ", String) + models.Debt.counterparty_name).label("title"),
+        models.Debt.remaining_amount.label("amount"),
+        models.Debt.id.label("source_id"),
+        models.Debt.id.label("debt_id"),
+        cast(null(), Integer).label("payment_plan_id"),
+    ).where(
+        models.Debt.owner_id == owner_id,
+        models.Debt.debt_type == models.DebtType.OWING,
+        *regular_debt_obligation_filters(owner_id),
+        models.Debt.expected_return_date >= start_date,
+        models.Debt.expected_return_date <= end_date,
     )
-    for debt in debts:
-        remaining = debt.remaining_amount
-        if remaining > 0 and debt.expected_return_date:
-            events.append(
-                schemas.TimelineEvent(
-                    id=f"debt_{debt.id}",
-                    title=f"Pay Debt: {debt.counterparty_name}",
-                    amount=remaining,
-                    direction=schemas.TimelineEventDirection.OUTFLOW,
-                    event_type=schemas.TimelineEventType.DEBT_PAYMENT,
-                    date=debt.expected_return_date,
-                    status="PENDING",
-                    category_id=None,
-                    source_id=debt.id,
-                    source_type=schemas.TimelineEventSourceType.DEBT,
-                    debt_id=debt.id,
-                )
-            )
-
-    # 4. Payment Plan Payments
-    payment_plans = (
-        db.query(models.PaymentPlanPayment)
-        .join(models.PaymentPlan)
-        .options(contains_eager(models.PaymentPlanPayment.plan))
-        .filter(
+    payment_remaining = models.PaymentPlanPayment.amount - (
+        _zero_if_null(models.PaymentPlanPayment.paid_amount)
+        + _zero_if_null(models.PaymentPlanPayment.written_off_amount)
+    )
+    payments = (
+        select(
+            _event_id("payment_plan_", models.PaymentPlanPayment.id).label("event_id"),
+            models.PaymentPlanPayment.due_date.label("date"),
+            literal(_OUTFLOW, String).label("direction"),
+            literal(schemas.TimelineEventType.PAYMENT_PLAN.value, String).label("event_type"),
+            _kind(schemas.TimelineEventSourceType.PAYMENT_PLAN_PAYMENT),
+            (literal("Payment plan: ", String) + models.PaymentPlan.item_name).label("title"),
+            payment_remaining.label("amount"),
+            models.PaymentPlanPayment.id.label("source_id"),
+            cast(null(), Integer).label("debt_id"),
+            models.PaymentPlanPayment.plan_id.label("payment_plan_id"),
+        )
+        .join(models.PaymentPlan, models.PaymentPlan.id == models.PaymentPlanPayment.plan_id)
+        .where(
             models.PaymentPlanPayment.owner_id == owner_id,
             models.PaymentPlan.owner_id == owner_id,
             models.PaymentPlan.status != models.PaymentPlanStatus.ARCHIVED,
             models.PaymentPlanPayment.due_date >= start_date,
-            models.PaymentPlanPayment.due_date < end_date,
+            models.PaymentPlanPayment.due_date <= end_date,
+            models.PaymentPlanPayment.status.in_(
+                [models.PaymentPlanPaymentStatus.PENDING, models.PaymentPlanPaymentStatus.PARTIAL]
+            ),
+            payment_remaining > 0,
         )
-        .all()
     )
-    for inst in payment_plans:
-        remaining = inst.amount - ((inst.paid_amount or 0) + (inst.written_off_amount or 0))
-        if remaining > 0 and inst.status in [
-            models.PaymentPlanPaymentStatus.PENDING,
-            models.PaymentPlanPaymentStatus.PARTIAL,
-        ]:
-            title = f"Payment plan: {inst.plan.item_name}" if inst.plan else "Scheduled payment"
-            events.append(
-                schemas.TimelineEvent(
-                    id=f"payment_plan_{inst.id}",
-                    title=title,
-                    amount=remaining,
-                    direction=schemas.TimelineEventDirection.OUTFLOW,
-                    event_type=schemas.TimelineEventType.PAYMENT_PLAN,
-                    date=inst.due_date,
-                    status="PENDING",
-                    category_id=None,
-                    source_id=inst.id,
-                    source_type=schemas.TimelineEventSourceType.PAYMENT_PLAN_PAYMENT,
-                    payment_plan_id=inst.plan_id,
-                    payment_plan_payment_id=inst.id,
-                )
+    return union_all(inflows, recurring, debts, payments).subquery("timeline")
+
+
+def _sort_key(event: schemas.TimelineEvent) -> tuple[date, str, int, int]:
+    return (event.date, event.direction.value, _KIND_RANK[event.source_type], event.source_id)
+
+
+def parse_timeline_cursor(cursor: str) -> tuple[date, str, int, int]:
+    """Decode a ``next_cursor`` value: ``<date>|<direction>|<kind>|<source id>``."""
+    try:
+        raw_date, direction, kind, source_id = cursor.split("|")
+        if direction not in (_INFLOW, _OUTFLOW):
+            raise ValueError(direction)
+        return date.fromisoformat(raw_date), direction, int(kind), int(source_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="timeline.cursor_invalid")
+
+
+def _encode_cursor(event: schemas.TimelineEvent) -> str:
+    after_date, direction, kind, source_id = _sort_key(event)
+    return f"{after_date.isoformat()}|{direction}|{kind}|{source_id}"
+
+
+def get_timeline_range(
+    db: Session,
+    owner_id: int,
+    start_date: date,
+    end_date: date,
+    *,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> schemas.TimelineEventPage:
+    """Timeline events in ``[start_date, end_date]`` ordered by (date, direction, id).
+
+    Within a date and direction, rows order by source kind, then source row id.
+
+    The four materialized sources come from one UNION ALL that is sorted,
+    keyset-filtered and capped in SQL; recurring dates not yet materialized
+    come from the owner-level projector and are merged in. Pass the returned
+    ``next_cursor`` back as *cursor* to continue after the last row.
+    """
+    if end_date < start_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="timeline.range_invalid")
+    if (end_date - start_date).days >= TIMELINE_MAX_RANGE_DAYS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="timeline.range_too_large")
+    after = parse_timeline_cursor(cursor) if cursor else None
+
+    timeline = _timeline_union(owner_id, start_date, end_date)
+    query = select(timeline).order_by(
+        timeline.c.date, timeline.c.direction, timeline.c.kind, timeline.c.source_id
+    )
+    if after is not None:
+        after_date, after_direction, after_kind, after_id = after
+        same_date = timeline.c.date == after_date
+        same_direction = and_(same_date, timeline.c.direction == after_direction)
+        same_kind = and_(same_direction, timeline.c.kind == after_kind)
+        query = query.where(
+            or_(
+                timeline.c.date > after_date,
+                and_(same_date, timeline.c.direction > after_direction),
+                and_(same_direction, timeline.c.kind > after_kind),
+                and_(same_kind, timeline.c.source_id > after_id),
             )
+        )
+    if limit is not None:
+        query = query.limit(limit + 1)
 
-    def sort_key(e: schemas.TimelineEvent):
-        return (e.date, e.direction.value)
+    events: List[schemas.TimelineEvent] = []
+    for row in db.execute(query):
+        event_type = schemas.TimelineEventType(row.event_type)
+        events.append(
+            schemas.TimelineEvent(
+                id=row.event_id,
+                title=row.title or "Expected Inflow",
+                amount=int(row.amount),
+                direction=schemas.TimelineEventDirection(row.direction),
+                event_type=event_type,
+                date=row.date,
+                status="PENDING",
+                category_id=None,
+                source_id=row.source_id,
+                source_type=_SOURCE_TYPE_BY_EVENT_TYPE[event_type],
+                debt_id=row.debt_id,
+                payment_plan_id=row.payment_plan_id,
+                payment_plan_payment_id=(
+                    row.source_id if event_type == schemas.TimelineEventType.PAYMENT_PLAN else None
+                ),
+            )
+        )
 
-    events.sort(key=sort_key)
+    projection = project_owner_obligations(db, owner_id, start_date, end_date)
+    for occ in projection.occurrences:
+        if occ.is_materialized:
+            continue
+        event = schemas.TimelineEvent(
+            id=f"recurring_template_{occ.source_id}_{occ.due_date.isoformat()}",
+            title=occ.title,
+            amount=occ.amount,
+            direction=schemas.TimelineEventDirection.OUTFLOW,
+            event_type=schemas.TimelineEventType.RECURRING_EXPENSE,
+            date=occ.due_date,
+            status="SCHEDULED",
+            category_id=None,
+            source_id=occ.source_id,
+            source_type=schemas.TimelineEventSourceType.RECURRING_TEMPLATE,
+        )
+        if after is None or _sort_key(event) > after:
+            events.append(event)
 
-    return schemas.TimelineEventList(items=events)
+    events.sort(key=_sort_key)
+    next_cursor = None
+    if limit is not None and len(events) > limit:
+        events = events[:limit]
+        next_cursor = _encode_cursor(events[-1])
+    return schemas.TimelineEventPage(items=events, next_cursor=next_cursor)
+
+
+def get_monthly_timeline(
+    db: Session, owner_id: int, budget_year: int, budget_month: int
+) -> schemas.TimelineEventList:
+    start_date, end_date = month_bounds(budget_year, budget_month)
+    page = get_timeline_range(db, owner_id, start_date, end_date - timedelta(days=1))
+    return schemas.TimelineEventList(items=page.items)
@@ -1,8 +1,7 @@
 import logging
 from typing import Any, Optional
 
-import httpx
-
+from app.http_clients import get_async_client
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -25,16 +24,15 @@ def _api_url(method: str) -> str:
 async def _post_telegram(method: str, payload: dict[str, Any]) -> None:
     """Post to Telegram API and log non-2xx responses for faster debugging."""
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.post(_api_url(method), json=payload)
-            if response.status_code >= 400:
-                logger.error(
-                    "Telegram API %s failed: status=%s body=%s payload=%s",
-                    method,
-                    response.status_code,
-                    response.text,
-                    payload,
-                )
+        response = await get_async_client().post(_api_url(method), json=payload)
+        if response.status_code >= 400:
+            logger.error(
+                "Telegram API %s failed: status=%s body=%s payload=%s",
+                method,
+                response.status_code,
+                response.text,
+                payload,
+            )
     except Exception as exc:  # pragma: no cover - defensive logging
         logger.exception("Telegram API %s request error: %s", method, exc)
 
@@ -10,6 +10,7 @@ from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from app import models
+from app.http_clients import get_sync_client
 from app.services.budget_service import get_budget_spent_amount
 
 logger = logging.getLogger(__name__)
@@ -30,21 +31,21 @@ def verify_turnstile_token(token: str, client_ip: str, secret_key: str) -> bool:
     if not token:
         return False
     try:
-        with httpx.Client(timeout=5.0) as client:
-            res = client.post(
-                "https://challenges.cloudflare.com/turnstile/v0/siteverify",
-                data={
-                    "secret": secret_key,
-                    "response": token,
-                    "remoteip": client_ip,
-                }
-            )
-            res.raise_for_status()
-            data = res.json()
-            if not data.get("success"):
-                logger.warning(f"CAPTCHA verification failed for {client_ip}: {data}")
-                return False
-            return True
+        res = get_sync_client().post(
+            "https://challenges.cloudflare.com/turnstile/v0/siteverify",
+            data={
+                "secret": secret_key,
+                "response": token,
+                "remoteip": client_ip,
+            },
+            timeout=5.0,
+        )
+        res.raise_for_status()
+        data = res.json()
+        if not data.get("success"):
+            logger.warning(f"CAPTCHA verification failed for {client_ip}: {data}")
+            return False
+        return True
     except httpx.RequestError as exc:
         logger.error(f"Error contacting Cloudflare Turnstile: {exc}")
         return False
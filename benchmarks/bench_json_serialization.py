@@ -0,0 +1,93 @@
+"""Benchmark: serializing a 1,000-item money-in feed.
+
+"before" is FastAPI's default path for a handler returning schema
+instances: validate against `response_model`, dump to Python objects, then
+encode with the stdlib-backed `JSONResponse`. "after" is
+`schema_response`, which serializes the already-validated models straight
+to JSON bytes. `FastJSONResponse` (orjson) is shown for routes that still
+go through FastAPI's validation pass.
+
+Run from the repo root with the usual environment variables set:
+
+    python -m benchmarks.bench_json_serialization [items] [rounds]
+"""
+import asyncio
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+# pyrefly: ignore [missing-import]
+from fastapi.responses import JSONResponse
+# pyrefly: ignore [missing-import]
+from fastapi.routing import serialize_response
+# pyrefly: ignore [missing-import]
+from fastapi.utils import create_model_field
+
+from app import models, schemas
+from app.json_responses import FastJSONResponse, schema_response
+
+
+def build_feed(items: int) -> schemas.PaginatedMoneyInOut:
+    created = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return schemas.PaginatedMoneyInOut(
+        total=items,
+        items=[
+            schemas.MoneyInItemOut(
+                id=index,
+                title=f"Salary part {index}",
+                description="Monthly salary instalment",
+                amount=1_250_000 + index,
+                date=date(2026, 1, 1) + timedelta(days=index % 365),
+                created_at=created + timedelta(minutes=index),
+                kind=schemas.MoneyInKind.INCOME,
+                counts_as_income=True,
+                event_type=models.TransactionType.INCOME,
+                reference_type="INCOME",
+                source_id=7,
+                source_name="Employer",
+                wallet_allocations=[
+                    schemas.MoneyInWalletOut(wallet_id=1, wallet_name="Card", amount=1_250_000 + index),
+                ],
+            )
+            for index in range(items)
+        ],
+    )
+
+
+def _time(label: str, fn, rounds: int) -> float:
+    fn()  # warm-up
+    started = time.perf_counter()
+    for _ in range(rounds):
+        body = fn()
+    elapsed_ms = (time.perf_counter() - started) / rounds * 1000
+    print(f"{label:<44} {elapsed_ms:8.2f} ms  ({len(body):,} bytes)")
+    return elapsed_ms
+
+
+def main(items: int, rounds: int) -> None:
+    feed = build_feed(items)
+    field = create_model_field(
+        name="response", type_=schemas.PaginatedMoneyInOut, mode="serialization"
+    )
+
+    def fastapi_default(response_class=JSONResponse):
+        content = asyncio.run(
+            serialize_response(field=field, response_content=feed, is_coroutine=True)
+        )
+        return response_class(content).body
+
+    before = _time("before: validate + dump + stdlib json", fastapi_default, rounds)
+    _time(
+        "response_model + FastJSONResponse (orjson)",
+        lambda: fastapi_default(FastJSONResponse),
+        rounds,
+    )
+    after = _time("after: schema_response fast path", lambda: schema_response(feed).body, rounds)
+    print(f"speed-up: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+    )
@@ -0,0 +1,155 @@
+"""Benchmark: projecting a daily template over horizons up to five years.
+
+"before" is the previous `build_projection_rows` algorithm: every horizon
+re-queried the template's occurrences and walked `calculate_next_due_date`
+one day at a time from `next_due_date`. "after" is
+`build_recurring_projection_output`, which loads occurrences once and
+counts scheduled dates arithmetically. Both run against an in-memory
+SQLite database and must produce identical rows.
+
+Run from the repo root with the usual environment variables set:
+
+    python -m benchmarks.bench_recurring_projection [rounds]
+"""
+import sys
+import time
+from datetime import date, timedelta
+
+# pyrefly: ignore [missing-import]
+from sqlalchemy import create_engine, event, select
+# pyrefly: ignore [missing-import]
+from sqlalchemy.orm import sessionmaker
+# pyrefly: ignore [missing-import]
+from sqlalchemy.pool import StaticPool
+
+from app import models, schemas
+from app.services.recurring_projection_service import (
+    DEFAULT_HORIZONS,
+    _exclusive_horizon_end,
+    _label,
+    build_recurring_projection_output,
+)
+from app.services.recurring_schedule_service import calculate_next_due_date
+
+
+ANCHOR = date(2026, 1, 1)
+MATERIALIZED_DAYS = 30
+AD_HOC_HORIZONS = [
+    schemas.RecurringProjectionHorizonIn(unit="days", value=1825),
+    schemas.RecurringProjectionHorizonIn(unit="years", value=5),
+]
+
+
+def build_session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autoflush=False, bind=engine)()
+
+    user = models.User(email="bench@example.com", username="bench", hashed_password="x")
+    db.add(user)
+    db.flush()
+    template = models.RecurringExpense(
+        owner_id=user.id,
+        title="Daily coffee",
+        amount=18_000,
+        category=models.ExpenseCategory.UTILITIES,
+        frequency=models.RecurringFrequency.DAILY,
+        start_date=ANCHOR,
+        next_due_date=ANCHOR + timedelta(days=MATERIALIZED_DAYS),
+        original_due_day=ANCHOR.day,
+        status=models.RecurringStatus.ACTIVE,
+    )
+    db.add(template)
+    db.flush()
+    for offset in range(MATERIALIZED_DAYS):
+        db.add(
+            models.RecurringOccurrence(
+                owner_id=user.id,
+                template_id=template.id,
+                scheduled_due_date=ANCHOR + timedelta(days=offset),
+                expected_title=template.title,
+                expected_amount=template.amount,
+                expected_category=template.category,
+                status=models.RecurringOccurrenceStatus.PENDING_CONFIRMATION,
+            )
+        )
+    db.commit()
+    return engine, db, template
+
+
+def _stepwise_window(db, template, start_date, end_date):
+    """The removed per-horizon query plus day-by-day walk."""
+    rows = []
+    for occurrence in db.scalars(
+        select(models.RecurringOccurrence)
+        .where(models.RecurringOccurrence.template_id == template.id)
+        .where(models.RecurringOccurrence.scheduled_due_date >= start_date)
+        .where(models.RecurringOccurrence.scheduled_due_date <= end_date)
+    ).all():
+        rows.append((occurrence.scheduled_due_date, occurrence.expected_amount))
+    current = template.next_due_date
+    guard = 0
+    while current <= end_date:
+        if current >= start_date:
+            rows.append((current, template.amount))
+        current = calculate_next_due_date(current, template.frequency, template.original_due_day)
+        guard += 1
+        if guard > 2000:
+            break
+    return rows
+
+
+def stepwise_projection(db, template):
+    horizons = [
+        *DEFAULT_HORIZONS[template.frequency],
+        *((horizon.unit.value, horizon.value) for horizon in AD_HOC_HORIZONS),
+    ]
+    rows = []
+    for unit, value in horizons:
+        horizon_end = _exclusive_horizon_end(ANCHOR, unit, value) - timedelta(days=1)
+        projected = _stepwise_window(db, template, ANCHOR, horizon_end)
+        rows.append((_label(unit, value), horizon_end, len(projected), sum(amount for _, amount in projected)))
+    return rows
+
+
+def closed_form_projection(db, template):
+    output = build_recurring_projection_output(
+        db, template, anchor_date=ANCHOR, ad_hoc_horizons=AD_HOC_HORIZONS
+    )
+    return [
+        (row.label, row.horizon_end, row.occurrence_count, row.total_amount)
+        for row in [*output.default_projections, *output.ad_hoc_projections]
+    ]
+
+
+def _time(label: str, fn, rounds: int, counter: dict) -> float:
+    fn()  # warm-up
+    counter["queries"] = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    elapsed_ms = (time.perf_counter() - started) / rounds * 1000
+    print(f"{label:<40} {elapsed_ms:8.2f} ms  ({counter['queries'] // rounds} queries)")
+    return elapsed_ms
+
+
+def main(rounds: int) -> None:
+    engine, db, template = build_session()
+    counter = {"queries": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(*_args):
+        counter["queries"] += 1
+
+    assert stepwise_projection(db, template) == closed_form_projection(db, template)
+    before = _time("before: per-horizon query + day walk", lambda: stepwise_projection(db, template), rounds, counter)
+    after = _time("after: one query + closed form", lambda: closed_form_projection(db, template), rounds, counter)
+    print(f"speed-up: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
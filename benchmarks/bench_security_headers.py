@@ -0,0 +1,103 @@
+"""Micro-benchmark: per-request overhead of the security-headers middleware.
+
+Compares the previous `@app.middleware("http")` implementation (a
+BaseHTTPMiddleware that rebuilt the CSP on every response) against
+`SecurityHeadersMiddleware`, each wrapping a bare ASGI app that returns a
+small JSON body. No network or server is involved.
+
+Run from the repo root with the usual environment variables set:
+
+    python -m benchmarks.bench_security_headers [requests]
+"""
+import asyncio
+import sys
+import time
+
+# pyrefly: ignore [missing-import]
+from starlette.middleware.base import BaseHTTPMiddleware
+# pyrefly: ignore [missing-import]
+from starlette.responses import JSONResponse
+
+from app.security_headers import (
+    SecurityHeadersMiddleware,
+    build_content_security_policy,
+    build_security_headers,
+)
+from config import settings
+
+
+async def endpoint(scope, receive, send):
+    await JSONResponse({"ok": True})(scope, receive, send)
+
+
+async def legacy_dispatch(request, call_next):
+    response = await call_next(request)
+    response.headers["Content-Security-Policy"] = build_content_security_policy(
+        settings.cors_origins_list, settings.is_production
+    )
+    response.headers["X-Content-Type-Options"] = "nosniff"
+    response.headers["X-Frame-Options"] = "DENY"
+    response.headers["Referrer-Policy"] = "no-referrer"
+    response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
+    response.headers["Cross-Origin-Opener-Policy"] = "same-origin"
+    response.headers["Cross-Origin-Resource-Policy"] = "same-origin"
+    if settings.is_production:
+        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+    return response
+
+
+def _scope():
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/",
+        "raw_path": b"/",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(_message):
+    return None
+
+
+async def _run(app, requests: int) -> float:
+    for _ in range(200):  # warm-up
+        await app(_scope(), _receive, _send)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(_scope(), _receive, _send)
+    return (time.perf_counter() - started) / requests * 1_000_000
+
+
+async def main(requests: int) -> None:
+    candidates = {
+        "no middleware": endpoint,
+        "BaseHTTPMiddleware (legacy)": BaseHTTPMiddleware(endpoint, dispatch=legacy_dispatch),
+        "SecurityHeadersMiddleware": SecurityHeadersMiddleware(
+            endpoint, headers=build_security_headers()
+        ),
+    }
+    baseline = None
+    for name, app in candidates.items():
+        per_request_us = await _run(app, requests)
+        if baseline is None:
+            baseline = per_request_us
+        print(
+            f"{name:<30} {per_request_us:8.1f} us/request"
+            f"  (+{per_request_us - baseline:6.1f} us overhead)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
@@ -34,11 +34,62 @@ class Settings(BaseSettings):
     email_from: str = "Sarflog Development <onboarding@resend.dev>"
     resend_api_key: Optional[SecretStr] = None
 
+    # Google ID-token signing keys (see app/google_keys.py)
+    google_certs_url: str = "https://www.googleapis.com/oauth2/v1/certs"
+    google_certs_default_max_age_seconds: int = 3600  # when the response has no max-age
+    google_certs_refresh_margin_seconds: int = 300
+    google_certs_retry_seconds: int = 30
+    google_certs_stale_ttl_seconds: int = 7 * 24 * 3600  # how long Redis keeps the last good set
+
+    # Shared outbound HTTP clients (see app/http_clients.py)
+    http_client_timeout_seconds: float = 10.0
+    http_client_connect_timeout_seconds: float = 5.0
+    http_client_max_connections_per_host: int = 20
+    http_client_max_keepalive_per_host: int = 10
+    http_client_keepalive_expiry_seconds: float = 60.0
+
+    # Transactional email outbox (see app/email_outbox.py)
+    email_transport: str = "resend"  # "stub" records messages in memory instead of sending
+    email_dispatch_interval_seconds: int = 5
+    email_outbox_batch_size: int = 50
+    email_outbox_max_batches_per_run: int = 10
+    email_outbox_workers: int = 4
+    email_outbox_lease_seconds: int = 300
+    email_outbox_max_attempts: int = 8
+    email_outbox_backoff_base_seconds: int = 30
+    email_outbox_backoff_max_seconds: int = 3600
+    email_outbox_retention_days: int = 30
+    email_outbox_retention_batch_size: int = 1000
+
     # Telegram (manual payment verification)
     telegram_bot_token: Optional[SecretStr] = None
     telegram_webhook_secret_token: Optional[SecretStr] = None
     telegram_admin_chat_ids: str = ""
 
+    # Version-keyed read-model cache (see app/read_cache.py)
+    read_cache_enabled: bool = True
+    read_cache_ttl_seconds: int = 300
+    read_cache_max_entries_per_user: int = 64
+
+    # Server-Sent Events over Redis pub/sub (see app/realtime.py)
+    sse_heartbeat_seconds: int = 15
+    sse_max_stream_seconds: int = 900
+    sse_retry_milliseconds: int = 3000
+
+    # Notifications (see app/services/notification_service.py)
+    notification_unread_counter_ttl_seconds: int = 3600
+    notification_retention_days: int = 90
+    notification_retention_batch_size: int = 1000
+
+    # gzip/brotli for response bodies at least this large (bytes)
+    response_compression_min_size: int = 1024
+
+    # Background jobs (see app/scheduler.py and app/scheduler_leadership.py)
+    scheduler_leader_election_enabled: bool = True
+    scheduler_lease_ttl_seconds: int = 30
+    recurring_scheduler_chunk_size: int = 200
+    recurring_scheduler_workers: int = 4
+
     # Debug / dev-only toggles
     debug_allow_premium_toggle: bool = False
 
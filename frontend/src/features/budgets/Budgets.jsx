@@ -630,7 +630,7 @@ export default function Budgets() {
   });
   const projectsQuery = useQuery({
     queryKey: ["projects", summaryTarget.year, summaryTarget.month],
-    queryFn: () => getProjects({ budgetYear: summaryTarget.year, budgetMonth: summaryTarget.month }),
+    queryFn: () => getProjects({ budgetYear: summaryTarget.year, budgetMonth: summaryTarget.month, includeHistory: true }),
     staleTime: 60_000,
   });
   const jitProjectsQuery = useQuery({
@@ -546,6 +546,7 @@ export default function Income() {
       search: debouncedSearch.trim() || undefined,
       limit: PAGE_SIZE,
       skip: (page - 1) * PAGE_SIZE,
+      include_total: true,
       start_date: startDate && endDate ? startDate : undefined,
       end_date: startDate && endDate ? endDate : undefined,
     }),
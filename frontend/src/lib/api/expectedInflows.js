@@ -2,7 +2,7 @@ import { apiClient } from "./client";
 
 export async function getExpectedInflows(params = {}) {
     const response = await apiClient.get("/expected-inflows", { params });
-    return Array.isArray(response.data) ? response.data : [];
+    return Array.isArray(response.data?.items) ? response.data.items : [];
 }
 
 export async function getExpectedInflow(id) {
@@ -66,5 +66,5 @@ export async function getExpectedInflowTimeline(params) {
 
 export async function getCashflow(params) {
     const response = await apiClient.get("/expected-inflows/cashflow", { params });
-    return Array.isArray(response.data) ? response.data : [];
+    return Array.isArray(response.data?.items) ? response.data.items : [];
 }
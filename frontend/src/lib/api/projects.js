@@ -19,6 +19,7 @@ export async function getProjects(params = {}) {
         params: compactParams({
             budget_year: params.budgetYear,
             budget_month: params.budgetMonth,
+            include_history: params.includeHistory,
         }),
     });
     return normalizeArrayPayload(response.data);
@@ -5,7 +5,7 @@ import pytest
 # pyrefly: ignore [missing-import]
 from fastapi.testclient import TestClient
 # pyrefly: ignore [missing-import]
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 # pyrefly: ignore [missing-import]
 from sqlalchemy.orm import sessionmaker
 # pyrefly: ignore [missing-import]
@@ -21,6 +21,7 @@ from config import settings
 # In production, this endpoint is still blocked by `settings.is_production`.
 settings.debug_allow_premium_toggle = True
 settings.resend_api_key = None # Disable Resend API emails in tests
+settings.email_transport = "stub"  # Outbox dispatches record messages in memory
 
 
 class InMemoryRedis:
@@ -120,22 +121,13 @@ def fake_rate_limits_without_redis(monkeypatch):
     for module_name in (
         "app.routers.users",
         "app.routers.auth",
-        "app.routers.expenses",
     ):
         monkeypatch.setattr(f"{module_name}.check_and_consume", allow_limit, raising=False)
 
-    for module_name in (
-        "app.routers.budget",
-        "app.routers.debts",
-        "app.routers.expenses",
-        "app.routers.goals",
-        "app.routers.income",
-        "app.routers.notifications",
-        "app.routers.payment_plans",
-        "app.routers.projects",
-        "app.routers.recurring",
-    ):
-        monkeypatch.setattr(f"{module_name}.consume_token_bucket", allow_limit, raising=False)
+    monkeypatch.setattr(
+        "app.rate_limit_middleware.consume_token_buckets",
+        lambda checks: [allow_limit() for _check in checks],
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -191,6 +183,12 @@ def clear_rate_limit_state():
             redis_client.delete(key)
         for key in redis_client.scan_iter("rt_user:*"):
             redis_client.delete(key)
+        # Read-model cache entries are keyed by user id + ledger version,
+        # both of which restart with every fresh test database.
+        for key in redis_client.scan_iter("rc:*"):
+            redis_client.delete(key)
+        for key in redis_client.scan_iter("nu:*"):
+            redis_client.delete(key)
     except Exception:
         # Most tests use the rate limiter's fail-open behavior. A few explicit
         # Redis tests skip themselves when the local Redis service is absent.
@@ -206,6 +204,25 @@ def session():
         db.close()
 
 
+@pytest.fixture()
+def count_queries():
+    """Call ``fn(*args, **kwargs)`` and return how many SQL statements it ran."""
+    def count(fn, *args, **kwargs) -> int:
+        statements = []
+
+        def record(*_args):
+            statements.append(1)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            fn(*args, **kwargs)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        return len(statements)
+
+    return count
+
+
 @pytest.fixture()
 def client():
     Base.metadata.create_all(bind=engine)
@@ -736,10 +736,13 @@ def test_change_password_rate_limit_includes_retry_after(client, monkeypatch):
 
     headers = create_user_and_token(client, "cp_rl", "cp_rl@example.com", "Pass123!")
 
-    def fake_check_and_consume(scope, identifier, window_seconds=60, max_attempts=5):
-        return RateLimitResult(allowed=False, limit=max_attempts, remaining=0, reset_seconds=42)
+    def deny(checks):
+        return [
+            RateLimitResult(allowed=False, limit=c.capacity, remaining=0, reset_seconds=42)
+            for c in checks
+        ]
 
-    monkeypatch.setattr("app.routers.auth.check_and_consume", fake_check_and_consume)
+    monkeypatch.setattr("app.rate_limit_middleware.consume_token_buckets", deny)
 
     payload = {"current_password": "Pass123!", "new_password": "NewPass2@"}
     response = client.post("/auth/change-password", json=payload, headers=headers)
@@ -756,10 +759,13 @@ def test_mobile_change_password_rate_limit_includes_retry_after(client, monkeypa
 
     headers = create_user_and_token(client, "mcp_rl", "mcp_rl@example.com", "Pass123!")
 
-    def fake_check_and_consume(scope, identifier, window_seconds=60, max_attempts=5):
-        return RateLimitResult(allowed=False, limit=max_attempts, remaining=0, reset_seconds=99)
+    def deny(checks):
+        return [
+            RateLimitResult(allowed=False, limit=c.capacity, remaining=0, reset_seconds=99)
+            for c in checks
+        ]
 
-    monkeypatch.setattr("app.routers.auth.check_and_consume", fake_check_and_consume)
+    monkeypatch.setattr("app.rate_limit_middleware.consume_token_buckets", deny)
 
     payload = {"current_password": "Pass123!", "new_password": "NewPass2@"}
     response = client.post("/auth/mobile/change-password", json=payload, headers=headers)
@@ -776,10 +782,13 @@ def test_verify_password_rate_limit_includes_retry_after(client, monkeypatch):
 
     headers = create_user_and_token(client, "vp_rl", "vp_rl@example.com", "Pass123!")
 
-    def fake_check_and_consume(scope, identifier, window_seconds=60, max_attempts=5):
-        return RateLimitResult(allowed=False, limit=max_attempts, remaining=0, reset_seconds=77)
+    def deny(checks):
+        return [
+            RateLimitResult(allowed=False, limit=c.capacity, remaining=0, reset_seconds=77)
+            for c in checks
+        ]
 
-    monkeypatch.setattr("app.routers.auth.check_and_consume", fake_check_and_consume)
+    monkeypatch.setattr("app.rate_limit_middleware.consume_token_buckets", deny)
 
     response = client.post(
         "/auth/verify-password",
@@ -1825,7 +1825,7 @@ def test_budget_month_summary_exposes_expected_income_lifecycle_totals_and_items
         f"/expected-inflows?budget_year={today.year}&budget_month={today.month}",
         headers=headers,
     )
-    missed_promise_id = next(item["id"] for item in listed_missed.json() if item["amount"] == 400_000)
+    missed_promise_id = next(item["id"] for item in listed_missed.json()["items"] if item["amount"] == 400_000)
 
     missed = client.post(
         f"/expected-inflows/{missed_promise_id}/write-off",
@@ -1846,7 +1846,7 @@ def test_budget_month_summary_exposes_expected_income_lifecycle_totals_and_items
         f"/expected-inflows?budget_year={today.year}&budget_month={today.month}",
         headers=headers,
     )
-    cancelled_promise_id = next(item["id"] for item in listed_cancelled.json() if item["amount"] == 700_000)
+    cancelled_promise_id = next(item["id"] for item in listed_cancelled.json()["items"] if item["amount"] == 700_000)
 
     cancelled = client.post(
         f"/expected-inflows/{cancelled_promise_id}/cancel",
@@ -319,3 +319,95 @@ def test_category_floor_warning_returns_multiple_structured_reasons(client, sess
         "PAYMENT_PLAN",
         "DEFERRED_EXPENSE",
     }
+
+
+def test_category_floor_recurring_projection_uses_fixed_query_count(client, session, count_queries):
+    from datetime import timedelta
+
+    from app.services.budget_service import month_bounds
+    from app.services.category_floor_service import build_category_floor_warnings
+    from app.services.recurring_projection_service import project_owner_obligations
+
+    email = "floorbatch@example.com"
+    create_user_and_token(client, "floorbatch", email, "Password123!")
+    user = _user(session, email)
+    today = user_timezone_today()
+    start, end = month_bounds(today.year, today.month)
+
+    def add_templates(count: int) -> None:
+        for index in range(count):
+            session.add(
+                models.RecurringExpense(
+                    owner_id=user.id,
+                    title=f"Bill {index}",
+                    amount=1_000,
+                    category=models.ExpenseCategory.UTILITIES,
+                    frequency=models.RecurringFrequency.WEEKLY,
+                    start_date=start,
+                    next_due_date=start,
+                    original_due_day=start.day,
+                    status=models.RecurringStatus.ACTIVE,
+                )
+            )
+        session.commit()
+
+    def build_warnings():
+        build_category_floor_warnings(session, user.id, start=start, end=end, effective_limits={})
+
+    add_templates(1)
+    with_one_template = count_queries(build_warnings)
+    add_templates(9)
+    assert count_queries(build_warnings) == with_one_template
+
+    weekly_dates = len(range(0, (end - start).days, 7))
+    projection = project_owner_obligations(session, user.id, start, end - timedelta(days=1))
+    assert projection.by_category() == {models.ExpenseCategory.UTILITIES: 10 * 1_000 * weekly_dates}
+
+
+def test_owner_obligations_skip_archived_templates_and_keep_occurrence_titles(client, session):
+    from datetime import datetime, timezone
+
+    from app.services.recurring_projection_service import project_owner_obligations
+
+    email = "floorarchived@example.com"
+    create_user_and_token(client, "floorarchived", email, "Password123!")
+    user = _user(session, email)
+    today = user_timezone_today()
+
+    def add_template(title: str, **overrides) -> models.RecurringExpense:
+        template = models.RecurringExpense(
+            owner_id=user.id,
+            title=title,
+            amount=1_000,
+            category=models.ExpenseCategory.UTILITIES,
+            frequency=models.RecurringFrequency.MONTHLY,
+            start_date=today,
+            next_due_date=today,
+            original_due_day=today.day,
+            status=models.RecurringStatus.ACTIVE,
+            **overrides,
+        )
+        session.add(template)
+        session.flush()
+        session.add(
+            models.RecurringOccurrence(
+                owner_id=user.id,
+                template_id=template.id,
+                scheduled_due_date=today,
+                expected_title=f"{title} (as scheduled)",
+                expected_amount=1_000,
+                expected_category=models.ExpenseCategory.UTILITIES,
+                status=models.RecurringOccurrenceStatus.PENDING_CONFIRMATION,
+            )
+        )
+        return template
+
+    kept = add_template("Internet")
+    add_template("Old gym", archived_at=datetime.now(timezone.utc))
+    session.commit()
+
+    projection = project_owner_obligations(session, user.id, today, today)
+
+    assert [(occ.source_id, occ.title) for occ in projection.occurrences] == [
+        (kept.id, "Internet (as scheduled)"),
+    ]
@@ -4,6 +4,7 @@ from app import models
 from app.services.debt_policy import (
     evaluate_debt_action,
     evaluate_debt_actions,
+    evaluate_debt_policies,
     evaluate_ledger_entry_reversal,
     is_formal_debt,
     is_informal_debt,
@@ -248,3 +249,74 @@ def test_ledger_entry_reversal_blocks_already_reversed_entries(client, session):
     blocked = evaluate_ledger_entry_reversal(session, debt, payment_entry)
     assert blocked.allowed is False
     assert blocked.reason_code == "debts.policy.entry_already_reversed"
+
+
+def test_batch_policy_matches_single_evaluation_with_fixed_query_count(client, session, count_queries):
+    create_user_and_token(client, "policybatch", "policybatch@example.com", "Password123!")
+    user = _user(session, "policybatch@example.com")
+
+    def add_debts(count: int) -> None:
+        for index in range(count):
+            debt = _make_debt(
+                session,
+                user,
+                counterparty_name=f"Batch {index}",
+                counterparty_kind=models.DebtCounterpartyKind.BANK if index % 2 else models.DebtCounterpartyKind.PERSON,
+            )
+            payments = []
+            for _ in range(3):
+                payment = models.DebtLedgerEntry(
+                    owner_id=user.id,
+                    debt_id=debt.id,
+                    entry_type=models.DebtLedgerEntryType.PAYMENT,
+                    amount_delta=-10_000,
+                    principal_delta=-10_000,
+                    entry_date=user_timezone_today(),
+                    status="POSTED",
+                    is_reversible=True,
+                )
+                session.add(payment)
+                payments.append(payment)
+            session.flush()
+            session.add(
+                models.DebtLedgerEntry(
+                    owner_id=user.id,
+                    debt_id=debt.id,
+                    entry_type=models.DebtLedgerEntryType.REVERSAL,
+                    amount_delta=10_000,
+                    principal_delta=10_000,
+                    reverses_entry_id=payments[-1].id,
+                    entry_date=user_timezone_today(),
+                    status="POSTED",
+                )
+            )
+        session.commit()
+
+    def load():
+        session.expire_all()
+        debts = session.query(models.Debt).filter(models.Debt.owner_id == user.id).all()
+        entries = (
+            session.query(models.DebtLedgerEntry)
+            .filter(models.DebtLedgerEntry.owner_id == user.id)
+            .all()
+        )
+        return debts, entries
+
+    add_debts(2)
+    debts, entries = load()
+    with_two_debts = count_queries(evaluate_debt_policies, session, debts, entries=entries)
+    add_debts(4)
+    debts, entries = load()
+    assert count_queries(evaluate_debt_policies, session, debts, entries=entries) == with_two_debts
+
+    debts, entries = load()
+    batch = evaluate_debt_policies(session, debts, entries=entries)
+    debts_by_id = {debt.id: debt for debt in debts}
+    assert batch.actions == {debt.id: evaluate_debt_actions(session, debt) for debt in debts}
+    assert batch.reversals == {
+        entry.id: evaluate_ledger_entry_reversal(session, debts_by_id[entry.debt_id], entry)
+        for entry in entries
+    }
+    reason_codes = [decision.reason_code for decision in batch.reversals.values()]
+    assert reason_codes.count("debts.policy.reverse_latest_first") == 6
+    assert reason_codes.count("debts.policy.entry_already_reversed") == 6
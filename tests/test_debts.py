@@ -1218,3 +1218,94 @@ def test_t4_payment_ledger_entries_have_component_deltas(client):
     charge_deltas = [p["charge_delta"] for p in payments]
     assert sum(principal_deltas) == -200_000
     assert sum(charge_deltas) == -100_000
+
+
+def test_debt_list_filters_in_sql_and_pages_with_cursor(client, session):
+    headers = create_user_and_token(client, "debtpage1", "debtpage1@example.com", "Password123!")
+    wallet_id = _default_wallet_id(client, headers)
+    spare = client.post(
+        "/wallets",
+        json={"name": "Spare", "wallet_type": "DEBIT", "initial_balance": 1_000_000},
+        headers=headers,
+    )
+    assert spare.status_code == 201, spare.text
+    debt_ids = [_create_transferred_debt(client, headers, wallet_id, amount=100_000)["id"] for _ in range(4)]
+    debt_ids.append(_create_transferred_debt(client, headers, spare.json()["id"], amount=100_000)["id"])
+    session.query(models.Wallet).filter_by(id=spare.json()["id"]).update({"is_active": False})
+    session.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        url = "/debts?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        page = client.get(url, headers=headers)
+        assert page.status_code == 200, page.text
+        payload = page.json()
+        assert payload["total"] == 5
+        seen.extend(payload["items"])
+        cursor = payload["next_cursor"]
+        if cursor is None:
+            break
+    assert [item["id"] for item in seen] == sorted(debt_ids, reverse=True)
+    assert {item["id"] for item in seen if item["has_archived_transactions"]} == {debt_ids[-1]}
+
+    yesterday = (user_timezone_today() - timedelta(days=1)).isoformat()
+    assert client.patch(
+        f"/debts/{debt_ids[0]}",
+        json={"date": yesterday, "expected_return_date": yesterday},
+        headers=headers,
+    ).status_code == 200
+    overdue = client.get("/debts?time_status=OVERDUE", headers=headers).json()
+    assert (overdue["total"], [item["id"] for item in overdue["items"]]) == (1, [debt_ids[0]])
+    closed = client.get("/debts?lifecycle_status=CLOSED", headers=headers).json()
+    assert (closed["total"], closed["items"]) == (0, [])
+
+    invalid = client.get("/debts?cursor=abc", headers=headers)
+    assert invalid.status_code == 400
+    assert invalid.json()["detail"] == "debts.cursor_invalid"
+
+
+def test_debt_list_cursor_pages_through_wallet_obligations_then_debts(client, session):
+    headers = create_user_and_token(client, "debtpage2", "debtpage2@example.com", "Password123!")
+    wallet_id = _default_wallet_id(client, headers)
+    credit_ids = []
+    for index in range(3):
+        credit = client.post(
+            "/wallets",
+            json={
+                "name": f"Card {index}",
+                "wallet_type": "CREDIT",
+                "accounting_type": "LIABILITY",
+                "initial_balance": -100_000,
+                "credit_limit": 1_000_000,
+            },
+            headers=headers,
+        )
+        assert credit.status_code == 201, credit.text
+        credit_ids.append(credit.json()["id"])
+    debt_ids = [_create_transferred_debt(client, headers, wallet_id, amount=100_000)["id"] for _ in range(2)]
+
+    # Obligations alone fill the first page; the rest of them and the debts follow.
+    seen = []
+    cursor = None
+    while True:
+        url = "/debts?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        page = client.get(url, headers=headers)
+        assert page.status_code == 200, page.text
+        payload = page.json()
+        assert payload["total"] == 5
+        seen.extend(item["id"] for item in payload["items"])
+        cursor = payload["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [-wallet for wallet in sorted(credit_ids)] + sorted(debt_ids, reverse=True)
+
+    exact = client.get("/debts?limit=3", headers=headers).json()
+    assert exact["next_cursor"] == str(-max(credit_ids))
+    rest = client.get(f"/debts?limit=3&cursor={exact['next_cursor']}", headers=headers).json()
+    assert [item["id"] for item in rest["items"]] == sorted(debt_ids, reverse=True)
+    assert rest["next_cursor"] is None
+
+    invalid = client.get("/debts?cursor=-abc", headers=headers)
+    assert invalid.status_code == 400
+    assert invalid.json()["detail"] == "debts.cursor_invalid"
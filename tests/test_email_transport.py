@@ -1,109 +1,215 @@
 import json
-from unittest.mock import patch, MagicMock
-from app.email_service import _send_email_via_resend_api, send_password_reset_email
-from config import settings
+from datetime import datetime, timedelta, timezone
+
 # pyrefly: ignore [missing-import]
-from pydantic import SecretStr
+import httpx
+
+from app import models
+from app.email_outbox import (
+    dispatch_email_outbox,
+    enqueue_email,
+    outbox_idempotency_key,
+    purge_settled_emails,
+)
+from app.email_service import (
+    EmailDeliveryError,
+    ResendTransport,
+    StubTransport,
+    get_email_transport,
+    password_reset_email,
+)
+from config import settings
+
+
+def _resend(handler):
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    return ResendTransport("re_test123", client=client)
+
+
+def _message(**overrides):
+    values = {
+        "to_email": "test@example.com",
+        "reset_link": "https://reset.link",
+        "idempotency_key": "idemp-key-1",
+    }
+    values.update(overrides)
+    return password_reset_email(**values)
+
 
 def test_resend_missing_configuration():
-    # If API key is missing, it should gracefully skip and return False
-    original_key = settings.resend_api_key
+    # Without an API key there is no transport.
+    original_key, original_transport = settings.resend_api_key, settings.email_transport
     settings.resend_api_key = None
+    settings.email_transport = "resend"
     try:
-        success = _send_email_via_resend_api("test@example.com", "Subj", "Text", "<p>HTML</p>")
-        assert not success
+        assert get_email_transport() is None
     finally:
-        settings.resend_api_key = original_key
-
-@patch("http.client.HTTPSConnection")
-def test_resend_success_request_construction(mock_https_class):
-    original_key = settings.resend_api_key
-    settings.resend_api_key = SecretStr("re_test123")
-    
-    mock_conn = MagicMock()
-    mock_https_class.return_value = mock_conn
-    mock_response = MagicMock()
-    mock_response.status = 200
-    mock_response.read.return_value = b'{"id":"mock_id"}'
-    mock_conn.getresponse.return_value = mock_response
+        settings.resend_api_key, settings.email_transport = original_key, original_transport
 
-    try:
-        success = _send_email_via_resend_api(
-            "test@example.com", "Test Subject", "Hello text", "<p>Hello HTML</p>", "idemp-key-1"
-        )
-        assert success is True
-        
-        mock_https_class.assert_called_with("api.resend.com", timeout=20)
-        
-        mock_conn.request.assert_called_once()
-        args, kwargs = mock_conn.request.call_args
-        assert args[0] == "POST"
-        assert args[1] == "/emails"
-        
-        headers = kwargs["headers"]
-        assert headers["Authorization"] == "Bearer re_test123"
-        assert headers["Content-Type"] == "application/json"
-        assert headers["Idempotency-Key"] == "idemp-key-1"
-        
-        body = json.loads(kwargs["body"])
-        assert body["to"] == ["test@example.com"]
-        assert body["subject"] == "Test Subject"
-        assert body["text"] == "Hello text"
-        assert body["html"] == "<p>Hello HTML</p>"
-        assert body["from"] == settings.email_from
-        
-    finally:
-        settings.resend_api_key = original_key
-
-@patch("http.client.HTTPSConnection")
-def test_resend_provider_rejection_redacted_diagnostics(mock_https_class, caplog):
-    original_key = settings.resend_api_key
-    settings.resend_api_key = SecretStr("re_test123")
-    
-    mock_conn = MagicMock()
-    mock_https_class.return_value = mock_conn
-    mock_response = MagicMock()
-    mock_response.status = 403
-    mock_response.read.return_value = b'{"statusCode": 403, "message": "Invalid API Key"}'
-    mock_conn.getresponse.return_value = mock_response
 
-    try:
-        success = _send_email_via_resend_api("test@example.com", "Subj", "Text", "<p>HTML</p>")
-        assert success is False
-        
-        # Ensure diagnostics are logged properly
-        assert "Resend API returned status=403 for test@example.com" in caplog.text
-        assert "Invalid API Key" in caplog.text
-        # Ensure raw token or sensitive body content isn't broadly logged by default
-    finally:
-        settings.resend_api_key = original_key
+def test_resend_success_request_construction():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"id": "mock_id"})
+
+    _resend(handler).send(_message())
+
+    assert len(requests) == 1
+    request = requests[0]
+    assert request.method == "POST"
+    assert request.url == "https://api.resend.com/emails"
+    assert request.headers["Authorization"] == "Bearer re_test123"
+    assert request.headers["Content-Type"] == "application/json"
+    assert request.headers["Idempotency-Key"] == "idemp-key-1"
+
+    body = json.loads(request.content)
+    assert body["to"] == ["test@example.com"]
+    assert body["subject"] == "Reset your Sarflog password"
+    assert "https://reset.link" in body["text"]
+    assert "https://reset.link" in body["html"]
+    assert body["from"] == settings.email_from
+
 
-@patch("http.client.HTTPSConnection")
-def test_resend_timeout(mock_https_class, caplog):
-    original_key = settings.resend_api_key
-    settings.resend_api_key = SecretStr("re_test123")
-    
-    mock_conn = MagicMock()
-    mock_https_class.return_value = mock_conn
-    mock_conn.request.side_effect = TimeoutError("Connection timed out")
+def test_resend_provider_rejection_redacted_diagnostics(caplog):
+    def handler(_request):
+        return httpx.Response(403, json={"statusCode": 403, "message": "Invalid API Key"})
 
     try:
-        success = _send_email_via_resend_api("test@example.com", "Subj", "Text", "<p>HTML</p>")
-        assert success is False
-        assert "Unexpected Resend API send failure for test@example.com" in caplog.text
-    finally:
-        settings.resend_api_key = original_key
-
-@patch("app.email_service._send_email_via_resend_api")
-def test_password_reset_email_delegates_through_boundary(mock_send):
-    mock_send.return_value = True
-    success = send_password_reset_email("test@example.com", "https://reset.link", "idemp_reset_1")
-    
-    assert success is True
-    mock_send.assert_called_once()
-    args, kwargs = mock_send.call_args
-    assert args[0] == "test@example.com"
-    assert args[1] == "Reset your Sarflog password"
-    assert "https://reset.link" in args[2]
-    assert "https://reset.link" in args[3]
-    assert args[4] == "idemp_reset_1"
+        _resend(handler).send(_message())
+    except EmailDeliveryError as exc:
+        assert exc.retryable is False
+    else:
+        raise AssertionError("403 must raise")
+
+    assert "Resend API returned status=403 for test@example.com" in caplog.text
+    assert "Invalid API Key" in caplog.text
+
+
+def test_resend_timeout_and_overload_are_retryable():
+    def timeout(request):
+        raise httpx.ConnectTimeout("Connection timed out", request=request)
+
+    def overloaded(_request):
+        return httpx.Response(429, json={"message": "slow down"})
+
+    for handler in (timeout, overloaded):
+        try:
+            _resend(handler).send(_message())
+        except EmailDeliveryError as exc:
+            assert exc.retryable is True
+        else:
+            raise AssertionError("failure must raise")
+
+
+def test_outbox_rows_commit_with_the_request_and_dispatch_once(client, session):
+    row = enqueue_email(session, _message())
+    # The same idempotency key is not queued twice.
+    assert enqueue_email(session, _message()) is row
+    session.commit()
+    assert row.idempotency_key == outbox_idempotency_key("idemp-key-1")
+
+    transport = StubTransport()
+    assert dispatch_email_outbox(session, transport=transport) == 1
+    assert [message.idempotency_key for message in transport.sent] == [row.idempotency_key]
+    assert dispatch_email_outbox(session, transport=transport) == 0
+
+    session.refresh(row)
+    assert row.status == models.EmailOutboxStatus.SENT.value
+    assert row.attempts == 1
+    assert row.text_body is None and row.html_body is None
+
+
+def test_outbox_dispatch_sends_a_bounded_number_of_batches(client, session):
+    for index in range(3):
+        enqueue_email(session, _message(idempotency_key=f"bounded-{index}"))
+    session.commit()
+
+    transport = StubTransport()
+    assert dispatch_email_outbox(session, transport=transport, batch_size=1, max_batches=2) == 2
+    # The rest waits for the next run.
+    assert dispatch_email_outbox(session, transport=transport, batch_size=1, max_batches=2) == 1
+    assert len(transport.sent) == 3
+
+
+def test_outbox_retries_with_backoff_then_gives_up(client, session, monkeypatch):
+    monkeypatch.setattr(settings, "email_outbox_max_attempts", 3)
+    transient = enqueue_email(session, _message(idempotency_key="transient"))
+    rejected = enqueue_email(session, _message(to_email="bad@example.com", idempotency_key="rejected"))
+    session.commit()
+
+    transport = StubTransport(failures=[
+        EmailDeliveryError("status 503", retryable=True),
+        EmailDeliveryError("status 422", retryable=False),
+    ])
+    now = datetime.now(timezone.utc) + timedelta(seconds=1)
+    assert dispatch_email_outbox(session, transport=transport, batch_size=1, now=now) == 0
+
+    session.refresh(transient)
+    session.refresh(rejected)
+    assert rejected.status == models.EmailOutboxStatus.FAILED.value
+    assert rejected.html_body is None
+    assert transient.status == models.EmailOutboxStatus.PENDING.value
+    assert transient.attempts == 1
+    assert transient.last_error == "status 503"
+    retry_at = transient.next_attempt_at.replace(tzinfo=timezone.utc)
+    assert retry_at >= now + timedelta(seconds=settings.email_outbox_backoff_base_seconds * 0.8)
+
+    # Not due yet: nothing is sent before the backoff elapses.
+    assert dispatch_email_outbox(session, transport=transport, now=now) == 0
+    transport.failures = [EmailDeliveryError("status 503", retryable=True)] * 2
+    assert dispatch_email_outbox(session, transport=transport, now=retry_at + timedelta(seconds=1)) == 0
+    session.refresh(transient)
+    retry_at = transient.next_attempt_at.replace(tzinfo=timezone.utc)
+    assert dispatch_email_outbox(session, transport=transport, now=retry_at + timedelta(seconds=1)) == 0
+
+    session.refresh(transient)
+    assert transient.status == models.EmailOutboxStatus.FAILED.value
+    assert transient.attempts == 3
+    assert transport.sent == []
+
+
+def test_nothing_is_queued_without_an_email_transport(client, session, monkeypatch):
+    monkeypatch.setattr(settings, "email_transport", "resend")
+    monkeypatch.setattr(settings, "resend_api_key", None)
+
+    assert enqueue_email(session, _message(idempotency_key="no-transport")) is None
+    session.commit()
+    assert session.query(models.EmailOutbox).count() == 0
+
+
+def test_settled_outbox_rows_are_purged_after_retention(client, session):
+    sent = enqueue_email(session, _message(idempotency_key="old-sent"))
+    failed = enqueue_email(session, _message(idempotency_key="old-failed"))
+    pending = enqueue_email(session, _message(idempotency_key="old-pending"))
+    recent = enqueue_email(session, _message(idempotency_key="recent-sent"))
+    session.commit()
+    now = datetime.now(timezone.utc)
+    sent.status = recent.status = models.EmailOutboxStatus.SENT.value
+    failed.status = models.EmailOutboxStatus.FAILED.value
+    for row in (sent, failed, pending):
+        row.created_at = now - timedelta(days=settings.email_outbox_retention_days + 1)
+    session.commit()
+
+    assert purge_settled_emails(session, batch_size=1, now=now) == 2
+    remaining = {key for (key,) in session.query(models.EmailOutbox.idempotency_key)}
+    assert remaining == {outbox_idempotency_key("old-pending"), outbox_idempotency_key("recent-sent")}
+
+
+def test_password_reset_request_only_queues_the_email(client, session):
+    client.post("/users/sign-up", json={
+        "username": "outboxuser",
+        "email": "outbox@example.com",
+        "password": "Password123!",
+    })
+    response = client.post("/auth/forgot-password", json={"email": "outbox@example.com"})
+    assert response.status_code == 200
+
+    subjects = [
+        subject
+        for (subject,) in session.query(models.EmailOutbox.subject)
+        .filter(models.EmailOutbox.to_email == "outbox@example.com")
+        .order_by(models.EmailOutbox.id)
+    ]
+    assert subjects == ["Verify your Sarflog email", "Reset your Sarflog password"]
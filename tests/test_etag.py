@@ -0,0 +1,73 @@
+from app.etag import if_none_match_matches
+from tests.helpers import create_budget, create_expense, create_user_and_token
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = 'W/"3-abc"'
+    assert if_none_match_matches('W/"3-abc"', etag)
+    assert if_none_match_matches('"3-abc"', etag)
+    assert if_none_match_matches('W/"1-old", W/"3-abc"', etag)
+    assert if_none_match_matches("*", etag)
+    assert not if_none_match_matches('W/"4-abc"', etag)
+    assert not if_none_match_matches(None, etag)
+
+
+def test_dashboard_summary_revalidates_until_data_changes(client, monkeypatch):
+    headers = create_user_and_token(client, "etagdash", "etagdash@example.com", "Pass123!")
+    create_budget(client, headers, category="Food", monthly_limit=500_000)
+    create_expense(client, headers, title="Lunch", amount=100, category="Food")
+
+    first = client.get("/analytics/dashboard-summary", headers=headers)
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    def fail_report(*_args, **_kwargs):
+        raise AssertionError("a 304 must not run the report queries")
+
+    with monkeypatch.context() as patch:
+        patch.setattr("app.routers.analytics._build_dashboard_summary", fail_report)
+        not_modified = client.get(
+            "/analytics/dashboard-summary",
+            headers={**headers, "If-None-Match": etag},
+        )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    create_expense(client, headers, title="Dinner", amount=50, category="Food")
+    changed = client.get(
+        "/analytics/dashboard-summary",
+        headers={**headers, "If-None-Match": etag},
+    )
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["spent"] == first.json()["spent"] + 50
+
+
+def test_etag_depends_on_query_parameters(client):
+    headers = create_user_and_token(client, "etagquery", "etagquery@example.com", "Pass123!")
+
+    week = client.get("/analytics/daily-trend?days=7", headers=headers)
+    month = client.get("/analytics/daily-trend?days=30", headers=headers)
+
+    assert week.status_code == month.status_code == 200
+    assert week.headers["etag"] != month.headers["etag"]
+
+
+def test_unread_count_etag_changes_after_mark_all_read(client):
+    headers = create_user_and_token(client, "etagnotify", "etagnotify@example.com", "Pass123!")
+    create_budget(client, headers, category="Food", monthly_limit=1000)
+    create_expense(client, headers, title="Lunch", amount=600, category="Food")
+
+    before = client.get("/notifications/unread-count", headers=headers)
+    assert before.json()["unread_count"] == 1
+
+    assert client.post("/notifications/mark-all-read", headers=headers).status_code == 204
+    after = client.get(
+        "/notifications/unread-count",
+        headers={**headers, "If-None-Match": before.headers["etag"]},
+    )
+
+    assert after.status_code == 200
+    assert after.json()["unread_count"] == 0
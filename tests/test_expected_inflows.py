@@ -2117,7 +2117,7 @@ def test_open_owed_debts_do_not_auto_project_into_cashflow(client, session):
         headers=headers,
     )
     assert cashflow.status_code == 200, cashflow.text
-    rows = cashflow.json()
+    rows = cashflow.json()["items"]
     debt_rows = [r for r in rows if r.get("promise_title", "").lower().find("non-projecting") >= 0]
     assert len(debt_rows) == 0
 
@@ -2190,7 +2190,7 @@ def test_explicit_creation_links_debt_to_expected_inflow(client, session):
         headers=headers,
     )
     assert cashflow.status_code == 200, cashflow.text
-    rows = cashflow.json()
+    rows = cashflow.json()["items"]
     inflow_rows = [r for r in rows if r["promise_id"] == inflow_data["id"]]
     assert len(inflow_rows) == 1
 
@@ -2278,7 +2278,7 @@ def test_receivable_promise_reschedule_creates_multiple_schedules(client):
             headers=headers,
         )
         assert cashflow.status_code == 200, cashflow.text
-        month_rows = [r for r in cashflow.json() if r["promise_id"] == inflow_id]
+        month_rows = [r for r in cashflow.json()["items"] if r["promise_id"] == inflow_id]
         assert len(month_rows) == 1
         assert month_rows[0]["amount"] == expected_amount
 
@@ -3047,7 +3047,7 @@ def test_epic5_regression_open_receivables_require_explicit_inflow_creation(clie
         headers=headers,
     )
     assert cashflow.status_code == 200
-    cf_labels = {r["source_label"] for r in cashflow.json()}
+    cf_labels = {r["source_label"] for r in cashflow.json()["items"]}
     assert "Auto-test A" not in cf_labels
     assert "Auto-test B" not in cf_labels
 
@@ -3070,7 +3070,7 @@ def test_epic5_regression_open_receivables_require_explicit_inflow_creation(clie
         f"/expected-inflows/cashflow?budget_year={today.year}&budget_month={today.month}",
         headers=headers,
     )
-    cf_labels2 = {r["source_label"] for r in cashflow2.json()}
+    cf_labels2 = {r["source_label"] for r in cashflow2.json()["items"]}
     assert "Auto-test A" in cf_labels2
     assert "Auto-test B" not in cf_labels2
 
@@ -3202,3 +3202,157 @@ def test_epic5_regression_deadline_independence_full_workflow(client):
     assert detail.json()["is_overdue"] is False
     assert detail.json()["schedules"][0]["due_date"] == next_month.isoformat()
     assert detail.json()["schedules"][0]["due_date"] != yesterday.isoformat()
+
+
+def test_listings_filter_month_in_sql_and_page_with_cursors(client):
+    headers = create_user_and_token(client, "g37paging", "g37paging@example.com", "Password123!")
+    today = user_timezone_today()
+    next_month = _month_date(today, 1)
+    source = _source(client, headers)
+    created = [_create_earned(client, headers, source["id"], 100_000 + index, next_month) for index in range(3)]
+    _create_earned(client, headers, source["id"], 50_000, _month_date(today, 2))
+    month = f"budget_year={next_month.year}&budget_month={next_month.month}"
+
+    seen = []
+    cursor = None
+    while True:
+        url = f"/expected-inflows?{month}&limit=2" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page["items"]) <= 2
+        assert all(item["activity"] == [] and item["realizations"] == [] for item in page["items"])
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [promise["id"] for promise in reversed(created)]
+
+    first = client.get(f"/expected-inflows/cashflow?{month}&limit=2", headers=headers)
+    assert first.status_code == 200, first.text
+    rest = client.get(
+        f"/expected-inflows/cashflow?{month}&limit=2&cursor={first.json()['next_cursor']}",
+        headers=headers,
+    )
+    assert rest.json()["next_cursor"] is None
+    rows = first.json()["items"] + rest.json()["items"]
+    assert [row["promise_id"] for row in rows] == [promise["id"] for promise in created]
+    assert rows == client.get(f"/expected-inflows/cashflow?{month}", headers=headers).json()["items"]
+
+    invalid = client.get(f"/expected-inflows/cashflow?{month}&cursor=nope", headers=headers)
+    assert invalid.status_code == 400
+    assert invalid.json()["detail"] == "expected_inflow.cursor_invalid"
+    assert client.get(f"/expected-inflows?{month}&cursor=999999", headers=headers).status_code == 400
+
+
+def test_stored_aggregates_track_mutations_and_checker_repairs_drift(client, session):
+    from app.services.expected_inflow_service import verify_promise_aggregates
+
+    headers = create_user_and_token(client, "g38aggregates", "g38aggregates@example.com", "Password123!")
+    today = user_timezone_today()
+    source = _source(client, headers)
+    wallet = _wallet(client, headers)
+    inflow = _create_earned(client, headers, source["id"], 1_000_000, today)
+    realized = client.post(
+        f"/expected-inflows/{inflow['id']}/realize",
+        json={
+            "actual_amount": 300_000,
+            "received_date": today.isoformat(),
+            "wallet_allocations": [{"wallet_id": wallet["id"], "amount": 300_000}],
+        },
+        headers=headers,
+    )
+    assert realized.status_code == 200, realized.text
+    written_off = client.post(
+        f"/expected-inflows/{inflow['id']}/write-off",
+        json={"amount": 200_000, "reason": "Client disputed part"},
+        headers=headers,
+    )
+    assert written_off.status_code == 200, written_off.text
+
+    session.expire_all()
+    promise = session.get(models.ExpectedInflowPromise, inflow["id"])
+    assert (promise.received_amount, promise.written_off_amount, promise.outstanding_amount) == (
+        300_000, 200_000, 500_000,
+    )
+    schedule = promise.schedules[0]
+    assert (schedule.received_amount, schedule.written_off_amount, schedule.outstanding_amount) == (
+        300_000, 200_000, 500_000,
+    )
+    assert verify_promise_aggregates(session, owner_id=promise.owner_id) == []
+
+    # A linked event voided outside void_financial_event leaves the columns stale.
+    event_id = realized.json()["realization"]["event_ids"][0]
+    session.get(models.FinancialEvent, event_id).status = models.FinancialEventStatus.VOIDED
+    session.flush()
+    drifts = verify_promise_aggregates(session, owner_id=promise.owner_id, repair=True)
+    assert {(drift.schedule_id, drift.field) for drift in drifts} == {
+        (schedule.id, "received_amount"),
+        (schedule.id, "outstanding_amount"),
+        (None, "received_amount"),
+        (None, "outstanding_amount"),
+    }
+    assert promise.outstanding_amount == 800_000
+    assert verify_promise_aggregates(session, owner_id=promise.owner_id) == []
+    session.rollback()
+
+
+def _realize_then_void_income_entry(client, session, username, void_entry):
+    headers = create_user_and_token(client, username, f"{username}@example.com", "Password123!")
+    today = user_timezone_today()
+    source = _source(client, headers)
+    wallet = _wallet(client, headers)
+    inflow = _create_earned(client, headers, source["id"], 1_000_000, today)
+    realized = client.post(
+        f"/expected-inflows/{inflow['id']}/realize",
+        json={
+            "actual_amount": 400_000,
+            "received_date": today.isoformat(),
+            "wallet_allocations": [{"wallet_id": wallet["id"], "amount": 400_000}],
+        },
+        headers=headers,
+    )
+    assert realized.status_code == 200, realized.text
+    event_id = realized.json()["realization"]["event_ids"][0]
+
+    response = void_entry(headers, event_id, today, source["id"], wallet["id"])
+    assert response.status_code in (200, 204), response.text
+
+    detail = client.get(f"/expected-inflows/{inflow['id']}", headers=headers)
+    assert detail.status_code == 200, detail.text
+    assert detail.json()["received_amount"] == 0
+    assert detail.json()["remaining_amount"] == 1_000_000
+    summary = client.get(
+        f"/budgets/month-summary?budget_year={today.year}&budget_month={today.month}",
+        headers=headers,
+    )
+    assert summary.json()["expected_income_remaining"] == 1_000_000
+    analytics = client.get(f"/income/sources/{source['id']}/analytics", headers=headers).json()
+    assert analytics["lifetime_received"] == 0
+    assert analytics["outstanding_expected"] == 1_000_000
+
+    from app.services.expected_inflow_service import verify_promise_aggregates
+
+    session.expire_all()
+    promise = session.get(models.ExpectedInflowPromise, inflow["id"])
+    assert verify_promise_aggregates(session, owner_id=promise.owner_id) == []
+
+
+def test_deleting_realized_income_entry_resyncs_promise_aggregates(client, session):
+    _realize_then_void_income_entry(
+        client,
+        session,
+        "g38void_delete",
+        lambda headers, event_id, *_: client.delete(f"/income/entries/{event_id}", headers=headers),
+    )
+
+
+def test_correcting_realized_income_entry_resyncs_promise_aggregates(client, session):
+    def correct(headers, event_id, today, source_id, wallet_id):
+        return client.put(
+            f"/income/entries/{event_id}",
+            json={"amount": 350_000, "date": today.isoformat(), "source_id": source_id, "wallet_id": wallet_id},
+            headers=headers,
+        )
+
+    _realize_then_void_income_entry(client, session, "g38void_correct", correct)
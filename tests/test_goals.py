@@ -4,7 +4,15 @@ import pytest
 
 from app import models
 from app.redis_rate_limiter import redis_client
-from app.services.goal_funding_service import get_goal_wallet_funded_amount
+from app.services.goal_balance_service import rebuild_goal_wallet_balances, verify_goal_wallet_balances
+from app.services.goal_funding_service import (
+    build_goal_with_progress,
+    build_goals_with_progress,
+    get_goal_funded_amount,
+    get_goal_linked_project_id,
+    get_goal_released_amount,
+    get_goal_wallet_funded_amount,
+)
 from tests.helpers import create_budget, create_expense, create_user_and_token, user_timezone_today
 
 
@@ -251,6 +259,72 @@ def test_pay_obligation_goal_for_payment_plan_targets_next_payment_plan(client):
     assert payload["payment_plan_target"]["remaining_amount"] == 100_000
 
 
+def test_goal_list_builds_progress_with_fixed_query_count(client, session, count_queries):
+    email = "goalbatch@example.com"
+    headers = create_user_and_token(client, "goalbatch", email, "Password123!")
+    wallet_id = _setup_premium_user_with_goal_wallet(client, headers)
+    plan = _create_payment_plan_debt(client, headers, amount=500_000)
+    assert client.post(
+        "/goals/",
+        json={
+            "title": "Pay phone plan",
+            "target_amount": 500_000,
+            "intent": "PAY_OBLIGATION",
+            "linked_payment_plan_id": plan["id"],
+        },
+        headers=headers,
+    ).status_code == 201
+    user = session.query(models.User).filter(models.User.email == email).one()
+    today = user_timezone_today()
+
+    def add_goals(count: int) -> None:
+        for index in range(count):
+            goal_id = client.post(
+                "/goals/",
+                json={"title": f"Reserve {index}", "target_amount": 100_000},
+                headers=headers,
+            ).json()["id"]
+            assert client.post(
+                f"/goals/{goal_id}/allocations",
+                json={"wallet_id": wallet_id, "amount": 10_000},
+                headers=headers,
+            ).status_code == 200
+
+    def owned_goals() -> list[models.Goals]:
+        session.expire_all()
+        return session.query(models.Goals).filter(models.Goals.owner_id == user.id).all()
+
+    add_goals(1)
+    goals = owned_goals()
+    build_goals_with_progress(session, user.id, goals, today=today)
+    with_two_goals = count_queries(build_goals_with_progress, session, user.id, goals, today=today)
+    add_goals(5)
+    goals = owned_goals()
+    build_goals_with_progress(session, user.id, goals, today=today)
+    assert count_queries(build_goals_with_progress, session, user.id, goals, today=today) == with_two_goals
+
+    batched = build_goals_with_progress(session, user.id, goals, today=today)
+    one_by_one = [
+        build_goal_with_progress(
+            session,
+            user.id,
+            goal,
+            get_goal_funded_amount(session, user.id, goal.id),
+            released_amount=get_goal_released_amount(session, user.id, goal.id),
+            linked_project_id=get_goal_linked_project_id(session, user.id, goal.id),
+            today=today,
+        )
+        for goal in goals
+    ]
+    assert [item.model_dump() for item in batched] == [item.model_dump() for item in one_by_one]
+    assert sum(item.payment_plan_target is not None for item in batched) == 1
+    assert all(item.funded_amount == 10_000 for item in batched if item.intent == "RESERVE")
+
+    listed = client.get("/goals/", headers=headers)
+    assert listed.status_code == 200
+    assert len(listed.json()) == 7
+
+
 def test_pay_obligation_goal_payment_applies_to_next_payment_plan(client):
     headers = create_user_and_token(
         client, "goaldebtplanpay", "goaldebtplanpay@example.com", "Password123!"
@@ -1165,6 +1239,46 @@ def test_goal_return_reduces_wallet_allocation_and_reopens_goal(client):
     assert summary.json()["available_for_goals"] == 1_400_000
 
 
+def test_goal_wallet_balances_track_contributions_and_rebuild_from_history(client, session):
+    headers = create_user_and_token(
+        client, "goalbalance1", "goalbalance1@example.com", "Password123!"
+    )
+    wallet_id = _setup_premium_user_with_goal_wallet(client, headers)
+    goal_id = client.post(
+        "/goals/",
+        json={"title": "Emergency fund", "target_amount": 900_000},
+        headers=headers,
+    ).json()["id"]
+    assert client.post(
+        f"/goals/{goal_id}/allocations",
+        json={"wallet_id": wallet_id, "amount": 900_000},
+        headers=headers,
+    ).status_code == 200
+    assert client.post(
+        f"/goals/{goal_id}/allocations/return",
+        json={"wallet_id": wallet_id, "amount": 300_000},
+        headers=headers,
+    ).status_code == 200
+
+    user = session.query(models.User).filter(models.User.email == "goalbalance1@example.com").one()
+    balance = session.get(models.GoalWalletBalance, (goal_id, wallet_id))
+    assert (balance.allocated, balance.returned, balance.consumed, balance.released) == (900_000, 300_000, 0, 0)
+    assert verify_goal_wallet_balances(session, owner_id=user.id) == []
+
+    session.query(models.GoalWalletBalance).filter(
+        models.GoalWalletBalance.goal_id == goal_id
+    ).update({"returned": 0})
+    session.commit()
+    assert get_goal_wallet_funded_amount(session, user.id, goal_id, wallet_id) == 900_000
+    drifts = verify_goal_wallet_balances(session, owner_id=user.id)
+    assert [(drift.field, drift.stored, drift.expected) for drift in drifts] == [("returned", 0, 300_000)]
+
+    assert rebuild_goal_wallet_balances(session, owner_id=user.id) == 1
+    session.commit()
+    assert verify_goal_wallet_balances(session, owner_id=user.id) == []
+    assert get_goal_wallet_funded_amount(session, user.id, goal_id, wallet_id) == 600_000
+
+
 def test_goal_return_rejects_when_wallet_goal_balance_insufficient(client):
     headers = create_user_and_token(
         client, "goaluser6", "goaluser6@example.com", "Password123!"
@@ -0,0 +1,204 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# pyrefly: ignore [missing-import]
+import pytest
+# pyrefly: ignore [missing-import]
+from cryptography import x509
+# pyrefly: ignore [missing-import]
+from cryptography.hazmat.primitives import hashes, serialization
+# pyrefly: ignore [missing-import]
+from cryptography.hazmat.primitives.asymmetric import rsa
+# pyrefly: ignore [missing-import]
+from cryptography.x509.oid import NameOID
+# pyrefly: ignore [missing-import]
+from google.auth import crypt
+# pyrefly: ignore [missing-import]
+from google.auth import jwt as google_jwt
+
+from app import google_keys
+from app.redis_rate_limiter import redis_client
+from config import settings
+
+
+def _signing_key(kid):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, kid)])
+    now = datetime.now(timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    signer = crypt.RSASigner.from_string(private_pem, key_id=kid)
+    return signer, cert.public_bytes(serialization.Encoding.PEM).decode("ascii")
+
+
+def _id_token(signer, **claims):
+    now = int(time.time())
+    payload = {
+        "iss": "https://accounts.google.com",
+        "aud": "test-ios-id",
+        "sub": "google-keys-123",
+        "email": "keys@example.com",
+        "email_verified": True,
+        "iat": now,
+        "exp": now + 600,
+        **claims,
+    }
+    return google_jwt.encode(signer, payload).decode("ascii")
+
+
+class _KeyServer:
+    """Local stand-in for Google's certificate endpoint."""
+
+    def __init__(self):
+        self.certs = {}
+        self.cache_control = "public, max-age=600"
+        self.status = 200
+        self.hits = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.hits += 1
+                body = json.dumps(server.certs).encode("utf-8")
+                self.send_response(server.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", server.cache_control)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/oauth2/v1/certs"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def wait_for_hits(self, count, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while self.hits < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.hits
+
+
+def _clear_shared():
+    try:
+        redis_client.delete(google_keys.SHARED_KEY, google_keys.REFRESH_LOCK_KEY)
+    except Exception:
+        pass
+
+
+@pytest.fixture()
+def key_server(monkeypatch):
+    server = _KeyServer()
+    signer, pem = _signing_key("key-a")
+    server.certs = {"key-a": pem}
+    server.signer = signer
+    monkeypatch.setattr(settings, "google_certs_url", server.url)
+    monkeypatch.setattr(settings, "google_ios_client_id", "test-ios-id")
+    _clear_shared()
+    google_keys.reset_google_certs_cache()
+    yield server
+    google_keys.reset_google_certs_cache()
+    _clear_shared()
+    server.httpd.shutdown()
+    server.httpd.server_close()
+
+
+def test_native_sign_in_verifies_against_cached_keys(client, key_server):
+    for _ in range(2):
+        response = client.post(
+            "/auth/google/native",
+            json={"id_token": _id_token(key_server.signer)},
+        )
+        assert response.status_code == 200
+
+    assert key_server.hits == 1
+
+
+def test_key_set_refreshes_in_background_before_expiry(key_server, monkeypatch):
+    assert google_keys.get_google_certs() == key_server.certs
+    assert key_server.hits == 1
+
+    # Inside the refresh margin: the current set is served, a refresh runs behind it.
+    monkeypatch.setattr(settings, "google_certs_refresh_margin_seconds", 900)
+    _, rotated_pem = _signing_key("key-b")
+    key_server.certs = {"key-b": rotated_pem}
+    assert "key-a" in google_keys.get_google_certs()
+
+    assert key_server.wait_for_hits(2) == 2
+    deadline = time.monotonic() + 5
+    while "key-b" not in google_keys.get_google_certs() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert "key-b" in google_keys.get_google_certs()
+
+
+def test_expired_key_set_is_fetched_again(key_server):
+    key_server.cache_control = "public, max-age=0"
+    google_keys.get_google_certs()
+    google_keys.get_google_certs()
+
+    assert key_server.hits == 2
+
+
+def test_key_set_is_shared_between_workers(key_server):
+    try:
+        redis_client.ping()
+    except Exception:
+        pytest.skip("Redis is not reachable for shared key set assertions.")
+    google_keys.get_google_certs()
+    # A worker with an empty cache picks up the set another worker fetched.
+    google_keys.reset_google_certs_cache()
+    token = _id_token(key_server.signer)
+
+    assert google_keys.verify_google_id_token(token)["sub"] == "google-keys-123"
+    assert key_server.hits == 1
+
+
+def test_last_good_key_set_is_kept_when_refresh_fails(key_server):
+    key_server.cache_control = "public, max-age=0"
+    google_keys.get_google_certs()
+    key_server.status = 503
+    token = _id_token(key_server.signer)
+
+    assert google_keys.verify_google_id_token(token)["email"] == "keys@example.com"
+    assert google_keys.verify_google_id_token(token)["email"] == "keys@example.com"
+    # The failed refresh is retried after google_certs_retry_seconds, not per sign-in.
+    assert key_server.hits == 2
+
+
+def test_unknown_key_id_forces_one_refresh(key_server):
+    google_keys.get_google_certs()
+    rotated_signer, rotated_pem = _signing_key("key-b")
+    key_server.certs = {"key-a": key_server.certs["key-a"], "key-b": rotated_pem}
+
+    assert google_keys.verify_google_id_token(_id_token(rotated_signer))["sub"] == "google-keys-123"
+    assert key_server.hits == 2
+
+    unknown_signer, _ = _signing_key("key-c")
+    with pytest.raises(ValueError):
+        google_keys.verify_google_id_token(_id_token(unknown_signer))
+    assert key_server.hits == 2
+
+
+def test_wrong_issuer_is_rejected(key_server):
+    token = _id_token(key_server.signer, iss="https://evil.example.com")
+
+    with pytest.raises(ValueError):
+        google_keys.verify_google_id_token(token)
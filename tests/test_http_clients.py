@@ -0,0 +1,76 @@
+import asyncio
+
+# pyrefly: ignore [missing-import]
+import httpx
+# pyrefly: ignore [missing-import]
+import pytest
+# pyrefly: ignore [missing-import]
+from fastapi.testclient import TestClient
+
+from app import http_clients
+from app.http_clients import (
+    get_async_client,
+    get_http_client_stats,
+    get_sync_client,
+    reset_http_client_stats,
+)
+from app.main import app
+
+
+def _handler(request):
+    if request.url.path == "/down":
+        raise httpx.ConnectError("refused", request=request)
+    status = 503 if request.url.path == "/busy" else 200
+    return httpx.Response(status, json={"ok": status == 200})
+
+
+async def _async_handler(request):
+    return _handler(request)
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats():
+    reset_http_client_stats()
+    yield
+    reset_http_client_stats()
+
+
+def test_sync_client_is_shared_and_records_per_host_metrics():
+    client = get_sync_client()
+    assert get_sync_client() is client
+    # Route the test host to a mock instead of the network.
+    client._transport._pools["https://api.example.test"] = httpx.MockTransport(_handler)
+
+    assert client.get("https://api.example.test/ok").status_code == 200
+    assert client.get("https://api.example.test/busy").status_code == 503
+    with pytest.raises(httpx.ConnectError):
+        client.get("https://api.example.test/down")
+
+    stats = get_http_client_stats()["https://api.example.test"]
+    assert stats["requests"] == 3
+    assert stats["errors"] == 2
+    assert stats["status_5xx"] == 1
+    assert stats["max_seconds"] >= stats["average_seconds"] >= 0
+
+
+def test_async_client_is_shared_per_event_loop():
+    async def use_client():
+        client = get_async_client()
+        assert get_async_client() is client
+        client._transport._pools["https://bot.example.test"] = httpx.MockTransport(_async_handler)
+        response = await client.post("https://bot.example.test/send", json={})
+        assert response.status_code == 200
+        return client
+
+    first = asyncio.run(use_client())
+    second = asyncio.run(use_client())
+    assert first is not second
+    assert get_http_client_stats()["https://bot.example.test"]["requests"] == 2
+
+
+def test_lifespan_opens_and_closes_clients():
+    with TestClient(app):
+        assert http_clients._sync_client is not None
+        assert http_clients._async_client is not None
+    assert http_clients._sync_client is None
+    assert http_clients._async_client is None
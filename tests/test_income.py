@@ -2,6 +2,11 @@ from datetime import date, timedelta
 
 from app import models
 from app.redis_rate_limiter import redis_client
+from app.services.income_source_stats_service import (
+    rebuild_income_source_stats,
+    source_totals,
+    verify_income_source_stats,
+)
 from tests.helpers import TEST_WALLET_EPOCH, create_budget, create_expense, create_user_and_token, user_timezone_today
 
 
@@ -317,48 +322,69 @@ def test_money_in_lists_and_classifies_incoming_money(client, session):
     )
     assert adjustment.status_code == 200, adjustment.text
 
-    all_money_in = client.get("/money-in?limit=20&skip=0", headers=headers)
+    all_money_in = client.get("/money-in?limit=20&skip=0&include_total=true", headers=headers)
     assert all_money_in.status_code == 200, all_money_in.text
     all_payload = all_money_in.json()
     assert all_payload["total"] >= 5
     kinds = {item["kind"] for item in all_payload["items"]}
     assert {"income", "returned", "borrowed", "sold", "adjustment"}.issubset(kinds)
 
-    paged_money_in = client.get("/money-in?limit=1&skip=1", headers=headers)
+    paged_money_in = client.get("/money-in?limit=1&skip=1&include_total=true", headers=headers)
     assert paged_money_in.status_code == 200, paged_money_in.text
     assert paged_money_in.json()["total"] == all_payload["total"]
     assert len(paged_money_in.json()["items"]) == 1
 
-    income_only = client.get("/money-in?kind=income", headers=headers)
+    income_only = client.get("/money-in?kind=income&include_total=true", headers=headers)
     assert income_only.status_code == 200, income_only.text
     assert income_only.json()["total"] == 1
     assert income_only.json()["items"][0]["counts_as_income"] is True
     assert income_only.json()["items"][0]["source_name"] == "Salary"
 
-    borrowed_only = client.get("/money-in?kind=borrowed", headers=headers)
+    borrowed_only = client.get("/money-in?kind=borrowed&include_total=true", headers=headers)
     assert borrowed_only.status_code == 200, borrowed_only.text
     assert borrowed_only.json()["total"] == 1
     assert borrowed_only.json()["items"][0]["counts_as_income"] is False
     assert borrowed_only.json()["items"][0]["source_name"] == "Friend"
 
-    salary_search = client.get("/money-in?search=salary", headers=headers)
+    salary_search = client.get("/money-in?search=salary&include_total=true", headers=headers)
     assert salary_search.status_code == 200, salary_search.text
     assert salary_search.json()["total"] == 1
     assert salary_search.json()["items"][0]["source_name"] == "Salary"
 
-    friend_search = client.get("/money-in?search=friend", headers=headers)
+    friend_search = client.get("/money-in?search=friend&include_total=true", headers=headers)
     assert friend_search.status_code == 200, friend_search.text
     assert friend_search.json()["total"] == 1
     assert friend_search.json()["items"][0]["kind"] == "borrowed"
 
-    asset_search = client.get("/money-in?search=old%20phone", headers=headers)
+    asset_search = client.get("/money-in?search=old%20phone&include_total=true", headers=headers)
     assert asset_search.status_code == 200, asset_search.text
     assert asset_search.json()["total"] == 1
     assert asset_search.json()["items"][0]["kind"] == "sold"
 
-    missing_search = client.get("/money-in?search=does-not-exist", headers=headers)
+    missing_search = client.get("/money-in?search=does-not-exist&include_total=true", headers=headers)
     assert missing_search.status_code == 200, missing_search.text
-    assert missing_search.json() == {"total": 0, "items": []}
+    assert missing_search.json() == {"total": 0, "items": [], "next_cursor": None}
+
+    returned_search = client.get("/money-in?search=returned", headers=headers)
+    assert returned_search.status_code == 200, returned_search.text
+    assert {item["kind"] for item in returned_search.json()["items"]} == {"returned"}
+
+    cursor_items = []
+    cursor = None
+    while True:
+        url = "/money-in?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        page = client.get(url, headers=headers)
+        assert page.status_code == 200, page.text
+        assert page.json()["total"] is None
+        cursor_items.extend(page.json()["items"])
+        cursor = page.json()["next_cursor"]
+        if cursor is None:
+            break
+    assert [item["id"] for item in cursor_items] == [item["id"] for item in all_payload["items"]]
+
+    invalid_cursor = client.get("/money-in?cursor=999999", headers=headers)
+    assert invalid_cursor.status_code == 400
+    assert invalid_cursor.json()["detail"] == "money_in.cursor_invalid"
 
 
 def test_income_entry_rejects_date_outside_current_month(client, monkeypatch):
@@ -1013,6 +1039,87 @@ def test_income_source_edit_voids_and_creates_corrected_event(client, session):
     assert corrected.entity_legs[0].income_source_id == source2_id
 
 
+def test_income_source_analytics_read_counters_kept_by_postings(client, session):
+    headers = create_user_and_token(client, "incstats", "incstats@example.com", "Password123!")
+    user = _get_user(session, "incstats@example.com")
+    wallet = _default_wallet(session, user.id)
+    s1 = client.post("/income/sources", json={"name": "Salary"}, headers=headers).json()
+    s2 = client.post("/income/sources", json={"name": "Freelance"}, headers=headers).json()
+    today = user_timezone_today()
+
+    first = client.post(
+        "/income/entries",
+        json={"amount": 300000, "source_id": s1["id"], "date": today.isoformat()},
+        headers=headers,
+    )
+    assert first.status_code == 201, first.text
+    second = client.post(
+        "/income/entries",
+        json={"amount": 120000, "source_id": s1["id"], "date": today.isoformat()},
+        headers=headers,
+    )
+    assert second.status_code == 201, second.text
+    # Moving an entry to another source voids it and reposts under the new source.
+    moved = client.put(
+        f"/income/entries/{second.json()['id']}",
+        json={"amount": 120000, "source_id": s2["id"], "date": today.isoformat()},
+        headers=headers,
+    )
+    assert moved.status_code == 200, moved.text
+
+    promise = client.post(
+        "/expected-inflows",
+        json={
+            "kind": "EARNED",
+            "source_id": s1["id"],
+            "title": "Invoice",
+            "amount": 500000,
+            "due_date": today.isoformat(),
+        },
+        headers=headers,
+    )
+    assert promise.status_code == 201, promise.text
+    realized = client.post(
+        f"/expected-inflows/{promise.json()['id']}/realize",
+        json={
+            "actual_amount": 200000,
+            "received_date": today.isoformat(),
+            "wallet_allocations": [{"wallet_id": wallet.id, "amount": 200000}],
+            "idempotency_key": "incstats-realize",
+        },
+        headers=headers,
+    )
+    assert realized.status_code == 200, realized.text
+
+    session.expire_all()
+    assert verify_income_source_stats(session, owner_id=user.id) == []
+    expected = source_totals(session, owner_id=user.id)
+    for source in (s1, s2):
+        analytics = client.get(f"/income/sources/{source['id']}/analytics", headers=headers)
+        assert analytics.status_code == 200, analytics.text
+        data = analytics.json()
+        totals = expected[source["id"]]
+        assert data["entry_count"] == totals["entry_count"]
+        assert data["entry_total_received"] == totals["entry_total_received"]
+        assert data["lifetime_received"] == totals["lifetime_received"]
+
+    data = client.get(f"/income/sources/{s1['id']}/analytics", headers=headers).json()
+    assert data["promise_ids"] == [promise.json()["id"]]
+    assert data["promise_count"] == 1
+    assert data["lifetime_expected"] == 500000
+    assert data["lifetime_received"] == 200000
+    assert data["outstanding_expected"] == 300000
+    assert data["entry_total_received"] == 300000 + 200000
+
+    session.query(models.IncomeSourceStats).filter(
+        models.IncomeSourceStats.source_id == s1["id"],
+    ).update({"entry_count": 0}, synchronize_session=False)
+    assert [drift.field for drift in verify_income_source_stats(session, owner_id=user.id)] == ["entry_count"]
+    assert rebuild_income_source_stats(session, owner_id=user.id) == 2
+    session.commit()
+    assert verify_income_source_stats(session, owner_id=user.id) == []
+
+
 def test_income_date_edit_voids_and_creates_corrected_event(client, session, monkeypatch):
     """Ticket 5: Changing the income date triggers a correction repost.
     The corrected date must pass normal-logging boundaries."""
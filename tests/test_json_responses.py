@@ -0,0 +1,83 @@
+import json
+from datetime import date, datetime, timezone
+
+from fastapi import Response
+
+from app import models, schemas
+from app.compression import accepted_encodings
+from app.json_responses import FastJSONResponse, schema_response
+from tests.helpers import create_budget, create_expense, create_user_and_token
+
+
+def _money_in_feed(items: int) -> schemas.PaginatedMoneyInOut:
+    return schemas.PaginatedMoneyInOut(
+        total=items,
+        items=[
+            schemas.MoneyInItemOut(
+                id=index,
+                title=f"Salary {index}",
+                amount=1000 + index,
+                date=date(2026, 3, 1),
+                created_at=datetime(2026, 3, 1, 9, 30, tzinfo=timezone.utc),
+                kind=schemas.MoneyInKind.INCOME,
+                counts_as_income=True,
+                event_type=models.TransactionType.INCOME,
+            )
+            for index in range(items)
+        ],
+    )
+
+
+def test_schema_response_matches_default_serialization_and_keeps_headers():
+    feed = _money_in_feed(3)
+    sub_response = Response()
+    del sub_response.headers["content-length"]
+    sub_response.headers["ETag"] = 'W/"1-abc"'
+
+    fast = schema_response(feed, response=sub_response)
+
+    assert fast.status_code == 200
+    assert fast.headers["etag"] == 'W/"1-abc"'
+    assert fast.headers["content-type"] == "application/json"
+    assert json.loads(fast.body) == feed.model_dump(mode="json")
+
+
+def test_fast_json_response_renders_compact_json():
+    body = FastJSONResponse({"b": [1, 2], "a": None}).body
+    assert json.loads(body) == {"b": [1, 2], "a": None}
+    assert b" " not in body
+
+
+def test_list_endpoint_fast_path_keeps_etag(client):
+    headers = create_user_and_token(client, "fastlist", "fastlist@example.com", "Pass123!")
+    create_budget(client, headers, category="Food", monthly_limit=50_000)
+    create_expense(client, headers, title="Tea", amount=10, category="Food")
+
+    response = client.get("/expenses/", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["total"] == 1
+    assert response.headers["etag"].startswith('W/"')
+
+
+def test_large_responses_are_gzipped_small_ones_are_not(client):
+    headers = create_user_and_token(client, "gzipuser", "gzipuser@example.com", "Pass123!")
+
+    large = client.get(
+        "/analytics/daily-trend?days=120",
+        headers={**headers, "Accept-Encoding": "gzip"},
+    )
+    small = client.get(
+        "/analytics/history",
+        headers={**headers, "Accept-Encoding": "gzip"},
+    )
+
+    assert large.headers["content-encoding"] == "gzip"
+    assert len(large.json()) == 120
+    assert "content-encoding" not in small.headers
+
+
+def test_accepted_encodings_ignores_q_zero():
+    assert accepted_encodings("gzip, br;q=0") == {"gzip"}
+    assert accepted_encodings("br;q=0.5, GZIP") == {"br", "gzip"}
+    assert accepted_encodings("") == set()
@@ -1,6 +1,33 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
 from app import models
+from app.realtime import channel_name, publish_events, stream_events
+from app.services.notification_service import purge_read_notifications, unread_key
+from app.redis_rate_limiter import redis_client
 from tests.helpers import create_user_and_token, create_budget, create_expense
 
+
+def _subscribe(owner_id):
+    try:
+        redis_client.ping()
+    except Exception:
+        pytest.skip("Redis is not reachable for realtime assertions.")
+    pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(channel_name(owner_id))
+    pubsub.get_message(timeout=1)  # subscribe confirmation
+    return pubsub
+
+
+def _drain(pubsub):
+    events = []
+    while (message := pubsub.get_message(timeout=0.5)) is not None:
+        events.append(json.loads(message["data"]))
+    return events
+
 def test_notification_creation_flow(client, session):
     # 1. Setup user and budget
     headers = create_user_and_token(client, "testnotify", "testnotify@example.com", "Password123!")
@@ -87,3 +114,168 @@ def test_delete_notification(client, session):
     # Verify
     response = client.get("/notifications", headers=headers)
     assert response.json()["total"] == 0
+
+
+def test_committed_writes_publish_realtime_events(client, session):
+    headers = create_user_and_token(client, "testlive", "testlive@example.com", "Password123!")
+    user = session.query(models.User).filter(models.User.email == "testlive@example.com").first()
+    wallet = session.query(models.Wallet).filter(models.Wallet.owner_id == user.id).first()
+    create_budget(client, headers, category="Food", monthly_limit=1000)
+    pubsub = _subscribe(user.id)
+    try:
+        response = create_expense(client, headers, title="Lunch", amount=600, category="Food")
+        assert response.status_code == 201
+        events = _drain(pubsub)
+        created = [event for event in events if event["type"] == "notification.created"]
+        assert len(created) == 1
+        assert "50%" in created[0]["data"]["message"]
+        assert {"type": "notifications.unread_count", "data": {"unread_count": 1}} in events
+        session.refresh(wallet)
+        assert {
+            "type": "wallet.balance",
+            "data": {"wallet_id": wallet.id, "current_balance": int(wallet.current_balance)},
+        } in events
+
+        response = client.post("/notifications/mark-all-read", headers=headers)
+        assert response.status_code == 204
+        assert _drain(pubsub) == [{"type": "notifications.unread_count", "data": {"unread_count": 0}}]
+
+        # Reads publish nothing.
+        client.get("/notifications", headers=headers)
+        assert _drain(pubsub) == []
+    finally:
+        pubsub.close()
+
+
+def test_rolled_back_writes_publish_nothing(client, session):
+    create_user_and_token(client, "testlivert", "testlivert@example.com", "Password123!")
+    user = session.query(models.User).filter(models.User.email == "testlivert@example.com").first()
+    pubsub = _subscribe(user.id)
+    try:
+        session.add(models.Notification(owner_id=user.id, type="system", title="t", message="m"))
+        session.flush()
+        session.rollback()
+        assert _drain(pubsub) == []
+    finally:
+        pubsub.close()
+
+
+def test_event_stream_relays_channel_as_sse():
+    _subscribe(987654).close()
+
+    async def not_disconnected():
+        return False
+
+    async def read_frames():
+        frames = stream_events(987654, is_disconnected=not_disconnected, heartbeat_seconds=0.2)
+        try:
+            assert (await frames.__anext__()).startswith("retry: ")
+            publish_events([(987654, "notifications.unread_count", {"unread_count": 3})])
+            frame = await frames.__anext__()
+            while frame.startswith(":"):
+                frame = await frames.__anext__()
+            return frame
+        finally:
+            await frames.aclose()
+
+    frame = asyncio.run(read_frames())
+    assert frame == 'event: notifications.unread_count\ndata: {"unread_count":3}\n\n'
+
+
+def test_event_stream_requires_a_valid_token(client):
+    response = client.get("/events/stream", headers={"Authorization": "Bearer not-a-token"})
+    assert response.status_code == 401
+    assert response.json()["detail"] == "auth.credentials_invalid"
+
+
+def _add_notifications(session, owner_id, count, *, is_read=False, start=None):
+    start = start or datetime.now(timezone.utc) - timedelta(hours=count)
+    rows = [
+        models.Notification(
+            owner_id=owner_id,
+            type="system",
+            title=f"n{index}",
+            message="m",
+            is_read=is_read,
+            created_at=start + timedelta(hours=index),
+        )
+        for index in range(count)
+    ]
+    session.add_all(rows)
+    session.commit()
+    return rows
+
+
+def test_notifications_keyset_pages(client, session):
+    headers = create_user_and_token(client, "testpage", "testpage@example.com", "Password123!")
+    user = session.query(models.User).filter(models.User.email == "testpage@example.com").first()
+    _add_notifications(session, user.id, 5)
+
+    first = client.get("/notifications/?limit=2", headers=headers).json()
+    assert first["total"] == 5
+    assert [item["title"] for item in first["items"]] == ["n4", "n3"]
+
+    second = client.get(f"/notifications/?limit=2&cursor={first['next_cursor']}", headers=headers).json()
+    assert second["total"] is None
+    assert [item["title"] for item in second["items"]] == ["n2", "n1"]
+
+    last = client.get(f"/notifications/?limit=2&cursor={second['next_cursor']}", headers=headers).json()
+    assert [item["title"] for item in last["items"]] == ["n0"]
+    assert last["next_cursor"] is None
+    assert last["unread_count"] == 5
+
+    response = client.get("/notifications/?cursor=999999", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "notifications.cursor_invalid"
+
+
+def test_unread_counter_follows_writes(client, session):
+    headers = create_user_and_token(client, "testcount", "testcount@example.com", "Password123!")
+    user = session.query(models.User).filter(models.User.email == "testcount@example.com").first()
+    _subscribe(user.id).close()
+    rows = _add_notifications(session, user.id, 4)
+
+    assert client.get("/notifications/unread-count", headers=headers).json() == {"unread_count": 4}
+    assert int(redis_client.get(unread_key(user.id))) == 4
+
+    # Marking an already-read id again must not count twice.
+    for _ in range(2):
+        response = client.post("/notifications/mark-read", json={"notification_ids": [rows[0].id]}, headers=headers)
+        assert response.status_code == 204
+    assert int(redis_client.get(unread_key(user.id))) == 3
+
+    client.delete(f"/notifications/{rows[1].id}", headers=headers)
+    _add_notifications(session, user.id, 1)
+    assert int(redis_client.get(unread_key(user.id))) == 3
+
+    client.delete("/notifications/?is_read=true", headers=headers)
+    assert int(redis_client.get(unread_key(user.id))) == 3
+
+    # The counter, not a COUNT, answers reads.
+    redis_client.set(unread_key(user.id), 42)
+    assert client.get("/notifications/unread-count", headers=headers).json() == {"unread_count": 42}
+
+    # Bulk deletes recount from the database.
+    client.delete("/notifications/", headers=headers)
+    assert int(redis_client.get(unread_key(user.id))) == 0
+    assert client.get("/notifications/unread-count", headers=headers).json() == {"unread_count": 0}
+
+
+def test_retention_purges_old_read_notifications_in_batches(client, session):
+    create_user_and_token(client, "testpurge", "testpurge@example.com", "Password123!")
+    user = session.query(models.User).filter(models.User.email == "testpurge@example.com").first()
+    old = datetime.now(timezone.utc) - timedelta(days=200)
+    _add_notifications(session, user.id, 3, is_read=True, start=old)
+    _add_notifications(session, user.id, 2, is_read=False, start=old)
+    _add_notifications(session, user.id, 1, is_read=True)
+
+    assert purge_read_notifications(session, older_than_days=90, batch_size=2) == 3
+
+    remaining = (
+        session.query(models.Notification.title, models.Notification.is_read)
+        .filter(models.Notification.owner_id == user.id)
+        .order_by(models.Notification.id)
+        .all()
+    )
+    # Unread notifications are kept however old; the recent read one stays.
+    assert [tuple(row) for row in remaining] == [("n0", False), ("n1", False), ("n0", True)]
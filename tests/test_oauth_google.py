@@ -8,7 +8,7 @@ def test_google_login_native_success(client, session):
     settings.google_ios_client_id = "test-ios-id"
     settings.google_android_client_id = "test-android-id"
 
-    with patch("app.routers.oauth_google.id_token.verify_oauth2_token") as mock_verify:
+    with patch("app.routers.oauth_google.verify_google_id_token") as mock_verify:
         mock_verify.return_value = {
             "aud": "test-ios-id",
             "sub": "google-123",
@@ -32,7 +32,7 @@ def test_google_login_native_success(client, session):
 
 
 def test_google_login_native_invalid_token(client):
-    with patch("app.routers.oauth_google.id_token.verify_oauth2_token") as mock_verify:
+    with patch("app.routers.oauth_google.verify_google_id_token") as mock_verify:
         mock_verify.side_effect = Exception("Invalid token")
         
         response = client.post("/auth/google/native", json={
@@ -48,7 +48,7 @@ def test_google_login_native_invalid_audience(client):
     settings.google_ios_client_id = "test-ios-id"
     settings.google_android_client_id = "test-android-id"
 
-    with patch("app.routers.oauth_google.id_token.verify_oauth2_token") as mock_verify:
+    with patch("app.routers.oauth_google.verify_google_id_token") as mock_verify:
         mock_verify.return_value = {
             "aud": "unknown-client-id",
             "sub": "google-123"
@@ -67,7 +67,7 @@ def test_google_login_native_subject_missing(client):
     settings.google_ios_client_id = "test-ios-id"
     settings.google_android_client_id = "test-android-id"
 
-    with patch("app.routers.oauth_google.id_token.verify_oauth2_token") as mock_verify:
+    with patch("app.routers.oauth_google.verify_google_id_token") as mock_verify:
         mock_verify.return_value = {
             "aud": "test-ios-id",
             "sub": ""
@@ -396,3 +396,37 @@ def test_completed_or_archived_project_cannot_be_completed_again(client):
     archived_complete = client.post(f"/projects/{archived_project_id}/complete", json={}, headers=archived_headers)
     assert archived_complete.status_code == 400
     assert archived_complete.json()["detail"] == "projects.complete_invalid_state"
+
+
+def test_project_list_omits_finished_projects_unless_history_requested(client):
+    headers = create_user_and_token(
+        client,
+        "projectlisthistory",
+        "projectlisthistory@example.com",
+        "Password123!",
+    )
+    today = user_timezone_today()
+    project_ids = []
+    for title in ("Running", "Wrapped"):
+        created = client.post(
+            "/projects",
+            json={"title": title, "is_isolated": False, "start_date": today.isoformat()},
+            headers=headers,
+        )
+        assert created.status_code == 201, created.text
+        project_ids.append(created.json()["id"])
+    running_id, wrapped_id = project_ids
+    completed = client.post(f"/projects/{wrapped_id}/complete", json={}, headers=headers)
+    assert completed.status_code == 200, completed.text
+
+    current = client.get("/projects", headers=headers)
+    assert current.status_code == 200, current.text
+    assert [item["id"] for item in current.json()] == [running_id]
+
+    history = client.get("/budgets/projects", params={"include_history": True}, headers=headers)
+    assert history.status_code == 200, history.text
+    assert {item["id"] for item in history.json()} == {running_id, wrapped_id}
+
+    detail = client.get(f"/projects/{wrapped_id}", headers=headers)
+    assert detail.status_code == 200, detail.text
+    assert detail.json()["status"] == "COMPLETED"
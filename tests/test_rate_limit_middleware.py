@@ -0,0 +1,148 @@
+# pyrefly: ignore [missing-import]
+import pytest
+
+from app.rate_limit_middleware import (
+    DEBTS_WRITE,
+    EXPENSES_WRITE,
+    IP_KEY,
+    NOTIFICATIONS_READ,
+    BucketPolicy,
+    RoutePolicy,
+    build_bucket_checks,
+    match_route_policy,
+)
+from app.redis_rate_limiter import (
+    RateLimitResult,
+    TokenBucketCheck,
+    consume_token_buckets,
+    redis_client,
+)
+from app.session import get_db
+from app.main import app
+from tests.helpers import create_user_and_token
+
+
+def test_route_table_matches_templates_and_methods():
+    assert match_route_policy("POST", "/expenses/") is EXPENSES_WRITE
+    assert match_route_policy("DELETE", "/expenses/42") is EXPENSES_WRITE
+    assert match_route_policy("POST", "/debts/7/ledger/3/reverse") is DEBTS_WRITE
+    assert match_route_policy("GET", "/notifications/") is NOTIFICATIONS_READ
+
+    assert match_route_policy("GET", "/expenses/") is None
+    assert match_route_policy("GET", "/notifications/unread-count") is None
+    assert match_route_policy("POST", "/expenses/42/unknown") is None
+
+
+def test_bucket_checks_use_jwt_identity_and_ip(client):
+    headers = create_user_and_token(client, "rl_mw", "rl_mw@example.com", "Pass123!")
+    policy = RoutePolicy(
+        detail="test.rate_limited",
+        buckets=(
+            BucketPolicy("test_ip", 50, 1.0, key=IP_KEY),
+            BucketPolicy("test_user", 5, 1.0),
+        ),
+    )
+    scope = {
+        "client": ("10.0.0.9", 1234),
+        "headers": [(b"authorization", headers["Authorization"].encode())],
+    }
+
+    checks = build_bucket_checks(policy, scope)
+
+    assert (checks[0].scope, checks[0].identifier) == ("test_ip", "10.0.0.9")
+    assert checks[1].scope == "test_user"
+    assert checks[1].identifier.isdigit()
+
+
+def test_bucket_checks_skip_user_scope_without_valid_token():
+    scope = {"client": ("10.0.0.9", 1234), "headers": [(b"authorization", b"Bearer not-a-jwt")]}
+    assert build_bucket_checks(EXPENSES_WRITE, scope) == []
+
+
+def test_over_limit_request_is_rejected_before_db_session(client, monkeypatch):
+    headers = create_user_and_token(client, "rl_deny", "rl_deny@example.com", "Pass123!")
+    seen_checks = []
+
+    def deny(checks):
+        seen_checks.append(checks)
+        return [
+            RateLimitResult(allowed=False, limit=c.capacity, remaining=0, reset_seconds=17)
+            for c in checks
+        ]
+
+    def fail_get_db():
+        raise AssertionError("rate-limited request must not open a DB session")
+        yield  # pragma: no cover
+
+    monkeypatch.setattr("app.rate_limit_middleware.consume_token_buckets", deny)
+    monkeypatch.setitem(app.dependency_overrides, get_db, fail_get_db)
+
+    response = client.post("/expenses/", json={"title": "x", "amount": 1}, headers=headers)
+
+    assert response.status_code == 429
+    assert response.json()["detail"] == "expenses.write_rate_limited"
+    assert response.headers["retry-after"] == "17"
+    assert response.headers["x-ratelimit-remaining"] == "0"
+    assert len(seen_checks) == 1
+    assert [c.scope for c in seen_checks[0]] == ["expenses_write"]
+
+
+def test_allowed_request_gets_rate_limit_headers(client, monkeypatch):
+    headers = create_user_and_token(client, "rl_allow", "rl_allow@example.com", "Pass123!")
+
+    def allow(checks):
+        return [
+            RateLimitResult(allowed=True, limit=c.capacity, remaining=c.capacity - 1, reset_seconds=1)
+            for c in checks
+        ]
+
+    monkeypatch.setattr("app.rate_limit_middleware.consume_token_buckets", allow)
+
+    response = client.get("/notifications/", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["x-ratelimit-limit"] == "30"
+    assert response.headers["x-ratelimit-remaining"] == "29"
+    assert "retry-after" not in response.headers
+
+
+def test_consume_token_buckets_charges_every_scope_in_one_call():
+    try:
+        for key in redis_client.scan_iter("tb:mw_test_*"):
+            redis_client.delete(key)
+    except Exception:
+        pytest.skip("Redis is not reachable for explicit rate-limit assertion.")
+
+    checks = [
+        TokenBucketCheck("mw_test_ip", "10.0.0.1", capacity=5, refill_rate_per_second=5 / 60),
+        TokenBucketCheck("mw_test_user", "1", capacity=2, refill_rate_per_second=2 / 60),
+    ]
+
+    first = consume_token_buckets(checks)
+    second = consume_token_buckets(checks)
+    third = consume_token_buckets(checks)
+
+    assert [rl.allowed for rl in first] == [True, True]
+    assert [rl.remaining for rl in second] == [3, 0]
+    assert [rl.allowed for rl in third] == [True, False]
+    assert third[1].reset_seconds >= 1
+
+
+def test_password_routes_charge_ip_and_user_buckets(client, monkeypatch):
+    headers = create_user_and_token(client, "rl_pw", "rl_pw@example.com", "Pass123!")
+    seen_checks = []
+
+    def allow(checks):
+        seen_checks.append(checks)
+        return [
+            RateLimitResult(allowed=True, limit=c.capacity, remaining=c.capacity - 1, reset_seconds=1)
+            for c in checks
+        ]
+
+    monkeypatch.setattr("app.rate_limit_middleware.consume_token_buckets", allow)
+
+    response = client.post("/auth/verify-password", json={"password": "Pass123!"}, headers=headers)
+
+    assert response.status_code == 200
+    assert [check.scope for check in seen_checks[0]] == ["verify_pw_ip", "verify_pw_user"]
+    assert seen_checks[0][0].identifier == "testclient"
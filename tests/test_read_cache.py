@@ -0,0 +1,177 @@
+# pyrefly: ignore [missing-import]
+import pytest
+
+from app import models, schemas
+from app.domains.ledger import get_ledger_version, is_ledger_version_bumped
+from app.read_cache import cached_read, get_read_cache_stats, reset_read_cache_stats
+from app.redis_rate_limiter import redis_client
+from config import settings
+from tests.helpers import create_budget, create_expense, create_user_and_token, user_timezone_today
+
+
+def _require_redis():
+    try:
+        redis_client.ping()
+    except Exception:
+        pytest.skip("Redis is not reachable for read-cache assertions.")
+
+
+def _user_id(session, email):
+    return session.query(models.User.id).filter(models.User.email == email).scalar()
+
+
+def test_expense_post_and_void_bump_ledger_version(client, session):
+    headers = create_user_and_token(client, "ledgerver", "ledgerver@example.com", "Pass123!")
+    user_id = _user_id(session, "ledgerver@example.com")
+    create_budget(client, headers, category="Food", monthly_limit=50_000)
+    before = get_ledger_version(session, user_id)
+
+    created = create_expense(client, headers, title="Tea", amount=10, category="Food")
+    assert created.status_code == 201
+    session.expire_all()
+    after_post = get_ledger_version(session, user_id)
+
+    deleted = client.delete(f"/expenses/{created.json()['id']}", headers=headers)
+    assert deleted.status_code == 204
+    session.expire_all()
+    after_void = get_ledger_version(session, user_id)
+
+    assert before < after_post < after_void
+
+
+def test_ledger_version_bumps_once_per_transaction(client, session):
+    create_user_and_token(client, "ledgeronce", "ledgeronce@example.com", "Pass123!")
+    user_id = _user_id(session, "ledgeronce@example.com")
+    before = get_ledger_version(session, user_id)
+
+    for name in ("One", "Two"):
+        session.add(
+            models.Wallet(
+                owner_id=user_id,
+                name=name,
+                wallet_type=models.WalletType.CASH,
+                accounting_type=models.AccountingType.ASSET,
+                initial_balance=0,
+                current_balance=0,
+            )
+        )
+        session.flush()
+    assert is_ledger_version_bumped(session, user_id)
+    session.commit()
+
+    assert not is_ledger_version_bumped(session, user_id)
+    assert get_ledger_version(session, user_id) == before + 1
+
+
+def test_dashboard_summary_is_served_from_cache_until_next_write(client):
+    _require_redis()
+    headers = create_user_and_token(client, "cachedash", "cachedash@example.com", "Pass123!")
+    create_budget(client, headers, category="Food", monthly_limit=500_000)
+    create_expense(client, headers, title="Lunch", amount=100, category="Food")
+    reset_read_cache_stats()
+
+    first = client.get("/analytics/dashboard-summary", headers=headers)
+    second = client.get("/analytics/dashboard-summary", headers=headers)
+    assert first.json() == second.json()
+    stats = get_read_cache_stats()["analytics_dashboard_summary"]
+    assert (stats["misses"], stats["hits"]) == (1, 1)
+
+    create_expense(client, headers, title="Dinner", amount=50, category="Food")
+    third = client.get("/analytics/dashboard-summary", headers=headers)
+
+    assert third.json()["spent"] == first.json()["spent"] + 50
+    stats = get_read_cache_stats()["analytics_dashboard_summary"]
+    assert (stats["misses"], stats["hits"]) == (2, 1)
+    assert stats["hit_rate"] == pytest.approx(1 / 3, abs=1e-3)
+
+
+def test_project_summaries_are_cached_until_a_reservation_changes(client):
+    _require_redis()
+    headers = create_user_and_token(client, "cacheprojects", "cacheprojects@example.com", "Pass123!")
+    create_budget(client, headers, category="Travel", monthly_limit=1_000_000)
+    today = user_timezone_today()
+    project = client.post(
+        "/projects",
+        json={"title": "Trip", "is_isolated": False, "start_date": today.isoformat()},
+        headers=headers,
+    )
+    assert project.status_code == 201, project.text
+    project_id = project.json()["id"]
+    reset_read_cache_stats()
+
+    first = client.get("/projects", headers=headers)
+    second = client.get("/projects", headers=headers)
+    assert first.json() == second.json()
+    stats = get_read_cache_stats()["project_budget_summaries"]
+    assert (stats["misses"], stats["hits"]) == (1, 1)
+
+    # Reservations have no owner_id of their own; writing one must still
+    # move the owner's version past the cached entry.
+    reservation = client.post(
+        f"/projects/{project_id}/category-limits",
+        json={
+            "category": "Travel",
+            "limit_amount": 250_000,
+            "budget_year": today.year,
+            "budget_month": today.month,
+        },
+        headers=headers,
+    )
+    assert reservation.status_code == 201, reservation.text
+    third = client.get("/projects", headers=headers)
+    assert third.json()[0]["selected_month_reserved_amount"] == 250_000
+
+
+def test_cached_read_bypasses_session_with_pending_changes(client, session):
+    _require_redis()
+    create_user_and_token(client, "cachebypass", "cachebypass@example.com", "Pass123!")
+    user_id = _user_id(session, "cachebypass@example.com")
+    calls = []
+
+    @cached_read("test_bypass")
+    def count_wallets(db, owner_id: int) -> int:
+        calls.append(owner_id)
+        return db.query(models.Wallet).filter(models.Wallet.owner_id == owner_id).count()
+
+    reset_read_cache_stats()
+    assert count_wallets(session, user_id) == count_wallets(session, user_id)
+    assert len(calls) == 1
+
+    session.add(
+        models.Wallet(
+            owner_id=user_id,
+            name="Pending",
+            wallet_type=models.WalletType.CASH,
+            accounting_type=models.AccountingType.ASSET,
+            initial_balance=0,
+            current_balance=0,
+        )
+    )
+    count_wallets(session, user_id)
+    session.rollback()
+
+    assert len(calls) == 2
+    assert get_read_cache_stats()["test_bypass"]["bypassed"] == 1
+
+
+def test_cached_read_evicts_least_recently_used_entries(client, session, monkeypatch):
+    _require_redis()
+    create_user_and_token(client, "cacheevict", "cacheevict@example.com", "Pass123!")
+    user_id = _user_id(session, "cacheevict@example.com")
+    monkeypatch.setattr(settings, "read_cache_max_entries_per_user", 2)
+
+    @cached_read("test_evict")
+    def echo(db, owner_id: int, value: int) -> schemas.DailyTrendItem:
+        return schemas.DailyTrendItem(date="2026-01-01", amount=value)
+
+    reset_read_cache_stats()
+    echo(session, user_id, 1)
+    echo(session, user_id, 2)
+    echo(session, user_id, 1)  # refresh 1 so that 2 is the LRU entry
+    echo(session, user_id, 3)
+
+    assert redis_client.zcard(f"rc:{user_id}:index") == 2
+    assert echo(session, user_id, 1).amount == 1
+    stats = get_read_cache_stats()["test_evict"]
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2
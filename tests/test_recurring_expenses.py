@@ -443,6 +443,92 @@ def test_scheduler_materializes_confirmation_occurrence_once(client):
         except StopIteration:
             pass
 
+def test_scheduler_commits_each_chunk_in_worker_sessions(client, monkeypatch):
+    today = user_timezone_today()
+    template_ids = []
+    for index in range(3):
+        email = f"req_scheduler_chunk_{index}@example.com"
+        create_user_and_token(client, f"req_scheduler_chunk_{index}", email, "Password123!")
+        _make_user_premium(email)
+        template_ids.append(
+            _create_recurring_row(email, title=f"Chunk {index}", next_due_date=today)
+        )
+
+    # Worker threads open their own sessions; point them at the test database.
+    monkeypatch.setattr(
+        "app.scheduler.SessionLocal",
+        lambda: next(app.dependency_overrides[get_db]()),
+    )
+    monkeypatch.setattr("app.scheduler.settings.recurring_scheduler_chunk_size", 2)
+    monkeypatch.setattr("app.scheduler.settings.recurring_scheduler_workers", 1)
+
+    assert process_due_recurring_expenses() == 3
+    assert process_due_recurring_expenses() == 0
+
+    db_gen, db = _get_test_db()
+    try:
+        occurrences = db.query(models.RecurringOccurrence).filter(
+            models.RecurringOccurrence.template_id.in_(template_ids),
+        ).count()
+        assert occurrences == 3
+    finally:
+        db.close()
+        try:
+            next(db_gen)
+        except StopIteration:
+            pass
+
+
+def test_scheduler_processes_one_timezone_bucket_and_syncs_midnight_jobs(client, monkeypatch):
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+    from app.scheduler import sync_recurring_timezone_jobs
+
+    template_ids = {}
+    for zone, slug in (("Asia/Tashkent", "tashkent"), ("America/Los_Angeles", "la")):
+        email = f"req_bucket_{slug}@example.com"
+        create_user_and_token(client, f"req_bucket_{slug}", email, "Password123!")
+        _make_user_premium(email)
+        db_gen, db = _get_test_db()
+        try:
+            db.query(models.User).filter(models.User.email == email).update({"timezone": zone})
+            db.commit()
+        finally:
+            db.close()
+        template_ids[zone] = _create_recurring_row(
+            email,
+            title=f"Bucket {slug}",
+            next_due_date=user_timezone_today() - timedelta(days=1),
+        )
+
+    db_gen, db = _get_test_db()
+    try:
+        assert process_due_recurring_expenses(db, timezone_name="Asia/Tashkent") == 1
+        generated = {
+            row[0]
+            for row in db.query(models.RecurringOccurrence.template_id).all()
+        }
+        assert generated == {template_ids["Asia/Tashkent"]}
+    finally:
+        db.close()
+
+    monkeypatch.setattr(
+        "app.scheduler.SessionLocal",
+        lambda: next(app.dependency_overrides[get_db]()),
+    )
+    scheduler = AsyncIOScheduler()
+    scheduler.add_job(print, "interval", hours=1, id="process_recurring_expenses:Europe/Paris")
+    sync_recurring_timezone_jobs(scheduler)
+
+    jobs = {job.id: job for job in scheduler.get_jobs()}
+    assert set(jobs) == {
+        "process_recurring_expenses:America/Los_Angeles",
+        "process_recurring_expenses:Asia/Tashkent",
+    }
+    trigger = jobs["process_recurring_expenses:Asia/Tashkent"].trigger
+    assert str(trigger.timezone) == "Asia/Tashkent"
+
+
 def test_confirm_recurring_occurrence(client):
     email = "req_confirm_api@example.com"
     headers = create_user_and_token(client, "req_confirm_api", email, "Password123!")
@@ -734,3 +820,55 @@ def test_recurring_custom_projection_validation_allows_practical_caps(client):
     )
     assert rejected.status_code == 400
     assert rejected.json()["detail"] == "recurring.projection_horizon_too_large"
+
+
+def test_recurrence_engine_matches_stepwise_schedule_with_month_end_clamping():
+    from app.services.recurring_schedule_service import (
+        calculate_next_due_date,
+        count_due_dates,
+        due_dates_between,
+        nth_due_date,
+    )
+
+    monthly = models.RecurringFrequency.MONTHLY
+    stepped = [date(2026, 1, 31)]
+    for _ in range(14):
+        stepped.append(calculate_next_due_date(stepped[-1], monthly, 31))
+
+    assert [nth_due_date(date(2026, 1, 31), monthly, n, 31) for n in range(15)] == stepped
+    assert nth_due_date(date(2026, 1, 31), monthly, 1, 31) == date(2026, 2, 28)
+    assert nth_due_date(date(2026, 1, 31), monthly, 2, 31) == date(2026, 3, 31)
+    assert due_dates_between(
+        date(2026, 1, 31), monthly, date(2026, 2, 1), date(2026, 4, 30), 31
+    ) == [date(2026, 2, 28), date(2026, 3, 31), date(2026, 4, 30)]
+
+    daily = models.RecurringFrequency.DAILY
+    assert count_due_dates(date(2026, 1, 1), daily, date(2026, 1, 1), date(2030, 12, 31)) == 1826
+    assert count_due_dates(date(2026, 1, 1), daily, date(2025, 1, 1), date(2025, 12, 31)) == 0
+    assert count_due_dates(
+        date(2026, 3, 1), models.RecurringFrequency.ONE_TIME, date(2026, 1, 1), date(2026, 12, 31)
+    ) == 1
+
+
+def test_every_recurring_frequency_has_exactly_one_step():
+    from app.services.recurring_schedule_service import (
+        DAY_STEPS,
+        MONTH_STEPS,
+        calculate_next_due_date,
+    )
+
+    stepped = set(models.RecurringFrequency) - {models.RecurringFrequency.ONE_TIME}
+    assert set(DAY_STEPS) | set(MONTH_STEPS) == stepped
+    assert not set(DAY_STEPS) & set(MONTH_STEPS)
+
+    start = date(2026, 1, 31)
+    assert {frequency: calculate_next_due_date(start, frequency) for frequency in models.RecurringFrequency} == {
+        models.RecurringFrequency.ONE_TIME: date(2026, 1, 31),
+        models.RecurringFrequency.DAILY: date(2026, 2, 1),
+        models.RecurringFrequency.WEEKLY: date(2026, 2, 7),
+        models.RecurringFrequency.BIWEEKLY: date(2026, 2, 14),
+        models.RecurringFrequency.MONTHLY: date(2026, 2, 28),
+        models.RecurringFrequency.QUARTERLY: date(2026, 4, 30),
+        models.RecurringFrequency.SEMI_ANNUALLY: date(2026, 7, 31),
+        models.RecurringFrequency.YEARLY: date(2027, 1, 31),
+    }
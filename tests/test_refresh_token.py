@@ -293,9 +293,9 @@ def test_expired_refresh_token_rejected(client, session):
 # Google OAuth Integration
 # ═══════════════════════════════════════════════════
 
-@patch("app.routers.oauth_google.httpx.post")
-@patch("app.routers.oauth_google.id_token.verify_oauth2_token")
-def test_google_oauth_returns_refresh_cookie(mock_verify, mock_post, client, session):
+@patch("app.routers.oauth_google.get_sync_client")
+@patch("app.routers.oauth_google.verify_google_id_token")
+def test_google_oauth_returns_refresh_cookie(mock_verify, mock_http_client, client, session):
     """Google OAuth callback should set a refresh_token cookie upon success."""
     
     # 1. Generate a valid state token to pass the CSRF check
@@ -307,7 +307,7 @@ def test_google_oauth_returns_refresh_cookie(mock_verify, mock_post, client, ses
         status_code = 200
         def json(self):
             return {"id_token": "mocked_id_token"}
-    mock_post.return_value = MockResponse()
+    mock_http_client.return_value.post.return_value = MockResponse()
     
     # 3. Mock the JWT verification result
     mock_verify.return_value = {
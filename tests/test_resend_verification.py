@@ -1,5 +1,6 @@
-from unittest.mock import patch
 from app import models
+from app.email_outbox import dispatch_email_outbox
+from app.email_service import EmailDeliveryError, StubTransport
 from app.redis_rate_limiter import redis_client
 
 def test_resend_verification_success_dispatch(client, session):
@@ -66,11 +67,18 @@ def test_resend_verification_provider_failure(client, session):
         "password": "Password123!"
     })
     
-    with patch("app.routers.auth.send_verification_email", return_value=False):
-        res = client.post("/auth/resend-verification", json={"email": "fail@example.com"})
-        assert res.status_code == 200
-        # It still returns 200 to resist enumeration, but logs the failure internally
-        assert "If the account exists" in res.json()["message"]
+    # Delivery happens in the outbox dispatcher, so a provider outage cannot
+    # fail the request; the row is retried later.
+    res = client.post("/auth/resend-verification", json={"email": "fail@example.com"})
+    assert res.status_code == 200
+    assert "If the account exists" in res.json()["message"]
+
+    transport = StubTransport(failures=[EmailDeliveryError("status 503", retryable=True)] * 2)
+    assert dispatch_email_outbox(session, transport=transport) == 0
+    rows = session.query(models.EmailOutbox).filter(models.EmailOutbox.to_email == "fail@example.com").all()
+    assert len(rows) == 2
+    assert {row.status for row in rows} == {models.EmailOutboxStatus.PENDING.value}
+    assert {row.attempts for row in rows} == {1}
 
 def test_resend_verification_token_replacement(client, session):
     client.post("/users/sign-up", json={
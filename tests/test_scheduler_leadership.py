@@ -0,0 +1,98 @@
+# pyrefly: ignore [missing-import]
+import pytest
+
+from app.redis_rate_limiter import redis_client
+from app import scheduler
+from app.scheduler import get_scheduler_job_stats, reset_scheduler_job_stats, run_leader_job
+from app.scheduler_leadership import LeaderElector
+
+
+LEASE_KEY = "scheduler:test-leader"
+
+
+@pytest.fixture
+def lease_key():
+    try:
+        redis_client.ping()
+    except Exception:
+        pytest.skip("Redis is not reachable for leader-election assertions.")
+    redis_client.delete(LEASE_KEY)
+    reset_scheduler_job_stats()
+    yield LEASE_KEY
+    redis_client.delete(LEASE_KEY)
+    reset_scheduler_job_stats()
+
+
+def test_only_one_instance_holds_the_lease(lease_key):
+    first = LeaderElector(key=lease_key, ttl_seconds=30, token="worker-a")
+    second = LeaderElector(key=lease_key, ttl_seconds=30, token="worker-b")
+
+    assert first.heartbeat() is True
+    assert second.heartbeat() is False
+    # Renewal keeps the lease with the current leader.
+    assert first.heartbeat() is True
+    assert first.is_leader() and not second.is_leader()
+
+    first.release()
+    assert second.heartbeat() is True
+    assert first.heartbeat() is False
+
+
+def test_follower_takes_over_when_leader_lease_expires(lease_key):
+    leader = LeaderElector(key=lease_key, ttl_seconds=30, token="worker-a")
+    follower = LeaderElector(key=lease_key, ttl_seconds=30, token="worker-b")
+    assert leader.heartbeat() is True
+
+    # The leader died without releasing; its lease lapses.
+    redis_client.delete(lease_key)
+
+    assert follower.heartbeat() is True
+    assert leader.heartbeat() is False
+    assert not leader.is_leader()
+
+
+def test_only_the_leader_runs_jobs_and_metrics_are_recorded(lease_key):
+    leader = LeaderElector(key=lease_key, ttl_seconds=30, token="worker-a")
+    follower = LeaderElector(key=lease_key, ttl_seconds=30, token="worker-b")
+    leader.heartbeat()
+    calls = []
+
+    def job():
+        calls.append(1)
+        return 3
+
+    assert run_leader_job("recurring", job, leader) == 3
+    assert run_leader_job("recurring", job, follower) is None
+
+    stats = get_scheduler_job_stats()["recurring"]
+    assert calls == [1]
+    assert stats["runs"] == 1
+    assert stats["skipped"] == 1
+    assert stats["processed"] == 3
+    assert stats["last_duration_seconds"] >= 0
+    assert stats["last_run_at"] is not None
+
+
+@pytest.mark.parametrize(
+    ("job", "dependency"),
+    [
+        (scheduler.process_due_recurring_expenses, "recurring_timezone_buckets"),
+        (scheduler.purge_old_read_notifications, "purge_read_notifications"),
+        (scheduler.dispatch_pending_emails, "dispatch_email_outbox"),
+        (scheduler.purge_old_settled_emails, "purge_settled_emails"),
+    ],
+)
+def test_failing_job_is_counted_as_a_failure(job, dependency, session, monkeypatch):
+    def boom(*args, **kwargs):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(scheduler, dependency, boom)
+    reset_scheduler_job_stats()
+
+    with pytest.raises(RuntimeError):
+        run_leader_job("failing", lambda: job(session))
+
+    stats = get_scheduler_job_stats()["failing"]
+    assert stats["runs"] == 1
+    assert stats["failures"] == 1
+    reset_scheduler_job_stats()
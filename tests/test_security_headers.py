@@ -0,0 +1,58 @@
+import asyncio
+
+from app.security_headers import SecurityHeadersMiddleware, build_security_headers
+from config import settings
+
+
+def test_security_headers_are_added_to_every_response(client):
+    response = client.get("/meta/categories")
+
+    csp = response.headers["content-security-policy"]
+    assert "frame-ancestors 'none'" in csp
+    for origin in settings.cors_origins_list:
+        assert origin in csp
+    assert response.headers["x-frame-options"] == "DENY"
+    assert response.headers["x-content-type-options"] == "nosniff"
+
+    missing = client.get("/does-not-exist")
+    assert missing.status_code == 404
+    assert missing.headers["referrer-policy"] == "no-referrer"
+
+
+def test_production_headers_include_hsts_and_upgrade():
+    headers = dict(build_security_headers(["https://app.example"], is_production=True))
+
+    assert b"upgrade-insecure-requests" in headers[b"content-security-policy"]
+    assert b"connect-src 'self' https://app.example" in headers[b"content-security-policy"]
+    assert headers[b"strict-transport-security"].startswith(b"max-age=")
+
+
+def test_middleware_replaces_app_headers_and_streams_body_chunks():
+    async def streaming_app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"x-frame-options", b"SAMEORIGIN"), (b"content-type", b"text/csv")],
+        })
+        await send({"type": "http.response.body", "body": b"a,b\n", "more_body": True})
+        await send({"type": "http.response.body", "body": b"1,2\n", "more_body": False})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    middleware = SecurityHeadersMiddleware(streaming_app, headers=build_security_headers([], False))
+    asyncio.run(middleware({"type": "http", "method": "GET", "path": "/"}, receive, send))
+
+    assert [message["type"] for message in sent] == [
+        "http.response.start",
+        "http.response.body",
+        "http.response.body",
+    ]
+    headers = sent[0]["headers"]
+    assert [value for name, value in headers if name == b"x-frame-options"] == [b"DENY"]
+    assert (b"content-type", b"text/csv") in headers
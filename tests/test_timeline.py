@@ -304,3 +304,70 @@ def test_timeline_excludes_fully_paid_items_and_uses_remaining_amount(client, se
     assert len(events) == 1
     assert events[0]["title"] == "Pay Debt: Bob"
     assert events[0]["amount"] == 200_000
+
+
+def test_timeline_range_spans_months_and_pages_by_cursor(client, session):
+    from datetime import timedelta
+
+    email = "timeline_range@example.com"
+    headers = create_user_and_token(client, "timeline_range", email, "Password123!")
+    user = _user(session, email)
+    today = user_timezone_today()
+
+    for index, offset in enumerate((0, 0, 35, 70)):
+        session.add(
+            models.Debt(
+                owner_id=user.id,
+                debt_type=models.DebtType.OWING,
+                origin_kind=models.DebtOriginKind.CASH_BORROWED,
+                counterparty_kind=models.DebtCounterpartyKind.PERSON,
+                counterparty_name=f"Lender {index}",
+                initial_amount=100_000,
+                remaining_amount=100_000,
+                date=today,
+                expected_return_date=today + timedelta(days=offset),
+            )
+        )
+    session.add(
+        models.RecurringExpense(
+            owner_id=user.id,
+            title="Rent",
+            amount=300_000,
+            category=models.ExpenseCategory.UTILITIES,
+            frequency=models.RecurringFrequency.MONTHLY,
+            start_date=today,
+            next_due_date=today + timedelta(days=1),
+            original_due_day=(today + timedelta(days=1)).day,
+            status=models.RecurringStatus.ACTIVE,
+        )
+    )
+    session.commit()
+    end = today + timedelta(days=89)
+    url = f"/budgets/timeline/range?start_date={today}&end_date={end}"
+
+    full = client.get(url, headers=headers)
+    assert full.status_code == 200, full.text
+    assert full.json()["next_cursor"] is None
+    all_ids = [event["id"] for event in full.json()["items"]]
+    assert len(all_ids) == 4 + 3
+    assert sum(1 for event in full.json()["items"] if event["status"] == "SCHEDULED") == 3
+
+    paged_ids = []
+    cursor = None
+    while True:
+        page_url = f"{url}&limit=2" + (f"&cursor={cursor}" if cursor else "")
+        page = client.get(page_url, headers=headers)
+        assert page.status_code == 200, page.text
+        paged_ids.extend(event["id"] for event in page.json()["items"])
+        cursor = page.json()["next_cursor"]
+        if cursor is None:
+            break
+    assert paged_ids == all_ids
+
+    bad_cursor = client.get(f"{url}&cursor=nonsense", headers=headers)
+    assert bad_cursor.status_code == 400
+    too_wide = client.get(
+        f"/budgets/timeline/range?start_date={today}&end_date={today + timedelta(days=400)}",
+        headers=headers,
+    )
+    assert too_wide.status_code == 400